@@ -5,7 +5,6 @@ Service de résolution des clients autorisés
 import json
 import logging
 from typing import Dict, List, Optional, Tuple
-from pathlib import Path
 
 from backend.config.settings import Config
 
@@ -13,7 +12,7 @@ class ClientResolverService:
     """Service pour résoudre les noms de clients vers leurs IDs Google Ads et Meta Ads"""
     
     def __init__(self):
-        self.allowlist_path = Path(__file__).parent.parent.parent / "config" / "client_allowlist.json"
+        self.allowlist_path = Config.PATHS.CLIENT_ALLOWLIST_FILE
         self._load_allowlist()
     
     def _load_allowlist(self) -> None:
@@ -0,0 +1,323 @@
+"""
+Export du contenu créatif (Google Ads, Meta Ads) vers Google Drive, en parallèle.
+
+Les campagnes des deux plateformes sont traitées sur un pool borné et chaque
+média est transféré en flux CDN → Drive sur un second pool. Trois limites
+séparées bornent la charge : appels API publicitaires (Ads / Graph),
+téléchargements CDN et uploads Drive. Les noms de fichiers restent
+déterministes (image_{n} / video_{n}, n = position du média dans la campagne)
+et les CSV sont rapportés dans l'ordre des campagnes.
+"""
+
+import contextvars
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.common.services.job_queue import report_job_progress
+
+
+def _env_int(name: str, default: int) -> int:
+    return max(1, int(os.getenv(name, str(default))))
+
+
+def _safe_name(campaign_name: str) -> str:
+    return campaign_name.replace('/', '-').replace('\\', '-').replace("'", "")
+
+
+def _is_not_found(error: Exception) -> bool:
+    """HttpError 404 de l'API Drive (fichier ou dossier parent supprimé)"""
+    return getattr(getattr(error, 'resp', None), 'status', None) == 404
+
+
+def _mime_type(kind: str, extension: str) -> str:
+    # extension contient le point, ex: '.jpg'
+    if kind == "image":
+        return f"image/{extension[1:]}" if extension[1:] != 'jpg' else "image/jpeg"
+    return f"video/{extension[1:]}"
+
+
+def _google_csv(ads: List[Dict[str, Any]]) -> str:
+    # En-têtes CSV (avec YouTube Videos URLs)
+    csv_content = "Groupe d'annonces,Nom annonce,Type,URL finale,Headlines,Descriptions,YouTube Videos URLs\n"
+    for ad in ads:
+        # Préparer les champs pour le CSV (échapper les guillemets)
+        ad_group = ad.get("ad_group_name", "").replace('"', '""')
+        ad_name = ad.get("ad_name", "").replace('"', '""')
+        ad_type = ad.get("ad_type", "")
+        headlines = " | ".join(ad.get('headlines', [])).replace('"', '""')
+        descriptions = " | ".join(ad.get('descriptions', [])).replace('"', '""')
+        final_urls = " | ".join(ad.get('final_urls', [])).replace('"', '""')
+        youtube_urls = " | ".join([yt['url'] for yt in ad.get('youtube_videos', [])]).replace('"', '""')
+        csv_content += f'"{ad_group}","{ad_name}","{ad_type}","{final_urls}","{headlines}","{descriptions}","{youtube_urls}"\n'
+    return csv_content
+
+
+def _meta_csv(creatives: List[Dict[str, Any]]) -> str:
+    # CSV sans URLs de médias
+    csv_content = "Nom annonce,Titre,Texte,Call to Action,Lien\n"
+    for creative in creatives:
+        name = creative.get("ad_name", "").replace('"', '""')
+        title = creative.get("title", "").replace('"', '""')
+        body = creative.get("body", "").replace('"', '""')
+        cta = creative.get("call_to_action", "").replace('"', '""')
+        link = creative.get("link_url", "").replace('"', '""')
+        csv_content += f'"{name}","{title}","{body}","{cta}","{link}"\n'
+    return csv_content
+
+
+class _Platform:
+    """Accès aux campagnes, annonces et médias d'une plateforme"""
+
+    def __init__(
+        self,
+        key: str,
+        label: str,
+        creative_service,
+        list_campaigns: Callable[[], List[Dict[str, Any]]],
+        list_items: Callable[[Dict[str, Any]], List[Dict[str, Any]]],
+        build_csv: Callable[[List[Dict[str, Any]]], str],
+        media_kinds: Tuple[Tuple[str, str], ...],
+        folder_id: str,
+    ):
+        self.key = key
+        self.label = label
+        self.creative_service = creative_service
+        self.list_campaigns = list_campaigns
+        self.list_items = list_items
+        self.build_csv = build_csv
+        self.media_kinds = media_kinds
+        self.folder_id = folder_id
+
+    def media(self, items: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        """(type, url) dans l'ordre historique : par annonce, images puis vidéos"""
+        return [(kind, url) for item in items for kind, field in self.media_kinds for url in item.get(field, [])]
+
+
+class CreativeExportEngine:
+    """
+    Exporte les campagnes actives d'un client : un dossier par campagne avec
+    ses médias et un CSV des annonces.
+
+    Limites (variables d'environnement) : EXPORT_CAMPAIGN_WORKERS campagnes et
+    EXPORT_MEDIA_WORKERS médias en cours, EXPORT_API_CONCURRENCY appels Ads/Graph,
+    EXPORT_DOWNLOAD_CONCURRENCY téléchargements CDN et EXPORT_UPLOAD_CONCURRENCY
+    uploads Drive simultanés. DRIVE_MEDIA_DEDUP=0 désactive la réutilisation
+    des médias déjà présents sur Drive.
+    """
+
+    def __init__(self, drive_service):
+        self.drive_service = drive_service
+        self.campaign_workers = _env_int("EXPORT_CAMPAIGN_WORKERS", 4)
+        self.media_workers = _env_int("EXPORT_MEDIA_WORKERS", 8)
+        self._api = threading.BoundedSemaphore(_env_int("EXPORT_API_CONCURRENCY", 4))
+        self._downloads = threading.BoundedSemaphore(_env_int("EXPORT_DOWNLOAD_CONCURRENCY", 8))
+        self._uploads = threading.BoundedSemaphore(_env_int("EXPORT_UPLOAD_CONCURRENCY", 4))
+        self.deduplicate = os.getenv("DRIVE_MEDIA_DEDUP", "1") != "0"
+        self._progress_lock = threading.Lock()
+
+    def export(
+        self,
+        client_name: str,
+        today: str,
+        google_customer_id: Optional[str] = None,
+        meta_account_id: Optional[str] = None,
+        google_folder_id: Optional[str] = None,
+        meta_folder_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns:
+            Fichiers CSV exportés ({platform, campaign, type, id, name, link}),
+            campagnes Google puis Meta, dans l'ordre des campagnes
+        """
+        platforms = []
+        if google_customer_id:
+            try:
+                platforms.append(self._google_platform(google_customer_id, google_folder_id))
+            except Exception as e:
+                report_job_progress("google", "error")
+                logging.error(f"❌ Erreur export Google Ads: {e}")
+        if meta_account_id:
+            try:
+                platforms.append(self._meta_platform(meta_account_id, meta_folder_id))
+            except Exception as e:
+                report_job_progress("meta", "error")
+                logging.error(f"❌ Erreur export Meta Ads: {e}")
+
+        with ThreadPoolExecutor(max_workers=self.campaign_workers, thread_name_prefix="export-campaign") as campaigns_pool, \
+                ThreadPoolExecutor(max_workers=self.media_workers, thread_name_prefix="export-media") as media_pool:
+
+            # 1. Campagnes actives des plateformes, en parallèle
+            listings = [(platform, self._submit(campaigns_pool, self._list_campaigns, platform, client_name))
+                        for platform in platforms]
+
+            # 2. Une tâche par campagne
+            jobs = []
+            for platform, listing in listings:
+                try:
+                    campaigns = listing.result()
+                except Exception as e:
+                    report_job_progress(platform.key, "error")
+                    logging.error(f"❌ Erreur export {platform.label}: {e}")
+                    continue
+                if len(campaigns) > 1:
+                    # Un seul listing des dossiers de campagne existants au lieu d'une recherche par campagne
+                    try:
+                        self.drive_service.prefetch_folders(platform.folder_id)
+                    except Exception as e:
+                        logging.warning(f"⚠️ Préchargement des dossiers {platform.label} impossible: {e}")
+                state = {"done": 0, "total": len(campaigns), "errors": 0}
+                report_job_progress(platform.key, "running", done=0, total=len(campaigns))
+                futures = [
+                    self._submit(campaigns_pool, self._export_campaign, platform, campaign, today, media_pool, state)
+                    for campaign in campaigns
+                ]
+                jobs.append((platform, state, futures))
+
+            # 3. Résultats dans l'ordre des campagnes
+            exported_files = []
+            for platform, state, futures in jobs:
+                for future in futures:
+                    csv_file = future.result()
+                    if csv_file:
+                        exported_files.append(csv_file)
+                report_job_progress(platform.key, "error" if state["errors"] else "ok")
+        return exported_files
+
+    @staticmethod
+    def _google_platform(customer_id: str, folder_id: str) -> _Platform:
+        from backend.google_ads_wrapper.services.google_ads_creative import GoogleAdsCreativeService
+        google_creative = GoogleAdsCreativeService()
+
+        if os.getenv("GOOGLE_ADS_BULK_CREATIVES", "1") == "0":
+            list_campaigns = lambda: google_creative.get_active_campaigns(customer_id)
+            list_items = lambda c: google_creative.get_campaign_ads(customer_id, c['id'], c.get('type'))
+        else:
+            # Annonces de toutes les campagnes en quelques requêtes, lues ensuite par campagne
+            ads_by_campaign: Dict[int, List[Dict[str, Any]]] = {}
+
+            def list_campaigns() -> List[Dict[str, Any]]:
+                campaigns = google_creative.get_active_campaigns(customer_id)
+                if campaigns:
+                    ads_by_campaign.update(google_creative.get_customer_ads(customer_id, campaigns))
+                return campaigns
+
+            list_items = lambda c: ads_by_campaign.get(c['id'], [])
+
+        return _Platform(
+            "google", "Google Ads", google_creative,
+            list_campaigns,
+            list_items,
+            _google_csv,
+            # Images uniquement (pas les vidéos YouTube)
+            (("image", "images"),),
+            folder_id,
+        )
+
+    @staticmethod
+    def _meta_platform(ad_account_id: str, folder_id: str) -> _Platform:
+        from backend.meta.services.meta_ads_creative import MetaAdsCreativeService
+        meta_creative = MetaAdsCreativeService()
+        return _Platform(
+            "meta", "Meta Ads", meta_creative,
+            lambda: meta_creative.get_active_campaigns(ad_account_id),
+            lambda c: meta_creative.get_campaign_creatives(ad_account_id, c['id']),
+            _meta_csv,
+            (("image", "images"), ("video", "videos")),
+            folder_id,
+        )
+
+    @staticmethod
+    def _submit(pool: ThreadPoolExecutor, func, *args):
+        # Les tâches gardent le contexte de l'appelant (job en cours pour report_job_progress)
+        return pool.submit(contextvars.copy_context().run, func, *args)
+
+    def _list_campaigns(self, platform: _Platform, client_name: str) -> List[Dict[str, Any]]:
+        logging.info(f"📊 Export {platform.label} créatif pour {client_name}")
+        with self._api:
+            campaigns = platform.list_campaigns()
+        if campaigns:
+            logging.info(f"✅ {len(campaigns)} campagnes {platform.label} actives trouvées")
+        else:
+            logging.warning(f"⚠️ Aucune campagne {platform.label} active trouvée pour {client_name}")
+        return campaigns or []
+
+    def _export_campaign(
+        self,
+        platform: _Platform,
+        campaign: Dict[str, Any],
+        today: str,
+        media_pool: ThreadPoolExecutor,
+        state: Dict[str, int],
+    ) -> Optional[Dict[str, Any]]:
+        campaign_name = campaign['name']
+        safe_campaign_name = _safe_name(campaign_name)
+        try:
+            logging.info(f"📝 Traitement campagne {platform.label}: {campaign_name}")
+            with self._api:
+                items = platform.list_items(campaign)
+            if not items:
+                logging.warning(f"⚠️ Aucune annonce trouvée pour {campaign_name}")
+                return None
+            logging.info(f"  📄 {len(items)} annonces trouvées ({campaign_name})")
+
+            csv_filename = f"{safe_campaign_name}_{today}.csv"
+            for attempt in range(2):
+                # Dossier de la campagne, puis médias en parallèle pendant l'upload du CSV
+                campaign_folder_id = self.drive_service.find_or_create_folder(safe_campaign_name, platform.folder_id)
+                media_futures = [
+                    media_pool.submit(self._transfer_media, platform, kind, url, index, campaign_folder_id)
+                    for index, (kind, url) in enumerate(platform.media(items))
+                ]
+                try:
+                    with self._uploads:
+                        csv_info = self.drive_service.upload_csv_to_drive(
+                            platform.build_csv(items), csv_filename, campaign_folder_id
+                        )
+                    break
+                except Exception as e:
+                    for future in media_futures:
+                        future.result()
+                    if attempt or not _is_not_found(e):
+                        raise
+                    # Dossier en cache supprimé côté Drive : l'oublier et tout renvoyer dans un nouveau dossier
+                    logging.warning(f"⚠️ Dossier de la campagne '{campaign_name}' introuvable sur Drive, recréation")
+                    self.drive_service.forget_folder(safe_campaign_name, platform.folder_id)
+            media_count = sum(future.result() for future in media_futures)
+            logging.info(f"📥 {media_count}/{len(media_futures)} fichiers média {platform.label} exportés ({campaign_name})")
+            logging.info(f"✅ CSV {platform.label} exporté: {csv_filename}")
+            return {"platform": platform.label, "campaign": campaign_name, "type": "csv", **csv_info}
+
+        except Exception as e:
+            with self._progress_lock:
+                state["errors"] += 1
+            logging.error(f"❌ Erreur export {platform.label} campagne '{campaign_name}': {e}")
+            return None
+        finally:
+            with self._progress_lock:
+                state["done"] += 1
+                done = state["done"]
+            report_job_progress(platform.key, "running", done=done, total=state["total"])
+
+    def _transfer_media(self, platform: _Platform, kind: str, url: str, index: int, folder_id: str) -> bool:
+        """Télécharge un média en flux et l'envoie sur Drive (image_{index} / video_{index})"""
+        try:
+            with self._downloads:
+                stream = platform.creative_service.open_media_stream(url)
+                if stream is None:
+                    return False
+                with stream:
+                    if not stream.extension:
+                        return False
+                    filename = f"{kind}_{index}{stream.extension}"
+                    # Média déjà exporté un autre jour : copie côté Drive au lieu d'un nouvel upload
+                    upload = self.drive_service.upload_media_deduplicated if self.deduplicate \
+                        else self.drive_service.upload_media_stream
+                    with self._uploads:
+                        upload(stream, filename, folder_id, _mime_type(kind, stream.extension))
+            return True
+        except Exception as e:
+            logging.warning(f"⚠️ Erreur téléchargement {kind} {platform.label}: {e}")
+            return False
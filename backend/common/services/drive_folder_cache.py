@@ -0,0 +1,202 @@
+"""
+Cache des dossiers Google Drive, indexé par (dossier parent, nom).
+
+Évite la requête files().list de chaque find_or_create : un dossier déjà résolu
+est réutilisé tel quel pendant DRIVE_FOLDER_CACHE_TTL secondes (10 min), puis
+revérifié par un files().get (entrée supprimée, mise à la corbeille ou déplacée :
+oubliée et résolue à nouveau). Les dossiers de premier niveau (client, date) sont
+revérifiés à chaque résolution (always_verify).
+Un parent listé entièrement (préchargement ou dossier que l'on vient de créer)
+est considéré complet pendant DRIVE_FOLDER_LISTING_TTL secondes : un nom absent
+y est créé directement, sans recherche.
+Le cache est persisté en JSON, partagé entre process : chaque modification
+relit le fichier sous verrou (fcntl) avant de l'écrire, sans écraser les entrées
+des autres workers.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows : pas de verrou entre process
+    fcntl = None
+
+from backend.config.settings import Config
+
+CACHE_VERSION = 1
+
+
+def _key(parent_id: str, name: str) -> str:
+    # Les IDs Drive ne contiennent pas de '/' : le premier '/' sépare parent et nom
+    return f"{parent_id}/{name}"
+
+
+class DriveFolderCache:
+    """Dossiers Drive connus ({parent/nom: [id, vérifié_le]}) et parents listés"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or Config.PATHS.DRIVE_FOLDER_CACHE_FILE)
+        self.entry_ttl = float(os.getenv("DRIVE_FOLDER_CACHE_TTL", "600"))
+        self.listing_ttl = float(os.getenv("DRIVE_FOLDER_LISTING_TTL", "600"))
+        self._folders: Dict[str, list] = {}
+        self._listings: Dict[str, float] = {}
+        self._mtime: Optional[int] = None
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "verified": 0, "stale": 0, "lookups": 0, "created": 0, "prefetched": 0}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            mtime = self.path.stat().st_mtime_ns
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(payload, dict) and payload.get("version") == CACHE_VERSION:
+            self._folders = dict(payload.get("folders", {}))
+            self._listings = dict(payload.get("listings", {}))
+            self._mtime = mtime
+
+    def _reload_if_changed(self) -> None:
+        """Relit le fichier si un autre process l'a modifié (à appeler sous self._lock)"""
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self._load()
+
+    def _save(self) -> None:
+        payload = {"version": CACHE_VERSION, "folders": self._folders, "listings": self._listings}
+        try:
+            tmp_path = self.path.with_name(f".{self.path.name}.{uuid.uuid4().hex}.tmp")
+            tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+            self._mtime = self.path.stat().st_mtime_ns
+        except OSError as e:
+            logging.warning(f"⚠️ Cache des dossiers Drive non sauvegardé: {e}")
+
+    @contextmanager
+    def _file_lock(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_name(f"{self.path.name}.lock"), "a") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            yield
+
+    def _commit(self, change: Callable[[Dict[str, list], Dict[str, float]], None]) -> None:
+        """Applique une modification à l'état le plus récent du fichier, puis l'écrit"""
+        with self._lock:
+            try:
+                with self._file_lock():
+                    self._load()
+                    change(self._folders, self._listings)
+                    self._save()
+            except OSError as e:
+                change(self._folders, self._listings)
+                logging.warning(f"⚠️ Cache des dossiers Drive non partagé: {e}")
+
+    def _listing_is_fresh(self, parent_id: str) -> bool:
+        listed_at = self._listings.get(parent_id)
+        return listed_at is not None and time.time() - listed_at < self.listing_ttl
+
+    def needs_listing(self, parent_id: str) -> bool:
+        with self._lock:
+            self._reload_if_changed()
+            return not self._listing_is_fresh(parent_id)
+
+    def put(self, parent_id: str, name: str, folder_id: str) -> None:
+        now = time.time()
+
+        def change(folders, listings):
+            folders[_key(parent_id, name)] = [folder_id, now]
+        self._commit(change)
+
+    def put_listing(self, parent_id: str, children: Dict[str, str]) -> None:
+        """Enregistre tous les sous-dossiers d'un parent (listing complet)"""
+        now = time.time()
+
+        def change(folders, listings):
+            prefix = _key(parent_id, "")
+            for key in [k for k in folders if k.startswith(prefix)]:
+                del folders[key]
+            for name, folder_id in children.items():
+                folders[_key(parent_id, name)] = [folder_id, now]
+            listings[parent_id] = now
+        self._commit(change)
+
+    def forget(self, parent_id: str, name: str) -> None:
+        def change(folders, listings):
+            folders.pop(_key(parent_id, name), None)
+            listings.pop(parent_id, None)
+        self._commit(change)
+
+    def resolve(
+        self,
+        parent_id: str,
+        name: str,
+        verify: Callable[[str], bool],
+        lookup: Callable[[], Optional[str]],
+        create: Callable[[], str],
+        always_verify: bool = False,
+    ) -> str:
+        """
+        ID du dossier `name` sous `parent_id`.
+
+        Args:
+            verify: files().get → True si le dossier existe toujours sous ce parent (et pas à la corbeille)
+            lookup: files().list par nom → ID ou None
+            create: files().create → ID du nouveau dossier
+            always_verify: vérifier l'entrée même récente (dossiers de premier niveau,
+                qu'un utilisateur peut supprimer entre deux exports)
+        """
+        with self._lock:
+            self._reload_if_changed()
+            entry = self._folders.get(_key(parent_id, name))
+            listing_fresh = self._listing_is_fresh(parent_id)
+
+        if entry:
+            folder_id, checked_at = entry
+            if not always_verify and time.time() - checked_at < self.entry_ttl:
+                self.stats["hits"] += 1
+                logging.info(f"📁 Dossier '{name}' (cache): {folder_id}")
+                return folder_id
+            if verify(folder_id):
+                self.stats["verified"] += 1
+                self.put(parent_id, name, folder_id)
+                return folder_id
+            self.stats["stale"] += 1
+            logging.info(f"🔄 Dossier '{name}' ({folder_id}) introuvable : entrée du cache oubliée")
+            self.forget(parent_id, name)
+            listing_fresh = False
+
+        folder_id = None
+        if not listing_fresh:
+            self.stats["lookups"] += 1
+            folder_id = lookup()
+        if folder_id is None:
+            folder_id = create()
+            self.stats["created"] += 1
+            # Un dossier que l'on vient de créer n'a aucun sous-dossier
+            self.put_listing(folder_id, {})
+        self.put(parent_id, name, folder_id)
+        return folder_id
+
+
+_cache: Optional[DriveFolderCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_drive_folder_cache() -> DriveFolderCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = DriveFolderCache()
+        return _cache
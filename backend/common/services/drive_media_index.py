@@ -0,0 +1,178 @@
+"""
+Index des médias déjà présents sur Google Drive, adressé par contenu.
+
+Les exports créatifs quotidiens renvoient chaque jour les mêmes images et vidéos
+dans un nouveau dossier daté. L'index associe le sha256 d'un média au fichier
+Drive qui le contient déjà, pour que GoogleDriveService le copie côté serveur
+(files.copy) ou crée un raccourci au lieu de le renvoyer.
+
+Pré-contrôle optionnel (DRIVE_MEDIA_PRECHECK, actif par défaut) : la source CDN
+(URL sans paramètres + ETag, ou + Last-Modified à défaut) est associée au
+sha256, ce qui permet de réutiliser un média connu sans même lire son corps.
+Une réponse sans validateur n'est jamais réutilisée sur la seule foi de sa taille.
+L'index est persisté en JSON, partagé entre process : chaque modification relit
+le fichier sous verrou (fcntl) avant de l'écrire, sans écraser les entrées des
+autres workers. Les entrées non revues depuis DRIVE_MEDIA_INDEX_MAX_AGE_DAYS
+jours sont oubliées au chargement.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+try:
+    import fcntl
+except ImportError:  # Windows : pas de verrou entre process
+    fcntl = None
+
+from backend.config.settings import Config
+
+INDEX_VERSION = 1
+
+
+def precheck_enabled() -> bool:
+    return os.getenv("DRIVE_MEDIA_PRECHECK", "1") != "0"
+
+
+def source_key(url: str, etag: Optional[str], last_modified: Optional[str],
+               size: Optional[int] = None) -> Optional[str]:
+    """
+    Clé de pré-contrôle d'un média CDN, None si la réponse n'a ni ETag ni Last-Modified.
+
+    Les paramètres de l'URL (signatures, expiration, access_token) changent d'un
+    jour à l'autre pour un même fichier : seuls l'hôte et le chemin sont gardés.
+    Un média remplacé sous le même chemin peut garder sa taille : Content-Length
+    ne fait que compléter Last-Modified, il ne suffit jamais seul.
+    """
+    parts = urlsplit(url)
+    location = f"{parts.netloc}{parts.path}"
+    if etag:
+        return f"{location}|etag:{etag}"
+    if last_modified:
+        return f"{location}|modified:{last_modified}|size:{size}"
+    return None
+
+
+class DriveMediaIndex:
+    """sha256 → {id, size, seen} et clé de pré-contrôle CDN → sha256"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or Config.PATHS.DRIVE_MEDIA_INDEX_FILE)
+        self.max_age = float(os.getenv("DRIVE_MEDIA_INDEX_MAX_AGE_DAYS", "90")) * 24 * 3600
+        self._hashes: Dict[str, dict] = {}
+        self._sources: Dict[str, str] = {}
+        self._mtime: Optional[int] = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            mtime = self.path.stat().st_mtime_ns
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(payload, dict) or payload.get("version") != INDEX_VERSION:
+            return
+        self._mtime = mtime
+        oldest = time.time() - self.max_age
+        self._hashes = {
+            digest: entry for digest, entry in payload.get("hashes", {}).items()
+            if entry.get("seen", 0) >= oldest
+        }
+        self._sources = {
+            key: digest for key, digest in payload.get("sources", {}).items()
+            if digest in self._hashes
+        }
+
+    def _reload_if_changed(self) -> None:
+        """Relit le fichier si un autre process l'a modifié (à appeler sous self._lock)"""
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self._load()
+
+    def _save(self) -> None:
+        payload = {"version": INDEX_VERSION, "hashes": self._hashes, "sources": self._sources}
+        try:
+            tmp_path = self.path.with_name(f".{self.path.name}.{uuid.uuid4().hex}.tmp")
+            tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+            self._mtime = self.path.stat().st_mtime_ns
+        except OSError as e:
+            logging.warning(f"⚠️ Index des médias Drive non sauvegardé: {e}")
+
+    @contextmanager
+    def _file_lock(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_name(f"{self.path.name}.lock"), "a") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            yield
+
+    def _commit(self, change: Callable[[Dict[str, dict], Dict[str, str]], None]) -> None:
+        """Applique une modification à l'état le plus récent du fichier, puis l'écrit"""
+        with self._lock:
+            try:
+                with self._file_lock():
+                    self._load()
+                    change(self._hashes, self._sources)
+                    self._save()
+            except OSError as e:
+                change(self._hashes, self._sources)
+                logging.warning(f"⚠️ Index des médias Drive non partagé: {e}")
+
+    def by_hash(self, digest: str) -> Optional[dict]:
+        with self._lock:
+            self._reload_if_changed()
+            entry = self._hashes.get(digest)
+            return dict(entry, sha256=digest) if entry else None
+
+    def by_source(self, key: Optional[str]) -> Optional[dict]:
+        if not key:
+            return None
+        with self._lock:
+            self._reload_if_changed()
+            digest = self._sources.get(key)
+            entry = self._hashes.get(digest) if digest else None
+            return dict(entry, sha256=digest) if entry else None
+
+    def record(self, digest: str, file_id: str, size: int, key: Optional[str] = None) -> None:
+        """Enregistre le fichier Drive contenant ce média (et sa source CDN)"""
+        entry = {"id": file_id, "size": size, "seen": time.time()}
+
+        def change(hashes, sources):
+            hashes[digest] = entry
+            if key:
+                sources[key] = digest
+
+        self._commit(change)
+
+    def forget(self, digest: str) -> None:
+        """Oublie un média dont le fichier Drive n'existe plus"""
+        def change(hashes, sources):
+            hashes.pop(digest, None)
+            for key in [k for k, d in sources.items() if d == digest]:
+                del sources[key]
+
+        self._commit(change)
+
+
+_index: Optional[DriveMediaIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_drive_media_index() -> DriveMediaIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = DriveMediaIndex()
+        return _index
@@ -2,15 +2,27 @@
 Service Google Drive pour l'upload de fichiers CSV
 """
 
+import hashlib
 import logging
-from typing import Optional, Dict, Any
+import os
+import tempfile
+import threading
+import time
+from typing import Optional, Dict, Any, Tuple
 from io import BytesIO
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaIoBaseUpload
 from google.oauth2.service_account import Credentials
 
+from backend.common.services.drive_folder_cache import get_drive_folder_cache
+from backend.common.services.drive_media_index import get_drive_media_index, precheck_enabled, source_key
+from backend.common.utils.media_stream import MediaStream, StreamingMediaUpload, upload_chunk_size
 from backend.config.settings import Config
 
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+SHORTCUT_MIME_TYPE = 'application/vnd.google-apps.shortcut'
+
 
 class GoogleDriveService:
     """Service pour gérer l'upload de fichiers vers Google Drive"""
@@ -18,6 +30,11 @@ class GoogleDriveService:
     def __init__(self):
         self.service = None
         self.folder_id = Config.API.GOOGLE_DRIVE_FOLDER_ID
+        self._credentials = None
+        # httplib2 n'est pas thread-safe : chaque thread (exports parallèles) a son client HTTP
+        self._local = threading.local()
+        self._folder_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._folder_locks_guard = threading.Lock()
         self._initialize_service()
     
     def _initialize_service(self):
@@ -33,6 +50,7 @@ class GoogleDriveService:
             
             credentials = get_user_credentials(scopes)
             
+            self._credentials = credentials
             self.service = build('drive', 'v3', credentials=credentials)
             logging.info("✅ Service Google Drive initialisé avec succès (OAuth2)")
             
@@ -40,6 +58,77 @@ class GoogleDriveService:
             logging.error(f"❌ Erreur lors de l'initialisation du service Google Drive: {e}")
             raise
     
+    def _thread_http(self):
+        """Client HTTP authentifié propre au thread courant (None : client par défaut du service)"""
+        if self._credentials is None:
+            return None
+        http = getattr(self._local, "http", None)
+        if http is None:
+            import google_auth_httplib2
+            import httplib2
+
+            http = google_auth_httplib2.AuthorizedHttp(self._credentials, http=httplib2.Http())
+            self._local.http = http
+        return http
+
+    def _execute(self, request) -> Dict[str, Any]:
+        return request.execute(http=self._thread_http())
+
+    def _folder_lock(self, folder_name: str, parent_folder_id: str) -> threading.Lock:
+        """Verrou par (parent, nom) : deux threads ne créent pas le même dossier en double"""
+        with self._folder_locks_guard:
+            return self._folder_locks.setdefault((parent_folder_id, folder_name), threading.Lock())
+
+    def _find_folder(self, folder_name: str, parent_folder_id: str) -> Optional[str]:
+        """Recherche un dossier par nom dans le parent (files().list), None s'il n'existe pas"""
+        query = f"name='{folder_name}' and '{parent_folder_id}' in parents and mimeType='{FOLDER_MIME_TYPE}' and trashed=false"
+        
+        results = self._execute(self.service.files().list(
+            q=query,
+            spaces='drive',
+            fields='files(id, name)',
+            supportsAllDrives=True,
+            includeItemsFromAllDrives=True
+        ))
+        
+        folders = results.get('files', [])
+        if not folders:
+            return None
+        folder_id = folders[0]['id']
+        logging.info(f"📁 Dossier '{folder_name}' trouvé: {folder_id}")
+        return folder_id
+
+    def _create_folder(self, folder_name: str, parent_folder_id: str) -> str:
+        file_metadata = {
+            'name': folder_name,
+            'mimeType': FOLDER_MIME_TYPE,
+            'parents': [parent_folder_id]
+        }
+        
+        folder = self._execute(self.service.files().create(
+            body=file_metadata,
+            fields='id',
+            supportsAllDrives=True
+        ))
+        
+        folder_id = folder.get('id')
+        logging.info(f"✅ Dossier '{folder_name}' créé: {folder_id}")
+        return folder_id
+
+    def _folder_exists(self, folder_id: str, parent_folder_id: str) -> bool:
+        """Vérifie (files().get) qu'un dossier connu existe toujours sous ce parent"""
+        try:
+            info = self._execute(self.service.files().get(
+                fileId=folder_id,
+                fields='id, trashed, parents',
+                supportsAllDrives=True
+            ))
+        except HttpError as e:
+            if e.resp.status == 404:
+                return False
+            raise
+        return not info.get('trashed') and parent_folder_id in info.get('parents', [])
+
     def find_or_create_client_folder(self, client_name: str, parent_folder_id: str) -> str:
         """
         Trouve ou crée un dossier pour le client dans le dossier parent
@@ -52,59 +141,81 @@ class GoogleDriveService:
             ID du dossier client
         """
         try:
-            # Rechercher si le dossier existe déjà
-            query = f"name='{client_name}' and '{parent_folder_id}' in parents and mimeType='application/vnd.google-apps.folder' and trashed=false"
-            
-            results = self.service.files().list(
-                q=query,
-                spaces='drive',
-                fields='files(id, name)',
-                supportsAllDrives=True,
-                includeItemsFromAllDrives=True
-            ).execute()
-            
-            folders = results.get('files', [])
-            
-            if folders:
-                # Le dossier existe déjà
-                folder_id = folders[0]['id']
-                logging.info(f"📁 Dossier client '{client_name}' trouvé: {folder_id}")
-                return folder_id
-            else:
-                # Créer le dossier
-                file_metadata = {
-                    'name': client_name,
-                    'mimeType': 'application/vnd.google-apps.folder',
-                    'parents': [parent_folder_id]
-                }
-                
-                folder = self.service.files().create(
-                    body=file_metadata,
-                    fields='id',
-                    supportsAllDrives=True
-                ).execute()
-                
-                folder_id = folder.get('id')
-                logging.info(f"✅ Dossier client '{client_name}' créé: {folder_id}")
-                return folder_id
+            # Rechercher si le dossier existe déjà, sinon le créer
+            return self._find_folder(client_name, parent_folder_id) or self._create_folder(client_name, parent_folder_id)
                 
         except Exception as e:
             logging.error(f"❌ Erreur lors de la recherche/création du dossier client: {e}")
             raise
     
-    def find_or_create_folder(self, folder_name: str, parent_folder_id: str) -> str:
+    def find_or_create_folder(self, folder_name: str, parent_folder_id: str, verify: bool = False) -> str:
         """
-        Trouve ou crée un dossier dans le dossier parent
+        Trouve ou crée un dossier dans le dossier parent, via le cache des dossiers
+        (aucune requête pour un dossier déjà résolu)
         
         Args:
             folder_name: Nom du dossier
             parent_folder_id: ID du dossier parent
+            verify: revérifier (files().get) un dossier déjà en cache : à utiliser pour
+                les dossiers de premier niveau, qu'un utilisateur peut supprimer entre deux exports
             
         Returns:
             ID du dossier
         """
-        # Réutiliser la logique existante car elle est identique
-        return self.find_or_create_client_folder(folder_name, parent_folder_id)
+        try:
+            with self._folder_lock(folder_name, parent_folder_id):
+                return get_drive_folder_cache().resolve(
+                    parent_folder_id,
+                    folder_name,
+                    verify=lambda folder_id: self._folder_exists(folder_id, parent_folder_id),
+                    lookup=lambda: self._find_folder(folder_name, parent_folder_id),
+                    create=lambda: self._create_folder(folder_name, parent_folder_id),
+                    always_verify=verify,
+                )
+        except Exception as e:
+            logging.error(f"❌ Erreur lors de la recherche/création du dossier '{folder_name}': {e}")
+            raise
+
+    def forget_folder(self, folder_name: str, parent_folder_id: str) -> None:
+        """Oublie un dossier du cache (supprimé côté Drive) : il sera résolu à nouveau"""
+        get_drive_folder_cache().forget(parent_folder_id, folder_name)
+
+    def prefetch_folders(self, parent_folder_id: str) -> int:
+        """
+        Liste en une requête paginée tous les sous-dossiers d'un parent, avant de
+        nombreuses résolutions de dossiers frères (ex: un dossier par campagne).
+        Sans effet si le cache connaît déjà le contenu du parent.
+
+        Returns:
+            Nombre de sous-dossiers listés
+        """
+        cache = get_drive_folder_cache()
+        if not cache.needs_listing(parent_folder_id):
+            return 0
+
+        query = f"'{parent_folder_id}' in parents and mimeType='{FOLDER_MIME_TYPE}' and trashed=false"
+        children: Dict[str, str] = {}
+        page_token = None
+        while True:
+            results = self._execute(self.service.files().list(
+                q=query,
+                spaces='drive',
+                fields='nextPageToken, files(id, name)',
+                pageSize=1000,
+                pageToken=page_token,
+                supportsAllDrives=True,
+                includeItemsFromAllDrives=True
+            ))
+            for folder in results.get('files', []):
+                children.setdefault(folder['name'], folder['id'])
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+
+        cache.put_listing(parent_folder_id, children)
+        cache.stats["prefetched"] += 1
+        logging.info(f"📂 {len(children)} sous-dossiers préchargés pour {parent_folder_id}")
+        return len(children)
 
     def upload_csv_to_drive(self, csv_content: str, filename: str, folder_id: str) -> Dict[str, Any]:
         """
@@ -136,12 +247,12 @@ class GoogleDriveService:
                 resumable=False
             )
             
-            file = self.service.files().create(
+            file = self._execute(self.service.files().create(
                 body=file_metadata,
                 media_body=media,
                 fields='id, name, webViewLink',
                 supportsAllDrives=True
-            ).execute()
+            ))
             
             file_info = {
                 'id': file.get('id'),
@@ -172,13 +283,13 @@ class GoogleDriveService:
             # Rechercher si le dossier existe déjà
             query = f"name='{campaign_name}' and '{client_folder_id}' in parents and mimeType='application/vnd.google-apps.folder' and trashed=false"
             
-            results = self.service.files().list(
+            results = self._execute(self.service.files().list(
                 q=query,
                 spaces='drive',
                 fields='files(id, name)',
                 supportsAllDrives=True,
                 includeItemsFromAllDrives=True
-            ).execute()
+            ))
             
             folders = results.get('files', [])
             
@@ -195,11 +306,11 @@ class GoogleDriveService:
                     'parents': [client_folder_id]
                 }
                 
-                folder = self.service.files().create(
+                folder = self._execute(self.service.files().create(
                     body=file_metadata,
                     fields='id',
                     supportsAllDrives=True
-                ).execute()
+                ))
                 
                 folder_id = folder.get('id')
                 logging.info(f"✅ Dossier campagne '{campaign_name}' créé: {folder_id}")
@@ -238,12 +349,12 @@ class GoogleDriveService:
                 resumable=False
             )
             
-            file = self.service.files().create(
+            file = self._execute(self.service.files().create(
                 body=file_metadata,
                 media_body=media,
                 fields='id, name, webViewLink',
                 supportsAllDrives=True
-            ).execute()
+            ))
             
             file_info = {
                 'id': file.get('id'),
@@ -259,6 +370,168 @@ class GoogleDriveService:
             logging.error(f"❌ Erreur lors de l'upload du fichier média '{filename}': {e}")
             raise
     
+    def upload_media_stream(self, stream: MediaStream, filename: str, folder_id: str, mime_type: str) -> Dict[str, Any]:
+        """
+        Upload un média lu en flux (MediaStream) par blocs résumables, sans le
+        charger entièrement en mémoire
+
+        Args:
+            stream: Réponse HTTP ouverte en flux (fermée par l'appelant)
+            filename: Nom du fichier
+            folder_id: ID du dossier de destination
+            mime_type: Type MIME du fichier (ex: 'image/jpeg', 'video/mp4')
+
+        Returns:
+            Informations du fichier uploadé, avec la taille (bytes) et le débit (throughput_mb_s)
+        """
+        try:
+            start_time = time.monotonic()
+            media = StreamingMediaUpload(stream, mime_type)
+            request = self.service.files().create(
+                body={'name': filename, 'parents': [folder_id]},
+                media_body=media,
+                fields='id, name, webViewLink',
+                supportsAllDrives=True
+            )
+
+            file = None
+            while file is None:
+                _, file = request.next_chunk(http=self._thread_http(), num_retries=3)
+
+            duration = max(time.monotonic() - start_time, 1e-6)
+            size_mb = stream.bytes_read / (1024 * 1024)
+            file_info = {
+                'id': file.get('id'),
+                'name': file.get('name'),
+                'link': file.get('webViewLink'),
+                'bytes': stream.bytes_read,
+                'seconds': round(duration, 3),
+                'throughput_mb_s': round(size_mb / duration, 2),
+            }
+            logging.info(
+                f"✅ Fichier média '{filename}' uploadé en flux ({size_mb:.2f} MB en {duration:.1f}s, "
+                f"{file_info['throughput_mb_s']} MB/s, tampon max {media.peak_buffer / (1024 * 1024):.1f} MB): {file_info['id']}"
+            )
+            return file_info
+
+        except Exception as e:
+            logging.error(f"❌ Erreur lors de l'upload en flux du fichier média '{filename}': {e}")
+            raise
+
+    def upload_media_deduplicated(self, stream: MediaStream, filename: str, folder_id: str, mime_type: str) -> Dict[str, Any]:
+        """
+        Upload un média en évitant de renvoyer un contenu déjà présent sur Drive
+        (index sha256 → fichier Drive, voir drive_media_index)
+
+        1. Pré-contrôle CDN (ETag / Last-Modified) : média connu → réutilisé sans lire le corps
+        2. Sinon le corps est lu et haché dans un fichier temporaire (mémoire bornée) :
+           sha256 connu → réutilisé, sinon upload résumable et enregistrement dans l'index
+
+        Un média réutilisé est copié côté serveur (files.copy) ou ajouté en
+        raccourci si DRIVE_MEDIA_DEDUP_MODE=shortcut.
+
+        Returns:
+            Informations du fichier, avec 'deduplicated' ('source', 'hash' ou None)
+        """
+        index = get_drive_media_index()
+        key = source_key(stream.url, stream.etag, stream.last_modified, stream.size) if precheck_enabled() else None
+
+        known = index.by_source(key)
+        if known:
+            file_info = self._reuse_media(known, filename, folder_id, index)
+            if file_info:
+                return dict(file_info, deduplicated='source')
+
+        with tempfile.SpooledTemporaryFile(max_size=upload_chunk_size()) as spool:
+            digest = hashlib.sha256()
+            size = 0
+            while True:
+                block = stream.read_block()
+                if not block:
+                    break
+                digest.update(block)
+                spool.write(block)
+                size += len(block)
+            sha256 = digest.hexdigest()
+
+            known = index.by_hash(sha256)
+            if known:
+                file_info = self._reuse_media(known, filename, folder_id, index, key)
+                if file_info:
+                    return dict(file_info, deduplicated='hash')
+
+            try:
+                spool.seek(0)
+                media = MediaIoBaseUpload(spool, mimetype=mime_type, chunksize=upload_chunk_size(), resumable=True)
+                request = self.service.files().create(
+                    body={'name': filename, 'parents': [folder_id]},
+                    media_body=media,
+                    fields='id, name, webViewLink',
+                    supportsAllDrives=True
+                )
+                file = None
+                while file is None:
+                    _, file = request.next_chunk(http=self._thread_http(), num_retries=3)
+            except Exception as e:
+                logging.error(f"❌ Erreur lors de l'upload du fichier média '{filename}': {e}")
+                raise
+
+        index.record(sha256, file.get('id'), size, key)
+        logging.info(f"✅ Fichier média '{filename}' uploadé ({size / (1024 * 1024):.2f} MB): {file.get('id')}")
+        return {
+            'id': file.get('id'),
+            'name': file.get('name'),
+            'link': file.get('webViewLink'),
+            'bytes': size,
+            'deduplicated': None,
+        }
+
+    def _reuse_media(
+        self,
+        known: Dict[str, Any],
+        filename: str,
+        folder_id: str,
+        index,
+        key: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Copie (ou raccourci) d'un média déjà sur Drive, None si le fichier source a disparu"""
+        shortcut = os.getenv("DRIVE_MEDIA_DEDUP_MODE", "copy") == "shortcut"
+        try:
+            if shortcut:
+                file = self._execute(self.service.files().create(
+                    body={
+                        'name': filename,
+                        'mimeType': SHORTCUT_MIME_TYPE,
+                        'parents': [folder_id],
+                        'shortcutDetails': {'targetId': known['id']},
+                    },
+                    fields='id, name, webViewLink',
+                    supportsAllDrives=True
+                ))
+            else:
+                file = self._execute(self.service.files().copy(
+                    fileId=known['id'],
+                    body={'name': filename, 'parents': [folder_id]},
+                    fields='id, name, webViewLink',
+                    supportsAllDrives=True
+                ))
+        except HttpError as e:
+            if e.resp.status != 404:
+                raise
+            logging.info(f"🔄 Média source {known['id']} introuvable : '{filename}' sera renvoyé")
+            index.forget(known['sha256'])
+            return None
+
+        # Une copie est un fichier à part entière : elle devient la référence (la plus récente)
+        index.record(known['sha256'], known['id'] if shortcut else file.get('id'), known['size'], key)
+        logging.info(f"♻️ Fichier média '{filename}' {'raccourci' if shortcut else 'copié'} depuis {known['id']} (inchangé)")
+        return {
+            'id': file.get('id'),
+            'name': file.get('name'),
+            'link': file.get('webViewLink'),
+            'bytes': 0,
+        }
+
     def delete_file(self, file_id: str) -> bool:
         """
         Supprime un fichier de Google Drive (utile pour les tests)
@@ -270,7 +543,7 @@ class GoogleDriveService:
             True si succès, False sinon
         """
         try:
-            self.service.files().delete(fileId=file_id, supportsAllDrives=True).execute()
+            self._execute(self.service.files().delete(fileId=file_id, supportsAllDrives=True))
             logging.info(f"🗑️ Fichier {file_id} supprimé avec succès")
             return True
             
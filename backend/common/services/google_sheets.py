@@ -1,15 +1,116 @@
 import logging
-from typing import Optional, List, Dict, Any
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any, Tuple
 from googleapiclient.discovery import build
 from google.oauth2.service_account import Credentials
 
 from backend.config.settings import Config
+from backend.common.utils.platform_executor import check_stage_deadline
+
+# Noms de groupes en ligne 2 (pas des vrais headers, les vrais sont en ligne 3)
+GROUP_HEADERS = {"FOLLOWERS", "DRIVE TO STORE", "SPONSO POSTS", "CAMPAGNES META",
+                 "SPONSO POST", "LEADS", "GÉNÉRAL", "GENERAL", "GOOGLE", "META",
+                 "MICROSOFT"}
+
+FRENCH_TO_ENGLISH_MONTHS = {
+    'janvier': 'January',
+    'février': 'February',
+    'mars': 'March',
+    'avril': 'April',
+    'mai': 'May',
+    'juin': 'June',
+    'juillet': 'July',
+    'août': 'August',
+    'septembre': 'September',
+    'octobre': 'October',
+    'novembre': 'November',
+    'décembre': 'December'
+}
+
+
+def _month_label_to_english(month: str) -> str:
+    for french_month, english_month in FRENCH_TO_ENGLISH_MONTHS.items():
+        if french_month in month.lower():
+            return month.replace(french_month, english_month)
+    return month
+
+
+def merge_header_rows(row2: List[str], row3: List[str]) -> List[str]:
+    """
+    Merge les headers : si la ligne 2 est vide ou est un nom de groupe,
+    et que la ligne 3 a un vrai header, on prend la ligne 3.
+    """
+    max_cols = max(len(row2), len(row3))
+    headers = []
+    for i in range(max_cols):
+        h2 = row2[i] if i < len(row2) else ""
+        h3 = row3[i] if i < len(row3) else ""
+        if h3 and (not h2 or h2.upper() in GROUP_HEADERS):
+            headers.append(h3)
+        else:
+            headers.append(h2)
+    return headers
+
+
+class SheetsQuota:
+    """
+    Budget d'appels Sheets sur une fenêtre glissante de 60 s, partagé par le process
+    (quota Google : 60 requêtes par minute et par utilisateur).
+    """
+
+    WINDOW_SECONDS = 60.0
+
+    def __init__(self, max_per_minute: int):
+        self.max_per_minute = max(1, max_per_minute)
+        self._calls: deque = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Bloque jusqu'à ce qu'un appel soit disponible dans la fenêtre"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.WINDOW_SECONDS:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_per_minute:
+                    self._calls.append(now)
+                    return
+                wait = self.WINDOW_SECONDS - (now - self._calls[0])
+            logging.info(f"⏳ Quota Sheets atteint, attente de {wait:.1f}s")
+            time.sleep(wait)
+
+
+_sheets_quota: Optional[SheetsQuota] = None
+_sheets_quota_lock = threading.Lock()
+
+
+def get_sheets_quota() -> SheetsQuota:
+    global _sheets_quota
+    with _sheets_quota_lock:
+        if _sheets_quota is None:
+            _sheets_quota = SheetsQuota(int(os.getenv("SHEETS_REQUESTS_PER_MINUTE", "60")))
+        return _sheets_quota
+
 
 class GoogleSheetsService:
+
+    # Durée de vie (secondes) de l'index mois/colonnes d'un onglet
+    LAYOUT_CACHE_TTL = 300
     
     def __init__(self):
         self.service = None
         self.sheet_id = Config.API.GOOGLE_SHEET_ID
+        self._layout_cache: Dict[str, Dict[str, Any]] = {}
+        self._layout_lock = threading.Lock()
+        # Le client googleapiclient (httplib2) n'est pas thread-safe : les appels
+        # API passent par _execute() pour être sérialisés entre threads
+        self._api_lock = threading.RLock()
+        self._credentials = None
+        self._local = threading.local()
         self._initialize_service()
     
     def _initialize_service(self):
@@ -18,15 +119,96 @@ class GoogleSheetsService:
             
             credentials = get_user_credentials(Config.API.GOOGLE_SCOPES)
             
+            self._credentials = credentials
             self.service = build('sheets', 'v4', credentials=credentials)
             logging.info("✅ Service Google Sheets initialisé avec succès (OAuth2)")
         except Exception as e:
             logging.error(f"❌ Erreur lors de l'initialisation du service Google Sheets: {e}")
             raise
     
+    def _execute(self, request) -> Dict[str, Any]:
+        # Étape d'export abandonnée (deadline) : ne pas reprendre le verrou API pendant le flush
+        check_stage_deadline()
+        if getattr(self._local, "parallel", False):
+            get_sheets_quota().acquire()
+            http = self._thread_http()
+            if http is not None:
+                return request.execute(http=http)
+        with self._api_lock:
+            return request.execute()
+
+    def _thread_http(self):
+        """Client HTTP authentifié propre au thread courant (httplib2 n'est pas thread-safe)"""
+        if self._credentials is None:
+            return None
+        http = getattr(self._local, "http", None)
+        if http is None:
+            import google_auth_httplib2
+            import httplib2
+
+            http = google_auth_httplib2.AuthorizedHttp(self._credentials, http=httplib2.Http())
+            self._local.http = http
+        return http
+
+    @contextmanager
+    def parallel_calls(self):
+        """
+        Dans ce bloc, les appels API du thread courant passent par son propre client
+        HTTP, sans le verrou global, dans la limite du budget SheetsQuota.
+        """
+        previous = getattr(self._local, "parallel", False)
+        self._local.parallel = True
+        try:
+            yield
+        finally:
+            self._local.parallel = previous
+
+    def get_values(self, range_name: str, spreadsheet_id: Optional[str] = None) -> List[List[str]]:
+        """Lit une plage (du Sheet principal par défaut) et retourne ses valeurs brutes."""
+        result = self._execute(self.service.spreadsheets().values().get(
+            spreadsheetId=spreadsheet_id or self.sheet_id,
+            range=range_name,
+        ))
+        return result.get('values', [])
+
+    def batch_get_values(
+        self,
+        ranges: List[str],
+        chunk_size: int = 50,
+        spreadsheet_id: Optional[str] = None,
+    ) -> List[List[List[str]]]:
+        """
+        Lit plusieurs plages (du Sheet principal par défaut) via values:batchGet, par lots
+        de chunk_size plages (longueur d'URL bornée).
+
+        Returns:
+            Valeurs brutes de chaque plage, dans l'ordre de ranges
+        """
+        values: List[List[List[str]]] = []
+        for start in range(0, len(ranges), chunk_size):
+            chunk = ranges[start:start + chunk_size]
+            result = self._execute(self.service.spreadsheets().values().batchGet(
+                spreadsheetId=spreadsheet_id or self.sheet_id,
+                ranges=chunk,
+            ))
+            value_ranges = result.get("valueRanges", [])
+            values.extend(
+                value_ranges[i].get("values", []) if i < len(value_ranges) else []
+                for i in range(len(chunk))
+            )
+        return values
+
+    def get_sheet_properties(self) -> List[Dict[str, Any]]:
+        """Propriétés de tous les onglets (title, hidden, ...) en un seul appel de métadonnées."""
+        spreadsheet = self._execute(self.service.spreadsheets().get(
+            spreadsheetId=self.sheet_id,
+            fields="sheets.properties",
+        ))
+        return [sheet['properties'] for sheet in spreadsheet.get('sheets', [])]
+
     def get_worksheet_names(self) -> List[str]:
         try:
-            spreadsheet = self.service.spreadsheets().get(spreadsheetId=self.sheet_id).execute()
+            spreadsheet = self._execute(self.service.spreadsheets().get(spreadsheetId=self.sheet_id))
             sheet_names = [sheet['properties']['title'] for sheet in spreadsheet['sheets']]
             logging.info(f"Onglets trouvés: {sheet_names}")
             return sheet_names
@@ -37,7 +219,7 @@ class GoogleSheetsService:
     def get_visible_worksheet_names(self) -> List[str]:
         """Retourne uniquement les onglets non masqués du spreadsheet."""
         try:
-            spreadsheet = self.service.spreadsheets().get(spreadsheetId=self.sheet_id).execute()
+            spreadsheet = self._execute(self.service.spreadsheets().get(spreadsheetId=self.sheet_id))
             visible = [
                 sheet['properties']['title']
                 for sheet in spreadsheet['sheets']
@@ -51,40 +233,13 @@ class GoogleSheetsService:
     
     def get_row_for_month(self, worksheet_name: str, month: str) -> Optional[int]:
         try:
-            french_to_english_months = {
-                'janvier': 'January',
-                'février': 'February', 
-                'mars': 'March',
-                'avril': 'April',
-                'mai': 'May',
-                'juin': 'June',
-                'juillet': 'July',
-                'août': 'August',
-                'septembre': 'September',
-                'octobre': 'October',
-                'novembre': 'November',
-                'décembre': 'December'
-            }
-            
-            month_to_search = month
-            for french_month, english_month in french_to_english_months.items():
-                if french_month in month.lower():
-                    month_to_search = month.replace(french_month, english_month)
-                    break
-            
-            range_name = f"'{worksheet_name}'!A:A"
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=self.sheet_id,
-                range=range_name
-            ).execute()
-            
-            values = result.get('values', [])
-            
-            for i, row in enumerate(values):
-                if row and len(row) > 0 and row[0].strip() == month_to_search.strip():
-                    row_number = i + 1  # 1-indexed
-                    return row_number
-            
+            month_to_search = _month_label_to_english(month)
+
+            layout = self.get_worksheet_layout(worksheet_name)
+            row_number = layout["month_rows"].get(month_to_search.strip())
+            if row_number:
+                return row_number
+
             logging.warning(f"⚠️ Mois '{month_to_search}' non trouvé dans l'onglet '{worksheet_name}'")
             return None
             
@@ -92,25 +247,27 @@ class GoogleSheetsService:
             logging.error(f"❌ Erreur lors de la recherche du mois: {e}")
             raise
     
-    def get_column_for_metric(self, worksheet_name: str, metric_name: str) -> Optional[str]:
+    def get_column_for_metric(self, worksheet_name: str, metric_name: str, header_row: int = 2) -> Optional[str]:
+        """
+        Retourne la lettre de colonne d'un header.
+
+        Args:
+            worksheet_name: Nom de l'onglet
+            metric_name: Header recherché
+            header_row: 2 (défaut) pour la ligne 2, 3 pour la ligne 3,
+                0 pour les headers fusionnés lignes 2/3 (cf. GROUP_HEADERS)
+        """
         try:
-            range_name = f"'{worksheet_name}'!2:2"
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=self.sheet_id,
-                range=range_name
-            ).execute()
-            
-            values = result.get('values', [])
-            if not values or len(values) == 0:
+            layout = self.get_worksheet_layout(worksheet_name)
+            index_key = {2: "row2_columns", 3: "row3_columns", 0: "merged_columns"}[header_row]
+
+            if header_row == 2 and not layout["row2_headers"]:
                 logging.warning(f"⚠️ Aucune donnée trouvée dans la ligne 2 de l'onglet '{worksheet_name}'")
                 return None
-            
-            headers = values[0]
-            
-            for i, header in enumerate(headers):
-                if header and header.strip() == metric_name.strip():
-                    column_letter = self._index_to_column_letter(i)
-                    return column_letter
+
+            column_letter = layout[index_key].get(metric_name.strip())
+            if column_letter:
+                return column_letter
             
             logging.warning(f"⚠️ Métrique '{metric_name}' non trouvée dans l'onglet '{worksheet_name}'")
             return None
@@ -118,6 +275,79 @@ class GoogleSheetsService:
         except Exception as e:
             logging.error(f"❌ Erreur lors de la recherche de la métrique: {e}")
             raise
+
+    # ──────────────────────────────────────────────
+    # Cache de structure par onglet (mois → ligne, header → colonne)
+    # ──────────────────────────────────────────────
+
+    def get_worksheet_layout(self, worksheet_name: str, force_refresh: bool = False) -> Dict[str, Any]:
+        """
+        Retourne l'index de structure d'un onglet, chargé via un seul batchGet
+        (colonne A + lignes 2:3) puis conservé LAYOUT_CACHE_TTL secondes.
+
+        Returns:
+            Dict avec month_rows, row2_headers, row3_headers, merged_headers,
+            row2_columns, row3_columns, merged_columns et loaded_at.
+        """
+        now = time.monotonic()
+        with self._layout_lock:
+            layout = self._layout_cache.get(worksheet_name)
+            if layout and not force_refresh and now - layout["loaded_at"] < self.LAYOUT_CACHE_TTL:
+                return layout
+
+        result = self._execute(self.service.spreadsheets().values().batchGet(
+            spreadsheetId=self.sheet_id,
+            ranges=[f"'{worksheet_name}'!A:A", f"'{worksheet_name}'!2:3"],
+        ))
+        value_ranges = result.get("valueRanges", [])
+        column_a = value_ranges[0].get("values", []) if len(value_ranges) > 0 else []
+        header_rows = value_ranges[1].get("values", []) if len(value_ranges) > 1 else []
+
+        layout = self._build_worksheet_layout(column_a, header_rows)
+        layout["loaded_at"] = now
+        with self._layout_lock:
+            self._layout_cache[worksheet_name] = layout
+        logging.info(
+            f"📐 Structure de l'onglet '{worksheet_name}' chargée: "
+            f"{len(layout['month_rows'])} lignes, {len(layout['merged_columns'])} colonnes"
+        )
+        return layout
+
+    def invalidate_layout(self, worksheet_name: Optional[str] = None) -> None:
+        """Invalide le cache de structure d'un onglet (ou de tous si None)."""
+        with self._layout_lock:
+            if worksheet_name is None:
+                self._layout_cache.clear()
+            else:
+                self._layout_cache.pop(worksheet_name, None)
+
+    def _build_worksheet_layout(self, column_a: List[List[str]], header_rows: List[List[str]]) -> Dict[str, Any]:
+        month_rows: Dict[str, int] = {}
+        for i, row in enumerate(column_a):
+            if row and row[0] and row[0].strip():
+                # Première occurrence prioritaire (même comportement que l'ancienne recherche linéaire)
+                month_rows.setdefault(row[0].strip(), i + 1)
+
+        row2 = [h.strip() if h else "" for h in header_rows[0]] if header_rows else []
+        row3 = [h.strip() if h else "" for h in header_rows[1]] if len(header_rows) > 1 else []
+        merged = merge_header_rows(row2, row3)
+
+        return {
+            "month_rows": month_rows,
+            "row2_headers": row2,
+            "row3_headers": row3,
+            "merged_headers": merged,
+            "row2_columns": self._headers_to_columns(row2),
+            "row3_columns": self._headers_to_columns(row3),
+            "merged_columns": self._headers_to_columns(merged),
+        }
+
+    def _headers_to_columns(self, headers: List[str]) -> Dict[str, str]:
+        columns: Dict[str, str] = {}
+        for i, header in enumerate(headers):
+            if header:
+                columns.setdefault(header, self._index_to_column_letter(i))
+        return columns
     
     def _index_to_column_letter(self, index: int) -> str:
         column_letter = ""
@@ -169,10 +399,10 @@ class GoogleSheetsService:
             
             logging.info(f"📋 Données à mettre à jour: {batch_update_data}")
             
-            result = self.service.spreadsheets().values().batchUpdate(
+            result = self._execute(self.service.spreadsheets().values().batchUpdate(
                 spreadsheetId=self.sheet_id,
                 body=batch_update_data
-            ).execute()
+            ))
             
             updated_cells = result.get('totalUpdatedCells', 0)
             
@@ -187,15 +417,164 @@ class GoogleSheetsService:
             full_range = f"'{worksheet_name}'!{cell_range}"
             body = {'values': [[value]]}
             
-            result = self.service.spreadsheets().values().update(
+            result = self._execute(self.service.spreadsheets().values().update(
                 spreadsheetId=self.sheet_id,
                 range=full_range,
                 valueInputOption='RAW',
                 body=body
-            ).execute()
+            ))
             
             return True
             
         except Exception as e:
             logging.error(f"❌ Erreur lors de la mise à jour de la cellule: {e}")
-            return False 
\ No newline at end of file
+            return False
+
+    def flush_write_plan(self, write_plan: "SheetWritePlan") -> Tuple[List[str], List[str]]:
+        """
+        Écrit toutes les cellules d'un SheetWritePlan en un seul batchUpdate
+        (tous onglets confondus).
+
+        Le flush n'est pas atomique : si ce batchUpdate échoue (ex: un onglet
+        renommé fait échouer toute la requête), chaque onglet est réécrit par
+        un batchUpdate séparé, et les onglets valides sont écrits même si
+        d'autres restent en échec.
+
+        Returns:
+            Tuple (messages de succès, messages d'échec), un message par groupe
+            de cellules ajouté au plan (pas par cellule) : un groupe est réussi si
+            toutes ses cellules sont écrites, sinon son message d'échec liste les
+            cellules non écrites.
+        """
+        successful: List[str] = []
+        failed: List[str] = []
+        if write_plan.is_empty():
+            return successful, failed
+
+        self._validate_meta_metrics_before_write(
+            [update for group in write_plan.groups for update in group["updates"]]
+        )
+
+        worksheet_names = write_plan.worksheet_names()
+        try:
+            return self._write_plan_groups(write_plan.groups, len(worksheet_names))
+        except Exception as e:
+            logging.error(f"❌ Erreur lors du flush du plan d'écriture: {e}")
+            # Le batchUpdate est atomique : une range invalide (onglet renommé...) fait échouer
+            # tous les onglets. Réessai onglet par onglet, sauf limite de quota.
+            if len(worksheet_names) <= 1 or getattr(getattr(e, 'resp', None), 'status', None) == 429:
+                return successful, [f"{group['failure_label']}: {str(e)[:100]}" for group in write_plan.groups]
+
+        logging.info(f"🔁 Réécriture du plan onglet par onglet ({len(worksheet_names)} onglets)")
+        for worksheet_name in worksheet_names:
+            groups = [group for group in write_plan.groups if group["worksheet_name"] == worksheet_name]
+            try:
+                group_successes, group_failures = self._write_plan_groups(groups, 1)
+            except Exception as e:
+                logging.error(f"❌ Écriture de l'onglet '{worksheet_name}' impossible: {e}")
+                group_successes = []
+                group_failures = [f"{group['failure_label']}: {str(e)[:100]}" for group in groups]
+            successful.extend(group_successes)
+            failed.extend(group_failures)
+        return successful, failed
+
+    def _write_plan_groups(self, groups: List[Dict[str, Any]], worksheet_count: int) -> Tuple[List[str], List[str]]:
+        """Un batchUpdate pour ces groupes du plan ; lève l'erreur de l'API si la requête échoue"""
+        data = []
+        for group in groups:
+            for update in group["updates"]:
+                data.append({
+                    'range': f"'{group['worksheet_name']}'!{update['range']}",
+                    'values': [[update['value']]]
+                })
+
+        result = self._execute(self.service.spreadsheets().values().batchUpdate(
+            spreadsheetId=self.sheet_id,
+            body={'valueInputOption': 'RAW', 'data': data}
+        ))
+        responses = result.get('responses', [])
+        logging.info(
+            f"📋 Plan d'écriture flushé: {result.get('totalUpdatedCells', 0)} cellules "
+            f"sur {worksheet_count} onglet(s) en 1 requête"
+        )
+
+        # Les réponses arrivent dans l'ordre des ranges envoyés : un groupe est réussi
+        # si chacune de ses cellules a une réponse
+        successful: List[str] = []
+        failed: List[str] = []
+        index = 0
+        for group in groups:
+            cell_count = len(group["updates"])
+            written = len(responses[index:index + cell_count])
+            index += cell_count
+            if written == cell_count:
+                if group["success_message"]:
+                    successful.append(group["success_message"])
+            else:
+                missing = ", ".join(update["range"] for update in group["updates"][written:])
+                failed.append(
+                    f"{group['failure_label']}: {cell_count - written}/{cell_count} cellules non écrites ({missing})"
+                )
+
+        return successful, failed
+
+
+class SheetWritePlan:
+    """
+    Accumulateur des cellules à écrire dans le Sheet principal pendant un export.
+    Chaque étape (Google, Meta, GA4, leads...) ajoute ses cellules, puis
+    GoogleSheetsService.flush_write_plan() écrit tout en un seul batchUpdate.
+    """
+
+    def __init__(self):
+        self.groups: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        worksheet_name: str,
+        updates: List[Dict[str, Any]],
+        success_message: Optional[str] = None,
+        failure_label: Optional[str] = None,
+    ) -> None:
+        """
+        Ajoute un groupe de cellules ({'range': 'B4', 'value': 12}) pour un onglet.
+
+        Args:
+            success_message: Message ajouté aux succès si toutes les cellules sont écrites
+            failure_label: Préfixe du message d'échec (défaut : l'onglet)
+        """
+        if not updates:
+            return
+        with self._lock:
+            self.groups.append({
+                "worksheet_name": worksheet_name,
+                "updates": list(updates),
+                "success_message": success_message,
+                "failure_label": failure_label or success_message or worksheet_name,
+            })
+
+    def add_cell(
+        self,
+        worksheet_name: str,
+        cell_range: str,
+        value: Any,
+        success_message: Optional[str] = None,
+        failure_label: Optional[str] = None,
+    ) -> None:
+        """Ajoute une cellule seule (équivalent différé de update_single_cell)."""
+        self.add(worksheet_name, [{'range': cell_range, 'value': value}], success_message, failure_label)
+
+    def merge(self, other: "SheetWritePlan") -> None:
+        """Ajoute à la suite les groupes d'un autre plan (ordre conservé)."""
+        with self._lock:
+            self.groups.extend(other.groups)
+
+    def cell_count(self) -> int:
+        return sum(len(group["updates"]) for group in self.groups)
+
+    def worksheet_names(self) -> List[str]:
+        return sorted({group["worksheet_name"] for group in self.groups})
+
+    def is_empty(self) -> bool:
+        return not self.groups
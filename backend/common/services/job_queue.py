@@ -0,0 +1,375 @@
+"""
+File de jobs persistante (SQLite) pour les exports longs
+
+Les routes lourdes (export unifié, export Drive, génération de rapports) peuvent
+être mises en file : la requête HTTP renvoie immédiatement un job_id, un pool de
+threads en arrière-plan exécute le job et GET /jobs/<id> expose son avancement
+par étape.
+
+Sous gunicorn (JOB_RUNNER=process), les jobs tournent dans un process dédié
+(backend/job_runner.py) lancé par le master : le recyclage des workers HTTP
+(max_requests) ne les interrompt pas. Sans gunicorn (JOB_RUNNER=inline, défaut),
+le pool tourne dans le process HTTP. La file est sur disque : un job interrompu
+par l'arrêt de son process est remis en file au démarrage suivant.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+from backend.config.settings import Config
+
+# (file, id) du job en cours d'exécution dans le contexte courant (pour report_job_progress)
+_current_job: contextvars.ContextVar[Optional[tuple]] = contextvars.ContextVar("current_job", default=None)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    progress TEXT NOT NULL DEFAULT '{}',
+    result TEXT,
+    http_status INTEGER,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker_pid INTEGER,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobQueue:
+    """
+    File de jobs stockée dans SQLite (une connexion par opération, sûre entre threads et process).
+
+    Statuts : queued → running → succeeded | failed
+    """
+
+    # Un job interrompu deux fois (recyclage, crash) est abandonné
+    MAX_ATTEMPTS = 2
+    # Jobs terminés conservés (secondes)
+    RETENTION_SECONDS = 7 * 24 * 3600
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = str(db_path or Config.PATHS.JOBS_DB_FILE)
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Transaction en écriture exclusive (lecture + mise à jour atomiques entre process)"""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def submit(self, kind: str, payload: Dict[str, Any]) -> str:
+        """Met un job en file et renvoie son identifiant"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, payload, created_at, updated_at) VALUES (?, ?, 'queued', ?, ?, ?)",
+                (job_id, kind, json.dumps(payload), now, now),
+            )
+        logging.info(f"📬 Job {kind} mis en file: {job_id}")
+        return job_id
+
+    def claim_next(self) -> Optional[Dict[str, Any]]:
+        """Réserve le plus ancien job en file pour ce process (None si la file est vide)"""
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            conn.execute(
+                "UPDATE jobs SET status = 'running', worker_pid = ?, attempts = attempts + 1, "
+                "started_at = ?, updated_at = ? WHERE id = ?",
+                (os.getpid(), now, now, row["id"]),
+            )
+        return self.get(row["id"])
+
+    def update_progress(self, job_id: str, stage: str, status: str, **details) -> None:
+        """Enregistre l'état d'une étape du job (ex: meta → running)"""
+        with self._transaction() as conn:
+            row = conn.execute("SELECT progress FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return
+            progress = json.loads(row["progress"] or "{}")
+            progress[stage] = {"status": status, **details}
+            conn.execute(
+                "UPDATE jobs SET progress = ?, updated_at = ? WHERE id = ?",
+                (json.dumps(progress), time.time(), job_id),
+            )
+
+    def finish(self, job_id: str, result: Any = None, http_status: int = 200, error: Optional[str] = None) -> None:
+        """Termine un job : succeeded si http_status < 400 et sans erreur, failed sinon"""
+        status = "failed" if error or http_status >= 400 else "succeeded"
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, http_status = ?, error = ?, finished_at = ?, updated_at = ? "
+                "WHERE id = ?",
+                (status, json.dumps(result), http_status, error, now, now, job_id),
+            )
+        logging.info(f"🏁 Job {job_id} terminé: {status}")
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["progress"] = json.loads(job["progress"] or "{}")
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def requeue_orphans(self, active_job_ids=()) -> int:
+        """
+        Remet en file les jobs 'running' dont le process n'existe plus (worker recyclé ou tué).
+
+        Args:
+            active_job_ids: jobs réellement en cours dans ce process (les autres jobs
+                marqués avec notre pid datent d'un process précédent au même pid)
+
+        Returns:
+            Nombre de jobs remis en file
+        """
+        requeued = 0
+        now = time.time()
+        with self._transaction() as conn:
+            rows = conn.execute("SELECT id, worker_pid, attempts FROM jobs WHERE status = 'running'").fetchall()
+            for row in rows:
+                if row["worker_pid"] == os.getpid():
+                    if row["id"] in active_job_ids:
+                        continue
+                elif _pid_alive(row["worker_pid"]):
+                    continue
+                if row["attempts"] >= self.MAX_ATTEMPTS:
+                    conn.execute(
+                        "UPDATE jobs SET status = 'failed', error = ?, finished_at = ?, updated_at = ? WHERE id = ?",
+                        (f"Job interrompu {row['attempts']} fois", now, now, row["id"]),
+                    )
+                    continue
+                conn.execute(
+                    "UPDATE jobs SET status = 'queued', worker_pid = NULL, updated_at = ? WHERE id = ?",
+                    (now, row["id"]),
+                )
+                requeued += 1
+            conn.execute(
+                "DELETE FROM jobs WHERE status IN ('succeeded', 'failed') AND finished_at < ?",
+                (now - self.RETENTION_SECONDS,),
+            )
+        if requeued:
+            logging.info(f"♻️ {requeued} job(s) interrompu(s) remis en file")
+        return requeued
+
+
+class JobWorkerPool:
+    """
+    Threads d'arrière-plan qui exécutent les jobs de la file.
+
+    Les handlers sont ceux enregistrés via register_job_handler : handler(payload) -> (résultat, code HTTP).
+    start() est idempotent par process ; run_forever() bloque le thread appelant
+    (process dédié) et rend la main entre deux jobs une fois max_jobs atteint.
+    """
+
+    POLL_INTERVAL = 1.0
+    # Vérification périodique des jobs orphelins (process disparu sans être remplacé ici)
+    ORPHAN_CHECK_INTERVAL = 60.0
+
+    def __init__(self, queue: JobQueue, workers: int = 1,
+                 handlers: Optional[Dict[str, Callable[[Dict[str, Any]], Any]]] = None):
+        self.queue = queue
+        self.workers = workers
+        self._handlers = _job_handlers if handlers is None else handlers
+        self._started_pid: Optional[int] = None
+        self._active_job_ids = set()
+        self._last_orphan_check = 0.0
+        self._processed = 0
+        self._max_jobs: Optional[int] = None
+        self._threads = []
+        self._stopping = threading.Event()
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._started_pid == os.getpid():
+                return
+            self._started_pid = os.getpid()
+            self._active_job_ids = set()
+            self._stopping.clear()
+            self._requeue_orphans()
+            self._threads = [
+                threading.Thread(target=self._run, name=f"job-worker-{index}", daemon=True)
+                for index in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+        logging.info(f"👷 {self.workers} worker(s) de jobs démarré(s) (pid {os.getpid()})")
+
+    def run_forever(self, max_jobs: Optional[int] = None) -> int:
+        """
+        Exécute les jobs jusqu'à max_jobs jobs traités (sans limite si None), puis
+        attend la fin des jobs en cours : un arrêt pour libérer la mémoire du
+        process n'interrompt jamais un job.
+
+        Returns:
+            Nombre de jobs traités
+        """
+        self._max_jobs = max_jobs
+        self.start()
+        while not max_jobs or self._processed < max_jobs:
+            time.sleep(self.POLL_INTERVAL)
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join()
+        logging.info(f"👷 {self._processed} job(s) traité(s), arrêt du runner (pid {os.getpid()})")
+        return self._processed
+
+    def notify(self) -> None:
+        """Réveille les workers après une mise en file"""
+        self._wakeup.set()
+
+    def _requeue_orphans(self) -> None:
+        """À appeler sous self._lock (pas de claim concurrent non encore marqué actif)"""
+        self._last_orphan_check = time.monotonic()
+        self.queue.requeue_orphans(active_job_ids=set(self._active_job_ids))
+
+    def _run(self) -> None:
+        while True:
+            try:
+                with self._lock:
+                    if self._stopping.is_set() or (self._max_jobs and self._processed >= self._max_jobs):
+                        return
+                    if time.monotonic() - self._last_orphan_check > self.ORPHAN_CHECK_INTERVAL:
+                        self._requeue_orphans()
+                    job = self.queue.claim_next()
+                    if job is not None:
+                        self._active_job_ids.add(job["id"])
+            except Exception as e:
+                logging.error(f"❌ Lecture de la file de jobs impossible: {e}")
+                job = None
+            if job is None:
+                self._wakeup.wait(self.POLL_INTERVAL)
+                self._wakeup.clear()
+                continue
+            try:
+                self._execute(job)
+            finally:
+                with self._lock:
+                    self._active_job_ids.discard(job["id"])
+                    self._processed += 1
+
+    def _execute(self, job: Dict[str, Any]) -> None:
+        handler = self._handlers.get(job["kind"])
+        if handler is None:
+            self.queue.finish(job["id"], http_status=500, error=f"Type de job inconnu: {job['kind']}")
+            return
+
+        token = _current_job.set((self.queue, job["id"]))
+        logging.info(f"▶️ Job {job['kind']} {job['id']} (tentative {job['attempts']})")
+        try:
+            result, http_status = handler(job["payload"])
+            self.queue.finish(job["id"], result=result, http_status=http_status)
+        except Exception as e:
+            logging.error(f"❌ Job {job['id']} en échec: {e}", exc_info=True)
+            self.queue.finish(job["id"], http_status=500, error=str(e))
+        finally:
+            _current_job.reset(token)
+
+
+_job_handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+_queue: Optional[JobQueue] = None
+_pool: Optional[JobWorkerPool] = None
+_singleton_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """File de jobs partagée par le process"""
+    global _queue
+    with _singleton_lock:
+        if _queue is None:
+            _queue = JobQueue()
+        return _queue
+
+
+def get_job_worker_pool() -> JobWorkerPool:
+    """Pool de workers partagé (JOB_WORKERS threads, 1 par défaut)"""
+    global _pool
+    queue = get_job_queue()
+    with _singleton_lock:
+        if _pool is None:
+            _pool = JobWorkerPool(queue, workers=int(os.getenv("JOB_WORKERS", "1")))
+        return _pool
+
+
+def job_runner_is_external() -> bool:
+    """True si les jobs sont exécutés par le process dédié (JOB_RUNNER=process, posé par gunicorn.conf.py)"""
+    return os.getenv("JOB_RUNNER", "inline") == "process"
+
+
+def register_job_handler(kind: str, handler: Callable[[Dict[str, Any]], Any]) -> None:
+    """Enregistre l'exécuteur d'un type de job : handler(payload) -> (résultat, code HTTP)"""
+    _job_handlers[kind] = handler
+
+
+def current_job_id() -> Optional[str]:
+    current = _current_job.get()
+    return current[1] if current else None
+
+
+def report_job_progress(stage: str, status: str, **details) -> None:
+    """Met à jour l'avancement du job en cours (sans effet hors d'un job)"""
+    current = _current_job.get()
+    if current is None:
+        return
+    queue, job_id = current
+    try:
+        queue.update_progress(job_id, stage, status, **details)
+    except Exception as e:
+        logging.warning(f"⚠️ Avancement du job {job_id} non enregistré: {e}")
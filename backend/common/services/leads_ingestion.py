@@ -0,0 +1,221 @@
+"""
+Lecture incrémentale des sheets leads sources.
+
+Les sheets leads sont des journaux en ajout seul où seules les dernières lignes
+bougent (statut qualifié, doublon...). Pour chaque (spreadsheet, onglet) on
+persiste les agrégats mensuels des lignes « figées » et l'index de la dernière
+ligne figée. Une lecture ne relit ensuite que la fenêtre de fin (TAIL_ROWS
+lignes) et les nouvelles lignes, par blocs de CHUNK_ROWS lignes, sans plafond.
+Le sheet est relu entièrement si l'en-tête change, si la ligne frontière a été
+modifiée (insertion/suppression au-dessus) ou si le nombre de lignes diminue.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from backend.common.services.leads_scraper import LeadDateParser, count_leads_by_month
+from backend.config.settings import Config
+
+# À incrémenter si le format de l'état ou les règles de comptage changent
+STATE_VERSION = 1
+
+# Lignes lues par appel Sheets
+CHUNK_ROWS = int(os.getenv("LEADS_CHUNK_ROWS", "5000"))
+
+# Dernières lignes relues à chaque passage (encore susceptibles d'être modifiées)
+TAIL_ROWS = int(os.getenv("LEADS_TAIL_ROWS", "1000"))
+
+COUNTER_KEYS = ("leads_google", "leads_meta", "leads_generes", "leads_qualifies")
+
+
+def _incremental_enabled() -> bool:
+    return os.getenv("LEADS_INCREMENTAL", "1").lower() not in ("0", "false")
+
+
+def _last_column(config: Dict[str, Any]) -> str:
+    """Dernière colonne lue dans le sheet source (même plage que la lecture historique)"""
+    return "AA" if config["date_col"] >= 26 else chr(ord('A') + max(config["date_col"], config["r_col"]) + 1)
+
+
+def _hash(value: Any) -> str:
+    return hashlib.sha1(json.dumps(value, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _columns_signature(config: Dict[str, Any]) -> List[int]:
+    return [config[key] for key in ("date_col", "provenance_col", "statut_col", "q_col", "r_col")]
+
+
+def _month_key(year: int, month: int) -> str:
+    return f"{year:04d}-{month:02d}"
+
+
+class LeadsStateStore:
+    """États de lecture persistés, un fichier JSON par (spreadsheet, onglet)"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = Path(directory or Config.PATHS.LEADS_STATE_DIR)
+
+    def _path(self, spreadsheet_id: str, tab_name: str) -> Path:
+        key = hashlib.sha1(f"{spreadsheet_id}\0{tab_name}".encode("utf-8")).hexdigest()
+        return self.directory / f"{key}.json"
+
+    def load(self, spreadsheet_id: str, tab_name: str) -> Optional[Dict[str, Any]]:
+        try:
+            state = json.loads(self._path(spreadsheet_id, tab_name).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+            return None
+        return state
+
+    def save(self, spreadsheet_id: str, tab_name: str, state: Dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(spreadsheet_id, tab_name)
+        tmp_path = self.directory / f".{path.stem}.{uuid.uuid4().hex}.tmp"
+        tmp_path.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+_store: Optional[LeadsStateStore] = None
+_store_lock = threading.Lock()
+
+
+def get_leads_state_store() -> LeadsStateStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = LeadsStateStore()
+        return _store
+
+
+def _read_rows(
+    sheets_service,
+    spreadsheet_id: str,
+    tab_name: str,
+    last_col: str,
+    first_index: int,
+    with_header: bool = True,
+) -> Tuple[Optional[List[str]], List[List[str]]]:
+    """
+    Lit les lignes de données à partir de l'index first_index (0 = ligne 2 du sheet),
+    par blocs de CHUNK_ROWS lignes jusqu'à un bloc incomplet.
+
+    Returns:
+        (en-tête ligne 1 ou None, lignes lues)
+    """
+    def chunk_range(start_row: int) -> str:
+        return f"'{tab_name}'!A{start_row}:{last_col}{start_row + CHUNK_ROWS - 1}"
+
+    start_row = first_index + 2
+    header = None
+    if with_header:
+        header_values, chunk = sheets_service.batch_get_values(
+            [f"'{tab_name}'!A1:{last_col}1", chunk_range(start_row)],
+            spreadsheet_id=spreadsheet_id,
+        )
+        header = header_values[0] if header_values else []
+    else:
+        chunk = sheets_service.get_values(chunk_range(start_row), spreadsheet_id=spreadsheet_id)
+
+    rows = list(chunk)
+    while len(chunk) >= CHUNK_ROWS:
+        start_row += CHUNK_ROWS
+        chunk = sheets_service.get_values(chunk_range(start_row), spreadsheet_id=spreadsheet_id)
+        rows.extend(chunk)
+    return header, rows
+
+
+def _state_is_valid(state: Dict[str, Any], header_hash: str, rows: List[List[str]], first_index: int) -> Optional[str]:
+    """Retourne la raison d'une relecture complète, None si l'état reste utilisable"""
+    if state["header_hash"] != header_hash:
+        return "en-tête modifié"
+    if state["frozen_rows"] and (not rows or _hash(rows[0]) != state["boundary_hash"]):
+        return "ligne frontière modifiée"
+    if first_index + len(rows) < state["total_rows"]:
+        return "nombre de lignes en baisse"
+    return None
+
+
+def read_leads_counts(
+    sheets_service,
+    config: Dict[str, Any],
+    months: Iterable[Tuple[int, int]],
+    store: Optional[LeadsStateStore] = None,
+) -> Dict[Tuple[int, int], Dict[str, int]]:
+    """
+    Compte les leads des mois demandés en ne lisant que la fin du sheet source.
+
+    Args:
+        sheets_service: Instance GoogleSheetsService.
+        config: Entrée de LEADS_SHEETS (spreadsheet, onglet, indices de colonnes).
+        months: Mois cibles sous forme de tuples (année, mois).
+        store: Stockage des états (singleton du process par défaut).
+
+    Returns:
+        Même format que count_leads_by_month.
+    """
+    months = list(months)
+    spreadsheet_id = config["spreadsheet_id"]
+    tab_name = config["tab_name"]
+    last_col = _last_column(config)
+    store = store or get_leads_state_store()
+
+    state = store.load(spreadsheet_id, tab_name) if _incremental_enabled() else None
+    if state and state.get("columns") != _columns_signature(config):
+        state = None
+
+    # La ligne frontière (dernière ligne figée) est relue pour détecter une modification au-dessus
+    frozen_rows = state["frozen_rows"] if state else 0
+    first_index = frozen_rows - 1 if frozen_rows else 0
+    header, rows = _read_rows(sheets_service, spreadsheet_id, tab_name, last_col, first_index)
+    header_hash = _hash(header)
+
+    if state:
+        reason = _state_is_valid(state, header_hash, rows, first_index)
+        if reason:
+            logging.info(f"  🔁 Relecture complète de '{tab_name}' ({reason})")
+            state, frozen_rows, first_index = None, 0, 0
+            _, rows = _read_rows(sheets_service, spreadsheet_id, tab_name, last_col, 0, with_header=False)
+
+    mode = "incrémentale" if state else "complète"
+    logging.info(f"  {len(rows)} lignes lues depuis le sheet leads (lecture {mode})")
+
+    new_rows = rows[1:] if frozen_rows else rows
+    total_rows = frozen_rows + len(new_rows)
+    new_frozen_rows = max(frozen_rows, total_rows - TAIL_ROWS)
+    split = new_frozen_rows - frozen_rows
+
+    # Agrégats figés : état précédent + lignes sorties de la fenêtre de fin
+    frozen = {key: list(values) for key, values in (state["months"] if state else {}).items()}
+    date_parser = LeadDateParser()
+    for (year, month), counts in count_leads_by_month(new_rows[:split], None, config, date_parser).items():
+        totals = frozen.setdefault(_month_key(year, month), [0, 0, 0, 0])
+        for i, key in enumerate(COUNTER_KEYS):
+            totals[i] += counts[key]
+
+    recent = count_leads_by_month(new_rows[split:], months, config, date_parser)
+    results = {}
+    for year, month in months:
+        base = frozen.get(_month_key(year, month), [0, 0, 0, 0])
+        results[(year, month)] = {key: base[i] + recent[(year, month)][key] for i, key in enumerate(COUNTER_KEYS)}
+
+    new_state = {
+        "version": STATE_VERSION,
+        "columns": _columns_signature(config),
+        "header_hash": header_hash,
+        "frozen_rows": new_frozen_rows,
+        "boundary_hash": _hash(rows[new_frozen_rows - 1 - first_index]) if new_frozen_rows else None,
+        "total_rows": total_rows,
+        "months": frozen,
+    }
+    try:
+        store.save(spreadsheet_id, tab_name, new_state)
+    except OSError as e:
+        logging.warning(f"⚠️ État de lecture leads non sauvegardé pour '{tab_name}': {e}")
+    return results
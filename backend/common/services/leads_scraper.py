@@ -5,9 +5,11 @@ et écrit les résultats dans le sheet principal du client.
 """
 
 import logging
+import os
+import re
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
-from typing import Dict, List, Any, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 # Spreadsheet IDs des sheets leads (source)
 LEADS_SHEETS = {
@@ -90,21 +92,41 @@ MONTH_NAMES_EN = [
 ]
 
 
-def _parse_date(value: str) -> Optional[datetime]:
-    """Parse une date depuis le sheet leads. Supporte plusieurs formats."""
-    if not value or not value.strip():
-        return None
-    value = value.strip()
+# Formats de date testés dans l'ordre : le premier qui parse l'emporte
+_DATE_FORMATS = (
+    "%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S", "%m/%d/%Y", "%d %B %Y %H:%M", "%d %B %Y",
+)
+
+_DIGITS_RE = re.compile(r"\d+")
+_LETTERS_RE = re.compile(r"[^\W\d_]+")
+_SPACES_RE = re.compile(r"\s+")
+
+
+def _normalize_date(value: str) -> str:
+    value = value.strip() if value else ""
     # Nettoyer le format ISO avec T et Z
     if "T" in value:
         value = value.split("T")[0]
-    for fmt in ("%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y %H:%M:%S",
-                "%Y-%m-%d %H:%M:%S", "%m/%d/%Y", "%d %B %Y %H:%M", "%d %B %Y"):
-        try:
-            return datetime.strptime(value, fmt)
-        except ValueError:
-            continue
-    # Essayer le format serial Google Sheets (nombre de jours depuis 1899-12-30)
+    return value
+
+
+def _date_shape(value: str) -> str:
+    """Forme d'une valeur, ex. "12/03/2026 14:05:00" → "9/9/9 9:9:9" et "3 March 2026" → "9 a 9"."""
+    return _SPACES_RE.sub(" ", _LETTERS_RE.sub("a", _DIGITS_RE.sub("9", value)))
+
+
+# Forme attendue par chaque format (%B → mots, autres directives → nombres)
+_FORMAT_SHAPES = tuple(
+    (fmt, _date_shape(re.sub(r"%[dmYHMS]", "0", fmt).replace("%B", "a")))
+    for fmt in _DATE_FORMATS
+)
+# Formes purement numériques : aucun format texte ne peut les parser
+_SERIAL_SHAPES = frozenset({"9", "9.9"})
+
+
+def _parse_serial(value: str) -> Optional[datetime]:
+    # Format serial Google Sheets (nombre de jours depuis 1899-12-30)
     try:
         serial = float(value)
         if 1000 < serial < 100000:
@@ -114,6 +136,66 @@ def _parse_date(value: str) -> Optional[datetime]:
     return None
 
 
+def _parse_date(value: str) -> Optional[datetime]:
+    """Parse une date depuis le sheet leads. Supporte plusieurs formats."""
+    value = _normalize_date(value)
+    if not value:
+        return None
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return _parse_serial(value)
+
+
+class LeadDateParser:
+    """
+    Parseur de dates d'un sheet leads, à utiliser le temps d'un scraping.
+
+    Même résultat que _parse_date, mais chaque valeur distincte n'est parsée
+    qu'une fois et, pour chaque forme de valeur rencontrée dans le sheet, seuls
+    les formats compatibles (dans l'ordre de _DATE_FORMATS) sont retenus :
+    une colonne homogène ne coûte plus qu'un strptime par date distincte.
+    """
+
+    def __init__(self):
+        self._by_value: Dict[str, Optional[datetime]] = {}
+        self._formats_by_shape: Dict[str, Tuple[str, ...]] = {}
+
+    @property
+    def formats_by_shape(self) -> Dict[str, Tuple[str, ...]]:
+        return dict(self._formats_by_shape)
+
+    def parse(self, value: str) -> Optional[datetime]:
+        try:
+            return self._by_value[value]
+        except KeyError:
+            pass
+        dt = self._parse(value)
+        self._by_value[value] = dt
+        return dt
+
+    def _parse(self, value: str) -> Optional[datetime]:
+        value = _normalize_date(value)
+        if not value:
+            return None
+        shape = _date_shape(value)
+        formats = self._formats_by_shape.get(shape)
+        if formats is None:
+            formats = tuple(fmt for fmt, fmt_shape in _FORMAT_SHAPES if fmt_shape == shape)
+            self._formats_by_shape[shape] = formats
+        for fmt in formats:
+            try:
+                return datetime.strptime(value, fmt)
+            except ValueError:
+                continue
+        if shape in _SERIAL_SHAPES:
+            return _parse_serial(value)
+        # Forme inattendue ou valeur hors plage (ex. 31/02) : parcours complet
+        return _parse_date(value)
+
+
 def _get_target_months(reference_month: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Retourne les 3 mois cibles (M-1, M-2, M-3 par rapport à maintenant,
@@ -139,137 +221,149 @@ def _get_target_months(reference_month: Optional[str] = None) -> List[Dict[str,
     return months
 
 
-def count_leads_for_month(
+def count_leads_by_month(
     rows: List[List[str]],
-    year: int,
-    month: int,
+    months: Optional[Iterable[Tuple[int, int]]],
     config: Dict[str, int],
-) -> Dict[str, int]:
+    date_parser: Optional[LeadDateParser] = None,
+) -> Dict[Tuple[int, int], Dict[str, int]]:
     """
-    Compte les leads Google, Meta et Générés pour un mois donné.
+    Compte les leads Google, Meta, Générés et Qualifiés de plusieurs mois en une passe.
+
+    Chaque ligne n'est lue qu'une fois : sa date est parsée (avec mémoïsation
+    via LeadDateParser) puis la ligne est rangée dans le mois correspondant.
 
     Args:
         rows: Données brutes du sheet leads.
-        year: Année cible.
-        month: Mois cible (1-12).
+        months: Mois cibles sous forme de tuples (année, mois). None : tous les
+            mois rencontrés dans les lignes.
         config: Config avec les indices de colonnes.
+        date_parser: Parseur à réutiliser (un nouveau par défaut).
 
     Returns:
-        {"leads_google": X, "leads_meta": Y, "leads_generes": Z, "leads_qualifies": W}
+        {(année, mois): {"leads_google": X, "leads_meta": Y, "leads_generes": Z, "leads_qualifies": W}}
     """
     date_col = config["date_col"]
     provenance_col = config["provenance_col"]
     statut_col = config["statut_col"]
     q_col = config["q_col"]
     r_col = config["r_col"]
+    parse = (date_parser or LeadDateParser()).parse
 
-    leads_google = 0
-    leads_meta = 0
-    leads_total = 0
-    leads_qualifies = 0
+    # [google, meta, générés, qualifiés] par mois
+    all_months = months is None
+    buckets = {} if all_months else {(year, month): [0, 0, 0, 0] for year, month in months}
 
     for row in rows:
-        # Vérifier que la ligne a assez de colonnes
-        def get_cell(idx: int) -> str:
-            return row[idx].strip() if idx < len(row) and row[idx] else ""
-
+        width = len(row)
         # Filtrer par date
-        date_str = get_cell(date_col)
-        dt = _parse_date(date_str)
-        if dt is None or dt.year != year or dt.month != month:
+        date_str = row[date_col] if date_col < width else None
+        if not date_str:
+            continue
+        dt = parse(date_str)
+        if dt is None:
             continue
+        counters = buckets.get((dt.year, dt.month))
+        if counters is None:
+            if not all_months:
+                continue
+            counters = buckets[(dt.year, dt.month)] = [0, 0, 0, 0]
 
-        statut = get_cell(statut_col).lower()
+        statut = row[statut_col].strip().lower() if statut_col < width and row[statut_col] else ""
 
         # Exclure les doublons
         if statut == "doublon":
             continue
 
-        provenance = get_cell(provenance_col).lower()
-        q_val = get_cell(q_col)
-        r_val = get_cell(r_col)
-        is_media = "google" in provenance or "meta" in provenance or q_val or r_val
-
-        # Ce lead est valide (non-doublon, bon mois)
-        if is_media:
-            leads_total += 1
+        provenance = row[provenance_col].strip().lower() if provenance_col < width and row[provenance_col] else ""
+        q_val = row[q_col].strip() if q_col < width and row[q_col] else ""
+        r_val = row[r_col].strip() if r_col < width and row[r_col] else ""
+        is_google = "google" in provenance or bool(r_val)
+        is_meta = "meta" in provenance or bool(q_val)
 
         # Lead Google : H contient "google" OU R non vide
-        if "google" in provenance or r_val:
-            leads_google += 1
+        if is_google:
+            counters[0] += 1
 
         # Lead Meta : H contient "meta" OU Q non vide
-        if "meta" in provenance or q_val:
-            leads_meta += 1
+        if is_meta:
+            counters[1] += 1
+
+        # Ce lead est valide (non-doublon, bon mois) et vient d'un média
+        if is_google or is_meta:
+            counters[2] += 1
 
         # Lead qualifié : statut "qualifié" ou "converti", peu importe la source (média ou organique)
         if statut in ("qualifié", "converti"):
-            leads_qualifies += 1
+            counters[3] += 1
 
     return {
-        "leads_google": leads_google,
-        "leads_meta": leads_meta,
-        "leads_generes": leads_total,
-        "leads_qualifies": leads_qualifies,
+        key: {
+            "leads_google": google,
+            "leads_meta": meta,
+            "leads_generes": total,
+            "leads_qualifies": qualifies,
+        }
+        for key, (google, meta, total, qualifies) in buckets.items()
     }
 
 
-def _scrape_leads_client(
-    sheets_service,
-    client_key: str,
-    reference_month: Optional[str] = None,
-) -> Dict[str, Any]:
+def count_leads_for_month(
+    rows: List[List[str]],
+    year: int,
+    month: int,
+    config: Dict[str, int],
+) -> Dict[str, int]:
     """
-    Scrape les leads d'un client et écrit les résultats dans le sheet principal.
+    Compte les leads Google, Meta et Générés pour un mois donné.
 
     Args:
-        sheets_service: Instance GoogleSheetsService (pour écrire).
-        client_key: Clé dans LEADS_SHEETS (ex: "kozeo", "riviera_grass").
-        reference_month: Mois de référence (ex: "February 2026"). Si None, M-1.
+        rows: Données brutes du sheet leads.
+        year: Année cible.
+        month: Mois cible (1-12).
+        config: Config avec les indices de colonnes.
 
     Returns:
-        Dict avec le résumé des résultats.
+        {"leads_google": X, "leads_meta": Y, "leads_generes": Z, "leads_qualifies": W}
     """
-    config = LEADS_SHEETS[client_key]
-    spreadsheet_id = config["spreadsheet_id"]
-    tab_name = config["tab_name"]
-    worksheet_name = config["worksheet_name"]
-    # Déterminer la plage de lecture selon la colonne date
-    max_col = "AA" if config["date_col"] >= 26 else chr(ord('A') + max(config["date_col"], config["r_col"]) + 1)
+    return count_leads_by_month(rows, [(year, month)], config)[(year, month)]
 
-    logging.info(f"📊 Scraping leads '{client_key}' depuis '{tab_name}'...")
 
-    # 1. Lire toutes les données du sheet leads
-    data_range = f"'{tab_name}'!A2:{max_col}10000"
-    result = sheets_service.service.spreadsheets().values().get(
-        spreadsheetId=spreadsheet_id,
-        range=data_range,
-    ).execute()
-    rows = result.get("values", [])
-    logging.info(f"  {len(rows)} lignes lues depuis le sheet leads")
+def _col_letter(idx: int) -> str:
+    result_str = ""
+    while idx >= 0:
+        result_str = chr(idx % 26 + ord('A')) + result_str
+        idx = idx // 26 - 1
+    return result_str
 
-    # 2. Calculer les 3 mois cibles
-    target_months = _get_target_months(reference_month)
-    logging.info(f"  Mois cibles : {[m['month_en'] for m in target_months]}")
 
-    # 3. Compter les leads pour chaque mois
+def _results_by_month(
+    target_months: List[Dict[str, Any]],
+    counts_by_month: Dict[Tuple[int, int], Dict[str, int]],
+) -> Dict[str, Dict[str, int]]:
+    """Compteurs indexés par libellé de mois ("March 2026"), tels qu'écrits dans le sheet principal"""
     results_by_month = {}
     for m in target_months:
-        counts = count_leads_for_month(rows, m["year"], m["month"], config)
+        counts = counts_by_month[(m["year"], m["month"])]
         results_by_month[m["month_en"]] = counts
         logging.info(
             f"  {m['month_en']}: Google={counts['leads_google']}, "
             f"Meta={counts['leads_meta']}, Générés={counts['leads_generes']}, "
             f"Qualifiés={counts['leads_qualifies']}"
         )
+    return results_by_month
 
-    # 4. Écrire dans le sheet principal
-    headers_range = f"'{worksheet_name}'!2:2"
-    headers_result = sheets_service.service.spreadsheets().values().get(
-        spreadsheetId=sheets_service.sheet_id,
-        range=headers_range,
-    ).execute()
-    headers_raw = headers_result.get("values", [[]])
+
+def _leads_updates(
+    worksheet_name: str,
+    headers_raw: List[List[str]],
+    month_rows: List[List[str]],
+    results_by_month: Dict[str, Dict[str, int]],
+) -> List[Dict[str, Any]]:
+    """
+    Cellules à écrire dans l'onglet du client à partir de sa ligne d'en-têtes (ligne 2)
+    et de sa colonne des mois (A3:A50).
+    """
     headers = [h.strip() if h else "" for h in headers_raw[0]] if headers_raw else []
 
     col_leads_google = None
@@ -293,20 +387,6 @@ def _scrape_leads_client(
             f"Attendus: 'Leads Google', 'Leads Meta', 'Leads Générés', 'Leads Qualifiés'"
         )
 
-    month_range = f"'{worksheet_name}'!A3:A50"
-    month_result = sheets_service.service.spreadsheets().values().get(
-        spreadsheetId=sheets_service.sheet_id,
-        range=month_range,
-    ).execute()
-    month_rows = month_result.get("values", [])
-
-    def col_letter(idx: int) -> str:
-        result_str = ""
-        while idx >= 0:
-            result_str = chr(idx % 26 + ord('A')) + result_str
-            idx = idx // 26 - 1
-        return result_str
-
     updates = []
     for row_idx, row_data in enumerate(month_rows):
         if not row_data or not row_data[0]:
@@ -317,23 +397,71 @@ def _scrape_leads_client(
             sheet_row = row_idx + 3
 
             updates.append({
-                "range": f"{col_letter(col_leads_google)}{sheet_row}",
+                "range": f"{_col_letter(col_leads_google)}{sheet_row}",
                 "value": counts["leads_google"],
             })
             updates.append({
-                "range": f"{col_letter(col_leads_meta)}{sheet_row}",
+                "range": f"{_col_letter(col_leads_meta)}{sheet_row}",
                 "value": counts["leads_meta"],
             })
             updates.append({
-                "range": f"{col_letter(col_leads_generes)}{sheet_row}",
+                "range": f"{_col_letter(col_leads_generes)}{sheet_row}",
                 "value": counts["leads_generes"],
             })
             updates.append({
-                "range": f"{col_letter(col_leads_qualifies)}{sheet_row}",
+                "range": f"{_col_letter(col_leads_qualifies)}{sheet_row}",
                 "value": counts["leads_qualifies"],
             })
+    return updates
+
+
+def _scrape_leads_client(
+    sheets_service,
+    client_key: str,
+    reference_month: Optional[str] = None,
+    write_plan=None,
+) -> Dict[str, Any]:
+    """
+    Scrape les leads d'un client et écrit les résultats dans le sheet principal.
+
+    Args:
+        sheets_service: Instance GoogleSheetsService (pour écrire).
+        client_key: Clé dans LEADS_SHEETS (ex: "kozeo", "riviera_grass").
+        reference_month: Mois de référence (ex: "February 2026"). Si None, M-1.
+        write_plan: SheetWritePlan optionnel. Si fourni, les cellules y sont
+            ajoutées au lieu d'être écrites immédiatement.
+
+    Returns:
+        Dict avec le résumé des résultats.
+    """
+    config = LEADS_SHEETS[client_key]
+    tab_name = config["tab_name"]
+    worksheet_name = config["worksheet_name"]
+
+    logging.info(f"📊 Scraping leads '{client_key}' depuis '{tab_name}'...")
+
+    # 1. Calculer les 3 mois cibles
+    target_months = _get_target_months(reference_month)
+    logging.info(f"  Mois cibles : {[m['month_en'] for m in target_months]}")
 
-    if updates:
+    # 2. Compter les leads des mois cibles (lecture incrémentale du sheet leads)
+    from backend.common.services.leads_ingestion import read_leads_counts
+    counts_by_month = read_leads_counts(sheets_service, config, [(m["year"], m["month"]) for m in target_months])
+    results_by_month = _results_by_month(target_months, counts_by_month)
+
+    # 3. Écrire dans le sheet principal
+    headers_raw = sheets_service.get_values(f"'{worksheet_name}'!2:2") or [[]]
+    month_rows = sheets_service.get_values(f"'{worksheet_name}'!A3:A50")
+    updates = _leads_updates(worksheet_name, headers_raw, month_rows, results_by_month)
+
+    if updates and write_plan is not None:
+        write_plan.add(
+            worksheet_name, updates,
+            success_message=f"Leads {worksheet_name}: {len(updates)} cellules",
+            failure_label=f"Leads {worksheet_name}",
+        )
+        logging.info(f"  📝 {len(updates)} cellules planifiées pour '{worksheet_name}'")
+    elif updates:
         sheets_service.update_sheet_data(worksheet_name, updates)
         logging.info(f"  ✅ {len(updates)} cellules mises à jour dans '{worksheet_name}'")
     else:
@@ -346,6 +474,95 @@ def _scrape_leads_client(
     }
 
 
+def scrape_all_leads(
+    sheets_service,
+    reference_month: Optional[str] = None,
+    client_keys: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Scrape les leads de tous les clients LEADS_SHEETS en parallèle.
+
+    Les sheets sources sont lus simultanément (un client HTTP par thread, dans
+    la limite du quota Sheets), les en-têtes et mois de tous les onglets cibles
+    sont lus en un seul batchGet, puis toutes les cellules sont écrites en un
+    seul batchUpdate. Un onglet cible introuvable ou une écriture refusée ne
+    fait échouer que son client (relecture et réécriture onglet par onglet).
+
+    Returns:
+        Un résumé par client, dans l'ordre de LEADS_SHEETS. Un client en échec
+        a une clé "error" au lieu de "months" / "updates_count".
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from backend.common.services.google_sheets import SheetWritePlan
+    from backend.common.services.leads_ingestion import read_leads_counts
+
+    client_keys = list(client_keys or LEADS_SHEETS)
+    target_months = _get_target_months(reference_month)
+    months = [(m["year"], m["month"]) for m in target_months]
+    max_workers = max_workers or int(os.getenv("LEADS_MAX_WORKERS", "4"))
+    logging.info(f"📊 Scraping leads de {len(client_keys)} clients en parallèle, mois cibles : "
+                 f"{[m['month_en'] for m in target_months]}")
+
+    def in_parallel(func, *args):
+        with sheets_service.parallel_calls():
+            return func(*args)
+
+    def layout_ranges(client_key):
+        worksheet_name = LEADS_SHEETS[client_key]["worksheet_name"]
+        return [f"'{worksheet_name}'!2:2", f"'{worksheet_name}'!A3:A50"]
+
+    def read_layouts(keys):
+        return sheets_service.batch_get_values([r for client_key in keys for r in layout_ranges(client_key)])
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="leads") as executor:
+        layouts_future = executor.submit(in_parallel, read_layouts, client_keys)
+        count_futures = {
+            client_key: executor.submit(in_parallel, read_leads_counts, sheets_service, LEADS_SHEETS[client_key], months)
+            for client_key in client_keys
+        }
+        try:
+            layouts = layouts_future.result()
+            layout_futures = None
+        except Exception as e:
+            # Un onglet renommé ou absent fait échouer tout le batchGet : relecture par client
+            logging.warning(f"⚠️ Lecture groupée des onglets leads impossible ({e}), lecture client par client")
+            layout_futures = {
+                client_key: executor.submit(in_parallel, read_layouts, [client_key]) for client_key in client_keys
+            }
+
+        write_plan = SheetWritePlan()
+        results = []
+        for i, client_key in enumerate(client_keys):
+            worksheet_name = LEADS_SHEETS[client_key]["worksheet_name"]
+            try:
+                logging.info(f"📊 Leads '{client_key}' :")
+                results_by_month = _results_by_month(target_months, count_futures[client_key].result())
+                headers, month_rows = layout_futures[client_key].result() if layout_futures else layouts[2 * i:2 * i + 2]
+                updates = _leads_updates(worksheet_name, headers or [[]], month_rows, results_by_month)
+            except Exception as e:
+                logging.error(f"❌ Erreur scraping leads '{client_key}': {e}")
+                results.append({"client": worksheet_name, "error": str(e)})
+                continue
+            if not updates:
+                logging.warning(f"  ⚠️ Aucune ligne trouvée pour les mois cibles dans '{worksheet_name}'")
+            write_plan.add(
+                worksheet_name, updates,
+                success_message=f"Leads {worksheet_name}: {len(updates)} cellules",
+                failure_label=f"Leads {worksheet_name}",
+            )
+            results.append({"client": worksheet_name, "months": results_by_month, "updates_count": len(updates)})
+
+    _, failed = sheets_service.flush_write_plan(write_plan)
+    for message in failed:
+        logging.error(f"❌ {message}")
+        for result in results:
+            if message.startswith(f"Leads {result['client']}:"):
+                result["error"] = message
+    return results
+
+
 def scrape_leads_kozeo(
     sheets_service,
     reference_month: Optional[str] = None,
@@ -0,0 +1,211 @@
+"""
+Registre des mappings clients partagé par le process.
+
+Charge une seule fois client_allowlist.json, client_mappings.json et
+meta_mappings.json (via les services existants, mêmes valeurs par défaut)
+et précalcule les index : client → comptes, customer_id → onglet,
+compte Meta → onglet, onglet → client et onglet → config Google Analytics.
+Chaque instantané est immuable ; il est remplacé d'un bloc quand la date de
+modification d'un des fichiers change (édition manuelle ou add_mapping).
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from backend.config.settings import Config
+
+# Listes d'onglets indexées par instantané (une par Sheet lu récemment ; les anciens snapshots sortent en LRU)
+WORKSHEET_INDEX_CACHE_SIZE = 8
+
+
+def _source_paths() -> Tuple[str, ...]:
+    return (
+        str(Config.PATHS.CLIENT_ALLOWLIST_FILE),
+        str(Config.PATHS.CLIENT_MAPPINGS_FILE),
+        str(Config.PATHS.META_MAPPINGS_FILE),
+    )
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class _WorksheetIndex:
+    """Index onglet → client / config GA pour une liste d'onglets disponibles donnée"""
+
+    def __init__(self, clients: Dict[str, str], ga_configs: Dict[str, Dict[str, Any]]):
+        self.clients = clients
+        self.ga_configs = ga_configs
+
+
+class MappingRegistry:
+    """
+    Instantané immuable des mappings clients et de leurs index inverses.
+
+    La résolution client → onglet suit l'ordre historique : onglet du mapping
+    Google, puis du mapping Meta, puis nom du client, le premier présent dans
+    le Sheet l'emporte.
+    """
+
+    def __init__(
+        self,
+        allowlist: Iterable[str],
+        client_mappings: Dict[str, Dict[str, Any]],
+        google_sheets: Dict[str, str],
+        meta_sheets: Dict[str, str],
+        signatures: Tuple = (),
+    ):
+        self.allowlist = tuple(allowlist)
+        self._authorized = frozenset(self.allowlist)
+        self.client_mappings = MappingProxyType({
+            name: MappingProxyType(dict(mapping or {})) for name, mapping in client_mappings.items()
+        })
+        self.sheet_by_customer = MappingProxyType(dict(google_sheets))
+        self.sheet_by_account = MappingProxyType(dict(meta_sheets))
+        self.signatures = signatures
+
+        # client → onglets candidats, dans l'ordre de résolution
+        self._candidates: Dict[str, Tuple[str, ...]] = {}
+        for name in dict.fromkeys([*self.client_mappings, *self.allowlist]):
+            self._candidates[name] = self._build_candidates(name)
+
+        self._worksheet_indexes: "OrderedDict[frozenset, _WorksheetIndex]" = OrderedDict()
+        self._index_lock = threading.Lock()
+
+    def _build_candidates(self, client_name: str) -> Tuple[str, ...]:
+        candidates = []
+        accounts = self.client_accounts(client_name)
+        customer_id = (accounts["googleAds"] or {}).get("customerId")
+        if customer_id and self.sheet_by_customer.get(customer_id):
+            candidates.append(self.sheet_by_customer[customer_id])
+        account_id = (accounts["metaAds"] or {}).get("adAccountId")
+        if account_id and self.sheet_by_account.get(account_id):
+            candidates.append(self.sheet_by_account[account_id])
+        candidates.append(client_name)
+        return tuple(candidates)
+
+    def is_authorized(self, client_name: str) -> bool:
+        return client_name in self._authorized
+
+    def client_accounts(self, client_name: str) -> Dict[str, Any]:
+        """Comptes googleAds / metaAds / googleAnalytics d'un client (None si non autorisé)"""
+        mapping = self.client_mappings.get(client_name, {}) if self.is_authorized(client_name) else {}
+        return {
+            "googleAds": mapping.get("googleAds"),
+            "metaAds": mapping.get("metaAds"),
+            "googleAnalytics": mapping.get("googleAnalytics"),
+        }
+
+    def sheet_for_customer(self, customer_id: str) -> Optional[str]:
+        return self.sheet_by_customer.get(customer_id)
+
+    def sheet_for_account(self, ad_account_id: str) -> Optional[str]:
+        return self.sheet_by_account.get(ad_account_id)
+
+    def worksheet_for_client(self, client_name: str, available_sheets: Iterable[str]) -> Optional[str]:
+        """Onglet d'un client parmi les onglets disponibles (None si aucun)"""
+        available = available_sheets if isinstance(available_sheets, (set, frozenset)) else set(available_sheets)
+        candidates = self._candidates.get(client_name) or (client_name,)
+        return next((sheet for sheet in candidates if sheet in available), None)
+
+    def _worksheet_index(self, available_sheets: Iterable[str]) -> _WorksheetIndex:
+        """Index inverse calculé une fois par liste d'onglets (une par snapshot du Sheet)"""
+        key = frozenset(available_sheets)
+        with self._index_lock:
+            index = self._worksheet_indexes.get(key)
+            if index is not None:
+                self._worksheet_indexes.move_to_end(key)
+                return index
+
+        clients: Dict[str, str] = {}
+        ga_configs: Dict[str, Dict[str, Any]] = {}
+        # Ordre des mappings : le premier client résolu vers un onglet l'emporte
+        for client_name in self._candidates:
+            worksheet = self.worksheet_for_client(client_name, key)
+            if worksheet is None:
+                continue
+            clients.setdefault(worksheet, client_name)
+            ga_config = self.client_mappings.get(client_name, {}).get("googleAnalytics")
+            if ga_config:
+                ga_configs.setdefault(worksheet, ga_config)
+
+        index = _WorksheetIndex(clients, ga_configs)
+        with self._index_lock:
+            self._worksheet_indexes[key] = index
+            self._worksheet_indexes.move_to_end(key)
+            while len(self._worksheet_indexes) > WORKSHEET_INDEX_CACHE_SIZE:
+                self._worksheet_indexes.popitem(last=False)
+        return index
+
+    def client_for_worksheet(self, worksheet_name: str, available_sheets: Iterable[str]) -> Optional[str]:
+        return self._worksheet_index(available_sheets).clients.get(worksheet_name)
+
+    def ga_config_for_worksheet(self, worksheet_name: str, available_sheets: Iterable[str]) -> Optional[Dict[str, Any]]:
+        return self._worksheet_index(available_sheets).ga_configs.get(worksheet_name)
+
+    def ga_configs_by_worksheet(self, available_sheets: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        return dict(self._worksheet_index(available_sheets).ga_configs)
+
+
+def load_mapping_registry() -> MappingRegistry:
+    """Lit les trois fichiers de mapping (mêmes replis que les services en cas d'erreur)"""
+    from backend.common.services.client_resolver import ClientResolverService
+    from backend.google_ads_wrapper.utils.mappings import GoogleAdsMappingService
+    from backend.meta.utils.mappings import MetaAdsMappingService
+
+    signatures = tuple(_file_signature(path) for path in _source_paths())
+    resolver = ClientResolverService()
+    registry = MappingRegistry(
+        allowlist=resolver.allowlist,
+        client_mappings=resolver.mappings,
+        google_sheets=GoogleAdsMappingService().get_client_sheet_mapping(),
+        meta_sheets=MetaAdsMappingService().get_meta_client_mapping(),
+        signatures=signatures,
+    )
+    logging.info(
+        f"🗂️ Registre des mappings chargé : {len(registry.allowlist)} clients, "
+        f"{len(registry.sheet_by_customer)} comptes Google, {len(registry.sheet_by_account)} comptes Meta"
+    )
+    return registry
+
+
+# Intervalle minimal entre deux vérifications des dates de modification (secondes)
+RELOAD_CHECK_INTERVAL = 1.0
+
+_registry: Optional[MappingRegistry] = None
+_last_check = 0.0
+_registry_lock = threading.Lock()
+
+
+def get_mapping_registry() -> MappingRegistry:
+    """Registre courant du process, rechargé si un fichier de mapping a changé"""
+    global _registry, _last_check
+    now = time.monotonic()
+    registry = _registry
+    if registry is not None and now - _last_check < RELOAD_CHECK_INTERVAL:
+        return registry
+
+    with _registry_lock:
+        signatures = tuple(_file_signature(path) for path in _source_paths())
+        if _registry is None or _registry.signatures != signatures:
+            if _registry is not None:
+                logging.info("🔄 Fichier de mapping modifié : rechargement du registre")
+            _registry = load_mapping_registry()
+        _last_check = time.monotonic()
+        return _registry
+
+
+def reset_mapping_registry() -> None:
+    """Force le rechargement au prochain accès"""
+    global _registry
+    with _registry_lock:
+        _registry = None
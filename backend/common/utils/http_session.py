@@ -0,0 +1,97 @@
+"""
+Session HTTP partagée (keep-alive, pool de connexions) pour les appels Meta et les téléchargements de médias
+
+Le pool est bloquant : au plus POOL_MAXSIZE connexions simultanées par hôte, une
+requête de plus attend qu'une connexion se libère. Une réponse lue en flux
+(stream=True) garde sa connexion jusqu'à sa fermeture (MediaStream.close()).
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Nombre d'hôtes gardés en pool (graph.facebook.com, CDN Meta/Google...)
+POOL_CONNECTIONS = 16
+# Connexions simultanées par hôte (≈ nombre de threads d'export simultanés), HTTP_POOL_MAXSIZE
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "32"))
+
+_session: Optional[requests.Session] = None
+_adapter: Optional[HTTPAdapter] = None
+_session_lock = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    global _adapter
+    _adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, pool_block=True)
+    session = requests.Session()
+    session.mount("https://", _adapter)
+    session.mount("http://", _adapter)
+    session.headers.update({
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+    })
+    logging.info(f"🌐 Session HTTP partagée créée (pool {POOL_CONNECTIONS} hôtes x {POOL_MAXSIZE} connexions)")
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """
+    Session requests unique pour le process.
+
+    Les connexions TLS vers un même hôte sont réutilisées entre services et entre threads
+    (requests.Session est utilisable depuis plusieurs threads pour des requêtes simples).
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _build_session()
+        return _session
+
+
+def get_http_session_stats() -> Dict[str, Any]:
+    """
+    Compteurs de réutilisation des connexions, par hôte.
+
+    requests = requêtes envoyées, connections = connexions ouvertes ;
+    la différence correspond aux requêtes servies par une connexion keep-alive.
+    """
+    with _session_lock:
+        adapter = _adapter
+    if adapter is None:
+        return {"hosts": {}, "requests": 0, "connections": 0, "reused": 0, "reuse_ratio": 0.0}
+
+    pools = adapter.poolmanager.pools
+    hosts = {}
+    for key in list(pools.keys()):
+        pool = pools.get(key)
+        if pool is None:
+            continue
+        host = f"{pool.scheme}://{pool.host}"
+        stats = hosts.setdefault(host, {"requests": 0, "connections": 0})
+        stats["requests"] += pool.num_requests
+        stats["connections"] += pool.num_connections
+
+    total_requests = sum(s["requests"] for s in hosts.values())
+    total_connections = sum(s["connections"] for s in hosts.values())
+    reused = max(total_requests - total_connections, 0)
+    return {
+        "hosts": hosts,
+        "requests": total_requests,
+        "connections": total_connections,
+        "reused": reused,
+        "reuse_ratio": round(reused / total_requests, 3) if total_requests else 0.0,
+    }
+
+
+def reset_http_session() -> None:
+    """Ferme la session partagée (elle sera recréée au prochain appel)"""
+    global _session, _adapter
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _adapter = None
@@ -0,0 +1,153 @@
+"""
+Transfert en flux des médias créatifs : corps HTTP → upload Drive résumable par blocs.
+
+Le corps de la réponse (requests, stream=True) est lu par blocs de READ_SIZE octets
+et envoyé à Drive par blocs de upload_chunk_size() octets : la mémoire utilisée par
+fichier est bornée par la taille de bloc, pas par la taille du fichier.
+"""
+
+import os
+from typing import Optional
+
+from googleapiclient.http import MediaUpload
+
+# Taille des lectures sur le corps HTTP
+READ_SIZE = 256 * 1024
+
+# Les blocs d'un upload résumable Drive doivent être des multiples de 256 Kio
+_DRIVE_CHUNK_UNIT = 256 * 1024
+
+
+def upload_chunk_size() -> int:
+    """Taille des blocs envoyés à Drive (DRIVE_UPLOAD_CHUNK_MB, 8 Mo par défaut)"""
+    size = int(float(os.getenv("DRIVE_UPLOAD_CHUNK_MB", "8")) * 1024 * 1024)
+    return max(_DRIVE_CHUNK_UNIT, size // _DRIVE_CHUNK_UNIT * _DRIVE_CHUNK_UNIT)
+
+
+def guess_media_extension(url: str, content_type: str) -> Optional[str]:
+    """Extension avec point (ex: '.jpg') d'après le Content-Type ou l'URL"""
+    if 'image/jpeg' in content_type or url.endswith('.jpg') or url.endswith('.jpeg'):
+        return '.jpg'
+    if 'image/png' in content_type or url.endswith('.png'):
+        return '.png'
+    if 'image/gif' in content_type or url.endswith('.gif'):
+        return '.gif'
+    if 'video/mp4' in content_type or url.endswith('.mp4'):
+        return '.mp4'
+    if 'video/quicktime' in content_type or url.endswith('.mov'):
+        return '.mov'
+    if 'video' in content_type:
+        return '.mp4'  # Par défaut pour les vidéos
+    # Essayer d'extraire depuis l'URL (seulement si ça ressemble à une extension valide)
+    if '.' in url:
+        potential_ext = url.split('.')[-1].split('?')[0].split('/')[0][:4]
+        if potential_ext.lower() in ['jpg', 'jpeg', 'png', 'gif', 'mp4', 'mov', 'webp']:
+            return f'.{potential_ext.lower()}'
+        return '.jpg'  # Par défaut
+    return None
+
+
+class MediaStream:
+    """Réponse HTTP ouverte en flux (corps non lu), à fermer après usage"""
+
+    def __init__(self, response, url: str):
+        self.response = response
+        self.url = url
+        self.content_type = response.headers.get('Content-Type', '')
+        self.extension = guess_media_extension(url, self.content_type)
+        # Content-Length ne donne la taille du média que sans compression de transport
+        content_length = response.headers.get('Content-Length')
+        encoded = response.headers.get('Content-Encoding', 'identity') not in ('', 'identity')
+        self.size = int(content_length) if content_length and content_length.isdigit() and not encoded else None
+        self.etag = response.headers.get('ETag') or None
+        self.last_modified = response.headers.get('Last-Modified') or None
+        self.bytes_read = 0
+        self._blocks = response.iter_content(chunk_size=READ_SIZE)
+
+    def read_block(self) -> bytes:
+        """Bloc suivant du corps (b'' en fin de flux)"""
+        for block in self._blocks:
+            if block:
+                self.bytes_read += len(block)
+                return block
+        return b''
+
+    def read_all(self) -> bytes:
+        data = bytearray()
+        while True:
+            block = self.read_block()
+            if not block:
+                return bytes(data)
+            data += block
+
+    def close(self) -> None:
+        self.response.close()
+
+    def __enter__(self) -> "MediaStream":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class StreamingMediaUpload(MediaUpload):
+    """
+    Média d'upload résumable alimenté par un MediaStream.
+
+    Seuls le bloc en cours et le bloc suivant sont gardés en mémoire (reprise
+    possible depuis le début du bloc en cours si Drive n'en a reçu qu'une partie).
+    Sans Content-Length, la fin du flux est anticipée d'un octet pour que le
+    dernier bloc annonce la taille totale.
+    """
+
+    def __init__(self, stream: MediaStream, mimetype: str, chunksize: Optional[int] = None):
+        super().__init__()
+        self._stream = stream
+        self._mimetype = mimetype
+        self._chunksize = chunksize or upload_chunk_size()
+        self._size = stream.size
+        self._buffer = bytearray()
+        self._buffer_start = 0
+        self._next_begin = 0
+        self._eof = False
+        self.peak_buffer = 0
+
+    def chunksize(self) -> int:
+        return self._chunksize
+
+    def mimetype(self) -> str:
+        return self._mimetype
+
+    def resumable(self) -> bool:
+        return True
+
+    def has_stream(self) -> bool:
+        return False
+
+    def size(self) -> Optional[int]:
+        if self._size is None:
+            self._fill(self._next_begin - self._buffer_start + self._chunksize + 1)
+        return self._size
+
+    def getbytes(self, begin: int, length: int) -> bytes:
+        if begin < self._buffer_start:
+            raise ValueError(f"Reprise impossible à l'octet {begin} : flux déjà consommé jusqu'à {self._buffer_start}")
+        del self._buffer[:begin - self._buffer_start]
+        self._buffer_start = begin
+        self._fill(length)
+        data = bytes(self._buffer[:length])
+        self._next_begin = begin + len(data)
+        return data
+
+    def _fill(self, length: int) -> None:
+        while len(self._buffer) < length and not self._eof:
+            block = self._stream.read_block()
+            if not block:
+                self._eof = True
+                self._size = self._buffer_start + len(self._buffer)
+                break
+            self._buffer += block
+            self.peak_buffer = max(self.peak_buffer, len(self._buffer))
+
+    def to_json(self):
+        raise NotImplementedError("Un flux HTTP n'est pas sérialisable")
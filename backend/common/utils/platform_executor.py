@@ -0,0 +1,132 @@
+"""
+Exécution parallèle des étapes plateformes d'un export (Google Ads, Meta, GA4, leads)
+
+Un thread ne peut pas être interrompu : une étape qui dépasse sa deadline continue
+de tourner jusqu'à son prochain appel API. Les services appellent
+check_stage_deadline() avant chaque requête (Sheets, Google Ads, GA4, Meta) : une
+étape abandonnée s'arrête donc au plus tard à la fin de la requête en cours, sans
+consommer de quota ni prendre le verrou API Sheets pendant le flush.
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Any, Callable, Dict, List, Optional
+
+
+class StageCancelledError(Exception):
+    """Étape plateforme abandonnée (deadline dépassée) : plus d'appel API à faire"""
+
+
+class _StageBudget:
+    def __init__(self, platform: str, deadline_at: float):
+        self.platform = platform
+        self.deadline_at = deadline_at
+        self.cancelled = threading.Event()
+
+
+# Budget de l'étape plateforme en cours dans le contexte courant (None hors étape)
+_current_stage: contextvars.ContextVar[Optional[_StageBudget]] = contextvars.ContextVar("current_stage", default=None)
+
+
+def stage_time_remaining() -> Optional[float]:
+    """Secondes restantes avant la deadline de l'étape en cours (None hors étape)"""
+    stage = _current_stage.get()
+    if stage is None:
+        return None
+    if stage.cancelled.is_set():
+        return 0.0
+    return max(0.0, stage.deadline_at - time.monotonic())
+
+
+def check_stage_deadline() -> None:
+    """À appeler avant chaque appel API : lève StageCancelledError si l'étape en cours est abandonnée"""
+    remaining = stage_time_remaining()
+    if remaining is not None and remaining <= 0:
+        raise StageCancelledError(f"Étape '{_current_stage.get().platform}' abandonnée (deadline dépassée)")
+
+
+class PlatformStageExecutor:
+    """
+    Lance les étapes de récupération des plateformes en parallèle sur un pool borné.
+
+    Chaque étape a sa propre deadline, comptée depuis la création de l'exécuteur.
+    collect() renvoie les résultats dans l'ordre de soumission, pour que la phase
+    d'écriture qui suit reste déterministe quel que soit l'ordre de fin des étapes.
+
+    on_progress(platform, status, **details) est appelé au début et à la fin de chaque
+    étape ; les étapes s'exécutent dans le contexte (contextvars) de l'appelant.
+
+    Une étape en retard est marquée abandonnée et son résultat ignoré : son thread
+    s'arrête au prochain check_stage_deadline() (voir le docstring du module).
+    """
+
+    def __init__(self, max_workers: int = 4, on_progress: Optional[Callable[..., None]] = None):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="platform-stage")
+        self._stages: List[Dict[str, Any]] = []
+        self._started_at = time.monotonic()
+        self._on_progress = on_progress
+
+    def submit(self, platform: str, func: Callable[[], Any], deadline: float) -> None:
+        """Soumet une étape (fonction sans argument) avec sa deadline en secondes."""
+        context = contextvars.copy_context()
+        budget = _StageBudget(platform, self._started_at + deadline)
+        future = self._executor.submit(context.run, self._run_timed, platform, func, budget)
+        self._stages.append({"platform": platform, "future": future, "deadline": deadline, "budget": budget})
+
+    def collect(self) -> List[Dict[str, Any]]:
+        """
+        Attend chaque étape jusqu'à sa deadline.
+
+        Returns:
+            Liste de dicts {platform, status ('ok' | 'timeout' | 'error'), result, error, duration}
+        """
+        results = []
+        try:
+            for stage in self._stages:
+                platform = stage["platform"]
+                remaining = max(0.0, self._started_at + stage["deadline"] - time.monotonic())
+                try:
+                    value, duration = stage["future"].result(timeout=remaining)
+                    results.append({"platform": platform, "status": "ok", "result": value,
+                                    "error": None, "duration": duration})
+                except FuturesTimeoutError:
+                    stage["future"].cancel()
+                    stage["budget"].cancelled.set()
+                    logging.error(f"⏱️ Étape '{platform}' abandonnée après {stage['deadline']}s")
+                    self._report(platform, "timeout")
+                    results.append({"platform": platform, "status": "timeout", "result": None,
+                                    "error": f"Timeout ({stage['deadline']}s)", "duration": stage["deadline"]})
+                except Exception as e:
+                    logging.error(f"❌ Étape '{platform}' en erreur: {e}")
+                    results.append({"platform": platform, "status": "error", "result": None,
+                                    "error": str(e), "duration": time.monotonic() - self._started_at})
+        finally:
+            # Ne pas bloquer la requête sur une étape en retard : son résultat est ignoré
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        return results
+
+    def _report(self, platform: str, status: str, **details) -> None:
+        if self._on_progress is not None:
+            self._on_progress(platform, status, **details)
+
+    def _run_timed(self, platform: str, func: Callable[[], Any], budget: _StageBudget):
+        _current_stage.set(budget)
+        self._report(platform, "running")
+        start_time = time.monotonic()
+        try:
+            value = func()
+        except Exception:
+            if not budget.cancelled.is_set():
+                self._report(platform, "error")
+            raise
+        duration = time.monotonic() - start_time
+        if budget.cancelled.is_set():
+            # Étape déjà rapportée en timeout : son résultat tardif est ignoré
+            logging.warning(f"⏱️ Étape '{platform}' terminée après abandon ({duration:.2f}s), résultat ignoré")
+            return value, duration
+        logging.info(f"Étape '{platform}' terminée en {duration:.2f}s")
+        self._report(platform, "ok", duration=round(duration, 2))
+        return value, duration
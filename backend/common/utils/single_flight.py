@@ -0,0 +1,69 @@
+"""
+Cache mémoire à chargement unique par clé (single-flight), avec durée de vie.
+
+Le verrou ne protège que la table des entrées : le chargement d'une clé se fait
+hors verrou. Les appelants concurrents d'une même clé attendent le chargement en
+cours au lieu de le refaire, et une clé lente ne bloque pas les autres.
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class SingleFlightCache:
+    """Valeurs mémorisées par clé pendant `ttl` secondes, chargées une seule fois"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[Hashable, dict] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, loader: Callable[[], Any], keep: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Valeur de `key`, chargée par `loader()` si absente ou expirée.
+
+        Args:
+            keep: si fourni et faux pour la valeur chargée (ex: échec rendu en None),
+                la valeur est rendue aux appelants en attente mais pas mémorisée
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            # Une entrée en cours de chargement (loaded_at None) n'expire pas
+            expired = entry is not None and entry["loaded_at"] is not None \
+                and time.monotonic() - entry["loaded_at"] > self.ttl
+            owner = entry is None or expired
+            if owner:
+                entry = {"future": Future(), "loaded_at": None}
+                self._entries[key] = entry
+
+        if not owner:
+            return entry["future"].result()
+
+        try:
+            value = loader()
+        except BaseException as e:
+            self._discard(key, entry)
+            entry["future"].set_exception(e)
+            raise
+        if keep is None or keep(value):
+            entry["loaded_at"] = time.monotonic()
+        else:
+            self._discard(key, entry)
+        entry["future"].set_result(value)
+        return value
+
+    def _discard(self, key: Hashable, entry: dict) -> None:
+        with self._lock:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+
+    def clear(self, predicate: Optional[Callable[[Hashable], bool]] = None) -> None:
+        """Oublie toutes les entrées, ou celles dont la clé vérifie `predicate`"""
+        with self._lock:
+            if predicate is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if predicate(k)]:
+                    del self._entries[key]
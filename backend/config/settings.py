@@ -73,12 +73,32 @@ class PathConfig:
     """Configuration des chemins"""
     
     # Fichiers de mapping
+    CLIENT_ALLOWLIST_FILE = CONFIG_DIR / "client_allowlist.json"
     CLIENT_MAPPINGS_FILE = CONFIG_DIR / "client_mappings.json"
     META_MAPPINGS_FILE = CONFIG_DIR / "meta_mappings.json"
+    CONVERSION_RULES_FILE = CONFIG_DIR / "conversion_rules.json"
     
     # Répertoire d'export
     EXPORTS_DIR = BASE_DIR / "exports"
 
+    # Cache disque des graphiques rendus (PNG indexés par hash du contenu)
+    CHART_CACHE_DIR = Path(os.getenv("CHART_CACHE_DIR", str(EXPORTS_DIR / "chart_cache")))
+
+    # File de jobs asynchrones (SQLite, doit survivre au recyclage des workers)
+    JOBS_DB_FILE = Path(os.getenv("JOBS_DB_PATH", str(EXPORTS_DIR / "jobs.sqlite3")))
+
+    # État de lecture incrémentale des sheets leads (agrégats mensuels + dernière ligne lue)
+    LEADS_STATE_DIR = Path(os.getenv("LEADS_STATE_DIR", str(EXPORTS_DIR / "leads_state")))
+
+    # Cache des IDs de dossiers Drive (parent + nom → ID)
+    DRIVE_FOLDER_CACHE_FILE = Path(os.getenv("DRIVE_FOLDER_CACHE_PATH", str(EXPORTS_DIR / "drive_folders.json")))
+
+    # Index des médias déjà sur Drive (sha256 → ID de fichier) pour la déduplication des exports
+    DRIVE_MEDIA_INDEX_FILE = Path(os.getenv("DRIVE_MEDIA_INDEX_PATH", str(EXPORTS_DIR / "drive_media_index.json")))
+
+    # Statistiques kaleido publiées par les process de rendu (un fichier par pid) pour /concurrency-status
+    PLOTLY_STATS_DIR = Path(os.getenv("PLOTLY_STATS_DIR", str(EXPORTS_DIR / "plotly_renderer")))
+
 # Classe principale de configuration
 class Config:
     """Configuration principale - Point d'accès unique"""
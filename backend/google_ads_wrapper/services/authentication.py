@@ -7,6 +7,7 @@ from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 
 from backend.config.settings import Config
+from backend.common.utils.platform_executor import check_stage_deadline
 
 class GoogleAdsAuthService:
     """Service pour gérer l'authentification Google Ads"""
@@ -41,6 +42,7 @@ class GoogleAdsAuthService:
         Returns:
             Résultats de la requête
         """
+        check_stage_deadline()
         try:
             ga_service = self.client.get_service("GoogleAdsService")
             response = ga_service.search(customer_id=customer_id, query=query)
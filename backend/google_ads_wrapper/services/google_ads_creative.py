@@ -9,6 +9,9 @@ from typing import Dict, List, Any, Optional, Tuple
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 
+from backend.common.utils.http_session import get_http_session
+from backend.common.utils.media_stream import MediaStream
+
 class GoogleAdsCreativeService:
     """Service pour gérer la récupération du contenu créatif Google Ads"""
     
@@ -96,6 +99,251 @@ class GoogleAdsCreativeService:
             logging.error(traceback.format_exc())
             return []
 
+    def get_customer_ads(self, customer_id: str, campaigns: List[Dict[str, Any]]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Récupère les annonces de toutes les campagnes d'un client en un nombre
+        fixe de requêtes search_stream (filtrées par campaign.id IN (...)),
+        regroupées en mémoire par campagne. Même résultat que get_campaign_ads
+        appelé campagne par campagne, sans requête par campagne.
+
+        Args:
+            customer_id: ID du client Google Ads
+            campaigns: Campagnes ({id, type}) issues de get_active_campaigns
+
+        Returns:
+            Dictionnaire {ID de campagne: liste des annonces}
+        """
+        pmax_ids = [c['id'] for c in campaigns if c.get('type') == 'PERFORMANCE_MAX']
+        search_ids = [c['id'] for c in campaigns if c.get('type') == 'SEARCH']
+        standard_ids = [c['id'] for c in campaigns if c.get('type') != 'PERFORMANCE_MAX']
+
+        ads_by_campaign = {c['id']: [] for c in campaigns}
+        ga_service = self.client.get_service("GoogleAdsService")
+
+        # 1. Performance Max : Asset Groups puis leurs assets
+        if pmax_ids:
+            try:
+                asset_groups = {campaign_id: {} for campaign_id in pmax_ids}
+                for row in self._stream_rows(ga_service, customer_id, f"""
+                    SELECT
+                        campaign.id,
+                        asset_group.id,
+                        asset_group.name,
+                        asset_group.status,
+                        asset_group.final_urls
+                    FROM asset_group
+                    WHERE campaign.id IN ({self._id_list(pmax_ids)})
+                        AND asset_group.status = 'ENABLED'
+                """):
+                    asset_groups[row.campaign.id][row.asset_group.id] = self._asset_group_entry(row)
+
+                if any(asset_groups.values()):
+                    for row in self._stream_rows(ga_service, customer_id, f"""
+                        SELECT
+                            campaign.id,
+                            asset_group.id,
+                            asset.id,
+                            asset.type,
+                            asset_group_asset.field_type,
+                            asset.image_asset.full_size.url,
+                            asset.youtube_video_asset.youtube_video_id,
+                            asset.text_asset.text
+                        FROM asset_group_asset
+                        WHERE campaign.id IN ({self._id_list(pmax_ids)})
+                            AND asset_group_asset.status = 'ENABLED'
+                    """):
+                        self._add_asset_group_asset(asset_groups.get(row.campaign.id, {}), row)
+
+                for campaign_id, groups in asset_groups.items():
+                    ads_by_campaign[campaign_id] = list(groups.values())
+            except Exception as e:
+                logging.error(f"❌ Erreur PMax pour {len(pmax_ids)} campagnes de {customer_id}: {e}")
+
+        # 2. Annonces standards (Search, Display, Video...) puis leurs assets
+        if standard_ids:
+            try:
+                ads_maps = {campaign_id: {} for campaign_id in standard_ids}
+                for row in self._stream_rows(ga_service, customer_id, f"""
+                    SELECT
+                        campaign.id,
+                        ad_group.id,
+                        ad_group.name,
+                        ad_group_ad.ad.id,
+                        ad_group_ad.ad.name,
+                        ad_group_ad.ad.type,
+                        ad_group_ad.ad.final_urls,
+                        ad_group_ad.ad.responsive_search_ad.headlines,
+                        ad_group_ad.ad.responsive_search_ad.descriptions,
+                        ad_group_ad.ad.responsive_display_ad.headlines,
+                        ad_group_ad.ad.responsive_display_ad.descriptions,
+                        ad_group_ad.status
+                    FROM ad_group_ad
+                    WHERE campaign.id IN ({self._id_list(standard_ids)})
+                        AND ad_group_ad.status = 'ENABLED'
+                    ORDER BY ad_group.name, ad_group_ad.ad.id
+                """):
+                    ads_maps[row.campaign.id][row.ad_group_ad.ad.id] = self._ad_entry(row)
+
+                if any(ads_maps.values()):
+                    try:
+                        for row in self._stream_rows(ga_service, customer_id, f"""
+                            SELECT
+                                campaign.id,
+                                ad_group_ad.ad.id,
+                                asset.id,
+                                asset.type,
+                                asset.image_asset.full_size.url,
+                                asset.youtube_video_asset.youtube_video_id
+                            FROM ad_group_ad_asset_view
+                            WHERE campaign.id IN ({self._id_list(standard_ids)})
+                              AND ad_group_ad.status = 'ENABLED'
+                        """):
+                            self._add_ad_asset(ads_maps.get(row.campaign.id, {}), row)
+                    except Exception as e:
+                        logging.warning(f"⚠️ Erreur récupération assets enrichis standard: {e}")
+
+                for campaign_id, ads_map in ads_maps.items():
+                    ads_by_campaign[campaign_id] = list(ads_map.values())
+            except Exception as e:
+                logging.error(f"❌ Erreur standard ads pour {len(standard_ids)} campagnes de {customer_id}: {e}")
+
+        # 3. Extensions d'image des campagnes Search ayant des annonces
+        search_with_ads = [campaign_id for campaign_id in search_ids if ads_by_campaign[campaign_id]]
+        if search_with_ads:
+            try:
+                extension_images = {campaign_id: [] for campaign_id in search_with_ads}
+                for row in self._stream_rows(ga_service, customer_id, f"""
+                    SELECT
+                        campaign.id,
+                        asset.id,
+                        asset.image_asset.full_size.url
+                    FROM campaign_asset
+                    WHERE campaign.id IN ({self._id_list(search_with_ads)})
+                        AND asset.type = 'IMAGE'
+                        AND campaign_asset.status = 'ENABLED'
+                """):
+                    if row.asset.image_asset.full_size.url:
+                        extension_images[row.campaign.id].append(row.asset.image_asset.full_size.url)
+
+                for campaign_id, images in extension_images.items():
+                    self._add_extension_images(ads_by_campaign[campaign_id], images)
+            except Exception as e:
+                logging.warning(f"⚠️ Erreur récupération extensions Search pour {customer_id}: {e}")
+
+        total_ads = sum(len(ads) for ads in ads_by_campaign.values())
+        logging.info(f"📊 {total_ads} annonces récupérées pour {len(campaigns)} campagnes de {customer_id} (extraction groupée)")
+        return ads_by_campaign
+
+    @staticmethod
+    def _stream_rows(ga_service, customer_id: str, query: str):
+        """Lignes d'une requête search_stream (tous les lots)"""
+        for batch in ga_service.search_stream(customer_id=customer_id, query=query):
+            yield from batch.results
+
+    @staticmethod
+    def _id_list(campaign_ids: List[int]) -> str:
+        return ", ".join(str(int(campaign_id)) for campaign_id in campaign_ids)
+
+    @staticmethod
+    def _asset_group_entry(row) -> Dict[str, Any]:
+        ag_id = row.asset_group.id
+        return {
+            "ad_group_id": ag_id, # On utilise l'ID asset group comme ad_group_id
+            "ad_group_name": row.asset_group.name,
+            "ad_id": ag_id,
+            "ad_name": f"Asset Group: {row.asset_group.name}",
+            "ad_type": "PERFORMANCE_MAX",
+            "final_urls": list(row.asset_group.final_urls) if row.asset_group.final_urls else [],
+            "headlines": [],
+            "descriptions": [],
+            "images": [],
+            "videos": []
+        }
+
+    @staticmethod
+    def _add_asset_group_asset(asset_groups: Dict[int, Dict[str, Any]], row) -> None:
+        ag_id = row.asset_group.id
+        if ag_id not in asset_groups:
+            return
+
+        asset = row.asset
+        field_type = row.asset_group_asset.field_type.name
+        # field_type peut être HEADLINE, DESCRIPTION, MARKETING_IMAGE, LOGO, YOUTUBE_VIDEO, etc.
+
+        if asset.type_.name == "IMAGE" and asset.image_asset.full_size.url:
+            asset_groups[ag_id]["images"].append(asset.image_asset.full_size.url)
+
+        elif asset.type_.name == "YOUTUBE_VIDEO" and asset.youtube_video_asset.youtube_video_id:
+            # Pour YouTube, on stocke l'ID et l'URL de la vidéo (pas téléchargeable directement)
+            video_id = asset.youtube_video_asset.youtube_video_id
+            youtube_url = f"https://www.youtube.com/watch?v={video_id}"
+            # Stocker l'URL YouTube dans un champ séparé
+            if "youtube_videos" not in asset_groups[ag_id]:
+                asset_groups[ag_id]["youtube_videos"] = []
+            asset_groups[ag_id]["youtube_videos"].append({
+                "id": video_id,
+                "url": youtube_url,
+                "thumbnail": f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
+            })
+
+        elif asset.type_.name == "TEXT" and asset.text_asset.text:
+            if "HEADLINE" in field_type:
+                asset_groups[ag_id]["headlines"].append(asset.text_asset.text)
+            elif "DESCRIPTION" in field_type:
+                asset_groups[ag_id]["descriptions"].append(asset.text_asset.text)
+
+    @staticmethod
+    def _ad_entry(row) -> Dict[str, Any]:
+        ad_id = row.ad_group_ad.ad.id
+
+        ad_data = {
+            "ad_group_id": row.ad_group.id,
+            "ad_group_name": row.ad_group.name,
+            "ad_id": ad_id,
+            "ad_name": row.ad_group_ad.ad.name if row.ad_group_ad.ad.name else f"Ad_{ad_id}",
+            "ad_type": row.ad_group_ad.ad.type_.name,
+            "final_urls": list(row.ad_group_ad.ad.final_urls) if row.ad_group_ad.ad.final_urls else [],
+            "headlines": [],
+            "descriptions": [],
+            "images": [],
+            "videos": []
+        }
+
+        # Textes
+        if row.ad_group_ad.ad.type_.name == "RESPONSIVE_SEARCH_AD":
+            ad_data["headlines"] = [h.text for h in row.ad_group_ad.ad.responsive_search_ad.headlines]
+            ad_data["descriptions"] = [d.text for d in row.ad_group_ad.ad.responsive_search_ad.descriptions]
+        elif row.ad_group_ad.ad.type_.name == "RESPONSIVE_DISPLAY_AD":
+            ad_data["headlines"] = [h.text for h in row.ad_group_ad.ad.responsive_display_ad.headlines]
+            ad_data["descriptions"] = [d.text for d in row.ad_group_ad.ad.responsive_display_ad.descriptions]
+        return ad_data
+
+    @staticmethod
+    def _add_ad_asset(ads_map: Dict[int, Dict[str, Any]], row) -> None:
+        ad_id = row.ad_group_ad.ad.id
+        if ad_id not in ads_map:
+            return
+
+        asset_type = row.asset.type_.name
+
+        if asset_type == "IMAGE":
+            if row.asset.image_asset.full_size.url:
+                ads_map[ad_id]["images"].append(row.asset.image_asset.full_size.url)
+
+        elif asset_type == "YOUTUBE_VIDEO":
+            if row.asset.youtube_video_asset.youtube_video_id:
+                video_url = f"https://www.youtube.com/watch?v={row.asset.youtube_video_asset.youtube_video_id}"
+                ads_map[ad_id]["videos"].append(video_url)
+
+    @staticmethod
+    def _add_extension_images(ads: List[Dict[str, Any]], extension_images: List[str]) -> None:
+        if extension_images:
+            logging.info(f"🖼️ {len(extension_images)} extensions d'image trouvées pour la campagne Search")
+            # On ajoute ces images à TOUTES les annonces de la campagne
+            # C'est une approximation, mais pour un rapport créatif c'est pertinent
+            for ad in ads:
+                ad["images"].extend(extension_images)
+
     def _get_pmax_assets(self, customer_id: str, campaign_id: int) -> List[Dict[str, Any]]:
         """Récupère les Asset Groups pour les campagnes Performance Max"""
         try:
@@ -117,19 +365,7 @@ class GoogleAdsCreativeService:
             
             asset_groups = {}
             for row in response_groups:
-                ag_id = row.asset_group.id
-                asset_groups[ag_id] = {
-                    "ad_group_id": ag_id, # On utilise l'ID asset group comme ad_group_id
-                    "ad_group_name": row.asset_group.name,
-                    "ad_id": ag_id,
-                    "ad_name": f"Asset Group: {row.asset_group.name}",
-                    "ad_type": "PERFORMANCE_MAX",
-                    "final_urls": list(row.asset_group.final_urls) if row.asset_group.final_urls else [],
-                    "headlines": [],
-                    "descriptions": [],
-                    "images": [],
-                    "videos": []
-                }
+                asset_groups[row.asset_group.id] = self._asset_group_entry(row)
             
             if not asset_groups:
                 logging.info(f"ℹ️ Aucun Asset Group trouvé pour la campagne PMax {campaign_id}")
@@ -153,35 +389,7 @@ class GoogleAdsCreativeService:
             response_assets = ga_service.search(customer_id=customer_id, query=query_assets)
             
             for row in response_assets:
-                ag_id = row.asset_group.id
-                if ag_id not in asset_groups:
-                    continue
-                    
-                asset = row.asset
-                field_type = row.asset_group_asset.field_type.name 
-                # field_type peut être HEADLINE, DESCRIPTION, MARKETING_IMAGE, LOGO, YOUTUBE_VIDEO, etc.
-                
-                if asset.type_.name == "IMAGE" and asset.image_asset.full_size.url:
-                    asset_groups[ag_id]["images"].append(asset.image_asset.full_size.url)
-                    
-                elif asset.type_.name == "YOUTUBE_VIDEO" and asset.youtube_video_asset.youtube_video_id:
-                    # Pour YouTube, on stocke l'ID et l'URL de la vidéo (pas téléchargeable directement)
-                    video_id = asset.youtube_video_asset.youtube_video_id
-                    youtube_url = f"https://www.youtube.com/watch?v={video_id}"
-                    # Stocker l'URL YouTube dans un champ séparé
-                    if "youtube_videos" not in asset_groups[ag_id]:
-                        asset_groups[ag_id]["youtube_videos"] = []
-                    asset_groups[ag_id]["youtube_videos"].append({
-                        "id": video_id,
-                        "url": youtube_url,
-                        "thumbnail": f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
-                    })
-                    
-                elif asset.type_.name == "TEXT" and asset.text_asset.text:
-                    if "HEADLINE" in field_type:
-                        asset_groups[ag_id]["headlines"].append(asset.text_asset.text)
-                    elif "DESCRIPTION" in field_type:
-                        asset_groups[ag_id]["descriptions"].append(asset.text_asset.text)
+                self._add_asset_group_asset(asset_groups, row)
             
             return list(asset_groups.values())
             
@@ -214,17 +422,9 @@ class GoogleAdsCreativeService:
             
             response_ext = ga_service.search(customer_id=customer_id, query=query_ext)
             
-            extension_images = []
-            for row in response_ext:
-                if row.asset.image_asset.full_size.url:
-                    extension_images.append(row.asset.image_asset.full_size.url)
-            
-            if extension_images:
-                logging.info(f"🖼️ {len(extension_images)} extensions d'image trouvées pour la campagne Search")
-                # On ajoute ces images à TOUTES les annonces de la campagne
-                # C'est une approximation, mais pour un rapport créatif c'est pertinent
-                for ad in ads:
-                    ad["images"].extend(extension_images)
+            extension_images = [row.asset.image_asset.full_size.url for row in response_ext
+                                if row.asset.image_asset.full_size.url]
+            self._add_extension_images(ads, extension_images)
             
         except Exception as e:
             logging.warning(f"⚠️ Erreur récupération extensions Search pour {campaign_id}: {e}")
@@ -259,30 +459,7 @@ class GoogleAdsCreativeService:
             
             ads_map = {}
             for row in response_ads:
-                ad_id = row.ad_group_ad.ad.id
-                
-                ad_data = {
-                    "ad_group_id": row.ad_group.id,
-                    "ad_group_name": row.ad_group.name,
-                    "ad_id": ad_id,
-                    "ad_name": row.ad_group_ad.ad.name if row.ad_group_ad.ad.name else f"Ad_{ad_id}",
-                    "ad_type": row.ad_group_ad.ad.type_.name,
-                    "final_urls": list(row.ad_group_ad.ad.final_urls) if row.ad_group_ad.ad.final_urls else [],
-                    "headlines": [],
-                    "descriptions": [],
-                    "images": [],
-                    "videos": []
-                }
-                
-                # Textes
-                if row.ad_group_ad.ad.type_.name == "RESPONSIVE_SEARCH_AD":
-                    ad_data["headlines"] = [h.text for h in row.ad_group_ad.ad.responsive_search_ad.headlines]
-                    ad_data["descriptions"] = [d.text for d in row.ad_group_ad.ad.responsive_search_ad.descriptions]
-                elif row.ad_group_ad.ad.type_.name == "RESPONSIVE_DISPLAY_AD":
-                    ad_data["headlines"] = [h.text for h in row.ad_group_ad.ad.responsive_display_ad.headlines]
-                    ad_data["descriptions"] = [d.text for d in row.ad_group_ad.ad.responsive_display_ad.descriptions]
-                
-                ads_map[ad_id] = ad_data
+                ads_map[row.ad_group_ad.ad.id] = self._ad_entry(row)
 
             if not ads_map:
                 return []
@@ -304,20 +481,7 @@ class GoogleAdsCreativeService:
                 response_assets = ga_service.search(customer_id=customer_id, query=query_assets)
                 
                 for row in response_assets:
-                    ad_id = row.ad_group_ad.ad.id
-                    if ad_id not in ads_map:
-                        continue
-                        
-                    asset_type = row.asset.type_.name
-                    
-                    if asset_type == "IMAGE":
-                        if row.asset.image_asset.full_size.url:
-                            ads_map[ad_id]["images"].append(row.asset.image_asset.full_size.url)
-                    
-                    elif asset_type == "YOUTUBE_VIDEO":
-                         if row.asset.youtube_video_asset.youtube_video_id:
-                            video_url = f"https://www.youtube.com/watch?v={row.asset.youtube_video_asset.youtube_video_id}"
-                            ads_map[ad_id]["videos"].append(video_url)
+                    self._add_ad_asset(ads_map, row)
                             
             except Exception as e:
                 logging.warning(f"⚠️ Erreur récupération assets enrichis standard: {e}")
@@ -328,62 +492,50 @@ class GoogleAdsCreativeService:
             logging.error(f"❌ Erreur standard ads pour {campaign_id}: {e}")
             return []
     
-    def download_media_file(self, url: str) -> Tuple[Optional[bytes], Optional[str]]:
+    def open_media_stream(self, url: str) -> Optional[MediaStream]:
         """
-        Télécharge un fichier média depuis une URL
-        
+        Ouvre un fichier média en flux, sans lire son contenu
+
         Args:
             url: URL du fichier à télécharger
-            
+
         Returns:
-            Tuple (contenu du fichier en bytes, extension du fichier avec point, ex: '.jpg')
+            MediaStream (à fermer par l'appelant, extension dans .extension) ou None en cas d'erreur
         """
         try:
             logging.info(f"📥 Téléchargement de {url}")
-            
-            response = requests.get(url, timeout=60, stream=True)
+
+            response = get_http_session().get(url, timeout=60, stream=True)
             response.raise_for_status()
-            
-            # Déterminer l'extension depuis le Content-Type ou l'URL
-            content_type = response.headers.get('Content-Type', '')
-            extension = None
-            
-            if 'image/jpeg' in content_type or url.endswith('.jpg') or url.endswith('.jpeg'):
-                extension = '.jpg'
-            elif 'image/png' in content_type or url.endswith('.png'):
-                extension = '.png'
-            elif 'image/gif' in content_type or url.endswith('.gif'):
-                extension = '.gif'
-            elif 'video/mp4' in content_type or url.endswith('.mp4'):
-                extension = '.mp4'
-            elif 'video/quicktime' in content_type or url.endswith('.mov'):
-                extension = '.mov'
-            elif 'video' in content_type:
-                extension = '.mp4'  # Par défaut pour les vidéos
-            else:
-                # Essayer d'extraire depuis l'URL (seulement si ça ressemble à une extension valide)
-                if '.' in url:
-                    potential_ext = url.split('.')[-1].split('?')[0].split('/')[0][:4]
-                    if potential_ext.lower() in ['jpg', 'jpeg', 'png', 'gif', 'mp4', 'mov', 'webp']:
-                        extension = f'.{potential_ext.lower()}'
-                    else:
-                        # Fallback: détecter par contenu
-                        extension = '.jpg'  # Par défaut
-            
-            # Lire le contenu
-            file_content = response.content
-            file_size_mb = len(file_content) / (1024 * 1024)
-            
-            
-            return file_content, extension
-            
+            return MediaStream(response, url)
+
         except requests.exceptions.Timeout:
             logging.error(f"❌ Timeout lors du téléchargement de {url}")
-            return None, None
+            return None
         except requests.exceptions.RequestException as e:
             logging.error(f"❌ Erreur lors du téléchargement de {url}: {e}")
-            return None, None
+            return None
         except Exception as e:
             logging.error(f"❌ Erreur inattendue lors du téléchargement: {e}")
-            return None, None
+            return None
 
+    def download_media_file(self, url: str) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        Télécharge un fichier média depuis une URL (contenu entier en mémoire,
+        préférer open_media_stream pour les gros fichiers)
+
+        Args:
+            url: URL du fichier à télécharger
+
+        Returns:
+            Tuple (contenu du fichier en bytes, extension du fichier avec point, ex: '.jpg')
+        """
+        stream = self.open_media_stream(url)
+        if stream is None:
+            return None, None
+        try:
+            with stream:
+                return stream.read_all(), stream.extension
+        except requests.exceptions.RequestException as e:
+            logging.error(f"❌ Erreur lors du téléchargement de {url}: {e}")
+            return None, None
@@ -0,0 +1,159 @@
+"""
+Classification des conversions Google Ads (Contact / Itinéraires) pilotée par règles
+
+Les règles par customer_id sont déclarées dans config/conversion_rules.json,
+chargées une seule fois et compilées en une regex par section.
+"""
+
+import json
+import logging
+import re
+import threading
+from typing import Any, Dict, Optional
+
+from backend.config.settings import Config
+
+SECTIONS = ("contact", "directions")
+SECTION_LABELS = {"contact": "Contact", "directions": "Itinéraires"}
+
+
+def normalize_conversion_name(name: str) -> str:
+    """Normalise les espaces insécables et les différents tirets"""
+    return name.replace('\xa0', ' ').replace('–', '-').replace('—', '-')
+
+
+def conversion_value(metrics, conversions_only: bool = False) -> float:
+    """Valeur retenue pour une ligne : conversions, sinon all_conversions"""
+    if metrics.conversions and metrics.conversions > 0:
+        return metrics.conversions
+    if not conversions_only and metrics.all_conversions and metrics.all_conversions > 0:
+        return metrics.all_conversions
+    return 0
+
+
+class ConversionMatcher:
+    """Règle d'une section (contact ou directions) compilée en une seule regex"""
+
+    def __init__(self, spec: Optional[Dict[str, Any]] = None):
+        spec = spec or {}
+        self.normalize = bool(spec.get("normalize", False))
+        # "value": "conversions" ignore all_conversions (conversions fractionnaires)
+        self.conversions_only = spec.get("value") == "conversions"
+
+        alternatives = [re.escape(s) for s in spec.get("contains", [])]
+        alternatives += [f"^{re.escape(s)}$" for s in spec.get("exact", [])]
+        alternatives += ["^" + "".join(f"(?=.*{re.escape(s)})" for s in group)
+                         for group in spec.get("all_of", [])]
+        self.pattern = re.compile("|".join(alternatives), re.S) if alternatives else None
+
+    def matches(self, name: str, normalized_name: str) -> bool:
+        if self.pattern is None:
+            return False
+        return self.pattern.search(normalized_name if self.normalize else name) is not None
+
+    def value_for(self, metrics) -> float:
+        return conversion_value(metrics, self.conversions_only)
+
+
+class ClientConversionRule:
+    """Règles compilées d'un client"""
+
+    def __init__(self, name: str, spec: Dict[str, Any]):
+        self.name = name
+        self.exclusive = bool(spec.get("exclusive", False))
+        self.matchers = {section: ConversionMatcher(spec.get(section)) for section in SECTIONS}
+
+
+class ConversionRuleEngine:
+    """
+    Classe les lignes d'un snapshot de conversions en une seule passe.
+
+    Résolution du client : customer_id, puis nom d'onglet, puis règles par défaut.
+    """
+
+    def __init__(self, rules: Dict[str, Any]):
+        self.default_rule = ClientConversionRule("default", rules.get("default", {}))
+        self.rules_by_customer: Dict[str, ClientConversionRule] = {}
+        self.rules_by_sheet_name: Dict[str, ClientConversionRule] = {}
+
+        for customer_id, spec in rules.get("clients", {}).items():
+            rule = ClientConversionRule(spec.get("name", customer_id), spec)
+            self.rules_by_customer[customer_id] = rule
+            for sheet_name in spec.get("sheet_names", []):
+                self.rules_by_sheet_name.setdefault(sheet_name, rule)
+
+    def resolve(self, customer_id: str, client_name: Optional[str] = None) -> ClientConversionRule:
+        rule = self.rules_by_customer.get(customer_id)
+        if rule is None and client_name:
+            rule = self.rules_by_sheet_name.get(client_name)
+        return rule or self.default_rule
+
+    def classify(self, rows, customer_id: str, client_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Args:
+            rows: lignes GoogleAdsRow (segments.conversion_action_name, metrics.*)
+
+        Returns:
+            Dict {contact: {total, conversions}, directions: {total, conversions}, all_conversions}
+        """
+        rule = self.resolve(customer_id, client_name)
+        result = {section: {"total": 0, "conversions": []} for section in SECTIONS}
+        all_conversions = []
+        contact_matcher = rule.matchers["contact"]
+        directions_matcher = rule.matchers["directions"]
+
+        for row in rows:
+            raw_name = row.segments.conversion_action_name or ""
+            name = raw_name.lower().strip()
+            normalized_name = normalize_conversion_name(name)
+
+            all_conversions.append({
+                'name': raw_name,
+                'id': row.segments.conversion_action,
+                'conversions': conversion_value(row.metrics)
+            })
+
+            is_contact = contact_matcher.matches(name, normalized_name)
+            is_directions = directions_matcher.matches(name, normalized_name)
+            if rule.exclusive and is_contact:
+                is_directions = False
+
+            for section, matched in (("contact", is_contact), ("directions", is_directions)):
+                if not matched:
+                    continue
+                value = rule.matchers[section].value_for(row.metrics)
+                result[section]["total"] += value
+                result[section]["conversions"].append({
+                    'name': raw_name,
+                    'id': row.segments.conversion_action,
+                    'conversions': value
+                })
+                logging.info(f"✅ Conversion {SECTION_LABELS[section]} ({rule.name}): {raw_name} = {value}")
+
+        result["all_conversions"] = all_conversions
+        return result
+
+
+_engine: Optional[ConversionRuleEngine] = None
+_engine_lock = threading.Lock()
+
+
+def load_conversion_rules() -> Dict[str, Any]:
+    """Charge config/conversion_rules.json (aucune règle en cas d'erreur)"""
+    try:
+        with open(Config.PATHS.CONVERSION_RULES_FILE, 'r', encoding='utf-8') as f:
+            rules = json.load(f)
+            logging.info(f"📋 {len(rules.get('clients', {}))} règles de conversions Google chargées")
+            return rules
+    except Exception as e:
+        logging.error(f"❌ Erreur lors du chargement de conversion_rules.json: {e}")
+        return {}
+
+
+def get_conversion_rule_engine() -> ConversionRuleEngine:
+    """Moteur de classification partagé par le process (règles chargées une fois)"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = ConversionRuleEngine(load_conversion_rules())
+        return _engine
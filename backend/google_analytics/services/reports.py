@@ -14,6 +14,7 @@ from google.analytics.data_v1beta.types import (
     RunReportRequest,
 )
 
+from backend.common.utils.platform_executor import check_stage_deadline
 from backend.google_analytics.services.authentication import GoogleAnalyticsAuthService
 
 
@@ -59,6 +60,7 @@ class GoogleAnalyticsReportsService:
             ),
         )
 
+        check_stage_deadline()
         try:
             response = self._client.run_report(request)
         except Exception as e:
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Process dédié à l'exécution des jobs asynchrones (file SQLite de job_queue).
+
+Lancé par le master gunicorn (gunicorn.conf.py, when_ready) : les workers HTTP
+recyclés par max_requests n'exécutent plus de jobs et ne peuvent donc plus en
+interrompre un en cours.
+
+    python -m backend.job_runner          superviseur : relance le runner quand il s'arrête
+    python -m backend.job_runner --child  runner : exécute les jobs
+
+Le runner s'arrête de lui-même entre deux jobs après JOB_RUNNER_MAX_JOBS jobs
+(50 par défaut, 0 = jamais) pour libérer sa mémoire, puis le superviseur le relance.
+"""
+
+import logging
+import os
+import signal
+import subprocess
+import sys
+import time
+
+# Ajouter le répertoire parent au sys.path pour permettre les imports backend.*
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Délai avant relance d'un runner arrêté anormalement
+RESTART_DELAY = 5.0
+
+
+def run_child() -> None:
+    import backend.main  # noqa: F401 - enregistre les handlers de jobs (routes @async_job)
+    from backend.common.services.job_queue import get_job_worker_pool
+
+    max_jobs = int(os.getenv("JOB_RUNNER_MAX_JOBS", "50")) or None
+    logging.info(f"👷 Runner de jobs démarré (pid {os.getpid()})")
+    get_job_worker_pool().run_forever(max_jobs=max_jobs)
+
+
+def supervise() -> None:
+    child = None
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        if child is not None and child.poll() is None:
+            child.terminate()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    while not stopping:
+        child = subprocess.Popen([sys.executable, "-m", "backend.job_runner", "--child"])
+        code = child.wait()
+        if stopping:
+            break
+        if code != 0:
+            logging.error(f"❌ Runner de jobs arrêté (code {code}), relance dans {RESTART_DELAY:.0f}s")
+            time.sleep(RESTART_DELAY)
+        else:
+            logging.info("♻️ Runner de jobs recyclé")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if "--child" in sys.argv:
+        run_child()
+    else:
+        supervise()
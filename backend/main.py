@@ -11,7 +11,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import logging
 import gc
+import threading
 import calendar
+from functools import wraps
 from datetime import datetime, date
 from flask import Flask, request, send_file, jsonify
 from flask_cors import CORS
@@ -24,10 +26,17 @@ load_dotenv()
 from backend.config.settings import Config
 
 # Services communs
-from backend.common.services.google_sheets import GoogleSheetsService
+from backend.common.services.google_sheets import GoogleSheetsService, SheetWritePlan
 from backend.common.services.client_resolver import ClientResolverService
 from backend.common.services.light_scraper import LightScraperService
 from backend.common.utils.concurrency_manager import with_concurrency_limit, get_concurrency_status
+from backend.common.utils.http_session import get_http_session_stats
+from backend.meta.utils.rate_limiter import MetaRateLimitError, get_meta_rate_limiter
+from backend.common.utils.platform_executor import PlatformStageExecutor
+from backend.common.services.job_queue import (
+    get_job_queue, get_job_worker_pool, job_runner_is_external, register_job_handler, report_job_progress,
+)
+from backend.reports.plotly_renderer import read_render_process_stats
 
 # Services Google Ads
 from backend.google_ads_wrapper.services.authentication import GoogleAdsAuthService
@@ -76,9 +85,14 @@ except ValueError as e:
 
 # Services globaux (initialisation paresseuse)
 _services = {}
+_services_lock = threading.RLock()
 
 def get_service(service_name):
     """Initialise les services de manière paresseuse pour éviter les logs répétitifs"""
+    with _services_lock:
+        return _get_or_create_service(service_name)
+
+def _get_or_create_service(service_name):
     if service_name not in _services:
         if service_name == 'google_auth':
             _services[service_name] = GoogleAdsAuthService()
@@ -107,6 +121,36 @@ def get_service(service_name):
             _services[service_name] = GoogleDriveService()
     return _services[service_name]
 
+def async_job(kind):
+    """
+    Permet d'exécuter une route longue en job d'arrière-plan.
+
+    Avec ?async=1, la requête est mise en file (SQLite) et la réponse 202 contient le job_id
+    à suivre sur GET /jobs/<id> ; sans ce paramètre la route reste synchrone.
+    """
+    def decorator(view):
+        def run_job(payload):
+            # Rejoue la route hors requête HTTP, avec le même corps JSON
+            with app.test_request_context(f"/jobs/{kind}", method="POST", json=payload):
+                response = app.make_response(view())
+                return response.get_json(silent=True), response.status_code
+
+        register_job_handler(kind, run_job)
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.args.get("async", "").lower() not in ("1", "true"):
+                return view(*args, **kwargs)
+
+            pool = get_job_worker_pool()
+            if not job_runner_is_external():
+                pool.start()
+            job_id = get_job_queue().submit(kind, request.get_json(silent=True) or {})
+            pool.notify()
+            return jsonify({"job_id": job_id, "status": "queued", "status_url": f"/jobs/{job_id}"}), 202
+        return wrapper
+    return decorator
+
 # ================================
 # ROUTES UNIFIÉES - NOUVELLES
 # ================================
@@ -290,6 +334,10 @@ def export_google_report():
                         
                         # Scraping Contact si demandé
                         contact_enabled = data.get("contact", False)
+                        itineraire_enabled = data.get("itineraire", False)
+                        if contact_enabled or itineraire_enabled:
+                            # Snapshot de conversions partagé par Contact et Itinéraires
+                            get_service('google_conversions').clear_conversion_snapshots(customer_id)
                         if contact_enabled:
                             try:
                                 google_conversions = get_service('google_conversions')
@@ -302,7 +350,6 @@ def export_google_report():
                                 logging.error(f"Erreur lors du scraping Contact: {e}")
                         
                         # Scraping Itinéraires si demandé
-                        itineraire_enabled = data.get("itineraire", False)
                         if itineraire_enabled:
                             try:
                                 google_conversions = get_service('google_conversions')
@@ -354,7 +401,13 @@ def list_meta_accounts():
 # ROUTES UNIFIÉES
 # ================================
 
+# Deadline (secondes) de chaque étape plateforme de l'export unifié, comptée depuis le
+# lancement en parallèle — doit rester sous le timeout gunicorn (120 s) avec le flush
+PLATFORM_STAGE_DEADLINES = {"google": 90, "meta": 90, "analytics": 60, "leads": 60}
+PLATFORM_STAGE_LABELS = {"google": "Google", "meta": "Meta", "analytics": "Analytics", "leads": "Leads"}
+
 @app.route("/export-unified-report", methods=["POST"])
+@async_job("unified_report")
 @with_concurrency_limit("unified_report_export", timeout=120)
 def export_unified_report():
     data = request.json
@@ -476,162 +529,171 @@ def export_unified_report():
         successful_updates = []
         failed_updates = []
         platform_warnings = []
+        # Toutes les écritures Sheet de l'export sont accumulées puis flushées en un seul batchUpdate
+        write_plan = SheetWritePlan()
 
-        # ===== TRAITEMENT GOOGLE ADS =====
-        # Sachs : on n'écrit aucune donnée Google dans le sheet (rapport Meta uniquement)
-        if is_sachs and google_metrics:
-            logging.info("Alexander Sachs détecté — skip total scraping Google Ads (rapport Meta uniquement)")
-            platform_warnings.append("Google Ads skip pour Alexander Sachs")
-        elif google_customer_id and google_metrics:
-            logging.info(f" Traitement Google Ads pour '{selected_client}' (ID: {google_customer_id})")
-            
-            try:
-                # Récupérer les données de campagne
-                google_reports = get_service('google_reports')
-                if is_emma:
-                    logging.info("Emma détecté — filtrage campagnes Google: actives sur la période uniquement (impressions > 0)")
-                if is_riviera_grass:
-                    logging.info("Riviera Grass détecté — filtrage campagnes Google: actives sur la période uniquement (impressions > 0)")
-                if is_univers_construction:
-                    logging.info("Univers Construction détecté — filtrage campagnes Google: actives sur la période uniquement (impressions > 0)")
-                if is_emma_nantes:
-                    logging.info("Emma Nantes détecté — filtrage campagnes Google: actives sur la période uniquement (impressions > 0)")
-                # Channel filter étendu pour les clients qui ont VIDEO/DEMAND_GEN
-                google_channel_filter = ["SEARCH", "PERFORMANCE_MAX", "DISPLAY"]
-                if is_eco_systeme_durable:
-                    google_channel_filter = ["SEARCH", "PERFORMANCE_MAX", "DISPLAY", "VIDEO", "DEMAND_GEN"]
-                    logging.info(f"Eco Système Durable détecté — channel_filter étendu: {google_channel_filter}")
-
-                response_data = google_reports.get_campaign_data(
-                    google_customer_id,
-                    start_date,
-                    end_date,
-                    only_enabled=is_emma or is_riviera_grass or is_univers_construction or is_emma_nantes or bool(google_campaign_filter),
-                    channel_filter=google_channel_filter,
-                )
-                if is_emma:
-                    logging.info(f"Emma Google — campagnes (après filtre): {len(response_data) if response_data else 0}")
-
-                # Filtrer par nom de campagne Google si configuré
-                if google_campaign_filter and response_data:
-                    filter_lower = google_campaign_filter.lower()
-                    before_count = len(response_data)
-                    response_data = [row for row in response_data if filter_lower in row.campaign.name.lower()]
-                    logging.info(f"Google campaign filter '{google_campaign_filter}': {before_count} → {len(response_data)} campagnes")
-
-                if response_data:
-                    # Calculer les métriques virtuelles
-                    virtual_metrics = google_reports.calculate_channel_specific_metrics(response_data, google_metrics)
-                    
-                    # Mettre à jour le Google Sheet si demandé
-                    if sheet_month:
-                        google_mappings = get_service('google_mappings')
-                        sheet_client_name = google_mappings.get_sheet_name_for_customer(google_customer_id)
-                        # Pour les comptes partagés avec campaignFilter, utiliser le nom du client sélectionné
-                        if google_campaign_filter and selected_client in available_sheets:
-                            sheet_client_name = selected_client
+        def run_google_stage():
+            successful_updates, failed_updates, platform_warnings = [], [], []
+            write_plan = SheetWritePlan()
 
-                        if sheet_client_name and sheet_client_name in available_sheets:
-                            month_row = sheets_service.get_row_for_month(sheet_client_name, sheet_month)
-                            
-                            if month_row:
-                                # Mapper vers les métriques du sheet
-                                sheet_data = google_reports.calculate_sheet_metrics_from_ads_data(virtual_metrics, google_metrics)
-                                
-                                updates = []
-                                for metric_name, metric_value in sheet_data.items():
-                                    column_letter = sheets_service.get_column_for_metric(sheet_client_name, metric_name)
-                                    
-                                    if column_letter:
-                                        updates.append({
-                                            'range': f"{column_letter}{month_row}",
-                                            'value': metric_value
-                                        })
-                                
-                                if updates:
-                                    sheets_service.update_sheet_data(sheet_client_name, updates)
-                                    successful_updates.append(f"Google - {sheet_client_name}: {len(updates)} cellules")
-                                    
-                                    # Scraping additionnel si demandé (skip pour Laserel : géré manuellement)
-                                    if contact_enabled and not is_laserel:
-                                        try:
-                                            google_conversions = get_service('google_conversions')
-                                            google_conversions.scrape_contact_conversions_for_customer(
-                                                google_customer_id, sheet_client_name, start_date, end_date, sheet_month
-                                            )
-                                        except Exception as e:
-                                            logging.error(f"Erreur scraping Contact Google {google_customer_id}: {e}")
-
-                                    if itineraire_enabled and not is_laserel:
-                                        try:
-                                            google_conversions = get_service('google_conversions')
-                                            google_conversions.scrape_directions_conversions_for_customer(
-                                                google_customer_id, sheet_client_name, start_date, end_date, sheet_month
-                                            )
-                                        except Exception as e:
-                                            logging.error(f"Erreur scraping Itinéraires Google {google_customer_id}: {e}")
-                                    if is_laserel and (contact_enabled or itineraire_enabled):
-                                        logging.info(f"Laserel Auxerre/Nantes — skip scraping Contact/Itinéraires Google (gérés manuellement)")
-
-                                    # Laserel Auxerre / Nantes : scraping conversion custom 'Temps passé 10sec' → colonne Temps passé Google
-                                    if is_laserel_auxerre or is_laserel_nantes:
-                                        action_substr = "auxerre temps passé 10sec" if is_laserel_auxerre else "nantes temps passé 10sec"
-                                        try:
-                                            google_conversions = get_service('google_conversions')
-                                            tp_result = google_conversions.scrape_temps_passe_for_customer(
-                                                google_customer_id, sheet_client_name, start_date, end_date, sheet_month,
-                                                action_name_substring=action_substr,
-                                                sheet_column="Temps passé Google",
-                                            )
-                                            if tp_result.get("success"):
-                                                successful_updates.append(f"Google Temps passé - {sheet_client_name}: {tp_result.get('total_conversions')}")
-                                            else:
-                                                failed_updates.append(f"Google Temps passé - {selected_client}: échec écriture")
-                                        except Exception as e:
-                                            logging.error(f"❌ Erreur scrape Temps passé Google {google_customer_id}: {e}")
-                                            failed_updates.append(f"Google Temps passé - {selected_client}: {e}")
+            # ===== TRAITEMENT GOOGLE ADS =====
+            # Sachs : on n'écrit aucune donnée Google dans le sheet (rapport Meta uniquement)
+            if is_sachs and google_metrics:
+                logging.info("Alexander Sachs détecté — skip total scraping Google Ads (rapport Meta uniquement)")
+                platform_warnings.append("Google Ads skip pour Alexander Sachs")
+            elif google_customer_id and google_metrics:
+                logging.info(f" Traitement Google Ads pour '{selected_client}' (ID: {google_customer_id})")
+
+                try:
+                    # Récupérer les données de campagne
+                    google_reports = get_service('google_reports')
+                    if is_emma:
+                        logging.info("Emma détecté — filtrage campagnes Google: actives sur la période uniquement (impressions > 0)")
+                    if is_riviera_grass:
+                        logging.info("Riviera Grass détecté — filtrage campagnes Google: actives sur la période uniquement (impressions > 0)")
+                    if is_univers_construction:
+                        logging.info("Univers Construction détecté — filtrage campagnes Google: actives sur la période uniquement (impressions > 0)")
+                    if is_emma_nantes:
+                        logging.info("Emma Nantes détecté — filtrage campagnes Google: actives sur la période uniquement (impressions > 0)")
+                    # Channel filter étendu pour les clients qui ont VIDEO/DEMAND_GEN
+                    google_channel_filter = ["SEARCH", "PERFORMANCE_MAX", "DISPLAY"]
+                    if is_eco_systeme_durable:
+                        google_channel_filter = ["SEARCH", "PERFORMANCE_MAX", "DISPLAY", "VIDEO", "DEMAND_GEN"]
+                        logging.info(f"Eco Système Durable détecté — channel_filter étendu: {google_channel_filter}")
+
+                    response_data = google_reports.get_campaign_data(
+                        google_customer_id,
+                        start_date,
+                        end_date,
+                        only_enabled=is_emma or is_riviera_grass or is_univers_construction or is_emma_nantes or bool(google_campaign_filter),
+                        channel_filter=google_channel_filter,
+                    )
+                    if is_emma:
+                        logging.info(f"Emma Google — campagnes (après filtre): {len(response_data) if response_data else 0}")
+
+                    # Filtrer par nom de campagne Google si configuré
+                    if google_campaign_filter and response_data:
+                        filter_lower = google_campaign_filter.lower()
+                        before_count = len(response_data)
+                        response_data = [row for row in response_data if filter_lower in row.campaign.name.lower()]
+                        logging.info(f"Google campaign filter '{google_campaign_filter}': {before_count} → {len(response_data)} campagnes")
+
+                    if response_data:
+                        # Calculer les métriques virtuelles
+                        virtual_metrics = google_reports.calculate_channel_specific_metrics(response_data, google_metrics)
+
+                        # Mettre à jour le Google Sheet si demandé
+                        if sheet_month:
+                            google_mappings = get_service('google_mappings')
+                            sheet_client_name = google_mappings.get_sheet_name_for_customer(google_customer_id)
+                            # Pour les comptes partagés avec campaignFilter, utiliser le nom du client sélectionné
+                            if google_campaign_filter and selected_client in available_sheets:
+                                sheet_client_name = selected_client
+
+                            if sheet_client_name and sheet_client_name in available_sheets:
+                                month_row = sheets_service.get_row_for_month(sheet_client_name, sheet_month)
+
+                                if month_row:
+                                    # Mapper vers les métriques du sheet
+                                    sheet_data = google_reports.calculate_sheet_metrics_from_ads_data(virtual_metrics, google_metrics)
+
+                                    updates = []
+                                    for metric_name, metric_value in sheet_data.items():
+                                        column_letter = sheets_service.get_column_for_metric(sheet_client_name, metric_name)
+
+                                        if column_letter:
+                                            updates.append({
+                                                'range': f"{column_letter}{month_row}",
+                                                'value': metric_value
+                                            })
+
+                                    if updates:
+                                        write_plan.add(
+                                            sheet_client_name, updates,
+                                            success_message=f"Google - {sheet_client_name}: {len(updates)} cellules",
+                                            failure_label=f"Google - {selected_client}",
+                                        )
+
+                                        # Nouveau snapshot de conversions pour cet export : Contact,
+                                        # Itinéraires et Temps passé partagent une seule requête GAQL
+                                        if contact_enabled or itineraire_enabled or is_laserel_auxerre or is_laserel_nantes:
+                                            get_service('google_conversions').clear_conversion_snapshots(google_customer_id)
+
+                                        # Scraping additionnel si demandé (skip pour Laserel : géré manuellement)
+                                        if contact_enabled and not is_laserel:
+                                            try:
+                                                google_conversions = get_service('google_conversions')
+                                                google_conversions.scrape_contact_conversions_for_customer(
+                                                    google_customer_id, sheet_client_name, start_date, end_date, sheet_month,
+                                                    write_plan=write_plan,
+                                                )
+                                            except Exception as e:
+                                                logging.error(f"Erreur scraping Contact Google {google_customer_id}: {e}")
+
+                                        if itineraire_enabled and not is_laserel:
+                                            try:
+                                                google_conversions = get_service('google_conversions')
+                                                google_conversions.scrape_directions_conversions_for_customer(
+                                                    google_customer_id, sheet_client_name, start_date, end_date, sheet_month,
+                                                    write_plan=write_plan,
+                                                )
+                                            except Exception as e:
+                                                logging.error(f"Erreur scraping Itinéraires Google {google_customer_id}: {e}")
+                                        if is_laserel and (contact_enabled or itineraire_enabled):
+                                            logging.info(f"Laserel Auxerre/Nantes — skip scraping Contact/Itinéraires Google (gérés manuellement)")
+
+                                        # Laserel Auxerre / Nantes : scraping conversion custom 'Temps passé 10sec' → colonne Temps passé Google
+                                        if is_laserel_auxerre or is_laserel_nantes:
+                                            action_substr = "auxerre temps passé 10sec" if is_laserel_auxerre else "nantes temps passé 10sec"
+                                            try:
+                                                google_conversions = get_service('google_conversions')
+                                                tp_result = google_conversions.scrape_temps_passe_for_customer(
+                                                    google_customer_id, sheet_client_name, start_date, end_date, sheet_month,
+                                                    action_name_substring=action_substr,
+                                                    sheet_column="Temps passé Google",
+                                                    write_plan=write_plan,
+                                                )
+                                                if not tp_result.get("success"):
+                                                    failed_updates.append(f"Google Temps passé - {selected_client}: échec écriture")
+                                            except Exception as e:
+                                                logging.error(f"❌ Erreur scrape Temps passé Google {google_customer_id}: {e}")
+                                                failed_updates.append(f"Google Temps passé - {selected_client}: {e}")
+                                else:
+                                    failed_updates.append(f"Google - {selected_client}: Mois '{sheet_month}' non trouvé")
                             else:
-                                failed_updates.append(f"Google - {selected_client}: Mois '{sheet_month}' non trouvé")
-                        else:
-                            failed_updates.append(f"Google - {selected_client}: Pas de mapping vers un onglet Google Sheet")
-                else:
-                    failed_updates.append(f"Google - {selected_client}: Aucune donnée Google Ads")
-                    
-            except Exception as e:
-                logging.error(f"Erreur Google Ads pour {selected_client}: {e}")
-                failed_updates.append(f"Google - {selected_client}: Erreur API")
-        elif google_metrics and not google_customer_id:
-            platform_warnings.append("Google Ads non configuré pour ce client")
-
-        # ===== TRAITEMENT META ADS (OPTIMISÉ) =====
-        if meta_account_id and meta_metrics:
-            logging.info(f" Traitement Meta Ads pour '{selected_client}' (ID: {meta_account_id})")
-            
-            try:
-                # Récupérer les données Meta avec timeout strict
-                meta_reports = get_service('meta_reports')
-                logging.info(f"Début récupération Meta pour {meta_account_id}")
-                
-                # Utiliser un timeout global pour éviter les blocages
-                import threading
-                import time
-                
-                timeout_occurred = threading.Event()
-                
-                def timeout_handler():
-                    timeout_occurred.set()
-                
-                # Définir un timeout de 60 secondes pour Meta
-                timeout_timer = threading.Timer(60.0, timeout_handler)
-                timeout_timer.start()
-                
+                                failed_updates.append(f"Google - {selected_client}: Pas de mapping vers un onglet Google Sheet")
+                    else:
+                        failed_updates.append(f"Google - {selected_client}: Aucune donnée Google Ads")
+
+                except Exception as e:
+                    logging.error(f"Erreur Google Ads pour {selected_client}: {e}")
+                    failed_updates.append(f"Google - {selected_client}: Erreur API")
+            elif google_metrics and not google_customer_id:
+                platform_warnings.append("Google Ads non configuré pour ce client")
+
+            return successful_updates, failed_updates, platform_warnings, write_plan
+
+        def run_meta_stage():
+            successful_updates, failed_updates, platform_warnings = [], [], []
+            write_plan = SheetWritePlan()
+
+            # ===== TRAITEMENT META ADS (OPTIMISÉ) =====
+            if meta_account_id and meta_metrics:
+                logging.info(f" Traitement Meta Ads pour '{selected_client}' (ID: {meta_account_id})")
+
                 try:
+                    # Récupérer les données Meta (bornées par la deadline de l'étape meta)
+                    meta_reports = get_service('meta_reports')
+                    logging.info(f"Début récupération Meta pour {meta_account_id}")
+                    # Insights frais pour cet export, puis partagés par toutes les métriques Meta
+                    meta_reports.clear_insights_cache(meta_account_id)
+
                     # Vérifier si la métrique "Contact Meta" est sélectionnée
                     use_new_contacts_method = "meta.contact" in meta_metrics
-                    
+
                     if use_new_contacts_method:
                         logging.info(f"🔄 Utilisation de la nouvelle méthode getContactsResults() pour les contacts Meta")
-                        
+
                         # Utiliser la nouvelle méthode pour récupérer les contacts via /insights avec results
                         if is_emma:
                             logging.info("Emma détecté — filtrage campagnes Meta: ACTIVE uniquement (effective_status) + nom contient 'Emma' (insensible à la casse)")
@@ -650,7 +712,7 @@ def export_unified_report():
                             only_active=is_emma or is_riviera_grass or is_univers_construction or is_emma_nantes,
                             name_contains_ci=meta_campaign_name_filter
                         )
-                        
+
                         if contacts_campaigns:
                             # Calculer le total des contacts via getContactsResults() (FALLBACK uniquement)
                             # ⚠️ Cette valeur peut inclure les recherches de lieux, donc on l'utilise seulement si insights_data ne fournit pas de contacts
@@ -658,10 +720,10 @@ def export_unified_report():
                             if is_emma:
                                 logging.info(f"Emma Meta — campagnes contacts (après filtre): {len(contacts_campaigns)}")
                             logging.info(f"📊 Total contacts Meta via results (fallback): {total_contacts_fallback}")
-                            
+
                             # Initialiser metrics vide - sera rempli par calculate_meta_metrics()
                             metrics = {}
-                            
+
                             # Récupérer les insights classiques pour TOUTES les métriques (y compris Contact Meta)
                             insights = meta_reports.get_meta_insights(
                                 meta_account_id,
@@ -676,7 +738,7 @@ def export_unified_report():
                                 metrics = meta_reports.calculate_meta_metrics(insights, cpl_average, meta_account_id, start_date, end_date, contacts_total=total_contacts_fallback)
                                 if is_emma and isinstance(insights, dict) and 'campaign_count' in insights:
                                     logging.info(f"Emma Meta — campagnes insights (après filtre): {insights['campaign_count']}")
-                            
+
                             # Cas spécial pour Roche Bobois Lyon Centre, Création contemporaine et Roche Saint-Bonnet (contacts et recherches forcés à 0)
                             if is_roche_lyon:
                                 logging.info("Roche Bobois Lyon Centre détecté — contacts et recherches forcés à 0")
@@ -712,18 +774,17 @@ def export_unified_report():
                             only_active=is_emma or is_riviera_grass or is_univers_construction or is_emma_nantes,
                             name_contains_ci=meta_campaign_name_filter
                         )
-                        timeout_timer.cancel()  # Annuler le timeout
                         logging.info(f"Données Meta récupérées: {insights is not None}")
-                        
+
                         if insights:
                             # Récupérer le CPL moyen des campagnes avec conversions > 0
                             cpl_average = meta_reports.get_meta_campaigns_cpl_average(meta_account_id, start_date, end_date)
-                            
+
                             # Calculer les métriques; ici pas de total contacts consolidé → fallback moyenne
                             metrics = meta_reports.calculate_meta_metrics(insights, cpl_average, meta_account_id, start_date, end_date, contacts_total=None)
                             if is_emma and isinstance(insights, dict) and 'campaign_count' in insights:
                                 logging.info(f"Emma Meta — campagnes insights (après filtre): {insights['campaign_count']}")
-                            
+
                             # Cas spécial pour Roche Bobois Lyon Centre, Création contemporaine et Roche Saint-Bonnet (contacts et recherches forcés à 0)
                             if is_roche_lyon:
                                 logging.info("Roche Bobois Lyon Centre détecté — contacts et recherches forcés à 0")
@@ -737,7 +798,7 @@ def export_unified_report():
                                 logging.info("Roche Bobois Saint-Bonnet détecté — contacts et recherches forcés à 0")
                                 metrics["Contact Meta"] = 0
                                 metrics["Recherche de lieux"] = 0
-                    
+
                     # Mettre à jour le Google Sheet si demandé (pour les deux méthodes)
                     if metrics and sheet_month:
                         meta_mappings = get_service('meta_mappings')
@@ -757,12 +818,12 @@ def export_unified_report():
                                 sheet_name = meta_mappings.get_sheet_name_for_account(meta_account_id)
                             if not sheet_name:
                                 sheet_name = selected_client
-                            
+
                         meta_metrics_mapping = meta_mappings.get_meta_metrics_mapping()
-                        
+
                         if sheet_name and sheet_name in available_sheets:
                             month_row = sheets_service.get_row_for_month(sheet_name, sheet_month)
-                            
+
                             if month_row:
                                 updates = []
 
@@ -791,10 +852,13 @@ def export_unified_report():
                                                 'value': metric_value
                                             })
                                             logging.info(f" {column_name}: {metric_value} → {column_letter}{month_row}")
-                                
+
                                 if updates:
-                                    sheets_service.update_sheet_data(sheet_name, updates)
-                                    successful_updates.append(f"Meta - {sheet_name}: {len(updates)} cellules")
+                                    write_plan.add(
+                                        sheet_name, updates,
+                                        success_message=f"Meta - {sheet_name}: {len(updates)} cellules",
+                                        failure_label=f"Meta - {selected_client}",
+                                    )
                                 else:
                                     failed_updates.append(f"Meta - {selected_client}: Aucune colonne trouvée")
 
@@ -807,8 +871,11 @@ def export_unified_report():
                                         )
                                         col_letter_tp = sheets_service.get_column_for_metric(sheet_name, "Temps passé")
                                         if col_letter_tp:
-                                            sheets_service.update_single_cell(sheet_name, f"{col_letter_tp}{month_row}", tp_total)
-                                            successful_updates.append(f"Meta Temps passé - {sheet_name}: {tp_total}")
+                                            write_plan.add_cell(
+                                                sheet_name, f"{col_letter_tp}{month_row}", tp_total,
+                                                success_message=f"Meta Temps passé - {sheet_name}: {tp_total}",
+                                                failure_label=f"Meta Temps passé - {selected_client}",
+                                            )
                                             logging.info(f"⏱️  Meta Temps passé ({action_type}): {tp_total} → {col_letter_tp}{month_row}")
                                         else:
                                             logging.warning(f"⚠️ Colonne 'Temps passé' non trouvée dans '{sheet_name}'")
@@ -843,8 +910,11 @@ def export_unified_report():
                                             else:
                                                 logging.warning(f"  ⚠️ Colonne LyleOO '{col_name}' non trouvée dans '{sheet_name}'")
                                         if ly_updates:
-                                            sheets_service.update_sheet_data(sheet_name, ly_updates)
-                                            successful_updates.append(f"Meta LyleOO - {sheet_name}: {len(ly_updates)} cellules")
+                                            write_plan.add(
+                                                sheet_name, ly_updates,
+                                                success_message=f"Meta LyleOO - {sheet_name}: {len(ly_updates)} cellules",
+                                                failure_label=f"Meta LyleOO - {selected_client}",
+                                            )
                                     except Exception as e:
                                         logging.error(f"❌ Erreur scraping LyleOO Interest/Retarget: {e}")
                                         failed_updates.append(f"Meta LyleOO - {selected_client}: {e}")
@@ -852,25 +922,16 @@ def export_unified_report():
                                 # Scraping par campagne spécifique (Sachs)
                                 if is_sachs and month_row:
                                     try:
-                                        # Lire les headers ligne 3 pour les colonnes campagnes
-                                        row3_range = f"'{sheet_name}'!3:3"
-                                        row3_result = sheets_service.service.spreadsheets().values().get(
-                                            spreadsheetId=sheets_service.sheet_id,
-                                            range=row3_range
-                                        ).execute()
-                                        row3_headers = row3_result.get("values", [[]])[0] if row3_result.get("values") else []
-
+                                        # Colonnes campagnes lues dans les headers ligne 3 (index en cache)
                                         def col_letter_from_row3(col_name):
-                                            for idx, h in enumerate(row3_headers):
-                                                if h and h.strip() == col_name.strip():
-                                                    return sheets_service._index_to_column_letter(idx)
-                                            return None
+                                            return sheets_service.get_column_for_metric(sheet_name, col_name, header_row=3)
 
                                         sachs_campaigns = {
                                             "follower": {"Montant": "spend", "Ajout au panier": "add_to_cart", "CTR": "ctr"},
                                             "drive": {"Montant DTS": "spend", "Itinéraires": "search", "CTR DTS": "ctr"},
                                             "interaction": {"Montant SP": "spend", "CTR SP": "ctr"},
                                         }
+                                        sachs_updates = []
                                         for camp_filter, col_mapping in sachs_campaigns.items():
                                             camp_data = meta_reports.get_campaign_specific_metrics(
                                                 meta_account_id, start_date, end_date, camp_filter)
@@ -880,11 +941,15 @@ def export_unified_report():
                                                     value = f"{value}%"  # Le sheet stocke avec %, le PPTX affiche tel quel
                                                 col_letter = col_letter_from_row3(col_name)
                                                 if col_letter:
-                                                    sheets_service.update_single_cell(sheet_name, f"{col_letter}{month_row}", value)
+                                                    sachs_updates.append({'range': f"{col_letter}{month_row}", 'value': value})
                                                     logging.info(f"  Sachs {camp_filter} — {col_name}: {value} → {col_letter}{month_row}")
                                                 else:
                                                     logging.warning(f"  ⚠️ Colonne '{col_name}' non trouvée en ligne 3 pour Sachs")
-                                        successful_updates.append(f"Meta Sachs campagnes - {sheet_name}")
+                                        write_plan.add(
+                                            sheet_name, sachs_updates,
+                                            success_message=f"Meta Sachs campagnes - {sheet_name}",
+                                            failure_label=f"Meta Sachs campagnes - {selected_client}",
+                                        )
                                     except Exception as e:
                                         logging.error(f"❌ Erreur scraping campagnes Sachs: {e}")
                                         failed_updates.append(f"Meta Sachs campagnes - {selected_client}: {e}")
@@ -894,99 +959,167 @@ def export_unified_report():
                             failed_updates.append(f"Meta - {selected_client}: Pas de mapping vers un onglet Google Sheet")
                     else:
                         failed_updates.append(f"Meta - {selected_client}: Aucune donnée Meta Ads")
-                        
-                except Exception as timeout_error:
-                    timeout_timer.cancel()  # Annuler le timeout
-                    if timeout_occurred.is_set():
-                        logging.error(f"Timeout Meta Ads pour {selected_client} (60s dépassé)")
-                        failed_updates.append(f"Meta - {selected_client}: Timeout (60s)")
+
+
+                except MetaRateLimitError as e:
+                    logging.error(f"⛔ Quota Meta atteint pour {selected_client}: {e}")
+                    failed_updates.append(f"Meta - {selected_client}: Quota Meta atteint, réessayer dans {e.retry_after:.0f}s")
+                except Exception as e:
+                    logging.error(f"Erreur Meta Ads pour {selected_client}: {e}")
+                    logging.error(f"Type d'erreur: {type(e).__name__}")
+                    failed_updates.append(f"Meta - {selected_client}: Erreur API - {str(e)[:100]}")
+
+            elif meta_metrics and not meta_account_id:
+                platform_warnings.append("Meta Ads non configuré pour ce client")
+
+            return successful_updates, failed_updates, platform_warnings, write_plan
+
+        def run_analytics_stage():
+            successful_updates, failed_updates, platform_warnings = [], [], []
+            write_plan = SheetWritePlan()
+
+            # ========================================
+            # GOOGLE ANALYTICS - Vues de pages
+            # ========================================
+            if include_analytics and ga_config and sheet_month:
+                try:
+                    ga_property_id = ga_config.get("propertyId")
+                    ga_pages = ga_config.get("pages", [])
+
+                    if not ga_property_id or not ga_pages:
+                        platform_warnings.append("Analytics: configuration incomplète pour ce client")
                     else:
-                        raise timeout_error
-                    
-            except Exception as e:
-                logging.error(f"Erreur Meta Ads pour {selected_client}: {e}")
-                logging.error(f"Type d'erreur: {type(e).__name__}")
-                failed_updates.append(f"Meta - {selected_client}: Erreur API - {str(e)[:100]}")
-                
-        elif meta_metrics and not meta_account_id:
-            platform_warnings.append("Meta Ads non configuré pour ce client")
+                        # Forcer la plage de dates GA au mois COMPLET dérivé de start_date,
+                        # pour éviter les off-by-one (ex: 2026-03-30 au lieu de 2026-03-31)
+                        # quand l'utilisateur ajuste manuellement les dates dans le frontend.
+                        try:
+                            sd = datetime.strptime(start_date, "%Y-%m-%d").date()
+                            ga_start = date(sd.year, sd.month, 1).isoformat()
+                            ga_end = date(sd.year, sd.month, calendar.monthrange(sd.year, sd.month)[1]).isoformat()
+                        except (ValueError, TypeError):
+                            ga_start, ga_end = start_date, end_date
+
+                        if (ga_start, ga_end) != (start_date, end_date):
+                            logging.info(
+                                f"📊 GA4 — plage normalisée au mois complet : "
+                                f"{start_date}→{end_date} ⇒ {ga_start}→{ga_end}"
+                            )
 
-        # ========================================
-        # GOOGLE ANALYTICS - Vues de pages
-        # ========================================
-        if include_analytics and ga_config and sheet_month:
-            try:
-                ga_property_id = ga_config.get("propertyId")
-                ga_pages = ga_config.get("pages", [])
+                        logging.info(f"📊 Scraping GA4 pour {selected_client} (property={ga_property_id}, {len(ga_pages)} pages)")
 
-                if not ga_property_id or not ga_pages:
-                    platform_warnings.append("Analytics: configuration incomplète pour ce client")
-                else:
-                    # Forcer la plage de dates GA au mois COMPLET dérivé de start_date,
-                    # pour éviter les off-by-one (ex: 2026-03-30 au lieu de 2026-03-31)
-                    # quand l'utilisateur ajuste manuellement les dates dans le frontend.
-                    try:
-                        sd = datetime.strptime(start_date, "%Y-%m-%d").date()
-                        ga_start = date(sd.year, sd.month, 1).isoformat()
-                        ga_end = date(sd.year, sd.month, calendar.monthrange(sd.year, sd.month)[1]).isoformat()
-                    except (ValueError, TypeError):
-                        ga_start, ga_end = start_date, end_date
-
-                    if (ga_start, ga_end) != (start_date, end_date):
-                        logging.info(
-                            f"📊 GA4 — plage normalisée au mois complet : "
-                            f"{start_date}→{end_date} ⇒ {ga_start}→{ga_end}"
-                        )
+                        ga_reports = get_service('ga_reports')
+                        paths = [p["path"] for p in ga_pages]
+                        page_views = ga_reports.get_page_views(ga_property_id, paths, ga_start, ga_end)
 
-                    logging.info(f"📊 Scraping GA4 pour {selected_client} (property={ga_property_id}, {len(ga_pages)} pages)")
-
-                    ga_reports = get_service('ga_reports')
-                    paths = [p["path"] for p in ga_pages]
-                    page_views = ga_reports.get_page_views(ga_property_id, paths, ga_start, ga_end)
-
-                    # Résoudre l'onglet de destination (mêmes règles que Meta)
-                    google_mappings = get_service('google_mappings')
-                    meta_mappings_svc = get_service('meta_mappings')
-                    ga_sheet_name = google_mappings.get_sheet_name_for_customer(google_customer_id) if google_customer_id else None
-                    if not ga_sheet_name and meta_account_id:
-                        ga_sheet_name = meta_mappings_svc.get_sheet_name_for_account(meta_account_id)
-                    if not ga_sheet_name:
-                        ga_sheet_name = selected_client
-
-                    if ga_sheet_name and ga_sheet_name in available_sheets:
-                        month_row = sheets_service.get_row_for_month(ga_sheet_name, sheet_month)
-
-                        if month_row:
-                            updates = []
-                            for page in ga_pages:
-                                column_name = page["sheetColumn"]
-                                value = page_views.get(page["path"], 0)
-                                column_letter = sheets_service.get_column_for_metric(ga_sheet_name, column_name)
-
-                                if column_letter:
-                                    updates.append({
-                                        'range': f"{column_letter}{month_row}",
-                                        'value': value
-                                    })
-                                    logging.info(f"  GA {column_name}: {value} → {column_letter}{month_row}")
-                                else:
-                                    logging.warning(f"  ⚠️ Colonne GA '{column_name}' non trouvée dans l'onglet '{ga_sheet_name}'")
+                        # Résoudre l'onglet de destination (mêmes règles que Meta)
+                        google_mappings = get_service('google_mappings')
+                        meta_mappings_svc = get_service('meta_mappings')
+                        ga_sheet_name = google_mappings.get_sheet_name_for_customer(google_customer_id) if google_customer_id else None
+                        if not ga_sheet_name and meta_account_id:
+                            ga_sheet_name = meta_mappings_svc.get_sheet_name_for_account(meta_account_id)
+                        if not ga_sheet_name:
+                            ga_sheet_name = selected_client
 
-                            if updates:
-                                sheets_service.update_sheet_data(ga_sheet_name, updates)
-                                successful_updates.append(f"Analytics - {ga_sheet_name}: {len(updates)} cellules")
+                        if ga_sheet_name and ga_sheet_name in available_sheets:
+                            month_row = sheets_service.get_row_for_month(ga_sheet_name, sheet_month)
+
+                            if month_row:
+                                updates = []
+                                for page in ga_pages:
+                                    column_name = page["sheetColumn"]
+                                    value = page_views.get(page["path"], 0)
+                                    column_letter = sheets_service.get_column_for_metric(ga_sheet_name, column_name)
+
+                                    if column_letter:
+                                        updates.append({
+                                            'range': f"{column_letter}{month_row}",
+                                            'value': value
+                                        })
+                                        logging.info(f"  GA {column_name}: {value} → {column_letter}{month_row}")
+                                    else:
+                                        logging.warning(f"  ⚠️ Colonne GA '{column_name}' non trouvée dans l'onglet '{ga_sheet_name}'")
+
+                                if updates:
+                                    write_plan.add(
+                                        ga_sheet_name, updates,
+                                        success_message=f"Analytics - {ga_sheet_name}: {len(updates)} cellules",
+                                        failure_label=f"Analytics - {selected_client}",
+                                    )
+                                else:
+                                    failed_updates.append(f"Analytics - {selected_client}: Aucune colonne trouvée")
                             else:
-                                failed_updates.append(f"Analytics - {selected_client}: Aucune colonne trouvée")
+                                failed_updates.append(f"Analytics - {selected_client}: Mois '{sheet_month}' non trouvé")
                         else:
-                            failed_updates.append(f"Analytics - {selected_client}: Mois '{sheet_month}' non trouvé")
-                    else:
-                        failed_updates.append(f"Analytics - {selected_client}: Onglet '{ga_sheet_name}' introuvable")
+                            failed_updates.append(f"Analytics - {selected_client}: Onglet '{ga_sheet_name}' introuvable")
 
-            except Exception as e:
-                logging.error(f"Erreur Google Analytics pour {selected_client}: {e}")
-                failed_updates.append(f"Analytics - {selected_client}: Erreur API - {str(e)[:100]}")
-        elif include_analytics and not ga_config:
-            platform_warnings.append("Google Analytics non configuré pour ce client")
+                except Exception as e:
+                    logging.error(f"Erreur Google Analytics pour {selected_client}: {e}")
+                    failed_updates.append(f"Analytics - {selected_client}: Erreur API - {str(e)[:100]}")
+            elif include_analytics and not ga_config:
+                platform_warnings.append("Google Analytics non configuré pour ce client")
+
+            return successful_updates, failed_updates, platform_warnings, write_plan
+
+        def run_leads_stage():
+            successful_updates, failed_updates, platform_warnings = [], [], []
+            write_plan = SheetWritePlan()
+
+            # Scraping leads automatique pour les clients leadgen
+            LEADS_CLIENTS = {
+                "kozeo": "kozeo",
+                "riviera grass": "riviera_grass",
+                "sud gazon": "sud_gazon",
+                "univers construction": "univers_construction",
+                "tairmic": "tairmic",
+                "eco système durable": "eco_systeme_durable",
+                "univers gazon": "univers_gazon",
+            }
+            sel_lower = (selected_client or "").lower()
+            for keyword, client_key in LEADS_CLIENTS.items():
+                if keyword in sel_lower:
+                    try:
+                        from backend.common.services.leads_scraper import _scrape_leads_client
+                        leads_result = _scrape_leads_client(
+                            sheets_service, client_key, reference_month=None, write_plan=write_plan
+                        )
+                        if not leads_result['updates_count']:
+                            successful_updates.append(f"Leads {selected_client}: 0 cellules")
+                        logging.info(f"✅ Leads scrapés automatiquement pour '{selected_client}'")
+                    except Exception as e:
+                        logging.error(f"❌ Erreur scraping leads auto pour '{selected_client}': {e}")
+                        failed_updates.append(f"Leads {selected_client}: {e}")
+                    break
+
+            return successful_updates, failed_updates, platform_warnings, write_plan
+
+        # Les plateformes sont récupérées en parallèle (APIs indépendantes) ; chaque étape
+        # remplit son propre plan d'écriture, fusionné ensuite dans l'ordre fixe
+        # Google → Meta → GA4 → leads pour garder une phase d'écriture déterministe
+        stage_executor = PlatformStageExecutor(max_workers=len(PLATFORM_STAGE_DEADLINES), on_progress=report_job_progress)
+        stage_executor.submit("google", run_google_stage, PLATFORM_STAGE_DEADLINES["google"])
+        stage_executor.submit("meta", run_meta_stage, PLATFORM_STAGE_DEADLINES["meta"])
+        stage_executor.submit("analytics", run_analytics_stage, PLATFORM_STAGE_DEADLINES["analytics"])
+        stage_executor.submit("leads", run_leads_stage, PLATFORM_STAGE_DEADLINES["leads"])
+
+        for stage in stage_executor.collect():
+            if stage["status"] == "ok":
+                stage_successes, stage_failures, stage_warnings, stage_plan = stage["result"]
+                successful_updates.extend(stage_successes)
+                failed_updates.extend(stage_failures)
+                platform_warnings.extend(stage_warnings)
+                write_plan.merge(stage_plan)
+            else:
+                failed_updates.append(
+                    f"{PLATFORM_STAGE_LABELS[stage['platform']]} - {selected_client}: {stage['error']}"
+                )
+
+        # Écriture unique de toutes les cellules planifiées (tous onglets, toutes plateformes)
+        if not write_plan.is_empty():
+            report_job_progress("sheet_write", "running")
+            plan_successes, plan_failures = sheets_service.flush_write_plan(write_plan)
+            successful_updates.extend(plan_successes)
+            failed_updates.extend(plan_failures)
+            report_job_progress("sheet_write", "ok", failures=len(plan_failures))
 
         # Log des résultats
         if successful_updates:
@@ -996,29 +1129,6 @@ def export_unified_report():
         if platform_warnings:
             logging.info(f"ℹ️ Avertissements plateformes: {platform_warnings}")
 
-        # Scraping leads automatique pour les clients leadgen
-        LEADS_CLIENTS = {
-            "kozeo": "kozeo",
-            "riviera grass": "riviera_grass",
-            "sud gazon": "sud_gazon",
-            "univers construction": "univers_construction",
-            "tairmic": "tairmic",
-            "eco système durable": "eco_systeme_durable",
-            "univers gazon": "univers_gazon",
-        }
-        sel_lower = (selected_client or "").lower()
-        for keyword, client_key in LEADS_CLIENTS.items():
-            if keyword in sel_lower:
-                try:
-                    from backend.common.services.leads_scraper import _scrape_leads_client
-                    leads_result = _scrape_leads_client(sheets_service, client_key, reference_month=None)
-                    successful_updates.append(f"Leads {selected_client}: {leads_result['updates_count']} cellules")
-                    logging.info(f"✅ Leads scrapés automatiquement pour '{selected_client}'")
-                except Exception as e:
-                    logging.error(f"❌ Erreur scraping leads auto pour '{selected_client}': {e}")
-                    failed_updates.append(f"Leads {selected_client}: {e}")
-                break
-
         # Nettoyage mémoire après traitement
         gc.collect()
         logging.info("🧹 Nettoyage mémoire effectué")
@@ -1054,12 +1164,38 @@ def concurrency_status():
         return jsonify({
             "status": "success",
             "concurrency": status,
+            "http_pool": get_http_session_stats(),
+            "meta_rate_limits": get_meta_rate_limiter().get_status(),
+            "plotly_renderers": read_render_process_stats(),
             "timestamp": datetime.now().isoformat()
         }), 200
     except Exception as e:
         logging.error(f"Erreur lors de la récupération du statut de concurrence: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route("/jobs/<job_id>", methods=["GET"])
+def get_job_status(job_id):
+    """Statut et avancement par étape d'un job asynchrone"""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": f"Job inconnu: {job_id}"}), 404
+    # Sans process dédié, le pool démarre aussi ici : reprise des jobs en file après un redémarrage
+    if not job_runner_is_external():
+        get_job_worker_pool().start()
+    return jsonify({
+        "job_id": job["id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "progress": job["progress"],
+        "result": job["result"],
+        "http_status": job["http_status"],
+        "error": job["error"],
+        "attempts": job["attempts"],
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+    }), 200
+
 @app.route("/", methods=["GET"])
 def root():
     """Endpoint racine pour éviter les erreurs 404"""
@@ -1292,6 +1428,7 @@ def scrape_website_light():
 # ================================
 
 @app.route("/export-to-drive", methods=["POST"])
+@async_job("drive_export")
 @with_concurrency_limit("drive_export", timeout=600)  # Timeout plus long pour les téléchargements
 def export_to_drive():
     """Export du contenu créatif des campagnes Google Ads et Meta Ads vers Google Drive"""
@@ -1320,223 +1457,31 @@ def export_to_drive():
         # Initialiser les services
         drive_service = get_service('google_drive')
         
-        # Créer ou trouver le dossier client
+        # Créer ou trouver le dossier client (revérifié : il a pu être supprimé depuis le dernier export)
         client_folder_id = drive_service.find_or_create_folder(
             client_name,
-            Config.API.GOOGLE_DRIVE_FOLDER_ID
+            Config.API.GOOGLE_DRIVE_FOLDER_ID,
+            verify=True
         )
         
         # Créer le dossier de date sous le client
         today = datetime.now().strftime("%d-%m-%Y")  # Format français: JJ-MM-AAAA
-        date_folder_id = drive_service.find_or_create_folder(today, client_folder_id)
+        date_folder_id = drive_service.find_or_create_folder(today, client_folder_id, verify=True)
         
         # Créer les dossiers de plateforme sous la date
-        google_folder_id = drive_service.find_or_create_folder("Google", date_folder_id)
-        meta_folder_id = drive_service.find_or_create_folder("Meta", date_folder_id)
-        
-        exported_files = []
-        
-        # ===== EXPORT GOOGLE ADS =====
-        if google_customer_id:
-            try:
-                logging.info(f"📊 Export Google Ads créatif pour {client_name} (ID: {google_customer_id})")
-                
-                # Importer le service créatif Google Ads
-                from backend.google_ads_wrapper.services.google_ads_creative import GoogleAdsCreativeService
-                google_creative = GoogleAdsCreativeService()
-                
-                # Récupérer les campagnes actives
-                campaigns = google_creative.get_active_campaigns(google_customer_id)
-                
-                if campaigns:
-                    logging.info(f"✅ {len(campaigns)} campagnes Google actives trouvées")
-                    
-                    # Pour chaque campagne
-                    for campaign in campaigns:
-                        campaign_id = campaign['id']
-                        campaign_name = campaign['name']
-                        safe_campaign_name = campaign_name.replace('/', '-').replace('\\', '-').replace("'", "")
-                        
-                        logging.info(f"📝 Traitement campagne Google: {campaign_name}")
-                        
-                        # Récupérer toutes les annonces de la campagne avec le type
-                        campaign_type = campaign.get('type')
-                        ads = google_creative.get_campaign_ads(google_customer_id, campaign_id, campaign_type)
-                        
-                        if ads:
-                            logging.info(f"  📄 {len(ads)} annonces trouvées")
-                            
-                            # Créer le CSV avec toutes les annonces
-                            # En-têtes CSV (avec YouTube Videos URLs)
-                            csv_content = "Groupe d'annonces,Nom annonce,Type,URL finale,Headlines,Descriptions,YouTube Videos URLs\n"
-                            
-                            for ad in ads:
-                                # Préparer les champs pour le CSV (échapper les guillemets)
-                                ad_group = ad.get("ad_group_name", "").replace('"', '""')
-                                ad_name = ad.get("ad_name", "").replace('"', '""')
-                                ad_type = ad.get("ad_type", "")
-                                
-                                headlines = " | ".join(ad.get('headlines', [])).replace('"', '""')
-                                descriptions = " | ".join(ad.get('descriptions', [])).replace('"', '""')
-                                
-                                final_urls = " | ".join(ad.get('final_urls', [])).replace('"', '""')
-                                
-                                # Extraire les URLs YouTube
-                                youtube_urls = " | ".join([yt['url'] for yt in ad.get('youtube_videos', [])]).replace('"', '""')
-                                
-                                # Ajouter la ligne au CSV
-                                csv_content += f'"{ad_group}","{ad_name}","{ad_type}","{final_urls}","{headlines}","{descriptions}","{youtube_urls}"\n'
-                            
-                            
-                            # Créer un dossier pour cette campagne
-                            campaign_folder_id = drive_service.find_or_create_folder(safe_campaign_name, google_folder_id)
-                            
-                            # Télécharger et uploader les médias dans le dossier de la campagne
-                            # Télécharger uniquement les images (pas les vidéos YouTube)
-                            media_count = 0
-                            for ad in ads:
-                                # Télécharger les images
-                                for img_url in ad.get('images', []):
-                                    try:
-                                        media_data, media_ext = google_creative.download_media_file(img_url)
-                                        if media_data and media_ext:
-                                            filename = f"image_{media_count}{media_ext}"
-                                            # Construire le mime_type (media_ext contient le point, ex: '.jpg')
-                                            mime_type = f"image/{media_ext[1:]}" if media_ext[1:] != 'jpg' else "image/jpeg"
-                                            drive_service.upload_media_file(media_data, filename, campaign_folder_id, mime_type)
-                                            media_count += 1
-                                    except Exception as e:
-                                        logging.warning(f"⚠️ Erreur téléchargement image: {e}")
-                            
-                            logging.info(f"📥 {media_count} images téléchargées")
-                            
-                            # Uploader le CSV dans le dossier de la campagne
-                            csv_filename = f"{safe_campaign_name}_{today}.csv"
-                            csv_info = drive_service.upload_csv_to_drive(
-                                csv_content,
-                                csv_filename,
-                                campaign_folder_id
-                            )
-                            
-                            exported_files.append({
-                                "platform": "Google Ads",
-                                "campaign": campaign_name,
-                                "type": "csv",
-                                **csv_info
-                            })
-                            
-                            logging.info(f"✅ CSV Google exporté: {csv_filename}")
-                        else:
-                            logging.warning(f"⚠️ Aucune annonce trouvée pour {campaign_name}")
-                else:
-                    logging.warning(f"⚠️ Aucune campagne Google active trouvée pour {client_name}")
-                    
-            except Exception as e:
-                logging.error(f"❌ Erreur export Google Ads: {e}")
-                import traceback
-                logging.error(traceback.format_exc())
+        google_folder_id = drive_service.find_or_create_folder("Google", date_folder_id, verify=True)
+        meta_folder_id = drive_service.find_or_create_folder("Meta", date_folder_id, verify=True)
         
-        # ===== EXPORT META ADS =====
-        if meta_account_id:
-            try:
-                logging.info(f"📊 Export Meta Ads créatif pour {client_name} (ID: {meta_account_id})")
-                
-                # Importer le service créatif Meta Ads
-                from backend.meta.services.meta_ads_creative import MetaAdsCreativeService
-                meta_creative = MetaAdsCreativeService()
-                
-                # Récupérer les campagnes actives
-                campaigns = meta_creative.get_active_campaigns(meta_account_id)
-                
-                if campaigns:
-                    logging.info(f"✅ {len(campaigns)} campagnes Meta actives trouvées")
-                    
-                    # Pour chaque campagne
-                    for campaign in campaigns:
-                        campaign_id = campaign['id']
-                        campaign_name = campaign['name']
-                        safe_campaign_name = campaign_name.replace('/', '-').replace('\\', '-').replace("'", "")
-                        
-                        logging.info(f"📝 Traitement campagne Meta: {campaign_name}")
-                        
-                        # Récupérer toutes les créations de la campagne
-                        creatives = meta_creative.get_campaign_creatives(meta_account_id, campaign_id)
-                        
-                        if creatives:
-                            logging.info(f"  🎨 {len(creatives)} créations trouvées")
-                            
-                            # Créer le CSV avec toutes les créations (sans URLs de médias)
-                            csv_content = "Nom annonce,Titre,Texte,Call to Action,Lien\n"
-                            
-                            for creative in creatives:
-                                name = creative.get("ad_name", "").replace('"', '""')
-                                title = creative.get("title", "").replace('"', '""')
-                                body = creative.get("body", "").replace('"', '""')
-                                cta = creative.get("call_to_action", "").replace('"', '""')
-                                link = creative.get("link_url", "").replace('"', '""')
-                                
-                                csv_content += f'"{name}","{title}","{body}","{cta}","{link}"\n'
-                            
-                            
-                            # Créer un dossier pour cette campagne
-                            campaign_folder_id = drive_service.find_or_create_folder(safe_campaign_name, meta_folder_id)
-                            
-                            # Télécharger et uploader les médias dans le dossier de la campagne
-                            media_count = 0
-                            for creative in creatives:
-                                # Télécharger les images
-                                for img_url in creative.get('images', []):
-                                    try:
-                                        media_data, media_ext = meta_creative.download_media_file(img_url)
-                                        if media_data and media_ext:
-                                            filename = f"image_{media_count}{media_ext}"
-                                            # Construire le mime_type (media_ext contient le point, ex: '.jpg')
-                                            mime_type = f"image/{media_ext[1:]}" if media_ext[1:] != 'jpg' else "image/jpeg"
-                                            drive_service.upload_media_file(media_data, filename, campaign_folder_id, mime_type)
-                                            media_count += 1
-                                    except Exception as e:
-                                        logging.warning(f"⚠️ Erreur téléchargement image Meta: {e}")
-                                
-                                # Télécharger les vidéos
-                                for vid_url in creative.get('videos', []):
-                                    try:
-                                        media_data, media_ext = meta_creative.download_media_file(vid_url)
-                                        if media_data and media_ext:
-                                            filename = f"video_{media_count}{media_ext}"
-                                            # Construire le mime_type (media_ext contient le point, ex: '.mp4')
-                                            mime_type = f"video/{media_ext[1:]}"
-                                            drive_service.upload_media_file(media_data, filename, campaign_folder_id, mime_type)
-                                            media_count += 1
-                                    except Exception as e:
-                                        logging.warning(f"⚠️ Erreur téléchargement vidéo Meta: {e}")
-                            
-                            logging.info(f"📥 {media_count} fichiers média Meta téléchargés")
-                            
-                            # Uploader le CSV dans le dossier de la campagne
-                            csv_filename = f"{safe_campaign_name}_{today}.csv"
-                            csv_info = drive_service.upload_csv_to_drive(
-                                csv_content,
-                                csv_filename,
-                                campaign_folder_id
-                            )
-                            
-                            exported_files.append({
-                                "platform": "Meta Ads",
-                                "campaign": campaign_name,
-                                "type": "csv",
-                                **csv_info
-                            })
-                            
-                            logging.info(f"✅ CSV Meta exporté: {csv_filename}")
-                        else:
-                            logging.warning(f"⚠️ Aucune création trouvée pour {campaign_name}")
-                else:
-                    logging.warning(f"⚠️ Aucune campagne Meta active trouvée pour {client_name}")
-                    
-            except Exception as e:
-                logging.error(f"❌ Erreur export Meta Ads: {e}")
-                import traceback
-                logging.error(traceback.format_exc())
+        # Campagnes Google et Meta traitées en parallèle (pools et limites bornés)
+        from backend.common.services.creative_export import CreativeExportEngine
+        exported_files = CreativeExportEngine(drive_service).export(
+            client_name,
+            today,
+            google_customer_id=google_customer_id,
+            meta_account_id=meta_account_id,
+            google_folder_id=google_folder_id,
+            meta_folder_id=meta_folder_id,
+        )
         
         logging.info(f"🎉 Export terminé: {len(exported_files)} fichiers créés")
         
@@ -1559,6 +1504,7 @@ def export_to_drive():
 # ================================
 
 @app.route("/generate-report", methods=["POST"])
+@async_job("generate_report")
 def generate_report():
     """
     Génère les rapports PPTX et les uploade sur Google Drive.
@@ -1607,7 +1553,7 @@ def scrape_leads():
         from backend.common.services.leads_scraper import (
             scrape_leads_kozeo, scrape_leads_riviera, scrape_leads_sud_gazon,
             scrape_leads_univers, scrape_leads_tairmic, scrape_leads_eco_systeme_durable,
-            scrape_leads_univers_gazon,
+            scrape_leads_univers_gazon, scrape_all_leads,
         )
 
         sheets_service = GoogleSheetsService()
@@ -1632,14 +1578,12 @@ def scrape_leads():
         elif client == "universgazon":
             results.append(scrape_leads_univers_gazon(sheets_service, reference_month=month))
         else:
-            # Tous les clients
-            results.append(scrape_leads_kozeo(sheets_service, reference_month=month))
-            results.append(scrape_leads_riviera(sheets_service, reference_month=month))
-            results.append(scrape_leads_sud_gazon(sheets_service, reference_month=month))
-            results.append(scrape_leads_univers(sheets_service, reference_month=month))
-            results.append(scrape_leads_tairmic(sheets_service, reference_month=month))
-            results.append(scrape_leads_eco_systeme_durable(sheets_service, reference_month=month))
-            results.append(scrape_leads_univers_gazon(sheets_service, reference_month=month))
+            # Tous les clients : lectures en parallèle, une seule écriture groupée
+            results = scrape_all_leads(sheets_service, reference_month=month)
+            errors = [r for r in results if r.get("error")]
+            if errors:
+                status_code = 500 if len(errors) == len(results) else 207
+                return jsonify({"success": False, "results": results}), status_code
 
         return jsonify({"success": True, "results": results}), 200
 
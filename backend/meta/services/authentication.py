@@ -3,11 +3,18 @@ Service d'authentification Meta Ads
 """
 
 import logging
-import requests
 import time
 from typing import List, Dict, Any
 
 from backend.config.settings import Config
+from backend.common.utils.http_session import get_http_session
+from backend.common.utils.platform_executor import check_stage_deadline
+from backend.meta.utils.rate_limiter import (
+    MetaRateLimitError,
+    get_meta_rate_limiter,
+    rate_limit_key,
+    response_rate_limit_seconds,
+)
 
 class MetaAdsAuthService:
     """Service pour gérer l'authentification Meta Ads"""
@@ -18,59 +25,41 @@ class MetaAdsAuthService:
         self.api_version = "v19.0"
         self.base_url = f"https://graph.facebook.com/{self.api_version}"
     
-    def _handle_meta_rate_limit(self, response):
-        """Gère les limites de taux Meta avec retry intelligent"""
-        if response.status_code == 403:
-            try:
-                error_data = response.json()
-                if error_data.get("error", {}).get("code") == 4:  # Rate limit
-                    error_subcode = error_data.get("error", {}).get("error_subcode")
-                    
-                    if error_subcode == 1504022:  # Application request limit
-                        logging.warning("⚠️ Limite de taux Meta atteinte - Application request limit")
-                        return True, 300  # Attendre 5 minutes
-                    elif error_subcode == 1504023:  # User request limit  
-                        logging.warning("⚠️ Limite de taux Meta atteinte - User request limit")
-                        return True, 60   # Attendre 1 minute
-                    else:
-                        logging.warning("⚠️ Limite de taux Meta atteinte - Autre erreur")
-                        return True, 120  # Attendre 2 minutes
-            except:
-                logging.warning("⚠️ Limite de taux Meta atteinte - Format d'erreur inconnu")
-                return True, 180  # Attendre 3 minutes
-        return False, 0
-    
-    def _make_meta_request_with_retry(self, url, params=None, max_retries=3):
-        """Effectue une requête Meta avec gestion des quotas"""
+    def _make_meta_request_with_retry(self, url, params=None, max_retries=3, max_wait=None):
+        """
+        Effectue une requête Meta avec gestion des quotas (limiteur partagé).
+
+        Raises:
+            MetaRateLimitError: si le quota ne permet pas d'appeler dans max_wait secondes
+                (par défaut le budget restant de l'étape d'export en cours) ou si Meta
+                refuse l'appel pour limite de taux
+        """
+        limiter = get_meta_rate_limiter()
+        key = rate_limit_key(url)
         for attempt in range(max_retries + 1):
+            check_stage_deadline()
+            limiter.acquire(key, max_wait)
             try:
                 # Timeout de 30 secondes pour éviter les blocages
-                response = requests.get(url, params=params, timeout=30)
-                
-                # Vérifier les limites de taux
-                is_rate_limited, wait_time = self._handle_meta_rate_limit(response)
-                
-                if is_rate_limited:
-                    if attempt < max_retries:
-                        logging.info(f"⏳ Attente de {wait_time}s avant retry {attempt + 1}/{max_retries}")
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        logging.error(f"❌ Limite de taux Meta dépassée après {max_retries} tentatives")
-                        return None
-                
-                if response.status_code == 200:
-                    return response
-                else:
-                    logging.error(f"❌ Erreur API Meta: {response.status_code} - {response.text}")
-                    return None
-                    
+                response = get_http_session().get(url, params=params, timeout=30)
             except Exception as e:
                 logging.error(f"❌ Exception lors de la requête Meta: {e}")
                 if attempt < max_retries:
-                    time.sleep(30)  # Attendre 30s avant retry
+                    time.sleep(2 ** attempt)
                     continue
                 return None
+
+            limiter.observe(key, response.headers)
+
+            block_seconds = response_rate_limit_seconds(response)
+            if block_seconds:
+                limiter.block(key, block_seconds)
+                raise MetaRateLimitError(key, block_seconds)
+
+            if response.status_code == 200:
+                return response
+            logging.error(f"❌ Erreur API Meta: {response.status_code} - {response.text}")
+            return None
         
         return None
     
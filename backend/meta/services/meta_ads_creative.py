@@ -7,14 +7,23 @@ import requests
 from typing import Dict, List, Any, Optional, Tuple
 
 from backend.config.settings import Config
+from backend.common.utils.http_session import get_http_session
+from backend.common.utils.media_stream import MediaStream
+from backend.meta.utils.graph_batch import MetaGraphBatch
+from backend.meta.utils.rate_limiter import APP_KEY
 
 class MetaAdsCreativeService:
     """Service pour gérer la récupération du contenu créatif Meta Ads"""
+
+    CREATIVE_FIELDS = "id,name,title,body,image_url,image_hash,video_id,thumbnail_url,object_story_spec,effective_object_story_id,asset_feed_spec,object_type,url_tags,link_url,call_to_action_type"
+    VIDEO_FIELDS = "source,picture"
+    STORY_FIELDS = "message,link,full_picture,name"
     
     def __init__(self):
         self.access_token = Config.API.META_ACCESS_TOKEN
         self.api_version = "v22.0"  # Updated to latest version
         self.base_url = f"https://graph.facebook.com/{self.api_version}"
+        self.graph_batch = MetaGraphBatch(self.access_token, self.base_url)
         logging.info("✅ Meta Ads Creative Service initialisé")
     
     def get_active_campaigns(self, ad_account_id: str) -> List[Dict[str, Any]]:
@@ -39,7 +48,7 @@ class MetaAdsCreativeService:
                 "limit": 100
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            response = get_http_session().get(url, params=params, timeout=30)
             response.raise_for_status()
             
             data = response.json()
@@ -93,7 +102,7 @@ class MetaAdsCreativeService:
                 "limit": 100
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            response = get_http_session().get(url, params=params, timeout=30)
             response.raise_for_status()
             
             data = response.json()
@@ -101,17 +110,18 @@ class MetaAdsCreativeService:
             
             logging.info(f"📝 {len(ads)} annonces trouvées pour la campagne {campaign_id}")
             
-            # Étape 2: Pour chaque annonce, récupérer les détails du creative
+            # Étape 2: Détails de tous les creatives en requêtes groupées (batch Graph API)
+            ads = [ad for ad in ads if "creative" in ad and "id" in ad["creative"]]
+            details = self.get_creatives_details([ad["creative"]["id"] for ad in ads], ad_account_id)
+
             creatives = []
             for ad in ads:
-                if "creative" in ad and "id" in ad["creative"]:
-                    creative_id = ad["creative"]["id"]
-                    creative_data = self._get_creative_details(creative_id)
-                    
-                    if creative_data:
-                        creative_data["ad_id"] = ad["id"]
-                        creative_data["ad_name"] = ad.get("name", f"Ad_{ad['id']}")
-                        creatives.append(creative_data)
+                creative_data = details.get(ad["creative"]["id"])
+                if creative_data:
+                    creative_data = dict(creative_data)
+                    creative_data["ad_id"] = ad["id"]
+                    creative_data["ad_name"] = ad.get("name", f"Ad_{ad['id']}")
+                    creatives.append(creative_data)
             
             logging.info(f"🎨 {len(creatives)} créations récupérées")
             return creatives
@@ -125,230 +135,207 @@ class MetaAdsCreativeService:
             logging.error(traceback.format_exc())
             return []
     
-    def _get_creative_details(self, creative_id: str) -> Optional[Dict[str, Any]]:
+    def get_creatives_details(self, creative_ids: List[str],
+                              ad_account_id: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
         """
-        Récupère les détails d'une création publicitaire
-        
+        Récupère les détails de plusieurs créations en requêtes groupées
+
+        Un premier lot récupère les creatives, un second les vidéos et posts associés.
+
         Args:
-            creative_id: ID de la création
-            
+            creative_ids: IDs des créations
+            ad_account_id: compte publicitaire des créations (quota du limiteur Meta)
+
         Returns:
-            Dictionnaire avec les détails de la création
+            Dictionnaire {creative_id: détails de la création}
         """
-        try:
-            url = f"{self.base_url}/{creative_id}"
-            
-            params = {
-                "access_token": self.access_token,
-                # Request comprehensive fields to see what's available
-                "fields": "id,name,title,body,image_url,image_hash,video_id,thumbnail_url,object_story_spec,effective_object_story_id,asset_feed_spec,object_type,url_tags,link_url,call_to_action_type"
-            }
-            
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            creative = response.json()
-            
-            # Debug: log what Meta returns
+        unique_ids = list(dict.fromkeys(creative_ids))
+        if not unique_ids:
+            return {}
+
+        key = f"act_{ad_account_id}" if ad_account_id else APP_KEY
+        creatives = self.graph_batch.get_many([
+            MetaGraphBatch.relative_url(creative_id, {"fields": self.CREATIVE_FIELDS})
+            for creative_id in unique_ids
+        ], keys=[key] * len(unique_ids))
+
+        # Extraire chaque creative et collecter les vidéos / posts à résoudre
+        details = {}
+        video_ids = []
+        story_ids = []
+        for creative_id, creative in zip(unique_ids, creatives):
+            if creative is None:
+                logging.warning(f"⚠️ Impossible de récupérer les détails du creative {creative_id}")
+                continue
             logging.info(f"🔍 Creative {creative_id} data: {creative}")
-            
-            # Extraire les informations créatives
-            creative_data = {
-                "creative_id": creative.get("id"),
-                "creative_name": creative.get("name", ""),
-                "title": "",
-                "body": "",
-                "call_to_action": "",
-                "link_url": "",
-                "images": [],
-                "videos": []
-            }
-            
-            # Check if this is an Advantage+ catalog ad with asset_feed_spec
-            if "asset_feed_spec" in creative:
-                feed_spec = creative["asset_feed_spec"]
-                
-                # Extract title
-                if "titles" in feed_spec and feed_spec["titles"]:
-                    creative_data["title"] = feed_spec["titles"][0].get("text", "")
-                
-                # Extract body
-                if "bodies" in feed_spec and feed_spec["bodies"]:
-                    creative_data["body"] = feed_spec["bodies"][0].get("text", "")
-                
-                # Extract description (fallback if no body)
-                if not creative_data["body"] and "descriptions" in feed_spec and feed_spec["descriptions"]:
-                    creative_data["body"] = feed_spec["descriptions"][0].get("text", "")
-                
-                # Extract link URL
-                if "link_urls" in feed_spec and feed_spec["link_urls"]:
-                    creative_data["link_url"] = feed_spec["link_urls"][0].get("website_url", "")
-                
-                # Extract call to action
-                if "call_to_action_types" in feed_spec and feed_spec["call_to_action_types"]:
-                    creative_data["call_to_action"] = feed_spec["call_to_action_types"][0]
-                
-                # Extract images from image hashes
-                if "images" in feed_spec:
-                    for img in feed_spec["images"]:
-                        if "hash" in img:
-                            # Construct image URL from hash
-                            image_url = f"https://scontent.xx.fbcdn.net/v/t45.1600-4/{img['hash']}"
-                            creative_data["images"].append(image_url)
-                
-                # Extract videos
-                if "videos" in feed_spec:
-                    for video in feed_spec["videos"]:
-                        if "video_id" in video:
-                            video_url = self._get_video_url(video["video_id"])
-                            if video_url:
-                                creative_data["videos"].append(video_url)
-            
-            # Fallback: Use thumbnail_url if no images found
-            if not creative_data["images"] and "thumbnail_url" in creative and creative["thumbnail_url"]:
-                creative_data["images"].append(creative["thumbnail_url"])
-            
-            # Try to get actual post content if effective_object_story_id is available
-            if "effective_object_story_id" in creative and not creative_data["title"]:
-                story_id = creative["effective_object_story_id"]
-                story_data = self._get_story_details(story_id)
-                if story_data:
-                    creative_data["title"] = story_data.get("name", "")
-                    creative_data["body"] = story_data.get("message", "")
-                    creative_data["link_url"] = story_data.get("link", "")
-                    
-                    # Get images from story
-                    if "full_picture" in story_data:
-                        creative_data["images"].append(story_data["full_picture"])
-            
+            creative_data, creative_video_ids, story_id = self._extract_creative_data(creative)
+            details[creative_id] = (creative_data, creative_video_ids, story_id)
+            video_ids.extend(creative_video_ids)
+            if story_id:
+                story_ids.append(story_id)
+
+        video_ids = list(dict.fromkeys(video_ids))
+        story_ids = list(dict.fromkeys(story_ids))
+        linked = self.graph_batch.get_many(
+            [MetaGraphBatch.relative_url(video_id, {"fields": self.VIDEO_FIELDS}) for video_id in video_ids]
+            + [MetaGraphBatch.relative_url(story_id, {"fields": self.STORY_FIELDS}) for story_id in story_ids],
+            keys=[key] * (len(video_ids) + len(story_ids)),
+        )
+        videos = dict(zip(video_ids, linked[:len(video_ids)]))
+        # Les Dynamic Ads n'ont pas de post accessible : réponse None attendue
+        stories = dict(zip(story_ids, linked[len(video_ids):]))
+
+        result = {}
+        for creative_id, (creative_data, creative_video_ids, story_id) in details.items():
+            for video_id in creative_video_ids:
+                video_url = (videos.get(video_id) or {}).get("source")
+                if video_url:
+                    creative_data["videos"].append(video_url)
+
+            story_data = stories.get(story_id) if story_id else None
+            if story_data:
+                creative_data["title"] = story_data.get("name", "")
+                creative_data["body"] = story_data.get("message", "")
+                creative_data["link_url"] = story_data.get("link", "")
+
+                # Get images from story
+                if "full_picture" in story_data:
+                    creative_data["images"].append(story_data["full_picture"])
+
             logging.info(f"✅ Creative data extracted: title={creative_data['title'][:50] if creative_data['title'] else ''}, images={len(creative_data['images'])}, videos={len(creative_data['videos'])}")
-            return creative_data
-            
-        except requests.exceptions.RequestException as e:
-            logging.warning(f"⚠️ Impossible de récupérer les détails du creative {creative_id}: {e}")
-            return None
-        except Exception as e:
-            logging.warning(f"⚠️ Erreur lors de la récupération du creative {creative_id}: {e}")
-            return None
-    
-    def _get_video_url(self, video_id: str) -> Optional[str]:
+            result[creative_id] = creative_data
+
+        return result
+
+    def _get_creative_details(self, creative_id: str) -> Optional[Dict[str, Any]]:
         """
-        Récupère l'URL de téléchargement d'une vidéo
+        Récupère les détails d'une création publicitaire
         
         Args:
-            video_id: ID de la vidéo
+            creative_id: ID de la création
             
         Returns:
-            URL de la vidéo ou None
+            Dictionnaire avec les détails de la création
         """
-        try:
-            url = f"{self.base_url}/{video_id}"
-            
-            params = {
-                "access_token": self.access_token,
-                "fields": "source,picture"
-            }
-            
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            video_data = response.json()
-            return video_data.get("source")
-            
-        except Exception as e:
-            logging.warning(f"⚠️ Impossible de récupérer l'URL de la vidéo {video_id}: {e}")
-            return None
-    
-    def _get_story_details(self, story_id: str) -> Optional[Dict[str, Any]]:
+        return self.get_creatives_details([creative_id]).get(creative_id)
+
+    def _extract_creative_data(self, creative: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str], Optional[str]]:
         """
-        Récupère les détails d'un post Facebook/Instagram
-        
-        Args:
-            story_id: ID du post (effective_object_story_id)
-            
+        Extrait les informations d'un creative Graph API
+
         Returns:
-            Dictionnaire avec les détails du post ou None
+            Tuple (détails de la création, IDs des vidéos à résoudre, ID du post à résoudre ou None)
         """
-        try:
-            url = f"{self.base_url}/{story_id}"
-            
-            params = {
-                "access_token": self.access_token,
-                "fields": "message,link,full_picture,name"
-            }
-            
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            return response.json()
-            
-        except requests.exceptions.HTTPError as e:
-            # Dynamic Ads don't have accessible story content - this is expected
-            logging.debug(f"Story {story_id} not accessible (likely Dynamic Ad): {e.response.status_code}")
-            return None
-        except Exception as e:
-            logging.debug(f"Could not fetch story {story_id}: {e}")
-            return None
+        creative_data = {
+            "creative_id": creative.get("id"),
+            "creative_name": creative.get("name", ""),
+            "title": "",
+            "body": "",
+            "call_to_action": "",
+            "link_url": "",
+            "images": [],
+            "videos": []
+        }
+        video_ids = []
+        
+        # Check if this is an Advantage+ catalog ad with asset_feed_spec
+        if "asset_feed_spec" in creative:
+            feed_spec = creative["asset_feed_spec"]
+            
+            # Extract title
+            if "titles" in feed_spec and feed_spec["titles"]:
+                creative_data["title"] = feed_spec["titles"][0].get("text", "")
+            
+            # Extract body
+            if "bodies" in feed_spec and feed_spec["bodies"]:
+                creative_data["body"] = feed_spec["bodies"][0].get("text", "")
+            
+            # Extract description (fallback if no body)
+            if not creative_data["body"] and "descriptions" in feed_spec and feed_spec["descriptions"]:
+                creative_data["body"] = feed_spec["descriptions"][0].get("text", "")
+            
+            # Extract link URL
+            if "link_urls" in feed_spec and feed_spec["link_urls"]:
+                creative_data["link_url"] = feed_spec["link_urls"][0].get("website_url", "")
+            
+            # Extract call to action
+            if "call_to_action_types" in feed_spec and feed_spec["call_to_action_types"]:
+                creative_data["call_to_action"] = feed_spec["call_to_action_types"][0]
+            
+            # Extract images from image hashes
+            if "images" in feed_spec:
+                for img in feed_spec["images"]:
+                    if "hash" in img:
+                        # Construct image URL from hash
+                        image_url = f"https://scontent.xx.fbcdn.net/v/t45.1600-4/{img['hash']}"
+                        creative_data["images"].append(image_url)
+            
+            # Videos: URLs résolues ensuite en requête groupée
+            if "videos" in feed_spec:
+                for video in feed_spec["videos"]:
+                    if "video_id" in video:
+                        video_ids.append(video["video_id"])
+        
+        # Fallback: Use thumbnail_url if no images found
+        if not creative_data["images"] and "thumbnail_url" in creative and creative["thumbnail_url"]:
+            creative_data["images"].append(creative["thumbnail_url"])
+        
+        # Try to get actual post content if effective_object_story_id is available
+        story_id = None
+        if "effective_object_story_id" in creative and not creative_data["title"]:
+            story_id = creative["effective_object_story_id"]
+
+        return creative_data, video_ids, story_id
     
-    def download_media_file(self, url: str) -> Tuple[Optional[bytes], Optional[str]]:
+    def open_media_stream(self, url: str) -> Optional[MediaStream]:
         """
-        Télécharge un fichier média depuis une URL
-        
+        Ouvre un fichier média en flux, sans lire son contenu
+
         Args:
             url: URL du fichier à télécharger
-            
+
         Returns:
-            Tuple (contenu du fichier en bytes, extension du fichier avec point, ex: '.jpg')
+            MediaStream (à fermer par l'appelant, extension dans .extension) ou None en cas d'erreur
         """
         try:
             logging.info(f"📥 Téléchargement de {url}")
-            
+
             # Pour les vidéos Meta, ajouter le token d'accès
             if "facebook.com" in url or "fbcdn.net" in url:
                 separator = "&" if "?" in url else "?"
                 url = f"{url}{separator}access_token={self.access_token}"
-            
-            response = requests.get(url, timeout=120, stream=True)  # Timeout plus long pour les vidéos
+
+            response = get_http_session().get(url, timeout=120, stream=True)  # Timeout plus long pour les vidéos
             response.raise_for_status()
-            
-            # Déterminer l'extension depuis le Content-Type ou l'URL
-            content_type = response.headers.get('Content-Type', '')
-            extension = None
-            
-            if 'image/jpeg' in content_type or url.endswith('.jpg') or url.endswith('.jpeg'):
-                extension = '.jpg'
-            elif 'image/png' in content_type or url.endswith('.png'):
-                extension = '.png'
-            elif 'image/gif' in content_type or url.endswith('.gif'):
-                extension = '.gif'
-            elif 'video/mp4' in content_type or url.endswith('.mp4'):
-                extension = '.mp4'
-            elif 'video/quicktime' in content_type or url.endswith('.mov'):
-                extension = '.mov'
-            elif 'video' in content_type:
-                extension = '.mp4'  # Par défaut pour les vidéos
-            else:
-                # Essayer d'extraire depuis l'URL (seulement si ça ressemble à une extension valide)
-                if '.' in url:
-                    potential_ext = url.split('.')[-1].split('?')[0].split('/')[0][:4]
-                    if potential_ext.lower() in ['jpg', 'jpeg', 'png', 'gif', 'mp4', 'mov', 'webp']:
-                        extension = f'.{potential_ext.lower()}'
-                    else:
-                        # Fallback: détecter par contenu
-                        extension = '.jpg'  # Par défaut
-            
-            # Lire le contenu
-            file_content = response.content
-            file_size_mb = len(file_content) / (1024 * 1024)
-            
-            return file_content, extension
-            
+            return MediaStream(response, url)
+
         except requests.exceptions.Timeout:
             logging.error(f"❌ Timeout lors du téléchargement de {url}")
-            return None, None
+            return None
         except requests.exceptions.RequestException as e:
             logging.error(f"❌ Erreur lors du téléchargement de {url}: {e}")
-            return None, None
+            return None
         except Exception as e:
             logging.error(f"❌ Erreur inattendue lors du téléchargement: {e}")
+            return None
+
+    def download_media_file(self, url: str) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        Télécharge un fichier média depuis une URL (contenu entier en mémoire,
+        préférer open_media_stream pour les gros fichiers)
+
+        Args:
+            url: URL du fichier à télécharger
+
+        Returns:
+            Tuple (contenu du fichier en bytes, extension du fichier avec point, ex: '.jpg')
+        """
+        stream = self.open_media_stream(url)
+        if stream is None:
+            return None, None
+        try:
+            with stream:
+                return stream.read_all(), stream.extension
+        except requests.exceptions.RequestException as e:
+            logging.error(f"❌ Erreur lors du téléchargement de {url}: {e}")
             return None, None
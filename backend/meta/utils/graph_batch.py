@@ -0,0 +1,184 @@
+"""
+Requêtes groupées Graph API Meta (paramètre 'batch', 50 sous-requêtes par appel)
+"""
+
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlencode
+
+import requests
+
+from backend.common.utils.http_session import get_http_session
+from backend.meta.utils.rate_limiter import (
+    APP_KEY,
+    MetaRateLimiter,
+    MetaRateLimitError,
+    get_meta_rate_limiter,
+    rate_limit_block_seconds,
+    rate_limit_key,
+)
+
+
+class MetaGraphBatch:
+    """
+    Regroupe des GET relatifs (ex: '<creative_id>?fields=...') en POST 'batch' de 50 au plus
+    et renvoie les réponses dans l'ordre des requêtes.
+
+    Chaque sous-requête a ses propres tentatives : seules celles en échec temporaire
+    (erreur 5xx, sous-requête expirée) sont renvoyées au lot suivant.
+
+    Quotas : le lot compte pour un appel de l'application et pour un appel de chaque
+    compte publicitaire visé (clé du limiteur partagé). Les en-têtes d'usage de
+    chaque sous-requête ajustent le débit de son compte ; une sous-requête refusée pour
+    limite de taux bloque son compte, et les sous-requêtes d'un compte bloqué ne sont
+    pas envoyées (réponse None).
+    """
+
+    MAX_BATCH_SIZE = 50
+    # Codes d'erreur Graph API transitoires (les limites de taux bloquent le compte)
+    RETRYABLE_ERROR_CODES = {1, 2, 341}
+
+    def __init__(self, access_token: str, base_url: str,
+                 post_func: Optional[Callable[[str, Dict[str, Any]], Any]] = None,
+                 max_retries: int = 2,
+                 limiter: Optional[MetaRateLimiter] = None):
+        self.access_token = access_token
+        self.base_url = base_url
+        self.post_func = post_func or self._default_post
+        self.max_retries = max_retries
+        self.limiter = limiter or get_meta_rate_limiter()
+
+    @staticmethod
+    def relative_url(path: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Construit une URL relative de sous-requête (sans access_token)"""
+        return f"{path}?{urlencode(params)}" if params else path
+
+    def get_many(self, relative_urls: List[str],
+                 keys: Optional[List[str]] = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        Exécute des GET relatifs par lots.
+
+        Args:
+            keys: clé du limiteur de chaque sous-requête (ex: 'act_123'), par défaut
+                déduite de l'URL ('app' si elle ne vise pas un compte)
+
+        Returns:
+            Corps JSON de chaque réponse (même ordre que relative_urls), None en cas d'échec
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(relative_urls)
+        keys = keys or [rate_limit_key(f"/{url}") for url in relative_urls]
+        pending = list(range(len(relative_urls)))
+
+        for attempt in range(self.max_retries + 1):
+            retry = []
+            for start in range(0, len(pending), self.MAX_BATCH_SIZE):
+                chunk = pending[start:start + self.MAX_BATCH_SIZE]
+                retry.extend(self._run_chunk(chunk, relative_urls, keys, results))
+
+            if not retry:
+                break
+            if attempt < self.max_retries:
+                wait_time = 2 ** attempt
+                logging.info(f"⏳ {len(retry)} sous-requête(s) Meta à relancer dans {wait_time}s ({attempt + 1}/{self.max_retries})")
+                time.sleep(wait_time)
+            else:
+                logging.warning(f"⚠️ {len(retry)} sous-requête(s) Meta en échec après {self.max_retries} tentatives")
+            pending = retry
+
+        return results
+
+    def _run_chunk(self, chunk: List[int], relative_urls: List[str], keys: List[str],
+                   results: List[Optional[Dict[str, Any]]]) -> List[int]:
+        """Envoie un lot et remplit results ; renvoie les index à relancer"""
+        try:
+            # Un lot compte pour un appel dans le quota de l'application
+            self.limiter.acquire(APP_KEY)
+        except MetaRateLimitError as e:
+            logging.error(f"❌ Lot Meta non envoyé: {e}")
+            return []
+
+        # Un appel par compte présent dans le lot ; les sous-requêtes d'un compte bloqué
+        # au-delà de la deadline ne partent pas (réponse None)
+        available = set()
+        for key in dict.fromkeys(keys[i] for i in chunk):
+            try:
+                self.limiter.acquire(key)
+                available.add(key)
+            except MetaRateLimitError as e:
+                logging.warning(f"⚠️ Sous-requêtes Meta non envoyées: {e}")
+        sendable = [index for index in chunk if keys[index] in available]
+        if not sendable:
+            return []
+
+        batch = [{"method": "GET", "relative_url": relative_urls[i]} for i in sendable]
+        data = {
+            "access_token": self.access_token,
+            "batch": json.dumps(batch),
+            "include_headers": "true",
+        }
+        response = self.post_func(f"{self.base_url}/", data)
+        if response is None:
+            return list(sendable)
+        self._observe(APP_KEY, getattr(response, "headers", None) or {})
+
+        try:
+            items = response.json()
+        except ValueError:
+            logging.error("❌ Réponse batch Meta illisible")
+            return list(sendable)
+
+        retry = []
+        for index, item in zip(sendable, items):
+            if item:
+                self._observe(keys[index], {h.get("name"): h.get("value") for h in item.get("headers") or []})
+            body, error, should_retry = self._parse_item(item)
+            if body is not None:
+                results[index] = body
+                continue
+            block_seconds = rate_limit_block_seconds(error)
+            if block_seconds:
+                self.limiter.block(keys[index], block_seconds)
+            elif should_retry:
+                retry.append(index)
+            else:
+                logging.warning(f"⚠️ Sous-requête Meta en échec: {relative_urls[index].split('?')[0]}")
+        return retry
+
+    def _observe(self, key: str, headers: Dict[str, Any]) -> None:
+        # Le quota de l'application ne suit que X-App-Usage : l'usage par compte
+        # (X-Business-Use-Case-Usage, X-Ad-Account-Usage) va au seau du compte
+        if key == APP_KEY:
+            headers = {"X-App-Usage": headers.get("X-App-Usage")}
+        self.limiter.observe(key, headers)
+
+    def _parse_item(self, item: Optional[Dict[str, Any]]):
+        """Renvoie (corps JSON ou None, erreur Graph API, à relancer ?)"""
+        if item is None:
+            # Meta renvoie null pour une sous-requête non exécutée à temps
+            return None, {}, True
+
+        try:
+            body = json.loads(item.get("body") or "null")
+        except ValueError:
+            body = None
+
+        code = item.get("code", 0)
+        if code == 200 and body is not None:
+            return body, {}, False
+
+        error = body.get("error", {}) if isinstance(body, dict) else {}
+        return None, error, code >= 500 or error.get("code") in self.RETRYABLE_ERROR_CODES
+
+    @staticmethod
+    def _default_post(url: str, data: Dict[str, Any]):
+        try:
+            response = get_http_session().post(url, data=data, timeout=60)
+        except requests.exceptions.RequestException as e:
+            logging.error(f"❌ Exception lors de la requête batch Meta: {e}")
+            return None
+        if response.status_code != 200:
+            logging.error(f"❌ Erreur API Meta (batch): {response.status_code} - {response.text[:200]}")
+            return None
+        return response
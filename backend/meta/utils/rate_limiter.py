@@ -0,0 +1,255 @@
+"""
+Limiteur de débit Graph API Meta piloté par les en-têtes d'usage
+
+Meta renvoie l'usage des quotas sur chaque réponse (X-Business-Use-Case-Usage,
+X-App-Usage, X-Ad-Account-Usage). Le débit de chaque compte publicitaire est
+réduit avant d'atteindre la limite, et un appel qui ne peut pas partir avant la
+deadline de l'appelant échoue immédiatement (MetaRateLimitError) au lieu de
+bloquer le worker plusieurs minutes.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from backend.common.utils.platform_executor import stage_time_remaining
+
+_ACCOUNT_PATTERN = re.compile(r"/act_(\d+)")
+
+# Clé utilisée pour les appels qui ne visent pas un compte (batch, business, créas)
+APP_KEY = "app"
+
+
+class MetaRateLimitError(Exception):
+    """Quota Meta insuffisant pour exécuter l'appel avant la deadline"""
+
+    def __init__(self, key: str, retry_after: float):
+        self.key = key
+        self.retry_after = retry_after
+        super().__init__(f"Limite de taux Meta pour '{key}' : nouvel essai possible dans {retry_after:.0f}s")
+
+
+def rate_limit_key(url: str) -> str:
+    """Compte publicitaire visé par une URL Graph API (ou 'app')"""
+    match = _ACCOUNT_PATTERN.search(url or "")
+    return f"act_{match.group(1)}" if match else APP_KEY
+
+
+def rate_limit_block_seconds(error: Optional[Dict[str, Any]]) -> float:
+    """
+    Classe une erreur Graph API ({'code': ..., 'error_subcode': ...}).
+
+    Returns:
+        Durée (secondes) pendant laquelle bloquer la clé si c'est une limite de taux, 0 sinon
+    """
+    if not isinstance(error, dict):
+        return 0.0
+    code = error.get("code")
+    if code == 4:  # Rate limit application / utilisateur
+        subcode = error.get("error_subcode")
+        if subcode == 1504022:  # Application request limit
+            return 300.0
+        if subcode == 1504023:  # User request limit
+            return 60.0
+        return 120.0
+    if code in (17, 32, 613, 80000, 80004):  # Limites utilisateur, page, compte publicitaire / insights
+        return 120.0
+    return 0.0
+
+
+def response_rate_limit_seconds(response) -> float:
+    """Blocage à appliquer pour une réponse HTTP Meta refusée pour limite de taux (0 sinon)"""
+    if response.status_code not in (400, 403):
+        return 0.0
+    try:
+        error = response.json().get("error", {})
+    except (ValueError, AttributeError):
+        return 0.0
+    return rate_limit_block_seconds(error)
+
+
+def _parse_header(value: Optional[str]) -> Any:
+    if not value:
+        return None
+    try:
+        return json.loads(value)
+    except ValueError:
+        return None
+
+
+def parse_usage_headers(headers) -> Dict[str, float]:
+    """
+    Lit les en-têtes d'usage Meta.
+
+    Returns:
+        Dict {usage: pourcentage max utilisé (0-100), regain_seconds: blocage annoncé par Meta}
+    """
+    usage = 0.0
+    regain_seconds = 0.0
+
+    app_usage = _parse_header(headers.get("X-App-Usage"))
+    if isinstance(app_usage, dict):
+        usage = max([usage] + [float(app_usage.get(k, 0) or 0) for k in ("call_count", "total_time", "total_cputime")])
+
+    account_usage = _parse_header(headers.get("X-Ad-Account-Usage"))
+    if isinstance(account_usage, dict):
+        usage = max(usage, float(account_usage.get("acc_id_util_pct", 0) or 0))
+        regain_seconds = max(regain_seconds, float(account_usage.get("reset_time_duration", 0) or 0))
+
+    business_usage = _parse_header(headers.get("X-Business-Use-Case-Usage"))
+    if isinstance(business_usage, dict):
+        for entries in business_usage.values():
+            for entry in entries if isinstance(entries, list) else []:
+                usage = max([usage] + [float(entry.get(k, 0) or 0) for k in ("call_count", "total_time", "total_cputime")])
+                # estimated_time_to_regain_access est exprimé en minutes
+                regain_seconds = max(regain_seconds, float(entry.get("estimated_time_to_regain_access", 0) or 0) * 60)
+
+    return {"usage": usage, "regain_seconds": regain_seconds}
+
+
+class _TokenBucket:
+    """Seau de jetons d'une clé ; le débit est multiplié par un facteur issu de l'usage Meta"""
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.factor = 1.0
+        self.usage = 0.0
+        self.blocked_until = 0.0
+        self.updated_at = now
+
+    def refill(self, now: float) -> None:
+        elapsed = max(now - self.updated_at, 0)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate * self.factor)
+        self.updated_at = now
+
+    def wait_time(self, now: float) -> float:
+        """Secondes avant qu'un jeton soit disponible"""
+        if self.blocked_until > now:
+            return self.blocked_until - now
+        self.refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / (self.rate * self.factor)
+
+
+class MetaRateLimiter:
+    """
+    Un seau de jetons par compte publicitaire, ralenti selon l'usage renvoyé par Meta.
+
+    Sous THROTTLE_START % d'usage le débit nominal s'applique ; au-delà il décroît
+    linéairement jusqu'à MIN_FACTOR, et à partir de BLOCK_AT % (ou si Meta annonce
+    un délai de récupération) la clé est bloquée.
+    """
+
+    RATE_PER_SECOND = 5.0
+    BURST = 10
+    THROTTLE_START = 60.0
+    BLOCK_AT = 95.0
+    MIN_FACTOR = 0.05
+    # Blocage par défaut quand Meta refuse l'appel sans indiquer de délai
+    DEFAULT_BLOCK_SECONDS = 60.0
+    # Attente maximale par appel hors étape d'export et sans deadline de l'appelant (< timeout gunicorn)
+    DEFAULT_MAX_WAIT = 20.0
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets: Dict[str, _TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, key: str, now: float) -> _TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _TokenBucket(self.RATE_PER_SECOND, self.BURST, now)
+        return bucket
+
+    def acquire(self, key: str, max_wait: Optional[float] = None) -> None:
+        """
+        Réserve un appel pour la clé, en attendant au plus max_wait secondes
+        (par défaut : le budget restant de l'étape d'export en cours, sinon DEFAULT_MAX_WAIT).
+
+        Raises:
+            MetaRateLimitError: si l'appel ne peut pas partir dans le délai
+        """
+        if max_wait is None:
+            max_wait = stage_time_remaining()
+        if max_wait is None:
+            max_wait = self.DEFAULT_MAX_WAIT
+        deadline = self._clock() + max_wait
+        while True:
+            with self._lock:
+                now = self._clock()
+                bucket = self._bucket(key, now)
+                wait = bucket.wait_time(now)
+                if wait <= 0:
+                    bucket.tokens -= 1
+                    return
+                if now + wait > deadline:
+                    logging.warning(f"⛔ Quota Meta '{key}' : {wait:.1f}s d'attente > deadline, appel annulé")
+                    raise MetaRateLimitError(key, wait)
+            self._sleep(wait)
+
+    def observe(self, key: str, headers) -> None:
+        """Ajuste le débit de la clé d'après les en-têtes d'usage d'une réponse"""
+        parsed = parse_usage_headers(headers)
+        usage, regain_seconds = parsed["usage"], parsed["regain_seconds"]
+        with self._lock:
+            now = self._clock()
+            bucket = self._bucket(key, now)
+            bucket.refill(now)
+            bucket.usage = usage
+            if usage <= self.THROTTLE_START:
+                bucket.factor = 1.0
+            else:
+                remaining = max(self.BLOCK_AT - usage, 0) / (self.BLOCK_AT - self.THROTTLE_START)
+                bucket.factor = max(remaining, self.MIN_FACTOR)
+
+            block_seconds = regain_seconds
+            if usage >= self.BLOCK_AT and not block_seconds:
+                block_seconds = self.DEFAULT_BLOCK_SECONDS
+            if block_seconds:
+                bucket.blocked_until = max(bucket.blocked_until, now + block_seconds)
+
+        if usage > self.THROTTLE_START:
+            logging.info(f"🐢 Usage Meta '{key}' à {usage:.0f}% : débit réduit à x{bucket.factor:.2f}")
+
+    def block(self, key: str, seconds: Optional[float] = None) -> None:
+        """Bloque la clé après un refus Meta (erreur de limite de taux)"""
+        seconds = self.DEFAULT_BLOCK_SECONDS if seconds is None else seconds
+        with self._lock:
+            now = self._clock()
+            bucket = self._bucket(key, now)
+            bucket.blocked_until = max(bucket.blocked_until, now + seconds)
+        logging.warning(f"⚠️ Limite de taux Meta atteinte pour '{key}' : bloqué {seconds:.0f}s")
+
+    def get_status(self) -> Dict[str, Any]:
+        """État des seaux pour le monitoring"""
+        with self._lock:
+            now = self._clock()
+            return {
+                key: {
+                    "usage": bucket.usage,
+                    "factor": round(bucket.factor, 3),
+                    "blocked_for": round(max(bucket.blocked_until - now, 0), 1),
+                }
+                for key, bucket in self._buckets.items()
+            }
+
+
+_limiter: Optional[MetaRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_meta_rate_limiter() -> MetaRateLimiter:
+    """Limiteur partagé par tous les services Meta du process"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = MetaRateLimiter()
+        return _limiter
@@ -0,0 +1,230 @@
+"""
+Cache disque des graphiques rendus (PNG), indexé par hash du contenu.
+
+La clé combine la fonction de graphique (nom + bytecode, y compris celui des
+fonctions de style enregistrées par @chart_style), les séries réellement tracées
+et les paramètres de style : un graphique déjà rendu avec les mêmes données est
+recopié depuis le cache sans appeler matplotlib ni kaleido.
+Le répertoire est borné en taille (éviction LRU d'après la date d'accès des fichiers)
+et peut être partagé par plusieurs process de rendu (écritures atomiques).
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.config.settings import Config
+
+# À incrémenter si le rendu change hors des fonctions hashées (constantes de styles.py,
+# version de matplotlib/kaleido) ; le code des graphiques et du style est déjà dans la clé
+CHART_CACHE_VERSION = 1
+
+# Fonctions de style communes à tous les graphiques (ex: setup_chart_style)
+_style_functions: List[Callable] = []
+
+
+class ChartCache:
+    """Répertoire de PNG nommés par clé sha256, borné à max_bytes."""
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.directory = Path(directory or Config.PATHS.CHART_CACHE_DIR)
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("CHART_CACHE_MAX_MB", "200")) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 and os.getenv("CHART_CACHE_DISABLED", "").lower() not in ("1", "true")
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.png"
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # LRU : marque l'entrée comme récemment utilisée
+        except OSError:
+            pass
+        self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.directory / f".{key}.{uuid.uuid4().hex}.tmp"
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, self._path(key))
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _scan_size(self) -> int:
+        return sum(p.stat().st_size for p in self.directory.glob("*.png"))
+
+    def _evict(self) -> None:
+        """Supprime les entrées les moins récemment utilisées jusqu'à 90 % de la limite."""
+        entries = []
+        for path in self.directory.glob("*.png"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self._size = total
+        if removed:
+            logging.info(f"🧹 Cache graphiques : {removed} image(s) évincée(s)")
+
+
+_cache: Optional[ChartCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_chart_cache() -> ChartCache:
+    """Cache partagé du process"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ChartCache()
+        return _cache
+
+
+def history_series(history, *keys) -> list:
+    """Ne garde de l'historique que les mois et les colonnes tracées (clé insensible aux autres colonnes)"""
+    return [[entry.get("month_fr", "")] + [entry.get(k) for k in keys] for entry in history or []]
+
+
+def chart_style(func: Callable) -> Callable:
+    """Enregistre une fonction de style commune : son code entre dans la clé de tous les graphiques"""
+    _style_functions.append(func)
+    return func
+
+
+def _update_code_digest(digest, code) -> None:
+    """
+    Bytecode, noms et constantes (fonctions imbriquées comprises), sans le chemin du
+    fichier ni les numéros de ligne : déplacer une fonction ne vide pas le cache.
+    """
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode("utf-8"))
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            _update_code_digest(digest, const)
+        elif isinstance(const, frozenset):  # `x in {...}` : ordre d'itération variable entre process
+            digest.update(repr(sorted(map(repr, const))).encode("utf-8"))
+        else:
+            digest.update(repr(const).encode("utf-8"))
+
+
+def _function_fingerprint(*funcs: Callable) -> str:
+    digest = hashlib.sha256()
+    for func in funcs:
+        _update_code_digest(digest, func.__code__)
+    return digest.hexdigest()[:16]
+
+
+def write_png(output_path, data: bytes) -> None:
+    """Écrit un PNG déjà rendu dans un chemin ou un flux (BytesIO)."""
+    if hasattr(output_path, "write"):
+        output_path.write(data)
+    else:
+        with open(output_path, "wb") as f:
+            f.write(data)
+
+
+def _read_output(output) -> bytes:
+    if hasattr(output, "getvalue"):
+        return output.getvalue()
+    with open(output, "rb") as f:
+        return f.read()
+
+
+def cached_chart(key_inputs: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+                 depends_on: Tuple[Callable, ...] = ()):
+    """
+    Décorateur pour une fonction de graphique qui écrit un PNG dans `output_path`
+    (chemin de fichier ou flux BytesIO).
+
+    Args:
+        key_inputs: réduit les arguments (sans output_path) aux données réellement tracées
+        depends_on: fonctions auxiliaires dont le code entre aussi dans la clé (ex: construction de la figure)
+
+    La fonction décorée expose cache_key(*args, **kwargs) -> (clé, output_path).
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        fingerprint = None
+
+        def cache_key(*args, **kwargs):
+            nonlocal fingerprint
+            if fingerprint is None:
+                # Calculée au premier appel : les fonctions de style sont alors toutes enregistrées
+                fingerprint = _function_fingerprint(func, *depends_on, *_style_functions)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            inputs = dict(bound.arguments)
+            output_path = inputs.pop("output_path")
+            if key_inputs is not None:
+                inputs = key_inputs(inputs)
+
+            payload = json.dumps(
+                [CHART_CACHE_VERSION, func.__name__, fingerprint, inputs],
+                sort_keys=True, default=str,
+            )
+            return hashlib.sha256(payload.encode("utf-8")).hexdigest(), output_path
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = get_chart_cache()
+            if not cache.enabled:
+                return func(*args, **kwargs)
+
+            key, output_path = cache_key(*args, **kwargs)
+            cached = cache.get(key)
+            if cached is not None:
+                write_png(output_path, cached)
+                return None
+
+            result = func(*args, **kwargs)
+            try:
+                data = _read_output(output_path)
+                if data:  # rien d'écrit (ex: historique vide) : rien à mettre en cache
+                    cache.put(key, data)
+            except OSError as e:
+                logging.warning(f"⚠️ Graphique non mis en cache ({func.__name__}): {e}")
+            return result
+
+        wrapper.cache_key = cache_key
+        return wrapper
+    return decorator
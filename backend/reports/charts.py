@@ -1,16 +1,23 @@
 """
 Génération de graphiques matplotlib pour les rapports PPTX.
 Tous les graphiques sont conçus pour être affichés sur fond noir (dark theme Tarmaac).
+Les PNG rendus sont mis en cache sur disque (voir chart_cache) ; les graphiques
+Plotly passent par le renderer kaleido gardé chaud (voir plotly_renderer).
+`output_path` accepte un chemin ou un flux (io.BytesIO) : les templates rendent en mémoire.
 """
 
+import io
+
 import matplotlib
 matplotlib.use('Agg')
 
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
 import numpy as np
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
+from backend.reports.chart_cache import cached_chart, chart_style, get_chart_cache, history_series, write_png
+from backend.reports.plotly_renderer import get_plotly_renderer
 from backend.reports.styles import INVERSE_METRICS
 
 
@@ -18,6 +25,7 @@ from backend.reports.styles import INVERSE_METRICS
 # Style global matplotlib (dark theme)
 # ──────────────────────────────────────────────
 
+@chart_style
 def setup_chart_style():
     """Configure matplotlib pour le dark theme Tarmaac."""
     plt.rcParams.update({
@@ -66,6 +74,7 @@ def _format_bar_value(value: float) -> str:
 # 1. Bar chart comparatif M vs M-1
 # ──────────────────────────────────────────────
 
+@cached_chart()
 def create_comparison_bar_chart(
     current_values: List[float],
     previous_values: List[float],
@@ -86,7 +95,7 @@ def create_comparison_bar_chart(
         fig, ax = plt.subplots(figsize=(8, 4))
         ax.text(0.5, 0.5, "Aucune donnée", ha="center", va="center", color="white", fontsize=14)
         ax.axis("off")
-        plt.savefig(output_path, dpi=150, bbox_inches="tight")
+        plt.savefig(output_path, format="png", dpi=150, bbox_inches="tight")
         plt.close()
         return
 
@@ -124,7 +133,7 @@ def create_comparison_bar_chart(
         ax.set_ylim(bottom=0, top=y_max * 1.25)
 
     plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches="tight")
+    plt.savefig(output_path, format="png", dpi=150, bbox_inches="tight")
     plt.close()
 
 
@@ -132,6 +141,7 @@ def create_comparison_bar_chart(
 # 2. Donut répartition budget par plateforme
 # ──────────────────────────────────────────────
 
+@cached_chart()
 def create_budget_donut(
     google_cost: float,
     meta_cost: float,
@@ -152,7 +162,7 @@ def create_budget_donut(
         ax.set_xlim(0, 1)
         ax.set_ylim(0, 1)
         ax.axis("off")
-        plt.savefig(output_path, dpi=150, bbox_inches="tight")
+        plt.savefig(output_path, format="png", dpi=150, bbox_inches="tight")
         plt.close()
         return
 
@@ -205,7 +215,7 @@ def create_budget_donut(
     total_str = f"{total:,.0f} €".replace(",", " ")
     ax.text(0, 0, total_str, ha="center", va="center", fontsize=18, fontweight="bold", color="white")
 
-    plt.savefig(output_path, dpi=150, bbox_inches="tight")
+    plt.savefig(output_path, format="png", dpi=150, bbox_inches="tight")
     plt.close()
 
 
@@ -213,6 +223,7 @@ def create_budget_donut(
 # 3. KPI comparison horizontal
 # ──────────────────────────────────────────────
 
+@cached_chart()
 def create_kpi_comparison_chart(
     metrics_data: List[Dict[str, Any]],
     output_path: str,
@@ -227,7 +238,7 @@ def create_kpi_comparison_chart(
         fig, ax = plt.subplots(figsize=(6, 3))
         ax.text(0.5, 0.5, "Aucune donnée", ha="center", va="center", color="white", fontsize=14)
         ax.axis("off")
-        plt.savefig(output_path, dpi=150, transparent=True, bbox_inches="tight")
+        plt.savefig(output_path, format="png", dpi=150, transparent=True, bbox_inches="tight")
         plt.close()
         return
 
@@ -284,7 +295,7 @@ def create_kpi_comparison_chart(
     ax.set_xlim(-x_max * 1.4, x_max * 1.4)
 
     plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches="tight")
+    plt.savefig(output_path, format="png", dpi=150, bbox_inches="tight")
     plt.close()
 
 
@@ -292,6 +303,7 @@ def create_kpi_comparison_chart(
 # 4. Donut répartition budget Google par canal
 # ──────────────────────────────────────────────
 
+@cached_chart()
 def create_platform_breakdown_chart(
     search_cost: float,
     pmax_cost: float,
@@ -326,7 +338,7 @@ def create_platform_breakdown_chart(
         fig, ax = plt.subplots(figsize=(4, 4))
         ax.text(0.5, 0.5, "Aucune donnée", ha="center", va="center", color="white", fontsize=14)
         ax.axis("off")
-        plt.savefig(output_path, dpi=150, transparent=True, bbox_inches="tight")
+        plt.savefig(output_path, format="png", dpi=150, transparent=True, bbox_inches="tight")
         plt.close()
         return
 
@@ -356,7 +368,7 @@ def create_platform_breakdown_chart(
     total_str = f"{total:,.0f} €".replace(",", " ")
     ax.text(0, 0, total_str, ha="center", va="center", fontsize=18, fontweight="bold", color="white")
 
-    plt.savefig(output_path, dpi=150, bbox_inches="tight")
+    plt.savefig(output_path, format="png", dpi=150, bbox_inches="tight")
     plt.close()
 
 
@@ -364,6 +376,7 @@ def create_platform_breakdown_chart(
 # 5. Line chart évolution (1 métrique, 3 mois)
 # ──────────────────────────────────────────────
 
+@cached_chart(lambda a: {**a, "history": history_series(a["history"], a["metric_key"])})
 def create_evolution_line_chart(
     history: List[Dict[str, Any]],
     metric_key: str,
@@ -378,7 +391,7 @@ def create_evolution_line_chart(
         history: Liste de dicts triés chronologiquement, chaque dict a "month_fr" et la métrique.
         metric_key: Nom de colonne Sheet à tracer.
         chart_title: Titre affiché au-dessus du graphique.
-        output_path: Chemin du PNG de sortie.
+        output_path: Chemin ou flux (BytesIO) du PNG de sortie.
     """
     setup_chart_style()
 
@@ -386,7 +399,7 @@ def create_evolution_line_chart(
         fig, ax = plt.subplots(figsize=(5, 3))
         ax.text(0.5, 0.5, "Aucune donnée", ha="center", va="center", color="white", fontsize=14)
         ax.axis("off")
-        plt.savefig(output_path, dpi=150, transparent=True, bbox_inches="tight")
+        plt.savefig(output_path, format="png", dpi=150, transparent=True, bbox_inches="tight")
         plt.close()
         return
 
@@ -422,7 +435,7 @@ def create_evolution_line_chart(
         ax.set_ylim(bottom=0, top=y_max * 1.25)
 
     plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches="tight")
+    plt.savefig(output_path, format="png", dpi=150, bbox_inches="tight")
     plt.close()
 
 
@@ -430,23 +443,15 @@ def create_evolution_line_chart(
 # 6. Plotly — Line chart évolution (dark theme)
 # ──────────────────────────────────────────────
 
-def create_plotly_evolution_chart(
+def _build_plotly_evolution_figure(
     history: List[Dict[str, Any]],
     metric_key: str,
     chart_title: str,
-    output_path: str,
     line_color: str = None,
-) -> None:
-    """
-    Line chart Plotly montrant l'évolution d'une métrique sur les derniers mois.
-    Rendu plus moderne que matplotlib, avec remplissage sous la courbe.
-    """
+):
+    """Figure de create_plotly_evolution_chart (historique non vide)"""
     import plotly.graph_objects as go
 
-    if not history:
-        create_evolution_line_chart(history, metric_key, chart_title, output_path, line_color)
-        return
-
     months = [entry.get("month_fr", "") for entry in history]
     values = [_safe_float(entry.get(metric_key, 0)) for entry in history]
 
@@ -501,31 +506,88 @@ def create_plotly_evolution_chart(
     if values and max(values) > 0:
         fig.update_yaxes(range=[0, max(values) * 1.25])
 
-    fig.write_image(output_path, format="png", scale=2)
+    return fig
+
+
+@cached_chart(
+    lambda a: {**a, "history": history_series(a["history"], a["metric_key"])},
+    depends_on=(_build_plotly_evolution_figure,),
+)
+def create_plotly_evolution_chart(
+    history: List[Dict[str, Any]],
+    metric_key: str,
+    chart_title: str,
+    output_path: str,
+    line_color: str = None,
+) -> None:
+    """
+    Line chart Plotly montrant l'évolution d'une métrique sur les derniers mois.
+    Rendu plus moderne que matplotlib, avec remplissage sous la courbe.
+    """
+    if not history:
+        create_evolution_line_chart(history, metric_key, chart_title, output_path, line_color)
+        return
+
+    fig = _build_plotly_evolution_figure(history, metric_key, chart_title, line_color)
+    write_png(output_path, get_plotly_renderer().render(fig))
+
+
+def render_plotly_evolution_charts(
+    history: List[Dict[str, Any]],
+    items: List[Tuple[str, str]],
+    line_color: str = None,
+) -> List[io.BytesIO]:
+    """
+    Plusieurs line charts Plotly d'un même historique rendus à la suite, sous une seule prise du renderer kaleido.
+
+    Args:
+        items: (metric_key, chart_title) de chaque graphique
+
+    Returns:
+        Un PNG en mémoire par item, dans l'ordre (mêmes images et même cache que
+        create_plotly_evolution_chart)
+    """
+    cache = get_chart_cache()
+    outputs = [io.BytesIO() for _ in items]
+    pending = []
+    for output, (metric_key, chart_title) in zip(outputs, items):
+        if not history or not cache.enabled:
+            key = None
+        else:
+            key, _ = create_plotly_evolution_chart.cache_key(history, metric_key, chart_title, output, line_color)
+            cached = cache.get(key)
+            if cached is not None:
+                output.write(cached)
+                continue
+        if not history:
+            create_evolution_line_chart(history, metric_key, chart_title, output, line_color)
+            continue
+        pending.append((output, key, _build_plotly_evolution_figure(history, metric_key, chart_title, line_color)))
+
+    images = get_plotly_renderer().render_many([fig for _, _, fig in pending], scale=2)
+    for (output, key, _), png in zip(pending, images):
+        output.write(png)
+        if key is not None:
+            cache.put(key, png)
+    return outputs
 
 
 # ──────────────────────────────────────────────
 # 7. Plotly — Dual axis chart (coûts + leads)
 # ──────────────────────────────────────────────
 
-def create_plotly_dual_axis_chart(
+def _build_plotly_dual_axis_figure(
     history: List[Dict[str, Any]],
     cost_key: str,
     leads_key: str,
     chart_title: str,
-    output_path: str,
     cost_color: str = "#FFC107",
     leads_color: str = "#FFFFFF",
-) -> None:
-    """
-    Chart Plotly double axe : coûts (axe gauche) + leads (axe droite).
-    """
+):
+    """Figure de create_plotly_dual_axis_chart (historique non vide)"""
     import plotly.graph_objects as go
     from plotly.subplots import make_subplots
 
-    if not history:
-        return
-
     months = [entry.get("month_fr", "") for entry in history]
     costs = [_safe_float(entry.get(cost_key, 0)) for entry in history]
     leads = [_safe_float(entry.get(leads_key, 0)) for entry in history]
@@ -623,4 +685,27 @@ def create_plotly_dual_axis_chart(
     if leads and max(leads) > 0:
         fig.update_yaxes(range=[0, max(leads) * 1.3], secondary_y=True)
 
-    fig.write_image(output_path, format="png", scale=2)
+    return fig
+
+
+@cached_chart(
+    lambda a: {**a, "history": history_series(a["history"], a["cost_key"], a["leads_key"])},
+    depends_on=(_build_plotly_dual_axis_figure,),
+)
+def create_plotly_dual_axis_chart(
+    history: List[Dict[str, Any]],
+    cost_key: str,
+    leads_key: str,
+    chart_title: str,
+    output_path: str,
+    cost_color: str = "#FFC107",
+    leads_color: str = "#FFFFFF",
+) -> None:
+    """
+    Chart Plotly double axe : coûts (axe gauche) + leads (axe droite).
+    """
+    if not history:
+        return
+
+    fig = _build_plotly_dual_axis_figure(history, cost_key, leads_key, chart_title, cost_color, leads_color)
+    write_png(output_path, get_plotly_renderer().render(fig))
@@ -9,6 +9,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
+from backend.common.services.google_sheets import merge_header_rows
 from backend.reports.styles import (
     GOOGLE_METRICS, META_METRICS, CONVERSION_METRICS,
     GENERAL_METRICS, MICROSOFT_METRICS, IGNORED_COLUMNS,
@@ -156,28 +157,31 @@ def _categorize_metrics(flat_dict: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
 def _find_ga_config_for_worksheet(worksheet_name: str, available_sheets: List[str]) -> Optional[Dict[str, Any]]:
     """
     Trouve la config googleAnalytics du client correspondant à un onglet Sheet.
-    Fait un reverse lookup via les mappings client.
+    Fait un reverse lookup via l'index onglet → config GA du registre des mappings.
 
     Returns:
         Le bloc googleAnalytics du client (avec propertyId + pages), ou None.
     """
     try:
-        from backend.common.services.client_resolver import ClientResolverService
+        from backend.common.services.mapping_registry import get_mapping_registry
 
-        resolver = ClientResolverService()
-        for client_name, mapping in resolver.mappings.items():
-            ga_config = mapping.get("googleAnalytics")
-            if not ga_config:
-                continue
-            client_sheet = _resolve_worksheet_name(client_name, available_sheets)
-            if client_sheet == worksheet_name:
-                return ga_config
-        return None
+        return get_mapping_registry().ga_config_for_worksheet(worksheet_name, available_sheets)
     except Exception as e:
         logging.error(f"❌ Erreur recherche config GA pour '{worksheet_name}': {e}")
         return None
 
 
+def _ga_configs_by_worksheet(available_sheets: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Configs googleAnalytics de tous les clients, indexées par onglet résolu."""
+    try:
+        from backend.common.services.mapping_registry import get_mapping_registry
+
+        return get_mapping_registry().ga_configs_by_worksheet(available_sheets)
+    except Exception as e:
+        logging.error(f"❌ Erreur chargement des configs GA: {e}")
+        return {}
+
+
 def _resolve_worksheet_name(
     client_name: str,
     available_sheets: List[str],
@@ -187,42 +191,12 @@ def _resolve_worksheet_name(
     Logique : mapping Google → mapping Meta → nom du client directement.
     """
     try:
-        from backend.google_ads_wrapper.utils.mappings import GoogleAdsMappingService
-        from backend.meta.utils.mappings import MetaAdsMappingService
-        from backend.common.services.client_resolver import ClientResolverService
-
-        resolver = ClientResolverService()
-        client_info = resolver.resolve_client_accounts(client_name)
-
-        if not client_info:
-            if client_name in available_sheets:
-                return client_name
-            return None
-
-        # Essayer mapping Google
-        google_customer_id = None
-        if client_info.get("googleAds") and client_info["googleAds"].get("customerId"):
-            google_customer_id = client_info["googleAds"]["customerId"]
-            google_mappings = GoogleAdsMappingService()
-            sheet_name = google_mappings.get_sheet_name_for_customer(google_customer_id)
-            if sheet_name and sheet_name in available_sheets:
-                return sheet_name
-
-        # Essayer mapping Meta
-        meta_account_id = None
-        if client_info.get("metaAds") and client_info["metaAds"].get("adAccountId"):
-            meta_account_id = client_info["metaAds"]["adAccountId"]
-            meta_mappings = MetaAdsMappingService()
-            sheet_name = meta_mappings.get_sheet_name_for_account(meta_account_id)
-            if sheet_name and sheet_name in available_sheets:
-                return sheet_name
-
-        # Fallback : nom du client directement
-        if client_name in available_sheets:
-            return client_name
+        from backend.common.services.mapping_registry import get_mapping_registry
 
-        logging.warning(f"⚠️ Aucun onglet trouvé pour le client '{client_name}'")
-        return None
+        sheet_name = get_mapping_registry().worksheet_for_client(client_name, available_sheets)
+        if not sheet_name:
+            logging.warning(f"⚠️ Aucun onglet trouvé pour le client '{client_name}'")
+        return sheet_name
 
     except Exception as e:
         logging.error(f"❌ Erreur résolution onglet pour '{client_name}': {e}")
@@ -258,6 +232,11 @@ def read_report_data(client_name: str, month: str) -> Dict[str, Any]:
     return data
 
 
+def _sheet_ranges(worksheet_name: str) -> List[str]:
+    """Plages lues pour un rapport : headers (lignes 2:3) puis données (A3:AZ)"""
+    return [f"'{worksheet_name}'!2:3", f"'{worksheet_name}'!A3:AZ"]
+
+
 def _read_sheet_data(
     sheets_service,
     worksheet_name: str,
@@ -267,42 +246,42 @@ def _read_sheet_data(
     Lecture brute d'un onglet Sheet : headers, lignes, catégorisation.
     Factorise la logique commune entre read_report_data et read_report_data_by_worksheet.
     """
-    headers_range = f"'{worksheet_name}'!2:3"
+    headers_range, data_range = _sheet_ranges(worksheet_name)
     headers_result = sheets_service.service.spreadsheets().values().get(
         spreadsheetId=sheets_service.sheet_id,
         range=headers_range,
     ).execute()
     headers_rows = headers_result.get("values", [])
-    row2 = [h.strip() if h else "" for h in headers_rows[0]] if headers_rows else []
-    row3 = [h.strip() if h else "" for h in headers_rows[1]] if len(headers_rows) > 1 else []
 
-    # Noms de groupes en ligne 2 (pas des vrais headers, les vrais sont en ligne 3)
-    GROUP_HEADERS = {"FOLLOWERS", "DRIVE TO STORE", "SPONSO POSTS", "CAMPAGNES META",
-                     "SPONSO POST", "LEADS", "GÉNÉRAL", "GENERAL", "GOOGLE", "META",
-                     "MICROSOFT"}
-
-    # Merger les headers : si la ligne 2 est vide ou est un nom de groupe,
-    # et que la ligne 3 a un vrai header, on prend la ligne 3
-    max_cols = max(len(row2), len(row3))
-    headers = []
-    for i in range(max_cols):
-        h2 = row2[i] if i < len(row2) else ""
-        h3 = row3[i] if i < len(row3) else ""
-        if h3 and (not h2 or h2.upper() in GROUP_HEADERS):
-            headers.append(h3)
-        else:
-            headers.append(h2)
-
-    if not headers:
-        raise ValueError(f"Aucun header trouvé dans l'onglet '{worksheet_name}'")
-
-    data_range = f"'{worksheet_name}'!A3:AZ"
     data_result = sheets_service.service.spreadsheets().values().get(
         spreadsheetId=sheets_service.sheet_id,
         range=data_range,
     ).execute()
     rows = data_result.get("values", [])
 
+    # Section Analytics : reverse lookup du client matchant ce worksheet
+    available_sheets = sheets_service.get_worksheet_names()
+    ga_config = _find_ga_config_for_worksheet(worksheet_name, available_sheets)
+
+    return _build_report_data(worksheet_name, month_en, headers_rows, rows, ga_config)
+
+
+def _build_report_data(
+    worksheet_name: str,
+    month_en: str,
+    headers_rows: List[List[str]],
+    rows: List[List[str]],
+    ga_config: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Construit les données du rapport à partir des valeurs brutes d'un onglet (sans appel API)."""
+    row2 = [h.strip() if h else "" for h in headers_rows[0]] if headers_rows else []
+    row3 = [h.strip() if h else "" for h in headers_rows[1]] if len(headers_rows) > 1 else []
+
+    headers = merge_header_rows(row2, row3)
+
+    if not headers:
+        raise ValueError(f"Aucun header trouvé dans l'onglet '{worksheet_name}'")
+
     all_months: Dict[str, Dict[str, Any]] = {}
     for row in rows:
         if not row or not row[0] or not row[0].strip():
@@ -342,10 +321,7 @@ def _read_sheet_data(
     month_fr = _month_to_fr(month_en)
     prev_month_fr = _month_to_fr(prev_month_en)
 
-    # Section Analytics : reverse lookup du client matchant ce worksheet,
-    # puis extraction des valeurs GA pour M / M-1 / M-2.
-    available_sheets = sheets_service.get_worksheet_names()
-    ga_config = _find_ga_config_for_worksheet(worksheet_name, available_sheets)
+    # Section Analytics : valeurs GA pour M / M-1 / M-2
     analytics_pages = []
     if ga_config:
         history_prev_prev = history[-3] if len(history) >= 3 else {}
@@ -393,10 +369,59 @@ def _read_sheet_data(
     }
 
 
+class SpreadsheetSnapshot:
+    """
+    Copie en mémoire des onglets nécessaires à une génération de rapports.
+
+    Une génération lit le même Sheet pour 40+ onglets : au lieu de 3 appels API
+    par onglet (headers, données, liste des onglets) plus une résolution GA par
+    onglet, le snapshot fait un appel de métadonnées, puis un values:batchGet
+    (par lots) pour tous les onglets demandés. Les lectures suivantes sont servies
+    depuis la mémoire (sûres entre threads).
+    """
+
+    # Onglets par appel batchGet (2 plages chacun)
+    TABS_PER_BATCH = 25
+
+    def __init__(self, sheets_service):
+        self.sheets_service = sheets_service
+        properties = sheets_service.get_sheet_properties()
+        self.available_sheets = [p["title"] for p in properties]
+        self.visible_sheets = [p["title"] for p in properties if not p.get("hidden", False)]
+        self._tabs: Dict[str, tuple] = {}
+        self._ga_configs: Optional[Dict[str, Dict[str, Any]]] = None
+        logging.info(f"📸 Snapshot du Sheet : {len(self.visible_sheets)} onglets visibles / {len(self.available_sheets)}")
+
+    def load(self, worksheet_names: List[str]) -> "SpreadsheetSnapshot":
+        """Charge headers + données des onglets demandés (non encore chargés) et les configs GA."""
+        missing = [name for name in dict.fromkeys(worksheet_names) if name not in self._tabs]
+        if missing:
+            ranges = [r for name in missing for r in _sheet_ranges(name)]
+            values = self.sheets_service.batch_get_values(ranges, chunk_size=self.TABS_PER_BATCH * 2)
+            for index, name in enumerate(missing):
+                self._tabs[name] = (values[2 * index], values[2 * index + 1])
+            batches = (len(missing) + self.TABS_PER_BATCH - 1) // self.TABS_PER_BATCH
+            logging.info(f"📸 {len(missing)} onglet(s) chargé(s) en {batches} batchGet")
+        if self._ga_configs is None:
+            self._ga_configs = _ga_configs_by_worksheet(self.available_sheets)
+        return self
+
+    def has(self, worksheet_name: str) -> bool:
+        return worksheet_name in self._tabs
+
+    def read(self, worksheet_name: str, month_en: str) -> Dict[str, Any]:
+        """Données du rapport d'un onglet chargé (KeyError sinon)"""
+        headers_rows, rows = self._tabs[worksheet_name]
+        return _build_report_data(
+            worksheet_name, month_en, headers_rows, rows, (self._ga_configs or {}).get(worksheet_name),
+        )
+
+
 def read_report_data_by_worksheet(
     worksheet_name: str,
     month: str,
     sheets_service=None,
+    snapshot: Optional[SpreadsheetSnapshot] = None,
 ) -> Dict[str, Any]:
     """
     Lit les données d'un onglet Sheet directement par son nom (sans résolution client).
@@ -406,12 +431,17 @@ def read_report_data_by_worksheet(
         worksheet_name: Nom exact de l'onglet dans le Sheet.
         month: Mois en anglais, ex: 'February 2026'.
         sheets_service: Instance GoogleSheetsService (optionnel, créé si absent).
+        snapshot: SpreadsheetSnapshot déjà chargé : l'onglet est lu en mémoire, sans appel API.
     """
+    month_en = _month_to_en(month)
+    if snapshot is not None and snapshot.has(worksheet_name):
+        logging.info(f"Lecture des données pour l'onglet '{worksheet_name}' — mois '{month_en}' (snapshot)")
+        return snapshot.read(worksheet_name, month_en)
+
     if sheets_service is None:
         from backend.common.services.google_sheets import GoogleSheetsService
         sheets_service = GoogleSheetsService()
 
-    month_en = _month_to_en(month)
     logging.info(f"Lecture des données pour l'onglet '{worksheet_name}' — mois '{month_en}'")
 
     return _read_sheet_data(sheets_service, worksheet_name, month_en)
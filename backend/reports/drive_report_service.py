@@ -8,8 +8,10 @@ from io import BytesIO
 from typing import Optional
 
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaIoBaseUpload
 
+from backend.common.services.drive_folder_cache import get_drive_folder_cache
 from backend.config.settings import Config
 
 REPORTS_PARENT_FOLDER_ID = "1l627RHHdt1Ob-9qqCgfJfpGlJOCxtW27"
@@ -42,7 +44,8 @@ class DriveReportService:
 
     def find_or_create_month_folder(self, folder_name: str) -> str:
         """
-        Trouve ou crée le sous-dossier mensuel (ex: '2026-02') dans _RAPPORTS.
+        Trouve ou crée le sous-dossier mensuel (ex: '2026-02') dans _RAPPORTS,
+        via le cache des dossiers Drive (entrée revérifiée à chaque rapport).
 
         Args:
             folder_name: Nom du dossier au format 'YYYY-MM'.
@@ -50,6 +53,16 @@ class DriveReportService:
         Returns:
             ID du dossier Google Drive.
         """
+        return get_drive_folder_cache().resolve(
+            REPORTS_PARENT_FOLDER_ID,
+            folder_name,
+            verify=self._folder_exists,
+            lookup=lambda: self._find_month_folder(folder_name),
+            create=lambda: self._create_month_folder(folder_name),
+            always_verify=True,
+        )
+
+    def _find_month_folder(self, folder_name: str) -> Optional[str]:
         query = (
             f"name='{folder_name}' "
             f"and '{REPORTS_PARENT_FOLDER_ID}' in parents "
@@ -61,11 +74,13 @@ class DriveReportService:
         ).execute()
 
         files = results.get("files", [])
-        if files:
-            folder_id = files[0]["id"]
-            logging.info(f"Dossier '{folder_name}' existant: {folder_id}")
-            return folder_id
+        if not files:
+            return None
+        folder_id = files[0]["id"]
+        logging.info(f"Dossier '{folder_name}' existant: {folder_id}")
+        return folder_id
 
+    def _create_month_folder(self, folder_name: str) -> str:
         file_metadata = {
             "name": folder_name,
             "mimeType": FOLDER_MIME_TYPE,
@@ -79,6 +94,17 @@ class DriveReportService:
         logging.info(f"Dossier '{folder_name}' créé: {folder_id}")
         return folder_id
 
+    def _folder_exists(self, folder_id: str) -> bool:
+        try:
+            info = self.service.files().get(
+                fileId=folder_id, fields="id, trashed, parents"
+            ).execute()
+        except HttpError as e:
+            if e.resp.status == 404:
+                return False
+            raise
+        return not info.get("trashed") and REPORTS_PARENT_FOLDER_ID in info.get("parents", [])
+
     def upload_pptx(
         self,
         file_bytes: bytes,
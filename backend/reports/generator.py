@@ -3,14 +3,15 @@ Générateur de rapports PPTX.
 Orchestre le flux complet : lecture Sheet → routage template → génération → upload Drive.
 """
 
-import io
 import logging
+import threading
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 from typing import List, Dict, Any, Optional
 
+from backend.common.services.job_queue import report_job_progress
+from backend.reports.pipeline import ReportPipeline, render_report_pptx
 from backend.reports.template_router import (
-    resolve_template,
     get_route_name,
     is_template_implemented,
 )
@@ -45,12 +46,46 @@ def _build_report_filename(sheet_name: str, month_fr: str) -> str:
     return f"Rapport {clean_name} {clean_month}.pptx"
 
 
+def _upload_report(
+    sheet_name: str,
+    month: str,
+    data: Dict[str, Any],
+    pptx_bytes: bytes,
+    drive_service,
+    drive_folder_id: str,
+) -> Dict[str, Any]:
+    """Uploade un PPTX rendu sur Drive et construit le résultat du client."""
+    filename = _build_report_filename(sheet_name, data.get("month_fr", month))
+    file_id = drive_service.upload_pptx(pptx_bytes, filename, drive_folder_id)
+    drive_link = drive_service.get_file_link(file_id)
+
+    return {
+        "client": sheet_name,
+        "route": get_route_name(sheet_name),
+        "status": "success",
+        "filename": filename,
+        "drive_link": drive_link,
+        "file_id": file_id,
+    }
+
+
+def _skipped_result(sheet_name: str) -> Dict[str, Any]:
+    route_name = get_route_name(sheet_name)
+    return {
+        "client": sheet_name,
+        "route": route_name,
+        "status": "skipped",
+        "reason": f"Template '{route_name}' pas encore implémenté",
+    }
+
+
 def _generate_single_report(
     sheet_name: str,
     month: str,
     sheets_service,
     drive_service,
     drive_folder_id: str,
+    snapshot=None,
 ) -> Dict[str, Any]:
     """
     Génère un rapport PPTX pour un seul onglet et l'uploade sur Drive.
@@ -58,48 +93,37 @@ def _generate_single_report(
     Returns:
         Dict avec le résultat : client, status, drive_link, error.
     """
-    route_name = get_route_name(sheet_name)
-
     if not is_template_implemented(sheet_name):
-        return {
-            "client": sheet_name,
-            "route": route_name,
-            "status": "skipped",
-            "reason": f"Template '{route_name}' pas encore implémenté",
-        }
+        return _skipped_result(sheet_name)
 
     from backend.reports.data_reader import read_report_data_by_worksheet
 
-    # 1. Lire les données du Sheet
+    # 1. Lire les données du Sheet (depuis le snapshot s'il est fourni)
     data = read_report_data_by_worksheet(
         worksheet_name=sheet_name,
         month=month,
         sheets_service=sheets_service,
+        snapshot=snapshot,
     )
 
-    # 2. Instancier le bon template et générer le PPTX
-    template_class = resolve_template(sheet_name)
-    template = template_class()
-    presentation = template.generate(data)
+    # 2. Générer le PPTX (template routé) et le sérialiser en bytes
+    pptx_bytes = render_report_pptx(sheet_name, data)
 
-    # 3. Sérialiser en bytes
-    buffer = io.BytesIO()
-    presentation.save(buffer)
-    pptx_bytes = buffer.getvalue()
+    # 3. Upload sur Drive
+    return _upload_report(sheet_name, month, data, pptx_bytes, drive_service, drive_folder_id)
 
-    # 4. Upload sur Drive
-    filename = _build_report_filename(sheet_name, data.get("month_fr", month))
-    file_id = drive_service.upload_pptx(pptx_bytes, filename, drive_folder_id)
-    drive_link = drive_service.get_file_link(file_id)
 
-    return {
-        "client": sheet_name,
-        "route": route_name,
-        "status": "success",
-        "filename": filename,
-        "drive_link": drive_link,
-        "file_id": file_id,
-    }
+def _thread_local_service(factory):
+    """Un service Google par thread (les clients googleapiclient/httplib2 ne sont pas thread-safe)."""
+    local = threading.local()
+
+    def get():
+        service = getattr(local, "service", None)
+        if service is None:
+            service = local.service = factory()
+        return service
+
+    return get
 
 
 def _resolve_month_and_folder(month: Optional[str]) -> tuple:
@@ -122,12 +146,11 @@ def _resolve_month_and_folder(month: Optional[str]) -> tuple:
 
 
 def _filter_visible_sheets(
-    sheets_service,
+    visible_sheets: List[str],
     filter_name: Optional[str] = None,
     filter_template: Optional[str] = None,
 ) -> List[str]:
-    """Liste les onglets visibles du Sheet après application des filtres optionnels."""
-    visible_sheets = sheets_service.get_visible_worksheet_names()
+    """Applique les filtres optionnels à la liste des onglets visibles du Sheet."""
     if filter_name:
         filter_lower = filter_name.lower()
         visible_sheets = [s for s in visible_sheets if filter_lower in s.lower()]
@@ -155,7 +178,7 @@ def generate_one_report(
 
     from backend.common.services.google_sheets import GoogleSheetsService
     from backend.reports.drive_report_service import DriveReportService
-    from backend.reports.data_reader import _resolve_worksheet_name
+    from backend.reports.data_reader import SpreadsheetSnapshot, _resolve_worksheet_name
 
     sheets_service = GoogleSheetsService()
     drive_service = DriveReportService()
@@ -163,20 +186,23 @@ def generate_one_report(
     # Le nom reçu vient de la liste déroulante (allowlist) et peut différer
     # légèrement du nom de l'onglet réel (ex: 'Emma Nantes' vs
     # 'Emma Nantes - RITEILE SAS'). On résout vers le vrai nom d'onglet.
-    available_sheets = sheets_service.get_worksheet_names()
-    resolved_name = _resolve_worksheet_name(sheet_name, available_sheets) or sheet_name
+    snapshot = SpreadsheetSnapshot(sheets_service)
+    resolved_name = _resolve_worksheet_name(sheet_name, snapshot.available_sheets) or sheet_name
     if resolved_name != sheet_name:
         logging.info(f"Client '{sheet_name}' → onglet '{resolved_name}'")
 
     drive_folder_id = drive_service.find_or_create_month_folder(folder_name)
 
     try:
+        if resolved_name in snapshot.available_sheets and is_template_implemented(resolved_name):
+            snapshot.load([resolved_name])
         result = _generate_single_report(
             sheet_name=resolved_name,
             month=target_month,
             sheets_service=sheets_service,
             drive_service=drive_service,
             drive_folder_id=drive_folder_id,
+            snapshot=snapshot,
         )
         if result["status"] == "success":
             logging.info(f"[OK] {sheet_name} → {result['filename']}")
@@ -202,6 +228,9 @@ def generate_all_reports(
     Génère les rapports PPTX pour tous les onglets visibles du Sheet
     et les uploade sur Google Drive.
 
+    Lecture, rendu et upload se chevauchent d'un client à l'autre (voir ReportPipeline) ;
+    les résultats restent dans l'ordre des onglets.
+
     Args:
         month: Mois cible en anglais (ex: 'February 2026').
                Si None, calcule automatiquement M-1.
@@ -214,6 +243,7 @@ def generate_all_reports(
 
     # Initialiser les services une seule fois
     from backend.common.services.google_sheets import GoogleSheetsService
+    from backend.reports.data_reader import SpreadsheetSnapshot, read_report_data_by_worksheet
     from backend.reports.drive_report_service import DriveReportService
 
     sheets_service = GoogleSheetsService()
@@ -222,35 +252,56 @@ def generate_all_reports(
     # Créer le dossier mensuel sur Drive
     drive_folder_id = drive_service.find_or_create_month_folder(folder_name)
 
-    # Lister les onglets visibles
-    visible_sheets = _filter_visible_sheets(sheets_service, filter_name, filter_template)
-
-    results: List[Dict[str, Any]] = []
-
-    for sheet_name in visible_sheets:
-        try:
-            result = _generate_single_report(
-                sheet_name=sheet_name,
-                month=target_month,
-                sheets_service=sheets_service,
-                drive_service=drive_service,
-                drive_folder_id=drive_folder_id,
-            )
-            results.append(result)
-
-            if result["status"] == "success":
-                logging.info(f"[OK] {sheet_name} → {result['filename']}")
-            else:
-                logging.info(f"[SKIP] {sheet_name} → {result.get('reason', '')}")
-
-        except Exception as e:
-            logging.error(f"[ERREUR] {sheet_name}: {e}", exc_info=True)
-            results.append({
-                "client": sheet_name,
-                "route": get_route_name(sheet_name),
-                "status": "error",
-                "error": str(e),
-            })
+    # Lister les onglets visibles (un appel de métadonnées pour tout le Sheet)
+    snapshot = SpreadsheetSnapshot(sheets_service)
+    visible_sheets = _filter_visible_sheets(snapshot.visible_sheets, filter_name, filter_template)
+
+    # Onglets sans template : résultat immédiat, les autres passent par le pipeline
+    results: List[Optional[Dict[str, Any]]] = [None] * len(visible_sheets)
+    to_generate = []
+    for index, sheet_name in enumerate(visible_sheets):
+        if is_template_implemented(sheet_name):
+            to_generate.append(index)
+        else:
+            results[index] = _skipped_result(sheet_name)
+            logging.info(f"[SKIP] {sheet_name} → {results[index]['reason']}")
+
+    # Headers + données de tous les onglets à générer en un batchGet (par lots)
+    try:
+        snapshot.load([visible_sheets[i] for i in to_generate])
+    except Exception as e:
+        logging.error(f"❌ Snapshot du Sheet impossible, lecture onglet par onglet: {e}")
+
+    thread_sheets = _thread_local_service(GoogleSheetsService)
+    thread_drive = _thread_local_service(DriveReportService)
+    completed = [len(visible_sheets) - len(to_generate)]
+    progress_lock = threading.Lock()
+
+    def read(sheet_name):
+        return read_report_data_by_worksheet(
+            worksheet_name=sheet_name,
+            month=target_month,
+            sheets_service=None if snapshot.has(sheet_name) else thread_sheets(),
+            snapshot=snapshot,
+        )
+
+    def upload(sheet_name, data, pptx_bytes):
+        return _upload_report(sheet_name, target_month, data, pptx_bytes, thread_drive(), drive_folder_id)
+
+    def on_result(position, result):
+        if result["status"] == "success":
+            logging.info(f"[OK] {result['client']} → {result['filename']}")
+        with progress_lock:
+            completed[0] += 1
+            report_job_progress("reports", "running", done=completed[0], total=len(visible_sheets),
+                                client=result["client"])
+
+    pipeline = ReportPipeline(read_func=read, upload_func=upload, on_result=on_result)
+    pipeline_results = pipeline.run([visible_sheets[i] for i in to_generate])
+    for index, result in zip(to_generate, pipeline_results):
+        results[index] = result
+
+    report_job_progress("reports", "ok", done=len(visible_sheets), total=len(visible_sheets))
 
     # Résumé
     success_count = sum(1 for r in results if r["status"] == "success")
@@ -0,0 +1,246 @@
+"""
+Graphiques natifs PowerPoint (python-pptx) pour les rapports PPTX.
+
+Alternative aux PNG de charts.py : aucun rendu matplotlib/kaleido, des fichiers
+plus légers et des graphiques modifiables dans PowerPoint. Même dark theme
+Tarmaac (palette de styles.py). Les fonctions ajoutent le graphique directement
+sur la slide au lieu d'écrire une image.
+
+Limites par rapport aux PNG : pas de remplissage sous la courbe, pas de double axe.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from pptx.chart.data import CategoryChartData
+from pptx.dml.color import RGBColor
+from pptx.enum.chart import XL_CHART_TYPE, XL_LABEL_POSITION, XL_LEGEND_POSITION, XL_MARKER_STYLE
+from pptx.enum.text import PP_ALIGN
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls, qn
+from pptx.util import Pt
+
+from backend.reports.charts import _safe_float
+from backend.reports.styles import FONT_TITLE, PALETTE
+
+_NO_FILL_XML = f"<c:spPr {nsdecls('c', 'a')}><a:noFill/><a:ln><a:noFill/></a:ln></c:spPr>"
+
+
+def _rgb(color: str) -> RGBColor:
+    return RGBColor.from_string(color.lstrip("#").upper())
+
+
+def _number_format(values: List[float]) -> str:
+    """Entiers sans décimale, sinon deux décimales (comme _format_bar_value)"""
+    return "#,##0" if all(v == int(v) for v in values) else "#,##0.00"
+
+
+def _set_transparent(chart) -> None:
+    """Fond et cadre transparents (zone du graphique et zone de traçage) sur fond noir"""
+    chart_space = chart._chartSpace
+    chart_space.insert_element_before(parse_xml(_NO_FILL_XML), "c:txPr", "c:externalData")
+    plot_area = chart_space.find(qn("c:chart")).find(qn("c:plotArea"))
+    plot_area.insert_element_before(parse_xml(_NO_FILL_XML), "c:extLst")
+
+
+def _style_chart(chart, title: Optional[str]) -> None:
+    """Dark theme commun : texte gris clair, titre blanc, fond transparent"""
+    _set_transparent(chart)
+    chart.font.name = FONT_TITLE
+    chart.font.size = Pt(11)
+    chart.font.color.rgb = _rgb(PALETTE["text_secondary"])
+
+    chart.has_title = bool(title)
+    if title:
+        chart.chart_title.text_frame.text = title
+        font = chart.chart_title.text_frame.paragraphs[0].font
+        font.size = Pt(16)
+        font.bold = False
+        font.color.rgb = _rgb(PALETTE["white"])
+
+
+def _style_axes(chart, max_value: float, headroom: float) -> None:
+    category_axis = chart.category_axis
+    category_axis.format.line.color.rgb = _rgb(PALETTE["light_gray"])
+    category_axis.has_major_gridlines = False
+    category_axis.tick_labels.font.size = Pt(12)
+
+    value_axis = chart.value_axis
+    value_axis.has_major_gridlines = True
+    value_axis.major_gridlines.format.line.color.rgb = _rgb(PALETTE["light_gray"])
+    value_axis.major_gridlines.format.line.width = Pt(0.75)
+    value_axis.format.line.fill.background()
+    value_axis.tick_labels.font.size = Pt(11)
+    value_axis.minimum_scale = 0
+    if max_value > 0:
+        value_axis.maximum_scale = max_value * headroom
+
+
+def add_native_evolution_chart(
+    slide,
+    history: List[Dict[str, Any]],
+    metric_key: str,
+    chart_title: str,
+    x, y, width, height,
+    line_color: str = None,
+):
+    """
+    Line chart natif de l'évolution d'une métrique (équivalent de create_plotly_evolution_chart).
+
+    Returns:
+        Le graphique python-pptx ajouté, None si l'historique est vide
+    """
+    if not history:
+        return None
+
+    months = [entry.get("month_fr", "") for entry in history]
+    values = [_safe_float(entry.get(metric_key, 0)) for entry in history]
+    color = _rgb(line_color or PALETTE["gold"])
+
+    chart_data = CategoryChartData(number_format=_number_format(values))
+    chart_data.categories = months
+    chart_data.add_series(chart_title, values)
+    chart = slide.shapes.add_chart(XL_CHART_TYPE.LINE_MARKERS, x, y, width, height, chart_data).chart
+
+    _style_chart(chart, chart_title)
+    chart.has_legend = False
+    _style_axes(chart, max(values), 1.25)
+
+    series = chart.plots[0].series[0]
+    series.smooth = True
+    series.format.line.color.rgb = color
+    series.format.line.width = Pt(3)
+    series.marker.style = XL_MARKER_STYLE.CIRCLE
+    series.marker.size = 10
+    series.marker.format.fill.solid()
+    series.marker.format.fill.fore_color.rgb = color
+    series.marker.format.line.color.rgb = _rgb(PALETTE["white"])
+
+    plot = chart.plots[0]
+    plot.has_data_labels = True
+    labels = plot.data_labels
+    labels.position = XL_LABEL_POSITION.ABOVE
+    labels.number_format = _number_format(values)
+    labels.number_format_is_linked = False
+    labels.font.size = Pt(14)
+    labels.font.color.rgb = _rgb(PALETTE["white"])
+    return chart
+
+
+def add_native_comparison_bar_chart(
+    slide,
+    current_values: List[float],
+    previous_values: List[float],
+    labels: List[str],
+    current_label: str,
+    previous_label: str,
+    x, y, width, height,
+) -> List[Any]:
+    """
+    Barres M-1 / M natives, un graphique par métrique côte à côte (chacun sa propre
+    échelle, comme create_comparison_bar_chart).
+
+    Returns:
+        Les graphiques ajoutés (un par label)
+    """
+    current_values = [_safe_float(v) for v in current_values]
+    previous_values = [_safe_float(v) for v in previous_values]
+    if not labels or not current_values:
+        return []
+
+    added = []
+    slot_width = int(width / len(labels))
+    for i, label in enumerate(labels):
+        vals = [previous_values[i], current_values[i]]
+        chart_data = CategoryChartData(number_format=_number_format(vals))
+        chart_data.categories = [previous_label, current_label]
+        chart_data.add_series(label, vals)
+        chart = slide.shapes.add_chart(
+            XL_CHART_TYPE.COLUMN_CLUSTERED, x + slot_width * i, y, slot_width, height, chart_data,
+        ).chart
+
+        _style_chart(chart, label)
+        chart.has_legend = False
+        _style_axes(chart, max(vals), 1.25)
+        chart.value_axis.visible = False
+        chart.category_axis.tick_labels.font.size = Pt(9)
+
+        plot = chart.plots[0]
+        plot.gap_width = 60
+        plot.vary_by_categories = False
+        for point, fill in zip(plot.series[0].points, (PALETTE["light_gray"], PALETTE["gold"])):
+            point.format.fill.solid()
+            point.format.fill.fore_color.rgb = _rgb(fill)
+        plot.has_data_labels = True
+        data_labels = plot.data_labels
+        data_labels.position = XL_LABEL_POSITION.OUTSIDE_END
+        data_labels.number_format = _number_format(vals)
+        data_labels.number_format_is_linked = False
+        data_labels.font.size = Pt(10)
+        data_labels.font.bold = True
+        data_labels.font.color.rgb = _rgb(PALETTE["white"])
+        added.append(chart)
+    return added
+
+
+def add_native_budget_donut(
+    slide,
+    google_cost: float,
+    meta_cost: float,
+    x, y, width, height,
+    microsoft_cost: float = 0,
+):
+    """
+    Donut natif de répartition du budget par plateforme (équivalent de create_budget_donut),
+    total au centre.
+
+    Returns:
+        Le graphique ajouté, None si le budget total est nul
+    """
+    platforms = [
+        ("Google Ads", _safe_float(google_cost), PALETTE["green"]),
+        ("Meta Ads", _safe_float(meta_cost), PALETTE["light_blue"]),
+        ("Microsoft Ads", _safe_float(microsoft_cost), PALETTE["orange"]),
+    ]
+    platforms = [p for p in platforms if p[1] > 0]
+    if not platforms:
+        return None
+    total = sum(cost for _, cost, _ in platforms)
+
+    chart_data = CategoryChartData(number_format="0%")
+    chart_data.categories = [name for name, _, _ in platforms]
+    chart_data.add_series("Budget", [cost for _, cost, _ in platforms])
+    chart = slide.shapes.add_chart(XL_CHART_TYPE.DOUGHNUT, x, y, width, height, chart_data).chart
+
+    _style_chart(chart, None)
+    chart.has_legend = True
+    chart.legend.position = XL_LEGEND_POSITION.BOTTOM
+    chart.legend.include_in_layout = False
+    chart.legend.font.color.rgb = _rgb(PALETTE["white"])
+
+    plot = chart.plots[0]
+    plot._element.find(qn("c:holeSize")).set("val", "60")
+    for point, (_, _, color) in zip(plot.series[0].points, platforms):
+        point.format.fill.solid()
+        point.format.fill.fore_color.rgb = _rgb(color)
+        point.format.line.fill.background()
+    plot.has_data_labels = True
+    data_labels = plot.data_labels
+    data_labels.show_percentage = True
+    data_labels.show_value = False
+    data_labels.number_format = "0%"
+    data_labels.number_format_is_linked = False
+    data_labels.font.size = Pt(9)
+    data_labels.font.bold = True
+    data_labels.font.color.rgb = _rgb(PALETTE["white"])
+
+    # Total au centre du donut (zone de traçage au-dessus de la légende)
+    box = slide.shapes.add_textbox(x, y + int(height * 0.35), width, int(height * 0.2))
+    paragraph = box.text_frame.paragraphs[0]
+    paragraph.alignment = PP_ALIGN.CENTER
+    run = paragraph.add_run()
+    run.text = f"{total:,.0f} €".replace(",", " ")
+    run.font.name = FONT_TITLE
+    run.font.size = Pt(18)
+    run.font.bold = True
+    run.font.color.rgb = _rgb(PALETTE["white"])
+    return chart
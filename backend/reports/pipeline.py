@@ -0,0 +1,275 @@
+"""
+Pipeline de génération des rapports : lecture Sheet → rendu PPTX → upload Drive.
+
+Les trois étages tournent en parallèle, reliés par des files bornées :
+- lecture du Sheet et upload Drive (I/O) sur des pools de threads ;
+- rendu PPTX (CPU, matplotlib non thread-safe) sur un pool de process partagé
+  entre les appels, arrêté après REPORT_RENDER_POOL_IDLE secondes sans rendu.
+"""
+
+import io
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.reports.plotly_renderer import warm_plotly_renderer
+from backend.reports.template_router import get_route_name, resolve_template
+
+READ_WORKERS = 4
+UPLOAD_WORKERS = 4
+# Rapports en attente entre deux étages (borne la mémoire : données lues, PPTX rendus)
+QUEUE_SIZE = 4
+
+_DONE = object()
+
+
+def _available_cpus() -> int:
+    # Cœurs réellement attribués au process (affinité), pas ceux de l'hôte
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def default_render_workers() -> int:
+    """
+    Nombre de process de rendu : 1 par défaut, chaque process embarquant
+    python-pptx, matplotlib, plotly et un Chromium kaleido. REPORT_RENDER_WORKERS
+    l'augmente, dans la limite des cœurs attribués au process.
+    """
+    configured = int(os.getenv("REPORT_RENDER_WORKERS", "1"))
+    return max(1, min(configured, _available_cpus()))
+
+
+_render_pool: Optional[ProcessPoolExecutor] = None
+_render_pool_users = 0
+_render_pool_timer: Optional[threading.Timer] = None
+_render_pool_lock = threading.Lock()
+
+
+def _new_render_pool(workers: int) -> ProcessPoolExecutor:
+    # spawn : pas de fork d'un process qui a des threads (verrous Google API, logging)
+    # kaleido démarre dès la création du process, en parallèle de la lecture du premier onglet
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=warm_plotly_renderer,
+    )
+    logging.info(f"🖨️ Pool de rendu PPTX démarré ({workers} process)")
+    return pool
+
+
+def acquire_render_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Pool de process de rendu partagé par le process, créé au premier rapport et
+    réutilisé ensuite (pas de nouveaux process ni de nouveau Chromium par génération).
+    À rendre avec release_render_pool().
+    """
+    global _render_pool, _render_pool_users, _render_pool_timer
+    with _render_pool_lock:
+        if _render_pool_timer is not None:
+            _render_pool_timer.cancel()
+            _render_pool_timer = None
+        if _render_pool is None:
+            _render_pool = _new_render_pool(workers)
+        _render_pool_users += 1
+        return _render_pool
+
+
+def release_render_pool() -> None:
+    """Rend le pool ; sans utilisateur pendant REPORT_RENDER_POOL_IDLE secondes (300), il est arrêté"""
+    global _render_pool_users, _render_pool_timer
+    with _render_pool_lock:
+        _render_pool_users -= 1
+        if _render_pool_users == 0 and _render_pool is not None:
+            _render_pool_timer = threading.Timer(
+                float(os.getenv("REPORT_RENDER_POOL_IDLE", "300")), shutdown_render_pool
+            )
+            _render_pool_timer.daemon = True
+            _render_pool_timer.start()
+
+
+def _replace_broken_render_pool(pool: ProcessPoolExecutor, workers: int) -> ProcessPoolExecutor:
+    """
+    Remplace un pool cassé (process de rendu tué : OOM, crash de kaleido) par un
+    nouveau, utilisé par les rendus en cours et suivants. Plusieurs threads de rendu
+    peuvent signaler le même pool cassé : un seul nouveau pool est créé.
+    """
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is pool or _render_pool is None:
+            logging.warning("♻️ Pool de rendu PPTX cassé (process arrêté), redémarrage")
+            _render_pool = _new_render_pool(workers)
+        current = _render_pool
+    pool.shutdown(wait=False)
+    return current
+
+
+def shutdown_render_pool() -> None:
+    """Arrête le pool de rendu s'il n'est pas en cours d'utilisation"""
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool_users or _render_pool is None:
+            return
+        pool, _render_pool = _render_pool, None
+    pool.shutdown(wait=True)
+    logging.info("🖨️ Pool de rendu PPTX arrêté (inactif)")
+
+
+def render_report_pptx(sheet_name: str, data: Dict[str, Any]) -> bytes:
+    """Génère le PPTX d'un onglet et le renvoie en bytes (exécuté dans un process de rendu)."""
+    template_class = resolve_template(sheet_name)
+    presentation = template_class().generate(data)
+    buffer = io.BytesIO()
+    presentation.save(buffer)
+    return buffer.getvalue()
+
+
+class ReportPipeline:
+    """
+    Exécute lecture → rendu → upload pour une liste d'onglets.
+
+    Args:
+        read_func: read_func(sheet_name) -> données du rapport
+        upload_func: upload_func(sheet_name, data, pptx_bytes) -> dict résultat
+        render_func: fonction de rendu (picklable si use_processes)
+        use_processes: rendu dans un pool de process (sinon dans les threads de rendu)
+        on_result: appelé avec (index, résultat) à chaque rapport terminé
+    """
+
+    def __init__(
+        self,
+        read_func: Callable[[str], Dict[str, Any]],
+        upload_func: Callable[[str, Dict[str, Any], bytes], Dict[str, Any]],
+        render_func: Callable[[str, Dict[str, Any]], bytes] = render_report_pptx,
+        read_workers: int = READ_WORKERS,
+        render_workers: Optional[int] = None,
+        upload_workers: int = UPLOAD_WORKERS,
+        queue_size: int = QUEUE_SIZE,
+        use_processes: bool = True,
+        on_result: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+    ):
+        self.read_func = read_func
+        self.upload_func = upload_func
+        self.render_func = render_func
+        self.read_workers = read_workers
+        self.render_workers = render_workers or default_render_workers()
+        self.upload_workers = upload_workers
+        self.queue_size = queue_size
+        self.use_processes = use_processes
+        self.on_result = on_result
+
+    def run(self, sheet_names: List[str]) -> List[Dict[str, Any]]:
+        """Renvoie un résultat par onglet, dans l'ordre de sheet_names."""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(sheet_names)
+        if not sheet_names:
+            return []
+
+        read_queue: "queue.Queue" = queue.Queue()
+        for index, sheet_name in enumerate(sheet_names):
+            read_queue.put((index, sheet_name))
+        render_queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        upload_queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        results_lock = threading.Lock()
+
+        def record(index: int, result: Dict[str, Any]) -> None:
+            with results_lock:
+                results[index] = result
+            if self.on_result is not None:
+                self.on_result(index, result)
+
+        def fail(index: int, sheet_name: str, stage: str, error: Exception) -> None:
+            logging.error(f"[ERREUR] {sheet_name} ({stage}): {error}", exc_info=True)
+            record(index, {
+                "client": sheet_name,
+                "route": get_route_name(sheet_name),
+                "status": "error",
+                "error": str(error),
+            })
+
+        # Pool courant (remplacé si un process de rendu meurt pendant la génération)
+        render_pool = [acquire_render_pool(self.render_workers)] if self.use_processes else None
+
+        def render(sheet_name: str, data: Dict[str, Any]) -> bytes:
+            if render_pool is None:
+                return self.render_func(sheet_name, data)
+            for attempt in range(2):
+                executor = render_pool[0]
+                try:
+                    return executor.submit(self.render_func, sheet_name, data).result()
+                except BrokenProcessPool:
+                    render_pool[0] = _replace_broken_render_pool(executor, self.render_workers)
+                    # Un seul nouvel essai : un onglet qui tue son process à chaque fois est en échec
+                    if attempt:
+                        raise
+                    logging.warning(f"🔁 Rendu de {sheet_name} relancé sur le nouveau pool")
+
+        def reader():
+            while True:
+                try:
+                    index, sheet_name = read_queue.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    data = self.read_func(sheet_name)
+                except Exception as e:
+                    fail(index, sheet_name, "lecture", e)
+                    continue
+                render_queue.put((index, sheet_name, data))
+
+        def renderer():
+            while True:
+                item = render_queue.get()
+                if item is _DONE:
+                    return
+                index, sheet_name, data = item
+                try:
+                    pptx_bytes = render(sheet_name, data)
+                except Exception as e:
+                    fail(index, sheet_name, "rendu", e)
+                    continue
+                upload_queue.put((index, sheet_name, data, pptx_bytes))
+
+        def uploader():
+            while True:
+                item = upload_queue.get()
+                if item is _DONE:
+                    return
+                index, sheet_name, data, pptx_bytes = item
+                try:
+                    record(index, self.upload_func(sheet_name, data, pptx_bytes))
+                except Exception as e:
+                    fail(index, sheet_name, "upload", e)
+
+        def start(target, count, name):
+            threads = [threading.Thread(target=target, name=f"report-{name}-{i}", daemon=True) for i in range(count)]
+            for thread in threads:
+                thread.start()
+            return threads
+
+        try:
+            readers = start(reader, min(self.read_workers, len(sheet_names)), "read")
+            renderers = start(renderer, self.render_workers, "render")
+            uploaders = start(uploader, self.upload_workers, "upload")
+
+            # Arrêt étage par étage : un marqueur de fin par thread de l'étage suivant
+            for thread in readers:
+                thread.join()
+            for _ in renderers:
+                render_queue.put(_DONE)
+            for thread in renderers:
+                thread.join()
+            for _ in uploaders:
+                upload_queue.put(_DONE)
+            for thread in uploaders:
+                thread.join()
+        finally:
+            if render_pool is not None:
+                release_render_pool()
+
+        return results
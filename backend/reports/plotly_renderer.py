@@ -0,0 +1,210 @@
+"""
+Rendu PNG des figures Plotly par un process kaleido gardé chaud.
+
+kaleido lance un sous-process Chromium au premier export : plusieurs secondes
+payées par chaque process de rendu du pipeline. Le renderer garde ce sous-process
+vivant pour tout le process et est préchauffé par l'initializer du pool de rendu,
+pendant la lecture du premier onglet. Les figures d'un slide sont exportées à la
+suite sous une seule prise du verrou.
+
+Les durées à froid / à chaud sont mesurées et publiées dans Config.PATHS.PLOTLY_STATS_DIR
+(un fichier par process) : les process de rendu ne sont pas ceux qui servent
+/concurrency-status.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.config.settings import Config
+
+DEFAULT_SCALE = 2
+
+
+def _figure_dict(fig) -> Dict[str, Any]:
+    return fig.to_dict() if hasattr(fig, "to_dict") else fig
+
+
+class PlotlyRenderer:
+    """
+    Exporteur PNG partagé par le process (un seul export kaleido à la fois).
+
+    Args:
+        export_func: export_func(figure_dict, scale) -> bytes ; par défaut le scope
+            kaleido persistant (kaleido 0.2.x) ou plotly.io.to_image (kaleido >= 1)
+        stats_dir: répertoire où publier get_stats() après chaque rendu (None : pas de publication)
+    """
+
+    def __init__(self, export_func: Optional[Callable[[Dict[str, Any], int], bytes]] = None,
+                 stats_dir: Optional[Path] = None):
+        self._export_func = export_func
+        self.stats_dir = Path(stats_dir) if stats_dir is not None else None
+        self._scope = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self.cold_start_seconds: Optional[float] = None
+        self.warm_renders = 0
+        self.warm_seconds = 0.0
+        self.render_calls = 0
+
+    def _exporter(self) -> Callable[[Dict[str, Any], int], bytes]:
+        """Exporteur du process courant (le sous-process kaleido n'est pas partagé après un fork)"""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._scope = None
+            self.cold_start_seconds = None
+            self.warm_renders = 0
+            self.warm_seconds = 0.0
+            self.render_calls = 0
+        if self._export_func is not None:
+            return self._export_func
+        if self._scope is None:
+            self._scope = self._create_scope()
+        return self._scope
+
+    @staticmethod
+    def _create_scope() -> Callable[[Dict[str, Any], int], bytes]:
+        try:
+            from kaleido.scopes.plotly import PlotlyScope
+        except ImportError:
+            # kaleido >= 1 : plotly pilote lui-même le navigateur
+            import plotly.io as pio
+
+            try:
+                import kaleido
+                if hasattr(kaleido, "start_sync_server"):
+                    kaleido.start_sync_server(silence_warnings=True)
+            except Exception as e:
+                logging.warning(f"⚠️ Serveur kaleido persistant indisponible: {e}")
+            return lambda figure, scale: pio.to_image(figure, format="png", scale=scale)
+
+        scope = PlotlyScope()
+        return lambda figure, scale: scope.transform(figure, format="png", scale=scale)
+
+    def _export(self, figure: Dict[str, Any], scale: int) -> bytes:
+        """À appeler sous self._lock"""
+        exporter = self._exporter()
+        started = time.perf_counter()
+        data = exporter(figure, scale)
+        elapsed = time.perf_counter() - started
+        if self.cold_start_seconds is None:
+            self.cold_start_seconds = elapsed
+            logging.info(f"🧊 Premier rendu kaleido (démarrage à froid) : {elapsed:.2f}s (pid {os.getpid()})")
+        else:
+            self.warm_renders += 1
+            self.warm_seconds += elapsed
+        return data
+
+    def warm_up(self) -> None:
+        """Démarre kaleido en rendant une figure minimale (sans effet s'il tourne déjà)"""
+        with self._lock:
+            if self._pid == os.getpid() and self.cold_start_seconds is not None:
+                return
+            try:
+                self._export({"data": [{"type": "scatter", "x": [0], "y": [0]}], "layout": {}}, 1)
+            except Exception as e:
+                logging.warning(f"⚠️ Préchauffage kaleido impossible: {e}")
+                return
+        self._publish_stats()
+
+    def render(self, fig, scale: int = DEFAULT_SCALE) -> bytes:
+        """PNG d'une figure (go.Figure ou dict)"""
+        return self.render_many([fig], scale=scale)[0]
+
+    def render_many(self, figs: List[Any], scale: int = DEFAULT_SCALE) -> List[bytes]:
+        """
+        PNG de plusieurs figures, dans l'ordre. kaleido n'exporte qu'une figure par
+        appel : elles passent une à une, mais sous une seule prise du verrou.
+        """
+        if not figs:
+            return []
+        figures = [_figure_dict(fig) for fig in figs]
+        with self._lock:
+            started = time.perf_counter()
+            images = [self._export(figure, scale) for figure in figures]
+            self.render_calls += 1
+        logging.debug(f"🎨 {len(images)} graphique(s) Plotly rendu(s) en {time.perf_counter() - started:.2f}s")
+        self._publish_stats()
+        return images
+
+    def _publish_stats(self) -> None:
+        """Écrit get_stats() dans <stats_dir>/<pid>.json (écriture atomique)"""
+        if self.stats_dir is None:
+            return
+        try:
+            self.stats_dir.mkdir(parents=True, exist_ok=True)
+            path = self.stats_dir / f"{os.getpid()}.json"
+            tmp_path = self.stats_dir / f".{os.getpid()}.{uuid.uuid4().hex}.tmp"
+            tmp_path.write_text(json.dumps(self.get_stats()), encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.debug(f"Statistiques kaleido non publiées: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "pid": self._pid,
+            "started": self._pid == os.getpid() and self.cold_start_seconds is not None,
+            "cold_start_seconds": round(self.cold_start_seconds, 3) if self.cold_start_seconds is not None else None,
+            "warm_renders": self.warm_renders,
+            "warm_avg_seconds": round(self.warm_seconds / self.warm_renders, 3) if self.warm_renders else None,
+            "render_calls": self.render_calls,
+        }
+
+
+_renderer: Optional[PlotlyRenderer] = None
+_renderer_lock = threading.Lock()
+
+
+def get_plotly_renderer() -> PlotlyRenderer:
+    """Renderer partagé du process"""
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = PlotlyRenderer(stats_dir=Config.PATHS.PLOTLY_STATS_DIR)
+        return _renderer
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def read_render_process_stats(stats_dir: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """
+    Statistiques publiées par les process de rendu encore vivants (pool du pipeline,
+    runner de jobs). Les fichiers des process terminés sont supprimés au passage.
+    """
+    stats_dir = Path(stats_dir or Config.PATHS.PLOTLY_STATS_DIR)
+    if not stats_dir.is_dir():
+        return []
+    stats = []
+    for path in sorted(stats_dir.glob("*.json")):
+        try:
+            pid = int(path.stem)
+        except ValueError:
+            continue
+        if not _pid_alive(pid):
+            path.unlink(missing_ok=True)
+            continue
+        try:
+            stats.append(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            continue
+    return stats
+
+
+def warm_plotly_renderer() -> None:
+    """Préchauffe kaleido (désactivable par PLOTLY_WARMUP=0)"""
+    if os.getenv("PLOTLY_WARMUP", "1").lower() in ("0", "false"):
+        return
+    get_plotly_renderer().warm_up()
@@ -3,6 +3,7 @@ BaseTemplate — Classe abstraite pour tous les templates PPTX Tarmaac.
 Design premium dark theme : fond noir, cartes KPI modernes, accents gold.
 """
 
+import io
 import os
 import logging
 from abc import ABC, abstractmethod
@@ -13,6 +14,7 @@ from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.enum.shapes import MSO_SHAPE
 from pptx.oxml.ns import qn
 
+from backend.reports import charts, native_charts
 from backend.reports.styles import (
     PALETTE, FUNCTIONAL_COLORS, FONT_TITLE, FONT_BODY,
     FONT_SIZES, SLIDE_WIDTH, SLIDE_HEIGHT, MARGIN,
@@ -24,11 +26,20 @@ from backend.reports.styles import (
 class BaseTemplate(ABC):
     """Classe abstraite dont tous les templates h\u00e9ritent."""
 
+    # Graphiques PowerPoint natifs (modifiables, sans rendu) au lieu de PNG :
+    # None = REPORT_NATIVE_CHARTS lu à la création du template ; surchargeable par
+    # template (True/False), ou par graphique via le paramètre native=
+    NATIVE_CHARTS = None
+
     def __init__(self):
         self.prs = Presentation()
         self.prs.slide_width = SLIDE_WIDTH
         self.prs.slide_height = SLIDE_HEIGHT
         self.blank_layout = self.prs.slide_layouts[6]
+        if self.NATIVE_CHARTS is None:
+            self.native_charts = os.getenv("REPORT_NATIVE_CHARTS", "").lower() in ("1", "true")
+        else:
+            self.native_charts = self.NATIVE_CHARTS
 
     @abstractmethod
     def generate(self, data: dict) -> Presentation:
@@ -348,17 +359,56 @@ class BaseTemplate(ABC):
             bold=True, font_name=FONT_BODY, alignment=PP_ALIGN.CENTER,
         )
 
-    def add_chart_image(self, slide, image_path: str, x, y, width, height):
-        """Ins\u00e8re une image PNG et supprime le fichier temporaire."""
+    def add_chart_image(self, slide, image, x, y, width, height):
+        """
+        Insère une image PNG rendue en mémoire (BytesIO ou bytes).
+
+        Compatibilité : un chemin de fichier est encore accepté, le fichier est
+        alors supprimé après insertion.
+        """
         try:
-            if os.path.exists(image_path):
-                slide.shapes.add_picture(image_path, x, y, width, height)
-                os.remove(image_path)
-            else:
-                logging.warning(f"Image non trouvee : {image_path}")
+            if isinstance(image, (str, os.PathLike)):
+                if os.path.exists(image):
+                    slide.shapes.add_picture(image, x, y, width, height)
+                    os.remove(image)
+                else:
+                    logging.warning(f"Image non trouvee : {image}")
+                return
+
+            stream = io.BytesIO(image) if isinstance(image, (bytes, bytearray)) else image
+            if stream.getbuffer().nbytes == 0:
+                logging.warning("Image vide : graphique non rendu")
+                return
+            stream.seek(0)
+            slide.shapes.add_picture(stream, x, y, width, height)
         except Exception as e:
             logging.error(f"Erreur insertion image : {e}")
 
+    def _use_native(self, native) -> bool:
+        return self.native_charts if native is None else native
+
+    def add_evolution_charts(self, slide, history, to_draw, positions, width, height,
+                             line_color=None, native=None):
+        """
+        Line charts d'évolution aux positions données.
+
+        Args:
+            to_draw: (index dans positions, metric_key, titre) de chaque graphique
+            native: graphiques natifs (défaut du template), sinon PNG Plotly rendus à la suite
+        """
+        if self._use_native(native):
+            for i, key, title in to_draw:
+                x, y = positions[i]
+                native_charts.add_native_evolution_chart(
+                    slide, history, key, title, x, y, width, height, line_color=line_color)
+            return
+
+        images = charts.render_plotly_evolution_charts(
+            history, [(key, title) for _, key, title in to_draw], line_color=line_color)
+        for (i, _, _), chart_png in zip(to_draw, images):
+            x, y = positions[i]
+            self.add_chart_image(slide, chart_png, x, y, width, height)
+
     # ──────────────────────────────────────────
     # Helpers de layout
     # ──────────────────────────────────────────
@@ -5,7 +5,6 @@ Clics RDV placeholder manuel.
 """
 
 import os
-import tempfile
 import logging
 from pathlib import Path
 from typing import Optional
@@ -21,7 +20,6 @@ from backend.reports.styles import (
     METRIC_TOOLTIPS, INVERSE_METRICS,
     hex_to_rgb, format_currency, format_number, format_percentage, calc_variation,
 )
-from backend.reports import charts
 
 ASSETS_DIR = Path(__file__).parent.parent / "assets"
 LOGO_PATH = ASSETS_DIR / "tarmaac_logo.png"
@@ -347,15 +345,12 @@ class TemplateDenteva(BaseTemplate):
         chart_w = Inches(6)
         chart_h = Inches(2.8)
 
-        for i, (key, title) in enumerate(keys_titles):
-            if i >= 4:
-                break
-            has_data = any(self._safe_get(h, key) > 0 for h in history)
-            if has_data:
-                with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-                    charts.create_plotly_evolution_chart(history, key, title, tmp.name, line_color=accent)
-                    x, y = positions[i]
-                    self.add_chart_image(slide, tmp.name, x, y, chart_w, chart_h)
+        to_draw = [
+            (i, key, title) for i, (key, title) in enumerate(keys_titles)
+            if i < 4 and any(self._safe_get(h, key) > 0 for h in history)
+        ]
+        self.add_evolution_charts(
+            slide, history, to_draw, positions, chart_w, chart_h, line_color=accent)
 
     # ──────────────────────────────────────────
     # Slide 4 — Évolution conversions
@@ -385,14 +380,12 @@ class TemplateDenteva(BaseTemplate):
             positions = [((SLIDE_WIDTH - Inches(8)) / 2, Inches(2.0))]
             chart_w, chart_h = Inches(8), Inches(4)
 
-        for i, (key, title) in enumerate(charts_to_draw):
-            has_data = any(self._safe_get(h, key) > 0 for h in history)
-            if has_data:
-                with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-                    charts.create_plotly_evolution_chart(
-                        history, key, title, tmp.name, line_color=PALETTE["gold"])
-                    x, y = positions[i]
-                    self.add_chart_image(slide, tmp.name, x, y, chart_w, chart_h)
+        to_draw = [
+            (i, key, title) for i, (key, title) in enumerate(charts_to_draw)
+            if any(self._safe_get(h, key) > 0 for h in history)
+        ]
+        self.add_evolution_charts(
+            slide, history, to_draw, positions, chart_w, chart_h, line_color=PALETTE["gold"])
 
     # ──────────────────────────────────────────
     # Slide 5 — Synthèse
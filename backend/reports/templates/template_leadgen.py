@@ -5,7 +5,7 @@ Leads qualifiés placeholder dans la synthèse.
 """
 
 import os
-import tempfile
+import io
 import logging
 from pathlib import Path
 from typing import Optional
@@ -324,12 +324,12 @@ class TemplateLeadGen(BaseTemplate):
         for i, (cost_key, leads_key, title, color) in enumerate(dual_charts):
             has_data = any(self._safe_get(h, cost_key) > 0 for h in history)
             if has_data:
-                with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-                    charts.create_plotly_dual_axis_chart(
-                        history, cost_key, leads_key, title, tmp.name,
-                        cost_color=color, leads_color="FFFFFF")
-                    x, y = positions[i]
-                    self.add_chart_image(slide, tmp.name, x, y, chart_w, chart_h)
+                chart_png = io.BytesIO()
+                charts.create_plotly_dual_axis_chart(
+                    history, cost_key, leads_key, title, chart_png,
+                    cost_color=color, leads_color="FFFFFF")
+                x, y = positions[i]
+                self.add_chart_image(slide, chart_png, x, y, chart_w, chart_h)
 
     def _slide_recap(self, gen_curr, gen_prev, g_curr, g_prev, m_curr, m_prev, month_fr):
         slide = self.prs.slides.add_slide(self.blank_layout)
@@ -435,15 +435,12 @@ class TemplateLeadGen(BaseTemplate):
         chart_w = Inches(6)
         chart_h = Inches(2.8)
 
-        for i, (key, title) in enumerate(keys_titles):
-            if i >= 4:
-                break
-            has_data = any(self._safe_get(h, key) > 0 for h in history)
-            if has_data:
-                with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-                    charts.create_plotly_evolution_chart(history, key, title, tmp.name, line_color=accent)
-                    x, y = positions[i]
-                    self.add_chart_image(slide, tmp.name, x, y, chart_w, chart_h)
+        to_draw = [
+            (i, key, title) for i, (key, title) in enumerate(keys_titles)
+            if i < 4 and any(self._safe_get(h, key) > 0 for h in history)
+        ]
+        self.add_evolution_charts(
+            slide, history, to_draw, positions, chart_w, chart_h, line_color=accent)
 
     # ──────────────────────────────────────────
     # Slide 4 — Meta Ads
@@ -0,0 +1,83 @@
+import io
+
+from backend.reports import chart_cache
+from backend.reports.chart_cache import ChartCache, cached_chart, history_series
+
+calls = []
+
+
+@cached_chart(lambda a: {**a, "history": history_series(a["history"], a["metric_key"])})
+def _fake_chart(history, metric_key, output_path, color="#FFC107"):
+    calls.append(metric_key)
+    with open(output_path, "wb") as f:
+        f.write(f"png:{metric_key}:{color}".encode())
+
+
+def test_chart_cache_reuses_png_and_evicts_lru(tmp_path, monkeypatch):
+    cache = ChartCache(tmp_path / "cache", max_bytes=10_000)
+    monkeypatch.setattr(chart_cache, "_cache", cache)
+    history = [{"month_fr": "Janvier", "Clics": 10, "Coût": 5}]
+    out = tmp_path / "out.png"
+
+    _fake_chart(history, "Clics", str(out))
+    # Une autre colonne de l'historique change : même série tracée → cache
+    _fake_chart([{**history[0], "Coût": 99}], "Clics", str(out))
+    assert calls == ["Clics"]
+    assert out.read_bytes() == b"png:Clics:#FFC107"
+
+    # Style différent → nouveau rendu
+    _fake_chart(history, "Clics", str(out), color="#FFFFFF")
+    assert calls == ["Clics", "Clics"]
+    assert cache.hits == 1
+
+    # Limite dépassée : les entrées les plus anciennes partent
+    small = ChartCache(tmp_path / "small", max_bytes=40)
+    for i in range(5):
+        small.put(f"k{i}", b"x" * 15)
+    assert small.get("k4") == b"x" * 15
+    assert small.get("k0") is None
+
+
+def test_chart_rendered_in_memory_is_inserted_without_temp_file(tmp_path, monkeypatch):
+    from pptx import Presentation
+    from pptx.util import Inches
+
+    from backend.reports import charts
+    from backend.reports.templates.base import BaseTemplate
+
+    monkeypatch.setattr(chart_cache, "_cache", ChartCache(tmp_path / "cache"))
+    monkeypatch.chdir(tmp_path)
+
+    chart_png = io.BytesIO()
+    charts.create_budget_donut(1200, 300, chart_png)
+    assert chart_png.getvalue().startswith(b"\x89PNG")
+
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    BaseTemplate.add_chart_image(None, slide, chart_png, 0, 0, Inches(4), Inches(4))
+
+    assert len(slide.shapes) == 1
+    assert [p.name for p in tmp_path.iterdir()] == ["cache"]
+
+
+def test_chart_key_ignores_code_location_but_follows_style(monkeypatch):
+    def chart(output_path):
+        return "a"
+
+    def moved(output_path):
+        # Même code, autre fichier/ligne
+        return "a"
+
+    moved.__code__ = moved.__code__.replace(co_filename="ailleurs.py", co_firstlineno=999)
+    assert chart_cache._function_fingerprint(chart) == chart_cache._function_fingerprint(moved)
+
+    def style():
+        return "dark"
+
+    def other_style():
+        return "light"
+
+    monkeypatch.setattr(chart_cache, "_style_functions", [style])
+    key = cached_chart()(chart).cache_key(io.BytesIO())[0]
+    monkeypatch.setattr(chart_cache, "_style_functions", [other_style])
+    assert cached_chart()(chart).cache_key(io.BytesIO())[0] != key
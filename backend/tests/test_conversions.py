@@ -0,0 +1,130 @@
+import types
+
+from backend.common.services.google_sheets import GoogleSheetsService
+from backend.google_ads_wrapper.services.authentication import GoogleAdsAuthService
+from backend.google_ads_wrapper.services.conversions import GoogleAdsConversionsService
+from backend.google_ads_wrapper.utils.conversion_rules import ConversionRuleEngine, load_conversion_rules
+
+
+def _fake_row(name, all_conversions, conversions=None):
+    row = types.SimpleNamespace()
+    row.segments = types.SimpleNamespace(conversion_action_name=name, conversion_action=f"actions/{name}")
+    row.metrics = types.SimpleNamespace(all_conversions=all_conversions,
+                                        conversions=all_conversions if conversions is None else conversions)
+    return row
+
+
+def _make_service(monkeypatch, rows):
+    monkeypatch.setattr(GoogleAdsAuthService, "_initialize_client", lambda self: None)
+    monkeypatch.setattr(GoogleSheetsService, "_initialize_service", lambda self: None)
+    service = GoogleAdsConversionsService()
+
+    queries = []
+
+    def fake_fetch(customer_id, query):
+        queries.append(query)
+        return iter(rows)  # itérateur à usage unique, comme ga_service.search
+
+    monkeypatch.setattr(service.auth_service, "fetch_report_data", fake_fetch)
+    return service, queries
+
+
+def test_contact_and_directions_share_one_snapshot(monkeypatch):
+    rows = [_fake_row("Appels", 4), _fake_row("Itinéraires", 2), _fake_row("Vide", 0)]
+    service, queries = _make_service(monkeypatch, rows)
+
+    contact_total, directions_total, _ = service.get_all_conversions_data("123", "2026-01-01", "2026-01-31")
+    directions_only, _ = service.get_directions_conversions_data("123", "2026-01-01", "2026-01-31")
+
+    assert (contact_total, directions_total, directions_only) == (4, 2, 2)
+    assert len(queries) == 1
+    assert "metrics.all_conversions > 0" not in queries[0]
+
+    positive = service.get_conversion_snapshot("123", "2026-01-01", "2026-01-31")
+    everything = service.get_conversion_snapshot("123", "2026-01-01", "2026-01-31", only_positive=False)
+    assert [r.segments.conversion_action_name for r in positive] == ["Appels", "Itinéraires"]
+    assert len(everything) == 3
+    assert len(queries) == 1
+
+
+def test_snapshot_cleared_per_customer(monkeypatch):
+    service, queries = _make_service(monkeypatch, [_fake_row("Appels", 1)])
+
+    service.get_conversion_snapshot("123", "2026-01-01", "2026-01-31")
+    service.get_conversion_snapshot("456", "2026-01-01", "2026-01-31")
+    service.clear_conversion_snapshots("123")
+    service.get_conversion_snapshot("123", "2026-01-01", "2026-01-31")
+    service.get_conversion_snapshot("456", "2026-01-01", "2026-01-31")
+
+    assert len(queries) == 3
+
+
+def test_rule_engine_classifies_in_one_pass():
+    engine = ConversionRuleEngine({
+        "default": {"contact": {"contains": ["appels"]}, "directions": {"contains": ["itinéraires"]}, "exclusive": True},
+        "clients": {
+            "111": {
+                "name": "Client exact",
+                "sheet_names": ["Onglet Exact"],
+                "contact": {"exact": ["cta"], "contains": ["clicks to call"], "value": "conversions"},
+                "directions": {"all_of": [["actions locales", "itinéraire"]], "normalize": True},
+            },
+        },
+    })
+    rows = [
+        _fake_row("CTA", 3, conversions=0),
+        _fake_row("Click CTA", 5),
+        _fake_row("Clicks to call", 2),
+        _fake_row("Actions locales\xa0– Itinéraire", 7),
+        _fake_row("Appels itinéraires", 1),
+    ]
+
+    result = engine.classify(rows, "111")
+    assert result["contact"]["total"] == 2  # "CTA" n'a que des all_conversions
+    assert [c["name"] for c in result["contact"]["conversions"]] == ["CTA", "Clicks to call"]
+    assert result["directions"]["total"] == 7
+    assert len(result["all_conversions"]) == 5
+
+    # Résolution par nom d'onglet, puis règles par défaut (exclusives)
+    assert engine.resolve("999", "Onglet Exact").name == "Client exact"
+    default = engine.classify(rows, "999")
+    assert (default["contact"]["total"], default["directions"]["total"]) == (1, 0)
+
+
+def test_shipped_rules_load():
+    rules = load_conversion_rules()
+    engine = ConversionRuleEngine(rules)
+
+    laserel = engine.classify([_fake_row("Appels", 2), _fake_row("[TARMAAC] Click CTA", 4)], "5901565913")
+    assert laserel["contact"]["total"] == 2
+    assert engine.resolve("0000000000", "Meubles Rigaud").name == "Meuble Rigaud"
+
+
+def test_slow_snapshot_does_not_block_other_customers(monkeypatch):
+    import threading
+
+    service, queries = _make_service(monkeypatch, [_fake_row("Appels", 1)])
+    release = threading.Event()
+    started = threading.Event()
+
+    def fetch(customer_id, query):
+        queries.append(customer_id)
+        if customer_id == "slow":
+            started.set()
+            release.wait(5)
+        return iter([_fake_row("Appels", 1)])
+
+    monkeypatch.setattr(service.auth_service, "fetch_report_data", fetch)
+    waiters = [threading.Thread(target=service.get_conversion_snapshot, args=("slow", "2026-01-01", "2026-01-31"))
+               for _ in range(3)]
+    for thread in waiters:
+        thread.start()
+    started.wait(5)
+
+    # Client lent en cours : un autre client est servi immédiatement
+    assert len(service.get_conversion_snapshot("fast", "2026-01-01", "2026-01-31")) == 1
+    release.set()
+    for thread in waiters:
+        thread.join(5)
+
+    assert sorted(queries) == ["fast", "slow"]
@@ -0,0 +1,110 @@
+import threading
+import time
+
+from backend.common.services import creative_export
+from backend.common.services.creative_export import CreativeExportEngine, _Platform
+
+
+class _Stream:
+    def __init__(self, url):
+        self.extension = ".mp4" if "video" in url else ".jpg"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+class _Creatives:
+    def open_media_stream(self, url):
+        time.sleep(0.01)
+        return None if "broken" in url else _Stream(url)
+
+
+class _Drive:
+    def __init__(self):
+        self.uploads = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def find_or_create_folder(self, name, parent_id):
+        return f"{parent_id}/{name}"
+
+    def forget_folder(self, name, parent_id):
+        self.forgotten = (parent_id, name)
+
+    def prefetch_folders(self, parent_id):
+        self.prefetched = parent_id
+
+    def _track(self, record):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.02)
+        with self._lock:
+            self.active -= 1
+            self.uploads.append(record)
+
+    def upload_media_deduplicated(self, stream, filename, folder_id, mime_type):
+        self._track((folder_id, filename, mime_type))
+
+    def upload_csv_to_drive(self, csv_content, filename, folder_id):
+        self._track((folder_id, filename, "text/csv"))
+        return {"id": filename, "name": filename, "link": None}
+
+
+def _meta_platform(ad_account_id, folder_id):
+    campaigns = [{"id": str(i), "name": f"Campagne {i}"} for i in range(4)]
+    creatives = [{"ad_name": "A", "images": ["img1", "broken"], "videos": ["video1"]}, {"images": ["img2"]}]
+    return _Platform("meta", "Meta Ads", _Creatives(), lambda: campaigns, lambda c: creatives,
+                     creative_export._meta_csv, (("image", "images"), ("video", "videos")), folder_id)
+
+
+def test_campaigns_exported_concurrently_with_stable_names(monkeypatch):
+    monkeypatch.setenv("EXPORT_UPLOAD_CONCURRENCY", "3")
+    monkeypatch.setattr(CreativeExportEngine, "_meta_platform", staticmethod(_meta_platform))
+    drive = _Drive()
+
+    files = CreativeExportEngine(drive).export("Kozeo", "17-10-2026", meta_account_id="act_1", meta_folder_id="meta")
+
+    assert [f["campaign"] for f in files] == [f"Campagne {i}" for i in range(4)]
+    assert files[0] == {"platform": "Meta Ads", "campaign": "Campagne 0", "type": "csv",
+                        "id": "Campagne 0_17-10-2026.csv", "name": "Campagne 0_17-10-2026.csv", "link": None}
+    media = sorted(u for u in drive.uploads if u[0] == "meta/Campagne 2" and u[2] != "text/csv")
+    # Positions dans la campagne : le média en échec (1) laisse un trou, les noms ne dépendent pas de l'ordre de fin
+    assert media == [
+        ("meta/Campagne 2", "image_0.jpg", "image/jpeg"),
+        ("meta/Campagne 2", "image_3.jpg", "image/jpeg"),
+        ("meta/Campagne 2", "video_2.mp4", "video/mp4"),
+    ]
+    assert 1 < drive.max_active <= 3
+    assert drive.prefetched == "meta"
+
+
+class _NotFound(Exception):
+    class resp:
+        status = 404
+
+
+def test_deleted_campaign_folder_is_recreated(monkeypatch):
+    monkeypatch.setattr(CreativeExportEngine, "_meta_platform", staticmethod(_meta_platform))
+    drive = _Drive()
+    folders = iter(["meta/supprimé"] + [f"meta/nouveau-{i}" for i in range(10)])
+    drive.find_or_create_folder = lambda name, parent_id: next(folders)
+    upload_csv = drive.upload_csv_to_drive
+
+    def upload_csv_to_drive(csv_content, filename, folder_id):
+        if folder_id == "meta/supprimé":
+            raise _NotFound()
+        return upload_csv(csv_content, filename, folder_id)
+
+    drive.upload_csv_to_drive = upload_csv_to_drive
+    monkeypatch.setenv("EXPORT_CAMPAIGN_WORKERS", "1")
+
+    files = CreativeExportEngine(drive).export("Kozeo", "17-10-2026", meta_account_id="act_1", meta_folder_id="meta")
+
+    assert len(files) == 4
+    assert drive.forgotten == ("meta", "Campagne 0")
+    assert ("meta/nouveau-0", "Campagne 0_17-10-2026.csv", "text/csv") in drive.uploads
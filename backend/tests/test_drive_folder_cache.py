@@ -0,0 +1,99 @@
+from backend.common.services.drive_folder_cache import DriveFolderCache
+
+
+class _Drive:
+    """Callbacks files().get / list / create comptés"""
+
+    def __init__(self, existing=None):
+        self.folders = dict(existing or {})
+        self.calls = []
+
+    def callbacks(self, parent, name):
+        def verify(folder_id):
+            self.calls.append(("get", folder_id))
+            return self.folders.get((parent, name)) == folder_id
+
+        def lookup():
+            self.calls.append(("list", parent, name))
+            return self.folders.get((parent, name))
+
+        def create():
+            self.calls.append(("create", parent, name))
+            folder_id = f"id-{len(self.folders)}"
+            self.folders[(parent, name)] = folder_id
+            return folder_id
+
+        return {"verify": verify, "lookup": lookup, "create": create}
+
+
+def test_resolved_folder_is_reused_and_persisted(tmp_path):
+    path = tmp_path / "folders.json"
+    drive = _Drive({("root", "Kozeo"): "k1"})
+    cache = DriveFolderCache(str(path))
+
+    assert cache.resolve("root", "Kozeo", **drive.callbacks("root", "Kozeo")) == "k1"
+    assert cache.resolve("root", "Kozeo", **drive.callbacks("root", "Kozeo")) == "k1"
+    assert drive.calls == [("list", "root", "Kozeo")]
+
+    reloaded = DriveFolderCache(str(path))
+    assert reloaded.resolve("root", "Kozeo", **drive.callbacks("root", "Kozeo")) == "k1"
+    assert len(drive.calls) == 1
+
+
+def test_children_of_created_folder_skip_lookup(tmp_path):
+    drive = _Drive()
+    cache = DriveFolderCache(str(tmp_path / "folders.json"))
+
+    client_id = cache.resolve("root", "Kozeo", **drive.callbacks("root", "Kozeo"))
+    cache.resolve(client_id, "Campagne 1", **drive.callbacks(client_id, "Campagne 1"))
+
+    assert drive.calls == [("list", "root", "Kozeo"), ("create", "root", "Kozeo"), ("create", client_id, "Campagne 1")]
+
+
+def test_stale_entry_is_verified_then_resolved_again(tmp_path, monkeypatch):
+    monkeypatch.setenv("DRIVE_FOLDER_CACHE_TTL", "0")
+    drive = _Drive({("root", "Kozeo"): "k1"})
+    cache = DriveFolderCache(str(tmp_path / "folders.json"))
+    cache.put("root", "Kozeo", "k1")
+
+    assert cache.resolve("root", "Kozeo", **drive.callbacks("root", "Kozeo")) == "k1"
+    assert drive.calls == [("get", "k1")]
+
+    # Dossier supprimé côté Drive : l'entrée est oubliée et le dossier recréé
+    del drive.folders[("root", "Kozeo")]
+    drive.calls.clear()
+    new_id = cache.resolve("root", "Kozeo", **drive.callbacks("root", "Kozeo"))
+
+    assert new_id != "k1"
+    assert drive.calls == [("get", "k1"), ("list", "root", "Kozeo"), ("create", "root", "Kozeo")]
+    assert cache.stats["stale"] == 1
+
+
+def test_always_verify_detects_trashed_folder(tmp_path):
+    drive = _Drive({("root", "Kozeo"): "k1"})
+    cache = DriveFolderCache(str(tmp_path / "folders.json"))
+    cache.put("root", "Kozeo", "k1")
+
+    # Entrée récente, mais dossier mis à la corbeille depuis : revérifié et recréé
+    del drive.folders[("root", "Kozeo")]
+    new_id = cache.resolve("root", "Kozeo", always_verify=True, **drive.callbacks("root", "Kozeo"))
+
+    assert new_id != "k1"
+    assert drive.calls == [("get", "k1"), ("list", "root", "Kozeo"), ("create", "root", "Kozeo")]
+
+
+def test_processes_sharing_the_file_keep_each_other_entries(tmp_path):
+    path = str(tmp_path / "folders.json")
+    worker_a = DriveFolderCache(path)
+    worker_b = DriveFolderCache(path)
+
+    worker_a.put("root", "Kozeo", "k1")
+    worker_b.put("root", "Emma", "e1")
+
+    reloaded = DriveFolderCache(path)
+    drive = _Drive()
+    assert reloaded.resolve("root", "Kozeo", **drive.callbacks("root", "Kozeo")) == "k1"
+    assert reloaded.resolve("root", "Emma", **drive.callbacks("root", "Emma")) == "e1"
+    # L'entrée écrite par l'autre worker est relue sans requête Drive
+    assert worker_a.resolve("root", "Emma", **drive.callbacks("root", "Emma")) == "e1"
+    assert drive.calls == []
@@ -0,0 +1,130 @@
+import threading
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from backend.common.services import drive_media_index
+from backend.common.services.drive_media_index import DriveMediaIndex
+from backend.common.services.google_drive import GoogleDriveService
+from backend.common.utils.media_stream import MediaStream
+
+
+class _Response:
+    def __init__(self, body, headers):
+        self.body = body
+        self.headers = headers
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+class _Request:
+    def __init__(self, result=None, media=None, error=None):
+        self.result = result
+        self.media = media
+        self.error = error
+
+    def execute(self, http=None):
+        if self.error:
+            raise self.error
+        return self.result
+
+    def next_chunk(self, http=None, num_retries=0):
+        self.result["bytes"] = self.media.getbytes(0, self.media.size())
+        return None, self.result
+
+
+class _Files:
+    """files() Drive : enregistre les uploads (contenu) et les copies"""
+
+    def __init__(self):
+        self.uploads = []
+        self.copies = []
+        self.deleted = set()
+
+    def create(self, body, media_body=None, **kwargs):
+        file_id = f"up{len(self.uploads)}"
+        self.uploads.append(body["name"])
+        return _Request({"id": file_id, "name": body["name"]}, media=media_body)
+
+    def copy(self, fileId, body, **kwargs):
+        if fileId in self.deleted:
+            return _Request(error=HttpError(httplib2.Response({"status": 404}), b"File not found"))
+        self.copies.append((fileId, body["name"]))
+        return _Request({"id": f"cp{len(self.copies)}", "name": body["name"]})
+
+
+def _service(files):
+    service = object.__new__(GoogleDriveService)
+    service.service = type("_Drive", (), {"files": lambda self: files})()
+    service._credentials = None
+    service._local = threading.local()
+    return service
+
+
+def _stream(url, body, etag=None):
+    headers = {"Content-Type": "image/jpeg", "Content-Length": str(len(body))}
+    if etag:
+        headers["ETag"] = etag
+    return MediaStream(_Response(body, headers), url)
+
+
+def test_unchanged_media_is_copied_instead_of_uploaded(tmp_path, monkeypatch):
+    monkeypatch.setattr(drive_media_index, "_index", DriveMediaIndex(str(tmp_path / "index.json")))
+    files = _Files()
+    drive = _service(files)
+    body = b"\xff\xd8" + b"x" * 5000
+
+    first = drive.upload_media_deduplicated(_stream("https://cdn.test/a.jpg?sig=1", body, '"e1"'), "image_0.jpg", "day1", "image/jpeg")
+    assert first["deduplicated"] is None and files.uploads == ["image_0.jpg"]
+
+    # Lendemain : même source CDN (signature différente) → copie sans lire le corps
+    stream = _stream("https://cdn.test/a.jpg?sig=2", body, '"e1"')
+    second = drive.upload_media_deduplicated(stream, "image_0.jpg", "day2", "image/jpeg")
+    assert second["deduplicated"] == "source"
+    assert stream.bytes_read == 0
+    assert files.copies == [("up0", "image_0.jpg")]
+
+    # Même contenu sous une autre URL, sans ETag : reconnu par son sha256
+    third = drive.upload_media_deduplicated(_stream("https://cdn.test/b.jpg", body), "image_1.jpg", "day2", "image/jpeg")
+    assert third["deduplicated"] == "hash"
+    assert len(files.uploads) == 1
+
+
+def test_missing_source_file_falls_back_to_upload(tmp_path, monkeypatch):
+    monkeypatch.setattr(drive_media_index, "_index", DriveMediaIndex(str(tmp_path / "index.json")))
+    files = _Files()
+    drive = _service(files)
+    body = b"video" * 1000
+
+    drive.upload_media_deduplicated(_stream("https://cdn.test/v.mp4", body, '"v"'), "video_0.mp4", "day1", "video/mp4")
+    files.deleted.add("up0")
+    result = drive.upload_media_deduplicated(_stream("https://cdn.test/v.mp4", body, '"v"'), "video_0.mp4", "day2", "video/mp4")
+
+    assert result["deduplicated"] is None
+    assert files.uploads == ["video_0.mp4", "video_0.mp4"]
+    assert drive_media_index.get_drive_media_index().by_source("cdn.test/v.mp4|etag:\"v\"")["id"] == "up1"
+
+
+def test_index_merges_records_from_other_processes(tmp_path):
+    path = str(tmp_path / "index.json")
+    first, second = DriveMediaIndex(path), DriveMediaIndex(path)
+
+    first.record("a" * 64, "id_a", 10, key="cdn.test/a.jpg|etag:\"a\"")
+    second.record("b" * 64, "id_b", 20)
+
+    # Aucun process n'écrase les entrées de l'autre, et chacun voit celles de l'autre
+    assert first.by_hash("b" * 64)["id"] == "id_b"
+    assert DriveMediaIndex(path).by_source("cdn.test/a.jpg|etag:\"a\"")["id"] == "id_a"
+    second.forget("a" * 64)
+    assert first.by_hash("a" * 64) is None
+
+
+def test_source_key_requires_a_validator():
+    assert drive_media_index.source_key("https://cdn.test/a.jpg?sig=1", None, None, 5000) is None
+    assert drive_media_index.source_key("https://cdn.test/a.jpg?sig=1", None, "Mon, 02 Feb 2026 10:00:00 GMT", 5000) == \
+        "cdn.test/a.jpg|modified:Mon, 02 Feb 2026 10:00:00 GMT|size:5000"
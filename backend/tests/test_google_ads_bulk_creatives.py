@@ -0,0 +1,83 @@
+import re
+from types import SimpleNamespace as NS
+
+from backend.google_ads_wrapper.services.google_ads_creative import GoogleAdsCreativeService
+
+
+def _enum(name):
+    return NS(name=name)
+
+
+def _asset(type_name, url="", video_id="", text=""):
+    return NS(type_=_enum(type_name), image_asset=NS(full_size=NS(url=url)),
+              youtube_video_asset=NS(youtube_video_id=video_id), text_asset=NS(text=text))
+
+
+def _ad(campaign_id, ad_id, ad_group_name):
+    texts = [NS(text=f"Titre {ad_id}")]
+    ad = NS(id=ad_id, name="", type_=_enum("RESPONSIVE_SEARCH_AD"), final_urls=["https://site.test"],
+            responsive_search_ad=NS(headlines=texts, descriptions=texts),
+            responsive_display_ad=NS(headlines=[], descriptions=[]))
+    return NS(campaign=NS(id=campaign_id), ad_group=NS(id=ad_id * 10, name=ad_group_name), ad_group_ad=NS(ad=ad))
+
+
+TABLES = {
+    "ad_group_ad": [_ad(1, 11, "Groupe A"), _ad(2, 21, "Groupe B"), _ad(1, 12, "Groupe C")],
+    "ad_group_ad_asset_view": [
+        NS(campaign=NS(id=1), ad_group_ad=NS(ad=NS(id=11)), asset=_asset("IMAGE", url="https://img.test/1")),
+        NS(campaign=NS(id=2), ad_group_ad=NS(ad=NS(id=21)), asset=_asset("YOUTUBE_VIDEO", video_id="yt2")),
+    ],
+    "campaign_asset": [NS(campaign=NS(id=1), asset=_asset("IMAGE", url="https://img.test/ext"))],
+    "asset_group": [NS(campaign=NS(id=3), asset_group=NS(id=31, name="PMax", final_urls=[]))],
+    "asset_group_asset": [
+        NS(campaign=NS(id=3), asset_group=NS(id=31), asset_group_asset=NS(field_type=_enum("HEADLINE")),
+           asset=_asset("TEXT", text="Titre PMax")),
+        NS(campaign=NS(id=3), asset_group=NS(id=31), asset_group_asset=NS(field_type=_enum("MARKETING_IMAGE")),
+           asset=_asset("IMAGE", url="https://img.test/pmax")),
+    ],
+}
+
+
+class _GoogleAdsService:
+    """search / search_stream : lignes de la table filtrées par campaign.id (= ou IN)"""
+
+    def __init__(self):
+        self.calls = []
+
+    def _rows(self, query):
+        table = re.search(r"FROM (\w+)", query).group(1)
+        match = re.search(r"campaign\.id (?:= (\d+)|IN \(([\d, ]+)\))", query)
+        ids = {int(i) for i in (match.group(1) or match.group(2)).split(",")}
+        return [row for row in TABLES[table] if row.campaign.id in ids]
+
+    def search(self, customer_id, query):
+        self.calls.append("search")
+        return self._rows(query)
+
+    def search_stream(self, customer_id, query):
+        self.calls.append("search_stream")
+        return [NS(results=self._rows(query))]
+
+
+def _service():
+    service = object.__new__(GoogleAdsCreativeService)
+    ga_service = _GoogleAdsService()
+    service.client = NS(get_service=lambda name: ga_service)
+    return service, ga_service
+
+
+CAMPAIGNS = [{"id": 1, "type": "SEARCH"}, {"id": 2, "type": "DISPLAY"}, {"id": 3, "type": "PERFORMANCE_MAX"}]
+
+
+def test_customer_ads_match_per_campaign_extraction():
+    per_campaign, _ = _service()
+    expected = {c["id"]: per_campaign.get_campaign_ads("123", c["id"], c["type"]) for c in CAMPAIGNS}
+
+    bulk, ga_service = _service()
+    ads = bulk.get_customer_ads("123", CAMPAIGNS)
+
+    assert ads == expected
+    assert [ad["images"] for ad in ads[1]] == [["https://img.test/1", "https://img.test/ext"], ["https://img.test/ext"]]
+    assert ads[3][0]["headlines"] == ["Titre PMax"]
+    # Nombre de requêtes fixe : 2 PMax + 2 standard + 1 extensions, quel que soit le nombre de campagnes
+    assert ga_service.calls == ["search_stream"] * 5
@@ -0,0 +1,48 @@
+from unittest.mock import MagicMock
+
+from backend.common.services.google_sheets import GoogleSheetsService, merge_header_rows
+
+
+def _make_service(monkeypatch, column_a, header_rows):
+    monkeypatch.setattr(GoogleSheetsService, "_initialize_service", lambda self: None)
+    service = GoogleSheetsService()
+    service.service = MagicMock()
+    batch_get = service.service.spreadsheets.return_value.values.return_value.batchGet
+    batch_get.return_value.execute.return_value = {
+        "valueRanges": [{"values": column_a}, {"values": header_rows}],
+    }
+    return service, batch_get
+
+
+def test_layout_loaded_once_for_all_lookups(monkeypatch):
+    column_a = [["Client"], [""], ["January 2026"], ["February 2026"]]
+    header_rows = [["Mois", "Clics", "", "META"], ["", "", "Montant", "CTR"]]
+    service, batch_get = _make_service(monkeypatch, column_a, header_rows)
+
+    assert service.get_row_for_month("Kozeo", "February 2026") == 4
+    assert service.get_row_for_month("Kozeo", "janvier 2026") == 3
+    assert service.get_column_for_metric("Kozeo", "Clics") == "B"
+    assert service.get_column_for_metric("Kozeo", "Montant") is None
+    assert service.get_column_for_metric("Kozeo", "Montant", header_row=3) == "C"
+    assert service.get_column_for_metric("Kozeo", "CTR", header_row=0) == "D"
+
+    assert batch_get.call_count == 1
+
+
+def test_layout_invalidation_and_ttl(monkeypatch):
+    service, batch_get = _make_service(monkeypatch, [["March 2026"]], [["Mois", "Clics"]])
+
+    service.get_row_for_month("Kozeo", "March 2026")
+    service.invalidate_layout("Kozeo")
+    service.get_row_for_month("Kozeo", "March 2026")
+    assert batch_get.call_count == 2
+
+    service.LAYOUT_CACHE_TTL = 0
+    service.get_column_for_metric("Kozeo", "Clics")
+    assert batch_get.call_count == 3
+
+
+def test_merge_header_rows_uses_row3_under_group_headers():
+    row2 = ["Mois", "GOOGLE", "", "Coût"]
+    row3 = ["January 2026", "Clics", "Impressions", "12"]
+    assert merge_header_rows(row2, row3) == ["Mois", "Clics", "Impressions", "Coût"]
@@ -0,0 +1,79 @@
+from unittest.mock import MagicMock
+
+from backend.common.services.google_sheets import GoogleSheetsService, SheetWritePlan
+
+
+def _make_service(monkeypatch, column_a, header_rows):
+    monkeypatch.setattr(GoogleSheetsService, "_initialize_service", lambda self: None)
+    service = GoogleSheetsService()
+    service.service = MagicMock()
+    batch_get = service.service.spreadsheets.return_value.values.return_value.batchGet
+    batch_get.return_value.execute.return_value = {
+        "valueRanges": [{"values": column_a}, {"values": header_rows}],
+    }
+    return service, batch_get
+
+
+def test_write_plan_flushed_in_single_batch_update(monkeypatch):
+    service, _ = _make_service(monkeypatch, [], [])
+    batch_update = service.service.spreadsheets.return_value.values.return_value.batchUpdate
+    batch_update.return_value.execute.return_value = {
+        "totalUpdatedCells": 3,
+        "responses": [{"updatedCells": 1}] * 3,
+    }
+
+    plan = SheetWritePlan()
+    plan.add("Kozeo", [{"range": "B4", "value": 10}, {"range": "C4", "value": 2}], success_message="Google - Kozeo: 2 cellules")
+    plan.add_cell("Laserel", "F4", 7, success_message="Meta Temps passé - Laserel: 7")
+    plan.add("Kozeo", [])
+
+    successes, failures = service.flush_write_plan(plan)
+
+    assert batch_update.call_count == 1
+    body = batch_update.call_args.kwargs["body"]
+    assert [d["range"] for d in body["data"]] == ["'Kozeo'!B4", "'Kozeo'!C4", "'Laserel'!F4"]
+    assert successes == ["Google - Kozeo: 2 cellules", "Meta Temps passé - Laserel: 7"]
+    assert failures == []
+
+
+def test_write_plan_reports_failures_per_group(monkeypatch):
+    service, _ = _make_service(monkeypatch, [], [])
+    batch_update = service.service.spreadsheets.return_value.values.return_value.batchUpdate
+    batch_update.return_value.execute.side_effect = RuntimeError("quota")
+
+    plan = SheetWritePlan()
+    plan.add("Kozeo", [{"range": "B4", "value": 1}], success_message="Google - Kozeo: 1 cellules", failure_label="Google - Kozeo")
+    plan.add_cell("Kozeo", "H4", 3, failure_label="Leads Kozeo")
+
+    successes, failures = service.flush_write_plan(plan)
+
+    assert successes == []
+    assert failures == ["Google - Kozeo: quota", "Leads Kozeo: quota"]
+
+
+def test_failed_batch_retried_per_worksheet(monkeypatch):
+    service, _ = _make_service(monkeypatch, [], [])
+    batch_update = service.service.spreadsheets.return_value.values.return_value.batchUpdate
+    requests = []
+
+    def fake_batch_update(spreadsheetId, body):
+        sheets = {d["range"].split("!")[0] for d in body["data"]}
+        requests.append(sheets)
+        request = MagicMock()
+        if "'Renommé'" in sheets:
+            request.execute.side_effect = RuntimeError("Unable to parse range")
+        else:
+            request.execute.return_value = {"responses": [{"updatedCells": 1}] * len(body["data"])}
+        return request
+
+    batch_update.side_effect = fake_batch_update
+
+    plan = SheetWritePlan()
+    plan.add_cell("Kozeo", "H4", 3, success_message="Leads Kozeo: 1 cellules", failure_label="Leads Kozeo")
+    plan.add_cell("Renommé", "H4", 5, success_message="Leads Renommé: 1 cellules", failure_label="Leads Renommé")
+
+    successes, failures = service.flush_write_plan(plan)
+
+    assert requests == [{"'Kozeo'", "'Renommé'"}, {"'Kozeo'"}, {"'Renommé'"}]
+    assert successes == ["Leads Kozeo: 1 cellules"]
+    assert failures == ["Leads Renommé: Unable to parse range"]
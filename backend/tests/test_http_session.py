@@ -0,0 +1,77 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from backend.common.utils import http_session
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_shared_session_reuses_keep_alive_connections():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    http_session.reset_http_session()
+    try:
+        session = http_session.get_http_session()
+        assert http_session.get_http_session() is session
+
+        url = f"http://127.0.0.1:{server.server_port}/"
+        for _ in range(5):
+            assert session.get(url, timeout=5).json() == {"ok": True}
+
+        stats = http_session.get_http_session_stats()
+        assert stats["requests"] == 5
+        assert stats["connections"] == 1
+        assert stats["reused"] == 4
+    finally:
+        http_session.reset_http_session()
+        server.shutdown()
+        server.server_close()
+
+
+def test_connections_per_host_are_capped(monkeypatch):
+    state = {"active": 0, "max_active": 0}
+    lock = threading.Lock()
+
+    class _SlowHandler(_OkHandler):
+        def do_GET(self):
+            with lock:
+                state["active"] += 1
+                state["max_active"] = max(state["max_active"], state["active"])
+            time.sleep(0.05)
+            with lock:
+                state["active"] -= 1
+            super().do_GET()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(http_session, "POOL_MAXSIZE", 2)
+    http_session.reset_http_session()
+    try:
+        session = http_session.get_http_session()
+        url = f"http://127.0.0.1:{server.server_port}/"
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            responses = list(pool.map(lambda _: session.get(url, timeout=5).json(), range(6)))
+
+        assert responses == [{"ok": True}] * 6
+        assert state["max_active"] == 2
+        assert http_session.get_http_session_stats()["connections"] == 2
+    finally:
+        http_session.reset_http_session()
+        server.shutdown()
+        server.server_close()
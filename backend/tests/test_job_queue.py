@@ -0,0 +1,75 @@
+import os
+import threading
+
+from backend.common.services.job_queue import JobQueue, JobWorkerPool, report_job_progress
+
+
+def test_job_lifecycle_and_orphan_requeue(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite3")
+    job_id = queue.submit("unified_report", {"client": "Emma"})
+
+    job = queue.claim_next()
+    assert job["id"] == job_id and job["status"] == "running" and job["attempts"] == 1
+    assert queue.claim_next() is None
+
+    # Worker recyclé : le job 'running' de l'ancien process repart en file
+    assert queue.requeue_orphans(active_job_ids=set()) == 1
+    job = queue.claim_next()
+    assert job["attempts"] == 2
+
+    # Toujours actif dans ce process : laissé tel quel
+    assert queue.requeue_orphans(active_job_ids={job_id}) == 0
+
+    queue.update_progress(job_id, "meta", "ok", duration=1.5)
+    queue.finish(job_id, result={"success": True}, http_status=200)
+    job = queue.get(job_id)
+    assert job["status"] == "succeeded"
+    assert job["progress"] == {"meta": {"status": "ok", "duration": 1.5}}
+    assert job["result"] == {"success": True}
+    assert job["worker_pid"] == os.getpid()
+
+
+def test_worker_pool_runs_handler_with_progress(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite3")
+    done = threading.Event()
+
+    def handler(payload):
+        report_job_progress("google", "ok")
+        done.set()
+        return {"client": payload["client"]}, 207
+
+    pool = JobWorkerPool(queue, workers=1, handlers={"unified_report": handler})
+    pool.start()
+    job_id = queue.submit("unified_report", {"client": "Sachs"})
+    pool.notify()
+
+    assert done.wait(5)
+    for _ in range(50):
+        job = queue.get(job_id)
+        if job["status"] != "running":
+            break
+        threading.Event().wait(0.05)
+
+    assert job["status"] == "succeeded"
+    assert job["http_status"] == 207
+    assert job["progress"]["google"]["status"] == "ok"
+    assert job["result"] == {"client": "Sachs"}
+
+
+def test_run_forever_stops_between_jobs(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite3")
+    ran = []
+
+    def handler(payload):
+        ran.append(payload["n"])
+        return {}, 200
+
+    for n in range(3):
+        queue.submit("drive_export", {"n": n})
+    pool = JobWorkerPool(queue, workers=1, handlers={"drive_export": handler})
+    pool.POLL_INTERVAL = 0.01
+
+    # Recyclage du runner après 2 jobs : aucun job interrompu, le troisième reste en file
+    assert pool.run_forever(max_jobs=2) == 2
+    assert ran == [0, 1]
+    assert queue.claim_next()["payload"] == {"n": 2}
@@ -0,0 +1,101 @@
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from backend.common.services import google_sheets, leads_scraper
+from backend.common.services.google_sheets import SheetsQuota
+from backend.common.services.leads_ingestion import get_leads_state_store
+
+
+class _FakeSheets:
+    """Sheet principal + sheets leads sources en mémoire, lectures sources lentes"""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.layout_calls = 0
+        self.missing_tab = None
+        self.flushed = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def parallel_calls(self):
+        yield
+
+    def _source(self, range_name):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.05)
+        with self._lock:
+            self.active -= 1
+        if re.search(r"!A1:", range_name):
+            return [["Date"]]
+        if re.search(r"!A2:", range_name):
+            row = [""] * 27
+            row[0] = row[26] = "10/02/2026"
+            row[16] = row[17] = row[18] = "gclid"  # colonne gclid selon le client
+            return [row]
+        return []
+
+    def get_values(self, range_name, spreadsheet_id=None):
+        return self._source(range_name)
+
+    def batch_get_values(self, ranges, chunk_size=50, spreadsheet_id=None):
+        if spreadsheet_id:
+            return [self._source(r) for r in ranges]
+        self.layout_calls += 1
+        if self.missing_tab and any(r.startswith(f"'{self.missing_tab}'!") for r in ranges):
+            raise RuntimeError(f"Unable to parse range: '{self.missing_tab}'!2:2")
+        values = []
+        for range_name in ranges:
+            if range_name.endswith("!2:2"):
+                values.append([["Mois", "Leads Google", "Leads Meta", "Leads Générés", "Leads Qualifiés"]])
+            else:
+                values.append([["January 2026"], ["February 2026"]])
+        return values
+
+    def flush_write_plan(self, write_plan):
+        self.flushed.append(write_plan)
+        return [group["success_message"] for group in write_plan.groups], []
+
+
+def test_all_clients_read_concurrently_and_written_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("LEADS_MAX_WORKERS", "8")
+    monkeypatch.setattr(get_leads_state_store(), "directory", tmp_path)
+    sheets = _FakeSheets()
+
+    results = leads_scraper.scrape_all_leads(sheets, reference_month="February 2026")
+
+    assert [r["client"] for r in results] == [c["worksheet_name"] for c in leads_scraper.LEADS_SHEETS.values()]
+    assert all(r["months"]["February 2026"]["leads_google"] == 1 for r in results)
+    assert sheets.max_active > 1
+    assert sheets.layout_calls == 1
+    assert len(sheets.flushed) == 1
+    assert sheets.flushed[0].cell_count() == 8 * len(results)  # 2 mois × 4 colonnes
+
+
+def test_missing_target_tab_only_fails_its_client(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_leads_state_store(), "directory", tmp_path)
+    sheets = _FakeSheets()
+    sheets.missing_tab = leads_scraper.LEADS_SHEETS["kozeo"]["worksheet_name"]
+
+    results = leads_scraper.scrape_all_leads(sheets, reference_month="February 2026")
+
+    failed = [r for r in results if "error" in r]
+    assert [r["client"] for r in failed] == [sheets.missing_tab]
+    assert len(results) - len(failed) == len(leads_scraper.LEADS_SHEETS) - 1
+    assert sheets.layout_calls == 1 + len(results)
+    assert len(sheets.flushed[0].groups) == len(results) - 1
+
+
+def test_sheets_quota_blocks_beyond_budget(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(google_sheets.time, "sleep", lambda s: sleeps.append(s) or quota._calls.popleft())
+    quota = SheetsQuota(max_per_minute=2)
+
+    for _ in range(3):
+        quota.acquire()
+
+    assert len(sleeps) == 1 and 0 < sleeps[0] <= SheetsQuota.WINDOW_SECONDS
@@ -0,0 +1,66 @@
+import re
+
+from backend.common.services import leads_ingestion
+from backend.common.services.leads_ingestion import LeadsStateStore, read_leads_counts
+from backend.common.services.leads_scraper import LEADS_SHEETS, count_leads_by_month
+
+CONFIG = LEADS_SHEETS["riviera_grass"]
+MONTHS = [(2026, 2), (2026, 1)]
+
+
+class _SourceSheet:
+    """Sheet leads en mémoire : ligne 1 = en-tête, lignes suivantes = données"""
+
+    def __init__(self, rows):
+        self.header = ["Date", "Nom"]
+        self.rows = rows
+        self.rows_served = 0
+
+    def _range(self, range_name):
+        start, end = map(int, re.search(r"!A(\d+):[A-Z]+(\d+)$", range_name).groups())
+        if start == 1:
+            return [self.header]
+        values = self.rows[start - 2:end - 1]
+        self.rows_served += len(values)
+        return values
+
+    def get_values(self, range_name, spreadsheet_id=None):
+        return self._range(range_name)
+
+    def batch_get_values(self, ranges, chunk_size=50, spreadsheet_id=None):
+        return [self._range(r) for r in ranges]
+
+
+def _row(day, month, statut="", provenance="google"):
+    row = [""] * 18
+    row[0], row[7], row[8] = f"{day:02d}/{month:02d}/2026", provenance, statut
+    return row
+
+
+def test_incremental_reads_tail_and_matches_full_count(tmp_path, monkeypatch):
+    monkeypatch.setattr(leads_ingestion, "CHUNK_ROWS", 4)
+    monkeypatch.setattr(leads_ingestion, "TAIL_ROWS", 3)
+    store = LeadsStateStore(tmp_path)
+    sheet = _SourceSheet([_row(d % 28 + 1, 1 + d % 2, provenance=("google", "meta")[d % 2]) for d in range(10)])
+
+    assert read_leads_counts(sheet, CONFIG, MONTHS, store) == count_leads_by_month(sheet.rows, MONTHS, CONFIG)
+    assert sheet.rows_served == 10
+
+    # Nouvelles lignes + statut modifié dans la fenêtre de fin : seule la fin est relue
+    sheet.rows_served = 0
+    sheet.rows[8][8] = "Doublon"
+    sheet.rows += [_row(20, 2, "qualifié"), _row(21, 2, provenance="meta")]
+    assert read_leads_counts(sheet, CONFIG, MONTHS, store) == count_leads_by_month(sheet.rows, MONTHS, CONFIG)
+    assert sheet.rows_served == 6  # ligne frontière + 3 lignes de fin + 2 nouvelles
+
+    # Ligne supprimée au-dessus de la fenêtre : relecture complète
+    sheet.rows_served = 0
+    del sheet.rows[2]
+    assert read_leads_counts(sheet, CONFIG, MONTHS, store) == count_leads_by_month(sheet.rows, MONTHS, CONFIG)
+    assert sheet.rows_served > len(sheet.rows)
+
+    # En-tête modifié : l'état persisté n'est plus utilisé
+    sheet.header = ["Date", "Nom", "Téléphone"]
+    sheet.rows_served = 0
+    assert read_leads_counts(sheet, CONFIG, MONTHS, store) == count_leads_by_month(sheet.rows, MONTHS, CONFIG)
+    assert sheet.rows_served >= len(sheet.rows)
@@ -0,0 +1,58 @@
+import json
+
+from backend.common.services import mapping_registry
+from backend.config.settings import Config
+
+
+def _write(path, payload):
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+def test_registry_indexes_and_hot_reload(tmp_path, monkeypatch):
+    allowlist = tmp_path / "client_allowlist.json"
+    google = tmp_path / "client_mappings.json"
+    meta = tmp_path / "meta_mappings.json"
+    _write(allowlist, {
+        "allowlist": ["Emma Nantes", "Kozeo", "Laserel"],
+        "mappings": {
+            "Emma Nantes": {"googleAds": {"customerId": "111"}, "googleAnalytics": {"propertyId": "9", "pages": []}},
+            "Kozeo": {"metaAds": {"adAccountId": "act_2"}},
+        },
+    })
+    _write(google, {"mappings": {"111": "Emma Nantes - RITEILE SAS"}})
+    _write(meta, {"mappings": {"act_2": "Kozeo Paris"}})
+    monkeypatch.setattr(Config.PATHS, "CLIENT_ALLOWLIST_FILE", allowlist)
+    monkeypatch.setattr(Config.PATHS, "CLIENT_MAPPINGS_FILE", google)
+    monkeypatch.setattr(Config.PATHS, "META_MAPPINGS_FILE", meta)
+    monkeypatch.setattr(mapping_registry, "RELOAD_CHECK_INTERVAL", 0)
+    mapping_registry.reset_mapping_registry()
+
+    registry = mapping_registry.get_mapping_registry()
+    sheets = ["Emma Nantes - RITEILE SAS", "Kozeo Paris", "Laserel", "Autre"]
+
+    assert registry.client_accounts("Emma Nantes")["googleAds"] == {"customerId": "111"}
+    assert registry.client_accounts("Inconnu")["googleAds"] is None
+    assert registry.sheet_for_customer("111") == "Emma Nantes - RITEILE SAS"
+    assert registry.sheet_for_account("act_2") == "Kozeo Paris"
+    assert registry.worksheet_for_client("Kozeo", sheets) == "Kozeo Paris"
+    assert registry.worksheet_for_client("Laserel", sheets) == "Laserel"
+    assert registry.worksheet_for_client("Autre", sheets) == "Autre"
+    assert registry.client_for_worksheet("Emma Nantes - RITEILE SAS", sheets) == "Emma Nantes"
+    assert registry.ga_config_for_worksheet("Emma Nantes - RITEILE SAS", sheets)["propertyId"] == "9"
+    assert registry.ga_config_for_worksheet("Kozeo Paris", sheets) is None
+
+    # Un index par liste d'onglets, borné : les listes les plus anciennes sont oubliées
+    monkeypatch.setattr(mapping_registry, "WORKSHEET_INDEX_CACHE_SIZE", 2)
+    for extra in ("Nouveau 1", "Nouveau 2", "Nouveau 3"):
+        registry.client_for_worksheet("Laserel", sheets + [extra])
+    assert len(registry._worksheet_indexes) == 2
+
+    # Sans modification : même instantané ; fichier modifié : nouvel instantané complet
+    assert mapping_registry.get_mapping_registry() is registry
+    _write(meta, {"mappings": {"act_2": "Kozeo Lyon"}})
+    reloaded = mapping_registry.get_mapping_registry()
+    assert reloaded is not registry
+    assert reloaded.worksheet_for_client("Kozeo", ["Kozeo Lyon"]) == "Kozeo Lyon"
+    assert registry.sheet_for_account("act_2") == "Kozeo Paris"
+
+    mapping_registry.reset_mapping_registry()
@@ -0,0 +1,79 @@
+import json
+
+import httplib2
+from googleapiclient.http import HttpRequest
+
+from backend.common.utils import media_stream
+from backend.common.utils.media_stream import MediaStream, StreamingMediaUpload
+
+CHUNK = 256 * 1024
+
+
+class _Response:
+    """Réponse requests en flux : le corps n'est produit que bloc par bloc"""
+
+    def __init__(self, size, headers):
+        self.size = size
+        self.headers = headers
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        for start in range(0, self.size, chunk_size):
+            yield bytes([start // chunk_size % 256]) * min(chunk_size, self.size - start)
+
+    def close(self):
+        self.closed = True
+
+
+class _ResumableDrive:
+    """Session d'upload résumable Drive : enregistre les Content-Range reçus"""
+
+    def __init__(self):
+        self.ranges = []
+        self.received = 0
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        if uri == "https://upload.test/files":
+            return httplib2.Response({"status": 200, "location": "https://upload.test/session"}), b""
+        self.ranges.append(headers["Content-Range"])
+        self.received += len(body)
+        total = headers["Content-Range"].rsplit("/", 1)[1]
+        if total != "*" and self.received == int(total):
+            return httplib2.Response({"status": 200}), json.dumps({"id": "f1", "bytes": self.received}).encode()
+        return httplib2.Response({"status": 308, "range": f"bytes=0-{self.received - 1}"}), b""
+
+
+def _upload(size, headers):
+    response = _Response(size, headers)
+    stream = MediaStream(response, "https://cdn.test/video.mp4")
+    media = StreamingMediaUpload(stream, "video/mp4", chunksize=CHUNK)
+    drive = _ResumableDrive()
+    request = HttpRequest(drive, lambda resp, content: json.loads(content), "https://upload.test/files",
+                          method="POST", body="{}", headers={}, resumable=media)
+    result = None
+    while result is None:
+        _, result = request.next_chunk(http=drive)
+    return result, drive, media
+
+
+def test_stream_upload_is_chunked_with_bounded_buffer(monkeypatch):
+    monkeypatch.setattr(media_stream, "READ_SIZE", 64 * 1024)
+    size = 3 * CHUNK + 1000
+
+    result, drive, media = _upload(size, {"Content-Type": "video/mp4", "Content-Length": str(size)})
+
+    assert result == {"id": "f1", "bytes": size}
+    assert drive.ranges[-1] == f"bytes {3 * CHUNK}-{size - 1}/{size}"
+    assert len(drive.ranges) == 4
+    assert media.peak_buffer <= CHUNK
+
+
+def test_unknown_size_announces_total_on_last_chunk():
+    # Taille exactement multiple du bloc, sans Content-Length (ex: transfert compressé)
+    size = 2 * CHUNK
+
+    result, drive, media = _upload(size, {"Content-Type": "video/mp4", "Content-Encoding": "gzip"})
+
+    assert result["bytes"] == size
+    assert drive.ranges == [f"bytes 0-{CHUNK - 1}/*", f"bytes {CHUNK}-{size - 1}/{size}"]
+    assert media.peak_buffer <= 2 * CHUNK + media_stream.READ_SIZE
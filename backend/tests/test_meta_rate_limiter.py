@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+from backend.common.utils.platform_executor import PlatformStageExecutor
+from backend.meta.services.reports import MetaAdsReportsService
+from backend.meta.utils.rate_limiter import (
+    MetaRateLimitError,
+    MetaRateLimiter,
+    parse_usage_headers,
+    rate_limit_block_seconds,
+    rate_limit_key,
+)
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_usage_headers_and_account_key():
+    headers = {
+        "X-App-Usage": json.dumps({"call_count": 12, "total_time": 30, "total_cputime": 5}),
+        "X-Business-Use-Case-Usage": json.dumps({
+            "999": [{"type": "ads_insights", "call_count": 72, "total_time": 10,
+                     "total_cputime": 8, "estimated_time_to_regain_access": 2}]
+        }),
+    }
+
+    assert parse_usage_headers(headers) == {"usage": 72.0, "regain_seconds": 120.0}
+    assert rate_limit_key("https://graph.facebook.com/v19.0/act_123/insights") == "act_123"
+    assert rate_limit_key("https://graph.facebook.com/v19.0/") == "app"
+
+
+def test_high_usage_throttles_then_fails_fast_instead_of_sleeping():
+    clock = _FakeClock()
+    limiter = MetaRateLimiter(clock=clock, sleep=clock.sleep)
+
+    # Usage à 90 % : débit réduit, les appels sont espacés sans dépasser la deadline
+    limiter.observe("act_1", {"X-App-Usage": json.dumps({"call_count": 90})})
+    for _ in range(limiter.BURST + 2):
+        limiter.acquire("act_1", max_wait=5)
+    assert clock.now > 0
+
+    # Meta annonce 5 minutes de blocage : erreur immédiate, aucune attente
+    limiter.observe("act_1", {"X-Business-Use-Case-Usage": json.dumps(
+        {"1": [{"call_count": 100, "estimated_time_to_regain_access": 5}]})})
+    before = clock.now
+    with pytest.raises(MetaRateLimitError) as exc:
+        limiter.acquire("act_1", max_wait=20)
+    assert clock.now == before
+    assert exc.value.retry_after == pytest.approx(300)
+
+    # Les autres comptes ne sont pas affectés
+    limiter.acquire("act_2", max_wait=0)
+
+
+def test_limiter_waits_within_the_stage_budget():
+    clock = _FakeClock()
+    limiter = MetaRateLimiter(clock=clock, sleep=clock.sleep)
+    limiter.block("act_1", 10)
+
+    def stage():
+        # Hors étape, 10 s d'attente passeraient sous DEFAULT_MAX_WAIT (20 s)
+        with pytest.raises(MetaRateLimitError):
+            limiter.acquire("act_1")
+        return True
+
+    executor = PlatformStageExecutor(max_workers=1)
+    executor.submit("meta", stage, deadline=5)
+    assert executor.collect()[0]["result"] is True
+    limiter.acquire("act_1")
+    assert clock.now == pytest.approx(10)
+
+
+def test_rate_limited_response_fails_without_retry(monkeypatch):
+    requests_sent = []
+
+    class Response:
+        status_code = 400
+        headers = {}
+
+        def json(self):
+            return {"error": {"code": 80004}}
+
+    class Session:
+        def get(self, url, params=None, timeout=None):
+            requests_sent.append(url)
+            return Response()
+
+    monkeypatch.setattr("backend.meta.services.reports.get_http_session", lambda: Session())
+    monkeypatch.setattr("backend.meta.services.reports.get_meta_rate_limiter", lambda: MetaRateLimiter())
+
+    with pytest.raises(MetaRateLimitError) as exc:
+        MetaAdsReportsService()._make_meta_request_with_retry("https://graph.facebook.com/v19.0/act_7/insights")
+    assert len(requests_sent) == 1
+    assert exc.value.key == "act_7"
+    assert rate_limit_block_seconds({"code": 4, "error_subcode": 1504022}) == 300
+    assert rate_limit_block_seconds({"code": 100}) == 0
@@ -0,0 +1,133 @@
+import json
+
+from backend.meta.services.reports import MetaAdsReportsService
+from backend.meta.utils.graph_batch import MetaGraphBatch
+from backend.meta.utils.rate_limiter import MetaRateLimiter
+
+
+def test_meta_insights_paginated_once_for_all_metrics(monkeypatch):
+    service = MetaAdsReportsService()
+
+    pages = [
+        {"data": [{"campaign_name": "Follower A", "impressions": 100, "clicks": 10, "spend": "5",
+                   "actions": [{"action_type": "add_to_cart", "value": "2"}]}],
+         "paging": {"cursors": {"after": "p2"}, "next": "https://graph.facebook.com/next"}},
+        {"data": [{"campaign_name": "Drive B", "impressions": 50, "clicks": 5, "spend": "3",
+                   "conversions": [{"action_type": "offsite_conversion.custom.auxerre_engaged_10s", "value": "4"}]}],
+         "paging": {"cursors": {"after": "p3"}}},
+    ]
+    calls = []
+
+    def fake_request(url, params=None, max_retries=3):
+        calls.append(dict(params))
+        page = pages[len(calls) - 1]
+        class Resp:
+            status_code = 200
+            def json(self):
+                return page
+        return Resp()
+
+    monkeypatch.setattr(service, "_make_meta_request_with_retry", fake_request)
+
+    insights = service.get_meta_insights("123", "2025-01-01", "2025-01-31")
+    follower = service.get_campaign_specific_metrics("123", "2025-01-01", "2025-01-31", "follower")
+    total = service.get_action_total_for_account("123", "2025-01-01", "2025-01-31", "auxerre_engaged_10s")
+
+    assert insights["campaign_count"] == 2
+    assert follower["add_to_cart"] == 2 and follower["ctr"] == 10.0
+    assert total == 4
+    assert len(calls) == 2
+    assert calls[1]["after"] == "p2"
+
+
+def test_failed_insights_fetch_is_not_cached(monkeypatch):
+    service = MetaAdsReportsService()
+    responses = [None, {"data": [{"campaign_name": "A"}], "paging": {}}]
+
+    def fake_request(url, params=None, max_retries=3):
+        page = responses.pop(0)
+        if page is None:
+            return None
+        class Resp:
+            status_code = 200
+            def json(self):
+                return page
+        return Resp()
+
+    monkeypatch.setattr(service, "_make_meta_request_with_retry", fake_request)
+
+    assert service.get_insights_rows("123", "2025-01-01", "2025-01-31") is None
+    assert service.get_insights_rows("123", "2025-01-01", "2025-01-31") == [{"campaign_name": "A"}]
+    assert service.get_insights_rows("123", "2025-01-01", "2025-01-31") == [{"campaign_name": "A"}]
+
+
+def test_graph_batch_chunks_and_retries_per_sub_request(monkeypatch):
+    monkeypatch.setattr("backend.meta.utils.graph_batch.time.sleep", lambda s: None)
+    posts = []
+    throttled = {"7"}
+
+    def fake_post(url, data):
+        batch = json.loads(data["batch"])
+        posts.append(len(batch))
+        items = []
+        for sub in batch:
+            object_id = sub["relative_url"].split("?")[0]
+            if object_id in throttled:
+                throttled.discard(object_id)  # erreur transitoire au premier essai seulement
+                items.append({"code": 500, "body": json.dumps({"error": {"code": 2}})})
+            elif object_id == "9":
+                items.append({"code": 400, "body": json.dumps({"error": {"code": 100}})})
+            else:
+                items.append({"code": 200, "body": json.dumps({"id": object_id})})
+        class Resp:
+            def json(self):
+                return items
+        return Resp()
+
+    batch = MetaGraphBatch("token", "https://graph.facebook.com/v22.0", post_func=fake_post, limiter=MetaRateLimiter())
+    urls = [MetaGraphBatch.relative_url(str(i), {"fields": "id"}) for i in range(120)]
+    results = batch.get_many(urls)
+
+    assert posts == [50, 50, 20, 1]
+    assert results[7] == {"id": "7"}
+    assert results[9] is None
+    assert [r["id"] for r in results[:3]] == ["0", "1", "2"]
+
+
+def test_graph_batch_rate_limit_blocks_only_the_sub_request_account():
+    sent = []
+    usage = json.dumps({"2": [{"call_count": 80}]})
+
+    def fake_post(url, data):
+        batch = json.loads(data["batch"])
+        sent.append([sub["relative_url"].split("?")[0] for sub in batch])
+        items = []
+        for sub in batch:
+            object_id = sub["relative_url"].split("?")[0]
+            headers = [{"name": "X-Business-Use-Case-Usage", "value": usage}]
+            if object_id == "b1":
+                items.append({"code": 400, "headers": headers, "body": json.dumps({"error": {"code": 80004}})})
+            else:
+                items.append({"code": 200, "headers": headers, "body": json.dumps({"id": object_id})})
+        class Resp:
+            headers = {"X-Business-Use-Case-Usage": usage}
+            def json(self):
+                return items
+        return Resp()
+
+    limiter = MetaRateLimiter()
+    batch = MetaGraphBatch("token", "https://graph.facebook.com/v22.0", post_func=fake_post, limiter=limiter)
+    urls = [MetaGraphBatch.relative_url(i, {"fields": "id"}) for i in ("a1", "b1", "b2")]
+
+    results = batch.get_many(urls, keys=["act_1", "act_2", "act_2"])
+    assert results == [{"id": "a1"}, None, {"id": "b2"}]
+    status = limiter.get_status()
+    assert status["act_2"]["blocked_for"] > 60
+    assert status["act_1"]["blocked_for"] == 0
+    # L'usage par compte ne ralentit pas le quota de l'application
+    assert status["app"]["usage"] == 0
+
+    # Compte bloqué : ses sous-requêtes ne partent plus, les autres si
+    results = batch.get_many(urls, keys=["act_1", "act_2", "act_2"])
+    assert sent[-1] == ["a1"]
+    assert results == [{"id": "a1"}, None, None]
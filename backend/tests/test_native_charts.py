@@ -0,0 +1,66 @@
+import io
+
+from pptx import Presentation
+from pptx.enum.chart import XL_CHART_TYPE
+from pptx.util import Inches
+
+from backend.reports import native_charts
+from backend.reports.templates.base import BaseTemplate
+
+
+class _Template(BaseTemplate):
+    def generate(self, data):
+        return self.prs
+
+
+def _slide():
+    prs = Presentation()
+    return prs, prs.slides.add_slide(prs.slide_layouts[6])
+
+
+def test_native_charts_are_editable_pptx_charts():
+    prs, slide = _slide()
+    history = [{"month_fr": "Janvier", "Clics": 10}, {"month_fr": "Février", "Clics": 12.5}]
+
+    line = native_charts.add_native_evolution_chart(
+        slide, history, "Clics", "Clics", 0, 0, Inches(6), Inches(3), line_color="03A9F4")
+    bars = native_charts.add_native_comparison_bar_chart(
+        slide, [120, 4], [100, 5], ["Leads", "CPL"], "Mars", "Février", 0, Inches(3), Inches(6), Inches(3))
+    donut = native_charts.add_native_budget_donut(slide, 1200, 300, Inches(6), 0, Inches(4), Inches(4))
+
+    assert line.chart_type == XL_CHART_TYPE.LINE_MARKERS
+    assert list(line.plots[0].categories) == ["Janvier", "Février"]
+    assert [chart.chart_type for chart in bars] == [XL_CHART_TYPE.COLUMN_CLUSTERED] * 2
+    assert donut.chart_type == XL_CHART_TYPE.DOUGHNUT
+    assert native_charts.add_native_budget_donut(slide, 0, 0, 0, 0, Inches(4), Inches(4)) is None
+
+    # Le fichier se relit : graphiques conservés, aucune image
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    buffer.seek(0)
+    shapes = Presentation(buffer).slides[0].shapes
+    assert sum(shape.has_chart for shape in shapes) == 4
+    assert not any(shape.shape_type == 13 for shape in shapes)  # MSO_SHAPE_TYPE.PICTURE
+
+
+def test_template_selects_native_backend_per_call(monkeypatch):
+    from backend.reports import charts
+
+    _, slide = _slide()
+    monkeypatch.setattr(charts, "render_plotly_evolution_charts",
+                        lambda *a, **k: (_ for _ in ()).throw(AssertionError("rendu PNG inattendu")))
+    history = [{"month_fr": "Janvier", "Leads": 3}]
+    positions = [(0, 0), (Inches(6), 0)]
+
+    _Template().add_evolution_charts(
+        slide, history, [(1, "Leads", "Leads")], positions, Inches(6), Inches(3), native=True)
+
+    assert [shape.left for shape in slide.shapes if shape.has_chart] == [Inches(6)]
+
+
+def test_native_default_read_when_template_is_created(monkeypatch):
+    monkeypatch.setenv("REPORT_NATIVE_CHARTS", "1")
+    assert _Template()._use_native(None)
+    monkeypatch.delenv("REPORT_NATIVE_CHARTS")
+    assert not _Template()._use_native(None)
+    assert _Template()._use_native(True)
@@ -0,0 +1,84 @@
+import threading
+import time
+
+from backend.common.utils.platform_executor import (
+    PlatformStageExecutor,
+    StageCancelledError,
+    check_stage_deadline,
+    stage_time_remaining,
+)
+
+
+def test_stages_run_in_parallel_and_keep_submission_order():
+    barrier = threading.Barrier(3, timeout=2)
+
+    def stage(name):
+        def run():
+            barrier.wait()  # ne passe que si les 3 étapes tournent en même temps
+            time.sleep(0.05 if name == "google" else 0)
+            return name
+        return run
+
+    executor = PlatformStageExecutor(max_workers=3)
+    for name in ("google", "meta", "analytics"):
+        executor.submit(name, stage(name), deadline=5)
+
+    results = executor.collect()
+
+    assert [r["platform"] for r in results] == ["google", "meta", "analytics"]
+    assert [r["result"] for r in results] == ["google", "meta", "analytics"]
+    assert all(r["status"] == "ok" for r in results)
+
+
+def test_stage_deadline_and_error_are_reported():
+    release = threading.Event()
+
+    def slow():
+        release.wait(2)
+        return "late"
+
+    def broken():
+        raise RuntimeError("API down")
+
+    executor = PlatformStageExecutor(max_workers=3)
+    executor.submit("meta", slow, deadline=0.1)
+    executor.submit("analytics", broken, deadline=5)
+    executor.submit("leads", lambda: 3, deadline=5)
+
+    start = time.monotonic()
+    results = executor.collect()
+    release.set()
+
+    assert time.monotonic() - start < 1
+    assert [r["status"] for r in results] == ["timeout", "error", "ok"]
+    assert results[1]["error"] == "API down"
+    assert results[2]["result"] == 3
+
+
+def test_abandoned_stage_stops_at_next_api_call():
+    calls = []
+    stopped = threading.Event()
+
+    def straggler():
+        assert 0 < stage_time_remaining() <= 0.1
+        try:
+            while True:
+                check_stage_deadline()  # comme avant chaque appel API
+                calls.append(1)
+                time.sleep(0.01)
+        except StageCancelledError:
+            stopped.set()
+            raise
+
+    executor = PlatformStageExecutor(max_workers=1)
+    executor.submit("meta", straggler, deadline=0.1)
+    results = executor.collect()
+
+    assert results[0]["status"] == "timeout"
+    assert stopped.wait(1)
+    made = len(calls)
+    time.sleep(0.05)
+    assert len(calls) == made
+    # Hors étape : pas de deadline
+    assert stage_time_remaining() is None
+    check_stage_deadline()
@@ -0,0 +1,53 @@
+import io
+
+from backend.reports import chart_cache, charts, plotly_renderer
+from backend.reports.chart_cache import ChartCache
+from backend.reports.plotly_renderer import PlotlyRenderer, read_render_process_stats
+
+
+def _fake_export(exports):
+    def export(figure, scale):
+        exports.append(figure)
+        return b"\x89PNG" + figure["layout"].get("title", {}).get("text", "").encode()
+    return export
+
+
+def test_renderer_records_cold_then_warm_renders(tmp_path):
+    exports = []
+    renderer = PlotlyRenderer(export_func=_fake_export(exports), stats_dir=tmp_path)
+
+    renderer.warm_up()
+    renderer.warm_up()  # déjà chaud : pas de second rendu
+    images = renderer.render_many([{"data": [], "layout": {"title": {"text": "A"}}},
+                                    {"data": [], "layout": {"title": {"text": "B"}}}])
+
+    assert images == [b"\x89PNGA", b"\x89PNGB"]
+    assert len(exports) == 3
+    stats = renderer.get_stats()
+    assert stats["started"] and stats["cold_start_seconds"] is not None
+    assert stats["warm_renders"] == 2
+    assert stats["render_calls"] == 1
+
+    # Publiées pour /concurrency-status ; le fichier d'un process terminé est ignoré
+    (tmp_path / "999999999.json").write_text("{}")
+    assert read_render_process_stats(tmp_path) == [stats]
+
+
+def test_evolution_charts_render_in_one_call_and_use_cache(tmp_path, monkeypatch):
+    exports = []
+    renderer = PlotlyRenderer(export_func=_fake_export(exports))
+    monkeypatch.setattr(plotly_renderer, "_renderer", renderer)
+    monkeypatch.setattr(chart_cache, "_cache", ChartCache(tmp_path / "cache"))
+    history = [{"month_fr": "Janvier", "Clics": 10, "Leads": 2}, {"month_fr": "Février", "Clics": 12, "Leads": 3}]
+    items = [("Clics", "Clics"), ("Leads", "Leads")]
+
+    images = charts.render_plotly_evolution_charts(history, items, line_color="FFC107")
+    assert [image.getvalue() for image in images] == [b"\x89PNGClics", b"\x89PNGLeads"]
+    assert renderer.render_calls == 1
+
+    # Même données : tout vient du cache, y compris pour l'appel unitaire
+    charts.render_plotly_evolution_charts(history, items, line_color="FFC107")
+    single = io.BytesIO()
+    charts.create_plotly_evolution_chart(history, "Leads", "Leads", single, line_color="FFC107")
+    assert single.getvalue() == b"\x89PNGLeads"
+    assert len(exports) == 2
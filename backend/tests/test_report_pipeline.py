@@ -0,0 +1,101 @@
+import os
+import threading
+
+from backend.reports.pipeline import ReportPipeline
+
+
+def _render(sheet_name, data):
+    if data["fail_render"]:
+        raise ValueError("template cassé")
+    return f"pptx:{sheet_name}".encode()
+
+
+def _render_or_crash(sheet_name, data):
+    # Simule un process de rendu tué (OOM) : une seule fois si un marqueur est fourni
+    marker = data.get("crash_once")
+    if data.get("crash_always") or (marker and not os.path.exists(marker)):
+        if marker:
+            open(marker, "w").close()
+        os._exit(1)
+    return f"pptx:{sheet_name}".encode()
+
+
+def test_pipeline_overlaps_stages_and_keeps_order():
+    # Les 3 lectures ne passent la barrière que si elles tournent en parallèle
+    barrier = threading.Barrier(3, timeout=5)
+    uploaded = []
+
+    def read(sheet_name):
+        barrier.wait()
+        if sheet_name == "B":
+            raise RuntimeError("onglet illisible")
+        return {"fail_render": sheet_name == "C"}
+
+    def upload(sheet_name, data, pptx_bytes):
+        uploaded.append(pptx_bytes)
+        return {"client": sheet_name, "status": "success", "filename": f"{sheet_name}.pptx"}
+
+    pipeline = ReportPipeline(read_func=read, upload_func=upload, render_func=_render,
+                              read_workers=3, render_workers=2, upload_workers=2, queue_size=1)
+    results = pipeline.run(["A", "B", "C"])
+
+    assert [r["client"] for r in results] == ["A", "B", "C"]
+    assert [r["status"] for r in results] == ["success", "error", "error"]
+    assert results[1]["error"] == "onglet illisible"
+    assert results[2]["error"] == "template cassé"
+    assert uploaded == [b"pptx:A"]
+
+
+def test_pipeline_renders_in_process_pool():
+    pipeline = ReportPipeline(
+        read_func=lambda name: {"fail_render": False},
+        upload_func=lambda name, data, pptx: {"client": name, "status": "success", "size": len(pptx)},
+        render_func=_render,
+        render_workers=2,
+        use_processes=True,
+    )
+
+    results = pipeline.run(["A", "BB"])
+
+    assert [r["size"] for r in results] == [len(b"pptx:A"), len(b"pptx:BB")]
+
+
+def test_render_pool_reused_across_runs(monkeypatch):
+    from backend.reports import pipeline as pipeline_module
+
+    monkeypatch.delenv("REPORT_RENDER_WORKERS", raising=False)
+    assert pipeline_module.default_render_workers() == 1
+
+    def run():
+        return ReportPipeline(read_func=lambda name: {"fail_render": False},
+                              upload_func=lambda name, data, pptx: {"client": name, "status": "success"},
+                              render_func=_render, render_workers=1).run(["A"])
+
+    run()
+    first_pool = pipeline_module._render_pool
+    run()
+    assert pipeline_module._render_pool is first_pool
+
+    pipeline_module.shutdown_render_pool()
+    assert pipeline_module._render_pool is None
+
+
+def test_broken_render_pool_is_replaced_mid_run(tmp_path):
+    from backend.reports import pipeline as pipeline_module
+
+    def read(sheet_name):
+        return {"crash_once": str(tmp_path / "crashed") if sheet_name == "X" else None,
+                "crash_always": sheet_name == "Y"}
+
+    try:
+        results = ReportPipeline(read_func=read,
+                                 upload_func=lambda name, data, pptx: {"client": name, "status": "success",
+                                                                       "pptx": pptx},
+                                 render_func=_render_or_crash, render_workers=1,
+                                 use_processes=True).run(["A", "X", "Y", "B"])
+    finally:
+        pipeline_module.shutdown_render_pool()
+
+    assert [r["status"] for r in results] == ["success", "success", "error", "success"]
+    assert results[1]["pptx"] == b"pptx:X"
+    assert results[3]["pptx"] == b"pptx:B"
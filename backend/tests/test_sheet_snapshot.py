@@ -0,0 +1,80 @@
+from unittest.mock import MagicMock
+
+from backend.common.services.google_sheets import GoogleSheetsService
+from backend.reports import data_reader
+from backend.reports.data_reader import SpreadsheetSnapshot, read_report_data_by_worksheet
+
+HEADERS = [["Mois", "GOOGLE", "Sessions"], ["", "Total Clic", ""]]
+
+
+def _tab_values(clicks):
+    return [
+        ["Mois", "Total Clic", ""],
+        ["January 2026", str(clicks), "40"],
+        ["February 2026", str(clicks + 1), "50"],
+    ]
+
+
+def _make_service(monkeypatch, tabs, hidden=()):
+    monkeypatch.setattr(GoogleSheetsService, "_initialize_service", lambda self: None)
+    service = GoogleSheetsService()
+    service.service = MagicMock()
+    service.service.spreadsheets.return_value.get.return_value.execute.return_value = {
+        "sheets": [{"properties": {"title": name, "hidden": name in hidden}} for name in tabs],
+    }
+
+    batch_get = service.service.spreadsheets.return_value.values.return_value.batchGet
+
+    def batch(spreadsheetId, ranges):
+        value_ranges = []
+        for range_name in ranges:
+            name = range_name.split("'")[1]
+            values = HEADERS if range_name.endswith("!2:3") else _tab_values(tabs[name])
+            value_ranges.append({"values": values})
+        request = MagicMock()
+        request.execute.return_value = {"valueRanges": value_ranges}
+        return request
+
+    batch_get.side_effect = batch
+    return service, batch_get
+
+
+def test_snapshot_serves_all_tabs_from_one_batch_get(monkeypatch):
+    tabs = {"Kozeo": 10, "Emma Nantes": 20, "Archive": 0}
+    service, batch_get = _make_service(monkeypatch, tabs, hidden={"Archive"})
+    ga_lookups = []
+    monkeypatch.setattr(data_reader, "_ga_configs_by_worksheet", lambda sheets: ga_lookups.append(sheets) or {
+        "Kozeo": {"pages": [{"sheetColumn": "Sessions"}]},
+    })
+
+    snapshot = SpreadsheetSnapshot(service)
+    assert snapshot.visible_sheets == ["Kozeo", "Emma Nantes"]
+    snapshot.load(snapshot.visible_sheets)
+
+    kozeo = read_report_data_by_worksheet("Kozeo", "Février 2026", snapshot=snapshot)
+    emma = read_report_data_by_worksheet("Emma Nantes", "February 2026", snapshot=snapshot)
+
+    assert kozeo["google_ads"]["current"]["Total Clic"] == 11
+    assert kozeo["google_ads"]["previous"]["Total Clic"] == 10
+    assert kozeo["analytics"]["pages"] == [
+        {"label": "Sessions", "current": 50, "previous": 40, "previous_previous": 0},
+    ]
+    assert emma["google_ads"]["current"]["Total Clic"] == 21
+    assert emma["analytics"]["pages"] == []
+    assert [h["month_fr"] for h in emma["history"]] == ["Janvier 2026", "Février 2026"]
+
+    assert batch_get.call_count == 1
+    assert service.service.spreadsheets.return_value.get.call_count == 1
+    assert len(ga_lookups) == 1
+
+
+def test_batch_get_values_is_chunked(monkeypatch):
+    tabs = {f"Client {i}": i for i in range(5)}
+    service, batch_get = _make_service(monkeypatch, tabs)
+    ranges = [r for name in tabs for r in data_reader._sheet_ranges(name)]
+
+    values = service.batch_get_values(ranges, chunk_size=4)
+
+    assert batch_get.call_count == 3
+    assert len(values) == 10
+    assert values[0] == HEADERS and values[9] == _tab_values(4)
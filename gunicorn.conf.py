@@ -4,6 +4,8 @@ Configuration Gunicorn optimisée pour Render - Anti SIGKILL
 
 import os
 import multiprocessing
+import subprocess
+import sys
 
 # Configuration de base
 bind = f"0.0.0.0:{os.getenv('PORT', 5000)}"
@@ -24,6 +26,11 @@ max_requests_jitter = 50
 # Préchargement pour optimiser les performances
 preload_app = True
 
+# Jobs asynchrones exécutés par un process dédié lancé par le master (voir when_ready) :
+# le recyclage des workers HTTP (max_requests, polls GET /jobs/<id> compris) ne les interrompt pas
+os.environ.setdefault("JOB_RUNNER", "process")
+_job_runner = None
+
 # Logging optimisé
 accesslog = "-"
 errorlog = "-"
@@ -47,6 +54,20 @@ def when_ready(server):
     """Callback appelé quand le serveur est prêt"""
     server.log.info("🚀 Serveur Gunicorn optimisé démarré")
 
+    global _job_runner
+    if os.environ.get("JOB_RUNNER") == "process":
+        _job_runner = subprocess.Popen([sys.executable, "-m", "backend.job_runner"])
+        server.log.info(f"👷 Process des jobs asynchrones démarré (pid {_job_runner.pid})")
+
+def on_exit(server):
+    """Callback appelé à l'arrêt du master : arrête le process des jobs"""
+    if _job_runner is not None and _job_runner.poll() is None:
+        _job_runner.terminate()
+        try:
+            _job_runner.wait(timeout=graceful_timeout)
+        except subprocess.TimeoutExpired:
+            _job_runner.kill()
+
 def worker_int(worker):
     """Callback appelé lors de l'interruption d'un worker"""
     worker.log.info("⚠️ Worker interrompu - nettoyage en cours")
@@ -58,6 +79,8 @@ def pre_fork(server, worker):
 def post_fork(server, worker):
     """Callback appelé après le fork d'un worker"""
     server.log.info(f"✅ Worker {worker.pid} démarré")
+    # Pas de préchauffage de kaleido ici : seuls les process de rendu des rapports
+    # le démarrent (pipeline.py), un rapport isolé le démarre à la demande
 
 def worker_abort(worker):
     """Callback appelé lors de l'abandon d'un worker"""